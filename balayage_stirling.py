@@ -0,0 +1,387 @@
+# balayage_stirling.py
+"""
+Balayage de l'espace de conception du moteur Stirling en ligne de commande.
+
+Exemples :
+    python balayage_stirling.py grille --puissance 1000:50000:50 --n-cyl 1:24:24 --sortie grille.csv
+    python balayage_stirling.py lhs --n 10000000 --puissance 1000:150000 --rpm 400:1800 --sortie lhs.parquet -j 8
+    python balayage_stirling.py incertitudes --puissance 15000 --n 1000000 --sortie incertitudes.csv
+
+Chaque paramètre accepte une valeur fixe ("20"), un intervalle "min:max"
+(hypercube latin) ou "min:max:n" (grille cartésienne à n points).
+Les points sont traités par blocs de taille bornée, répartis sur un pool de
+processus, et écrits au fil de l'eau : la mémoire ne dépend pas de la taille du balayage.
+Le mode « incertitudes » propage tolérances et dispersions autour d'une conception
+(calculs/incertitudes.py) : mêmes blocs et même pool, mais seules des sommes
+remontent des processus (distributions, probabilités de défaillance, indices de Sobol).
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing import get_context
+
+import numpy as np
+
+from calculs.incertitudes import (
+    QUANTILES, VARIABLES, bornes_histogrammes, conception_nominale, cumuler, resultats, statistiques_bloc,
+)
+from calculs.moteur_stirling import (
+    DTYPE_MOTEUR, dimensionner_moteur, temperature_chaude_reco, temperature_froide_reco,
+)
+from calculs.pieces_stirling import DTYPE_PIECES, dimensionner_pieces
+from calculs.schmidt import DTYPE_SCHMIDT, schmidt_moteur
+
+# Paramètres d'entrée (nom CLI, clé, défaut) dans l'ordre de dimensionner_moteur
+PARAMETRES = [
+    ("puissance", "puissance", "15000"),
+    ("n-cyl", "n_cyl", "8"),
+    ("pression", "pression", "20"),
+    ("rpm", "rpm", "1400"),
+    ("t-chaude", "t_chaude", str(temperature_chaude_reco())),
+    ("t-froide", "t_froide", str(temperature_froide_reco())),
+]
+
+COLONNES = list(DTYPE_MOTEUR.names) + list(DTYPE_PIECES.names) + list(DTYPE_SCHMIDT.names)
+
+
+def lire_plage(texte):
+    """'v' -> (v, v, 1) ; 'a:b' -> (a, b, None) ; 'a:b:n' -> (a, b, n)"""
+    morceaux = texte.split(":")
+    if len(morceaux) == 1:
+        v = float(morceaux[0])
+        return v, v, 1
+    if len(morceaux) == 2:
+        return float(morceaux[0]), float(morceaux[1]), None
+    if len(morceaux) == 3:
+        return float(morceaux[0]), float(morceaux[1]), int(morceaux[2])
+    raise ValueError(f"Plage invalide : {texte!r}")
+
+
+# ----------------- Générateurs de points (par indices, sans tout matérialiser) -----------------
+
+class GrilleCartesienne:
+    """Grille produit ; le point i est retrouvé par décomposition de l'indice"""
+
+    def __init__(self, plages):
+        self.axes = []
+        for vmin, vmax, n in plages:
+            if n is None:
+                raise ValueError("Grille : préciser le nombre de points (min:max:n)")
+            self.axes.append(np.linspace(vmin, vmax, n) if n > 1 else np.array([vmin]))
+        self.forme = tuple(len(a) for a in self.axes)
+        self.taille = int(np.prod(self.forme, dtype=np.int64))
+
+    def points(self, debut, fin):
+        idx = np.unravel_index(np.arange(debut, fin, dtype=np.int64), self.forme)
+        return [axe[i] for axe, i in zip(self.axes, idx)]
+
+
+class HypercubeLatin:
+    """
+    Hypercube latin sans tableau de permutation.
+
+    Chaque dimension utilise une permutation affine i -> (a i + b) mod n
+    (a premier avec n), ce qui garantit une seule valeur par strate et permet
+    de générer n'importe quel bloc indépendamment des autres.
+    """
+
+    def __init__(self, plages, taille, graine=0):
+        self.plages = plages
+        self.taille = int(taille)
+        self.graine = graine
+        rng = np.random.default_rng(graine)
+        self.affines = []
+        for _ in plages:
+            a = int(rng.integers(1, max(self.taille, 2)))
+            while np.gcd(a, self.taille) != 1:
+                a += 1
+            self.affines.append((a, int(rng.integers(0, self.taille))))
+
+    def points(self, debut, fin):
+        i = np.arange(debut, fin, dtype=np.int64)
+        rng = np.random.default_rng([self.graine, debut])
+        cols = []
+        for (vmin, vmax, _), (a, b) in zip(self.plages, self.affines):
+            strate = (i * a + b) % self.taille  # int64 : n < 2**31 conseillé
+            u = (strate + rng.random(i.size)) / self.taille
+            cols.append(vmin + u * (vmax - vmin))
+        return cols
+
+
+# ----------------- Travail d'un bloc (exécuté dans les processus) -----------------
+
+_GENERATEUR = None
+
+
+def _init_travailleur(generateur):
+    global _GENERATEUR
+    _GENERATEUR = generateur
+
+
+def calculer_bloc(debut, fin, generateur=None, format_sortie="csv", echangeurs=False):
+    """Dimensionne les points [debut, fin) ; renvoie du texte CSV ou les colonnes"""
+    generateur = generateur or _GENERATEUR
+    entrees = generateur.points(debut, fin)
+    moteur = dimensionner_moteur(*entrees, echangeurs=echangeurs)
+    pieces = dimensionner_pieces(moteur)
+    cycle = schmidt_moteur(moteur)
+    if format_sortie == "csv":
+        tampon = io.StringIO()
+        table = np.column_stack([moteur[c].astype(float) for c in DTYPE_MOTEUR.names] +
+                                [pieces[c].astype(float) for c in DTYPE_PIECES.names] +
+                                [cycle[c] for c in DTYPE_SCHMIDT.names])
+        np.savetxt(tampon, table, delimiter=",", fmt="%.6g")
+        return fin - debut, tampon.getvalue().encode()
+    colonnes = {c: moteur[c] for c in DTYPE_MOTEUR.names}
+    colonnes.update({c: pieces[c] for c in DTYPE_PIECES.names})
+    colonnes.update({c: cycle[c] for c in DTYPE_SCHMIDT.names})
+    return fin - debut, colonnes
+
+
+# ----------------- Écriture des résultats -----------------
+
+class EcrivainCSV:
+    def __init__(self, chemin):
+        self.fichier = open(chemin, "wb")
+        self.fichier.write((",".join(COLONNES) + "\n").encode())
+
+    def ecrire(self, donnees):
+        self.fichier.write(donnees)
+
+    def fermer(self):
+        self.fichier.close()
+
+
+class EcrivainParquet:
+    def __init__(self, chemin):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Export Parquet : installer pyarrow (pip install pyarrow) ou utiliser une sortie .csv")
+        self.pa = pa
+        self.chemin = chemin
+        self.pq = pq
+        self.writer = None
+
+    def ecrire(self, colonnes):
+        table = self.pa.table(colonnes)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.chemin, table.schema)
+        self.writer.write_table(table)
+
+    def fermer(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def balayer(generateur, sortie, workers=None, taille_bloc=200_000, progression=True, echangeurs=False):
+    """
+    Répartit le balayage sur un pool et écrit les blocs dans l'ordre ; echangeurs : rendement
+    par le bilan des échangeurs (dimensionner_moteur), bien plus lent
+    """
+    format_sortie = "parquet" if sortie.lower().endswith(".parquet") else "csv"
+    ecrivain = EcrivainParquet(sortie) if format_sortie == "parquet" else EcrivainCSV(sortie)
+    workers = workers or os.cpu_count() or 1
+    blocs = [(d, min(d + taille_bloc, generateur.taille)) for d in range(0, generateur.taille, taille_bloc)]
+    t0 = time.perf_counter()
+    fait = 0
+    try:
+        if workers == 1:
+            for debut, fin in blocs:
+                n, donnees = calculer_bloc(debut, fin, generateur, format_sortie, echangeurs)
+                ecrivain.ecrire(donnees)
+                fait += n
+                if progression:
+                    _afficher_progression(fait, generateur.taille, t0)
+        else:
+            # Au plus 2 blocs en attente par processus : mémoire bornée même si l'écriture est lente
+            ctx = get_context("spawn")
+            with ctx.Pool(workers, initializer=_init_travailleur, initargs=(generateur,)) as pool:
+                en_cours = deque()
+                restants = iter(blocs)
+                for debut, fin in restants:
+                    en_cours.append(pool.apply_async(calculer_bloc, (debut, fin, None, format_sortie, echangeurs)))
+                    if len(en_cours) >= 2 * workers:
+                        break
+                while en_cours:
+                    n, donnees = en_cours.popleft().get()
+                    ecrivain.ecrire(donnees)
+                    fait += n
+                    if progression:
+                        _afficher_progression(fait, generateur.taille, t0)
+                    suivant = next(restants, None)
+                    if suivant is not None:
+                        en_cours.append(pool.apply_async(calculer_bloc, (*suivant, None, format_sortie, echangeurs)))
+    finally:
+        ecrivain.fermer()
+    if progression:
+        sys.stderr.write("\n")
+    return fait, time.perf_counter() - t0
+
+
+# ----------------- Propagation des incertitudes -----------------
+
+_CONTEXTE = None
+
+
+def _init_incertitudes(contexte):
+    global _CONTEXTE
+    _CONTEXTE = contexte
+
+
+def _bloc_incertitudes(bloc, contexte=None):
+    """Sommes d'un bloc (indice, n_base) ; le contexte (nominal, bornes, graine, sobol) vient du pool"""
+    nominal, bornes, graine, sobol = contexte or _CONTEXTE
+    indice, n_base = bloc
+    return statistiques_bloc(nominal, bornes, n_base, graine, indice, sobol)
+
+
+def propager(nominal, n, graine=0, sobol=True, workers=None, taille_bloc=200_000, progression=True):
+    """
+    Pousse au moins n évaluations (plan de Sobol compris) dans la chaîne des pièces, par blocs
+    de taille_bloc évaluations répartis sur un pool ; renvoie (synthèse, évaluations, durée).
+    """
+    par_ligne = len(VARIABLES) + 2 if sobol else 2
+    n_base = max(1, taille_bloc // par_ligne)
+    n_blocs = max(1, -(-n // (n_base * par_ligne)))
+    evaluations = n_blocs * n_base * par_ligne
+    bornes = bornes_histogrammes(nominal, graine)
+    contexte = (nominal, bornes, graine, sobol)
+    blocs = ((i, n_base) for i in range(n_blocs))
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    total, fait = None, 0
+    if workers == 1:
+        partiels = (_bloc_incertitudes(bloc, contexte) for bloc in blocs)
+        total, fait = _cumuler_blocs(partiels, n_base * par_ligne, evaluations, t0, progression)
+    else:
+        # Les processus ne renvoient que des sommes : rien à borner côté mémoire
+        ctx = get_context("spawn")
+        with ctx.Pool(workers, initializer=_init_incertitudes, initargs=(contexte,)) as pool:
+            partiels = pool.imap(_bloc_incertitudes, blocs)
+            total, fait = _cumuler_blocs(partiels, n_base * par_ligne, evaluations, t0, progression)
+    if progression:
+        sys.stderr.write("\n")
+    return resultats(total, bornes), fait, time.perf_counter() - t0
+
+
+def _cumuler_blocs(partiels, par_bloc, evaluations, t0, progression):
+    total, fait = None, 0
+    for partiel in partiels:
+        total = cumuler(total, partiel)
+        fait += par_bloc
+        if progression:
+            _afficher_progression(fait, evaluations, t0)
+    return total, fait
+
+
+def afficher_incertitudes(synthese, seuil_sobol=0.01):
+    """Tableau des distributions et probabilités de défaillance, puis sensibilités de Sobol"""
+    q_bas, q_haut = QUANTILES[0], QUANTILES[-1]
+    lignes = [f"{'sortie':<16}{'moyenne':>12}{'écart-type':>12}{f'q{q_bas:.1%}':>12}{'médiane':>12}"
+              f"{f'q{q_haut:.1%}':>12}   P défaillance"]
+    for nom, r in synthese.items():
+        q = r["quantiles"]
+        p = f"   {r['P_defaillance']:.2e} ± {r['erreur_type']:.1e}" if "P_defaillance" in r else ""
+        lignes.append(f"{nom:<16}{r['moyenne']:>12.4g}{r['ecart_type']:>12.4g}{q[q_bas]:>12.4g}{q[0.5]:>12.4g}"
+                      f"{q[q_haut]:>12.4g}{p}")
+    if any("total" in r for r in synthese.values()):
+        lignes.append(f"\nSensibilités : indices de Sobol totaux (premier ordre) ≥ {seuil_sobol}")
+        for nom, r in synthese.items():
+            if "total" not in r:
+                continue
+            termes = sorted(((st, r["premier_ordre"][v], v) for v, st in r["total"].items()
+                             if np.isfinite(st) and st >= seuil_sobol), reverse=True)
+            lignes.append(f"{nom:<16}" + (", ".join(f"{v} {st:.2f} ({s1:.2f})" for st, s1, v in termes) or "-"))
+    return "\n".join(lignes)
+
+
+def ecrire_incertitudes(synthese, chemin):
+    """Synthèse CSV : une ligne par sortie (statistiques, quantiles, défaillance, Sobol)"""
+    noms = [v[0] for v in VARIABLES]
+    colonnes = (["sortie", "moyenne", "ecart_type", "min", "max"] + [f"q{q}" for q in QUANTILES]
+                + ["P_defaillance", "erreur_type"] + [f"S1_{v}" for v in noms] + [f"ST_{v}" for v in noms])
+    with open(chemin, "w", encoding="utf-8") as f:
+        f.write(",".join(colonnes) + "\n")
+        for nom, r in synthese.items():
+            valeurs = ([r["moyenne"], r["ecart_type"], r["min"], r["max"]] + [r["quantiles"][q] for q in QUANTILES]
+                       + [r.get("P_defaillance", np.nan), r.get("erreur_type", np.nan)]
+                       + [r.get("premier_ordre", {}).get(v, np.nan) for v in noms]
+                       + [r.get("total", {}).get(v, np.nan) for v in noms])
+            f.write(nom + "," + ",".join(f"{float(v):.6g}" for v in valeurs) + "\n")
+
+
+def _afficher_progression(fait, total, t0):
+    duree = time.perf_counter() - t0
+    debit = fait / duree if duree > 0 else 0
+    sys.stderr.write(f"\r{fait}/{total} points ({100 * fait / total:.1f} %) – {debit:,.0f} pts/s")
+    sys.stderr.flush()
+
+
+def construire_parser():
+    parser = argparse.ArgumentParser(description="Balayage de conception du moteur Stirling (moteur + pièces + cycle de Schmidt).")
+    sous = parser.add_subparsers(dest="mode", required=True)
+    for mode, aide in (("grille", "grille cartésienne (plages min:max:n)"),
+                       ("lhs", "hypercube latin (plages min:max)")):
+        p = sous.add_parser(mode, help=aide)
+        for nom, cle, defaut in PARAMETRES:
+            p.add_argument(f"--{nom}", dest=cle, default=defaut, help=f"valeur, min:max ou min:max:n (défaut {defaut})")
+        if mode == "lhs":
+            p.add_argument("--n", type=int, required=True, help="nombre de points tirés")
+            p.add_argument("--graine", type=int, default=0)
+        p.add_argument("--sortie", required=True, help="fichier .csv ou .parquet")
+        p.add_argument("-j", "--workers", type=int, default=None, help="processus (défaut : tous les cœurs)")
+        p.add_argument("--taille-bloc", type=int, default=200_000, help="points par bloc (borne la mémoire)")
+        p.add_argument("--echangeurs", action="store_true",
+                       help="rendement par le bilan des échangeurs (rendement thermique rempli, bien plus lent)")
+    p = sous.add_parser("incertitudes", help="propagation des tolérances et dispersions autour d'une conception")
+    for nom, cle, defaut in PARAMETRES:
+        p.add_argument(f"--{nom}", dest=cle, type=float, default=float(defaut), help=f"valeur nominale (défaut {defaut})")
+    p.add_argument("--n", type=int, default=1_000_000, help="évaluations (plan de Sobol compris)")
+    p.add_argument("--graine", type=int, default=0)
+    p.add_argument("--tol", type=float, default=0.2, help="tolérance de dimensionnement des pièces (défaut 0.2)")
+    p.add_argument("--tol-alesage", type=float, default=40.0, help="tolérance d'alésage -0/+µm (défaut 40)")
+    p.add_argument("--materiau-cylindre", default="Inox 304L")
+    p.add_argument("--materiau-piston", default=None,
+                   help="défaut : le moins dilatable qui tient la température chaude")
+    p.add_argument("--sans-sobol", action="store_true", help="distributions seules (pas d'indices de Sobol)")
+    p.add_argument("--sortie", help="synthèse .csv (facultatif)")
+    p.add_argument("-j", "--workers", type=int, default=None, help="processus (défaut : tous les cœurs)")
+    p.add_argument("--taille-bloc", type=int, default=200_000, help="évaluations par bloc (borne la mémoire)")
+    return parser
+
+
+def incertitudes(args):
+    try:
+        nominal = conception_nominale(*(getattr(args, cle) for _, cle, _ in PARAMETRES), tol=args.tol,
+                                      materiau_cylindre=args.materiau_cylindre, materiau_piston=args.materiau_piston,
+                                      tol_alesage=args.tol_alesage / 1000)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    synthese, n, duree = propager(nominal, args.n, args.graine, not args.sans_sobol, args.workers, args.taille_bloc)
+    print(afficher_incertitudes(synthese))
+    if args.sortie:
+        ecrire_incertitudes(synthese, args.sortie)
+    print(f"{n} évaluations en {duree:.1f} s" + (f" -> {args.sortie}" if args.sortie else ""))
+
+
+def main(argv=None):
+    args = construire_parser().parse_args(argv)
+    if args.mode == "incertitudes":
+        return incertitudes(args)
+    plages = [lire_plage(getattr(args, cle)) for _, cle, _ in PARAMETRES]
+    if args.mode == "grille":
+        generateur = GrilleCartesienne(plages)
+    else:
+        generateur = HypercubeLatin(plages, args.n, args.graine)
+    n, duree = balayer(generateur, args.sortie, args.workers, args.taille_bloc, echangeurs=args.echangeurs)
+    print(f"{n} variantes dimensionnées en {duree:.1f} s -> {args.sortie}")
+
+
+if __name__ == "__main__":
+    main()
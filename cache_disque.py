@@ -0,0 +1,38 @@
+# cache_disque.py
+"""
+Dossier de cache disque de l'application (fonds de carte, tables précalculées…).
+
+Par défaut ~/.cache/cao_auxiliaire (%LOCALAPPDATA%\\cao_auxiliaire sous Windows),
+modifiable par la variable d'environnement CAO_CACHE.
+"""
+
+import os
+import tempfile
+
+
+def dossier_cache(sous_dossier=""):
+    """Renvoie (et crée si besoin) le dossier de cache, ou None s'il n'est pas accessible en écriture"""
+    racine = os.environ.get("CAO_CACHE")
+    if not racine:
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+        racine = os.path.join(base, "cao_auxiliaire")
+    chemin = os.path.join(racine, sous_dossier)
+    try:
+        os.makedirs(chemin, exist_ok=True)
+    except OSError:
+        return None
+    return chemin
+
+
+def ecrire_atomique(chemin, ecrire):
+    """Écrit via ecrire(fichier) dans un fichier temporaire puis le renomme : pas de cache à moitié écrit"""
+    dossier = os.path.dirname(chemin) or "."
+    fd, tmp = tempfile.mkstemp(dir=dossier, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            ecrire(f)
+        os.replace(tmp, chemin)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
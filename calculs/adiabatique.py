@@ -0,0 +1,225 @@
+# calculs/adiabatique.py
+"""
+Modèle adiabatique idéal (Urieli & Berchowitz) des moteurs Stirling.
+
+Cinq volumes en série : compression (c), refroidisseur (k), régénérateur (r),
+réchauffeur (h), détente (e). Les échangeurs sont isothermes (T_k, T_r en
+moyenne logarithmique, T_h), les espaces de travail sont adiabatiques : leurs
+températures T_c, T_e varient au cours du cycle, et le gaz qui entre dans un
+espace y apporte la température de l'échangeur voisin (températures
+conditionnelles selon le sens de l'écoulement).
+
+Les dérivées par rapport à l'angle de vilebrequin sont écrites en opérations
+sur tableaux : toutes les conceptions d'un lot avancent ensemble (Runge-Kutta 4
+à pas fixe). Le cycle est répété jusqu'au régime périodique ; chaque conception
+sort du lot dès que ses températures T_c, T_e reviennent à leur valeur de
+début de cycle, les autres continuent sur un lot compacté.
+
+La masse de gaz est celle de l'analyse de Schmidt à la pression moyenne
+demandée ; le gaz n'intervient que par γ = cp/cv, lu dans les tables de
+calculs/gaz.py à la température du régénérateur et à la pression moyenne.
+Unités SI, phase en degrés comme dans calculs/schmidt.py.
+"""
+
+import os
+import time
+from multiprocessing import get_context
+
+import numpy as np
+
+from calculs.gaz import table
+from calculs.schmidt import (
+    PHASE, PI, RATIO_MORT, coefficients_volumes, schmidt, temperature_regenerateur, volumes_morts,
+)
+
+N_PAS = 360          # pas d'intégration par cycle
+TOLERANCE = 0.01     # K, |ΔT_c| + |ΔT_e| sur un cycle
+MAX_CYCLES = 50
+CLAIRANCE = 0.05     # volume mort des espaces de travail / volume balayé
+TAILLE_LOT = 256     # conceptions par lot (et par tâche en parallèle)
+
+
+def _derivees(cos_t, sin_t, Tc, Te, ck_sortant, he_entrant, g):
+    """
+    Dérivées d/dθ de (T_c, T_e, Q_k, Q_r, Q_h, W_c, W_e) et débits (×R) aux interfaces c|k et h|e.
+    ck_sortant : le gaz quitte l'espace de compression ; he_entrant : il entre dans l'espace de détente.
+    """
+    Vc = g["c0"] + g["cc"] * cos_t + g["cs"] * sin_t
+    Ve = g["e0"] + g["ec"] * cos_t + g["es"] * sin_t
+    dVc = g["cs"] * cos_t - g["cc"] * sin_t
+    dVe = g["es"] * cos_t - g["ec"] * sin_t
+    gam = g["gamma"]
+
+    p = g["mR"] / (Vc / Tc + g["Vm"] + Ve / Te)
+    Tck = np.where(ck_sortant, Tc, g["Tk"])
+    The = np.where(he_entrant, g["Th"], Te)
+    dp = -gam * p * (dVc / Tck + dVe / The) / (Vc / Tck + gam * g["Vm"] + Ve / The)
+
+    # Masses et débits multipliés par R (J/K) : R n'intervient plus
+    dmc = (p * dVc + Vc * dp / gam) / Tck
+    dme = (p * dVe + Ve * dp / gam) / The
+    gAck = -dmc
+    gAkr = gAck - g["Vk"] / g["Tk"] * dp
+    gAhe = dme
+    gArh = gAhe + g["Vh"] / g["Th"] * dp
+
+    cv, cp = 1 / (gam - 1), gam / (gam - 1)
+    d = np.empty((7,) + np.shape(Tc))
+    d[0] = Tc * (dp / p + dVc / Vc - dmc * Tc / (p * Vc))
+    d[1] = Te * (dp / p + dVe / Ve - dme * Te / (p * Ve))
+    d[2] = g["Vk"] * dp * cv - cp * (Tck * gAck - g["Tk"] * gAkr)
+    d[3] = g["Vr"] * dp * cv - cp * (g["Tk"] * gAkr - g["Th"] * gArh)
+    d[4] = g["Vh"] * dp * cv - cp * (g["Th"] * gArh - The * gAhe)
+    d[5] = p * dVc
+    d[6] = p * dVe
+    return d, p, gAck, gAhe
+
+
+def _integrer_lot(g, n_pas, tolerance, max_cycles):
+    """Cycles RK4 jusqu'au régime périodique ; g : paramètres 1D d'un lot"""
+    n = g["Th"].size
+    t0 = time.perf_counter()
+    h = 2 * PI / n_pas
+    theta = np.arange(2 * n_pas + 1) * (h / 2)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+
+    res = {cle: np.zeros(n) for cle in ("W", "Q_k", "Q_r", "Q_h", "p_max", "p_min", "T_c", "T_e", "duree")}
+    res["cycles"] = np.zeros(n, dtype=np.int32)
+    res["converge"] = np.zeros(n, dtype=bool)
+
+    actifs = np.arange(n)
+    y = np.empty((7, n))
+    y[0], y[1] = g["Tk"], g["Th"]  # départ : espaces à la température de leur échangeur
+    ck = np.ones(n, dtype=bool)
+    he = np.ones(n, dtype=bool)
+    for cycle in range(1, max_cycles + 1):
+        debut = y[:2].copy()
+        y[2:] = 0
+        p_max = np.full(actifs.size, -np.inf)
+        p_min = np.full(actifs.size, np.inf)
+        somme_T = np.zeros((2, actifs.size))
+        for k in range(n_pas):
+            i = 2 * k
+            k1, p, gAck, gAhe = _derivees(cos_t[i], sin_t[i], y[0], y[1], ck, he, g)
+            # Sens des écoulements figé sur le pas (évalué en début de pas)
+            ck, he = gAck > 0, gAhe > 0
+            k2 = _derivees(cos_t[i + 1], sin_t[i + 1], *(y[:2] + h / 2 * k1[:2]), ck, he, g)[0]
+            k3 = _derivees(cos_t[i + 1], sin_t[i + 1], *(y[:2] + h / 2 * k2[:2]), ck, he, g)[0]
+            k4 = _derivees(cos_t[i + 2], sin_t[i + 2], *(y[:2] + h * k3[:2]), ck, he, g)[0]
+            y += h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            np.maximum(p_max, p, out=p_max)
+            np.minimum(p_min, p, out=p_min)
+            somme_T += y[:2]
+
+        ecart = np.abs(y[0] - debut[0]) + np.abs(y[1] - debut[1])
+        fini = ecart < tolerance
+        if cycle == max_cycles:
+            fini[:] = True
+        if fini.any():
+            j = actifs[fini]
+            res["W"][j] = y[5, fini] + y[6, fini]
+            res["Q_k"][j], res["Q_r"][j], res["Q_h"][j] = y[2, fini], y[3, fini], y[4, fini]
+            res["p_max"][j], res["p_min"][j] = p_max[fini], p_min[fini]
+            res["T_c"][j], res["T_e"][j] = somme_T[:, fini] / n_pas
+            res["cycles"][j] = cycle
+            res["converge"][j] = ecart[fini] < tolerance
+            res["duree"][j] = time.perf_counter() - t0
+            # On poursuit avec les seules conceptions non convergées
+            reste = ~fini
+            actifs = actifs[reste]
+            if not actifs.size:
+                break
+            y = y[:, reste]
+            ck, he = ck[reste], he[reste]
+            g = {cle: v[reste] if np.ndim(v) else v for cle, v in g.items()}
+    return res
+
+
+def _integrer_tache(args):
+    return _integrer_lot(*args)
+
+
+def adiabatique(configuration, V_se, V_sc, V_de, V_dc, V_h, V_r, V_k, T_h, T_c, p_moy,
+                phase=PHASE, freq=None, gaz="Hélium", n_pas=N_PAS, tolerance=TOLERANCE,
+                max_cycles=MAX_CYCLES, workers=1, taille_lot=TAILLE_LOT):
+    """
+    Cycle adiabatique idéal de toutes les conceptions (entrées diffusables entre elles).
+
+    V_de, V_dc : volumes morts des espaces de détente / compression ; V_h, V_r, V_k :
+    réchauffeur, régénérateur, refroidisseur. Les lots de taille_lot conceptions sont
+    répartis sur workers processus (None : tous les cœurs).
+
+    Renvoie un dict de tableaux : W, Q_k, Q_r, Q_h (J/cycle, > 0 : chaleur reçue par le gaz),
+    puissance (W, si freq), rendement, p_max, p_min (Pa), T_c, T_e (K, moyennes sur le cycle),
+    cycles (nombre de cycles intégrés), converge, duree (s, depuis le début du lot).
+    """
+    (e0, ec, es), (c0, cc, cs) = coefficients_volumes(configuration, V_se, V_sc, V_de, V_dc, phase)
+    T_r = temperature_regenerateur(T_h, T_c)
+    # Même masse de gaz que le cycle de Schmidt équivalent à p_moy
+    mR = schmidt(configuration, V_se, V_sc, np.add(V_de, V_h), np.add(V_dc, V_k), V_r, T_h, T_c, p_moy, phase)["mR"]
+    g = dict(e0=e0, ec=ec, es=es, c0=c0, cc=cc, cs=cs, Vh=V_h, Vr=V_r, Vk=V_k,
+             Th=T_h, Tk=T_c, Tr=T_r, mR=mR, gamma=table(gaz).gamma(T_r, p_moy))
+    g = dict(zip(g, (np.ravel(v).astype(float) for v in np.broadcast_arrays(*g.values()))))
+    g["Vm"] = g["Vk"] / g["Tk"] + g["Vr"] / g["Tr"] + g["Vh"] / g["Th"]
+    forme = np.broadcast_shapes(*(np.shape(v) for v in (e0, ec, es, c0, cc, cs, V_h, V_r, V_k, T_h, T_c, mR)))
+
+    n = g["Th"].size
+    lots = [{cle: v[d:d + taille_lot] for cle, v in g.items()} for d in range(0, n, taille_lot)]
+    taches = [(lot, n_pas, tolerance, max_cycles) for lot in lots]
+    workers = min(workers or os.cpu_count() or 1, len(taches))
+    if workers <= 1:
+        resultats = [_integrer_tache(t) for t in taches]
+    else:
+        with get_context("spawn").Pool(workers) as pool:
+            resultats = pool.map(_integrer_tache, taches)
+
+    res = {cle: np.concatenate([r[cle] for r in resultats]).reshape(forme) for cle in resultats[0]}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        res["rendement"] = np.where(res["Q_h"] > 0, res["W"] / res["Q_h"], 0.0)
+    if freq is not None:
+        res["puissance"] = res["W"] * np.asarray(freq, dtype=float)
+    return res
+
+
+# ----------------- Conceptions issues de dimensionner_moteur -----------------
+
+DTYPE_ADIABATIQUE = np.dtype([
+    ("W_adiab", "f8"),          # J par cycle et par cylindre
+    ("P_adiab", "f8"),          # W, tous cylindres
+    ("Q_chaud", "f8"),          # J par cycle et par cylindre, reçus au réchauffeur
+    ("Q_froid", "f8"),          # J par cycle et par cylindre, cédés au refroidisseur
+    ("Q_regen", "f8"),          # J par cycle, bilan net du régénérateur (≈ 0)
+    ("rendement_adiab", "f8"),
+    ("p_max_adiab", "f8"),      # bar
+    ("p_min_adiab", "f8"),      # bar
+    ("T_compression", "f8"),    # °C, moyenne sur le cycle
+    ("T_detente", "f8"),        # °C, moyenne sur le cycle
+    ("cycles", "i4"),
+    ("converge", "?"),
+    ("duree", "f8"),            # s
+])
+
+
+def adiabatique_moteur(moteur, configuration="alpha", phase=PHASE, ratio_mort=RATIO_MORT,
+                       gaz="Hélium", workers=1, **options):
+    """Cycle adiabatique d'un tableau DTYPE_MOTEUR (pression de service = pression moyenne)"""
+    V = moteur["V_balaye"]
+    V_h, V_r, V_k = volumes_morts(V, ratio_mort)
+    V_jeu = V * CLAIRANCE
+    cycle = adiabatique(configuration, V, V, V_jeu, V_jeu, V_h, V_r, V_k,
+                        moteur["t_chaude"] + 273.15, moteur["t_froide"] + 273.15,
+                        moteur["pression"] * 1e5, phase, moteur["freq"], gaz, workers=workers, **options)
+    res = np.empty(moteur.shape, dtype=DTYPE_ADIABATIQUE)
+    res["W_adiab"] = cycle["W"]
+    res["P_adiab"] = cycle["puissance"] * moteur["n_cyl"]
+    res["Q_chaud"] = cycle["Q_h"]
+    res["Q_froid"] = -cycle["Q_k"]
+    res["Q_regen"] = cycle["Q_r"]
+    res["rendement_adiab"] = cycle["rendement"]
+    res["p_max_adiab"] = cycle["p_max"] / 1e5
+    res["p_min_adiab"] = cycle["p_min"] / 1e5
+    res["T_compression"] = cycle["T_c"] - 273.15
+    res["T_detente"] = cycle["T_e"] - 273.15
+    for cle in ("cycles", "converge", "duree"):
+        res[cle] = cycle[cle]
+    return res
@@ -0,0 +1,279 @@
+# calculs/cinematique.py
+"""
+Cinématique exacte du système bielle-manivelle et efforts dans l'embiellage.
+
+Rayon de manivelle r, entraxe de bielle L (λ = r / L), angle de vilebrequin θ
+compté depuis le point mort haut du piston :
+
+    x(θ)   = r (1 - cos θ) + L (1 - √(1 - λ² sin² θ))      (course depuis le PMH)
+    x'(θ)  = r sin θ (1 + λ cos θ / √(1 - λ² sin² θ))
+    x''(θ) = r (cos θ + λ (cos 2θ + λ² sin⁴ θ) / (1 - λ² sin² θ)^(3/2))
+    sin β  = λ sin θ                                      (obliquité de la bielle)
+
+À régime constant, v = ω x' et a = ω² x''. Effort le long du cylindre
+F = (p - p_carter) S - m_alt a (gaz et inertie des masses alternatives),
+effort dans la bielle F / cos β, poussée latérale F tan β, couple
+F r sin(θ + β) / cos β ; la force centrifuge m_rot r ω² des masses rotatives
+s'ajoute à la charge du maneton (un maneton entre deux paliers : chacun en
+reprend la moitié).
+
+La pression vue par le piston de compression vient du cycle de Schmidt
+(carter à la pression moyenne par défaut, comme calculs/phasage.py).
+Les résultats sont des tableaux (..., n_angles), conceptions d'abord et angle
+en dernier : efforts_moteur() garde en mémoire ceux d'un moteur pour que la
+bielle, le vilebrequin, la fatigue et l'équilibrage relisent les mêmes
+tableaux, efforts_crete() réduit des millions de conceptions par blocs et
+crete_gaz() donne sans grille d'angles les crêtes de gaz du dimensionnement.
+
+Cotes en mm, masses en g, pressions en bar, températures en °C (comme les
+pages) ; sorties SI (m, m/s, N, Nm).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from calculs.schmidt import PHASE, PI, RATIO_MORT, schmidt, volumes_morts
+
+N_ANGLES = 360              # points par tour (pas de 1°)
+N_ANGLES_CRETE = 90         # balayages : pas de 4°, crêtes à moins de 0.1 % près
+RATIO_BIELLE = 2.3          # longueur bielle / course
+PART_ALTERNATIVE = 1 / 3    # part de la masse de bielle ramenée à l'axe de piston
+TAILLE_BLOC = 1024          # conceptions par bloc dans efforts_crete (tableaux tenant en cache)
+
+CHAMPS_CRETE = ("F_gaz", "F_bielle", "F_traction", "F_laterale", "F_maneton", "F_palier", "couple")
+
+
+def _col(v):
+    return np.asarray(v, dtype=float)[..., None]
+
+
+def angles(n_angles=N_ANGLES):
+    """Angles de vilebrequin (rad) d'un tour, depuis le PMH"""
+    return np.linspace(0, 2 * PI, n_angles, endpoint=False)
+
+
+def _uniforme(v):
+    """Réduit un tableau de valeurs égales (aux arrondis près) à un scalaire : courbes calculées une seule fois"""
+    return v.flat[0] if v.size and np.ptp(v) <= 1e-12 * abs(v.flat[0]) else v
+
+
+def cinematique(rayon, L, n_angles=N_ANGLES):
+    """
+    Position x (m), dérivées dx (m/rad), d2x (m/rad²) et obliquité beta (rad) du piston,
+    de forme (..., n_angles) pour des cotes (mm) diffusables.
+    """
+    theta = angles(n_angles)
+    r = _col(rayon) / 1000
+    forme = _formes(r / (_col(L) / 1000), theta)
+    return {
+        "angle": theta,
+        "x": r * forme["x"],
+        "dx": r * forme["dx"],
+        "d2x": r * forme["d2x"],
+        "beta": np.broadcast_to(forme["beta"], np.broadcast_shapes(r.shape, forme["beta"].shape)),
+    }
+
+
+def _formes(lam, theta):
+    """Courbes par unité de rayon ; un λ commun à toutes les conceptions donne des courbes (n_angles)"""
+    lam = _uniforme(np.asarray(lam))
+    s, c = np.sin(theta), np.cos(theta)
+    racine = np.sqrt(1 - (lam * s) ** 2)
+    beta = np.arcsin(lam * s)
+    return {
+        "x": 1 - c + (1 - racine) / lam,
+        "dx": s * (1 + lam * c / racine),
+        "d2x": c + lam * (np.cos(2 * theta) + lam ** 2 * s ** 4) / racine ** 3,
+        "beta": beta,
+        "tan_b": np.tan(beta),
+        "sec_b": 1 / racine,
+    }
+
+
+def pression_piston(configuration, V_balaye, pression, t_chaude, t_froide, phase=PHASE,
+                    ratio_mort=RATIO_MORT, n_angles=N_ANGLES):
+    """Pression du cycle de Schmidt (Pa) sur le piston de compression, θ depuis son PMH"""
+    V = np.asarray(V_balaye, dtype=float)
+    V_dh, V_r, V_dc = volumes_morts(V, ratio_mort)
+    cycle = schmidt(configuration, V, V, V_dh, V_dc, V_r, np.asarray(t_chaude) + 273.15,
+                    np.asarray(t_froide) + 273.15, np.asarray(pression) * 1e5, phase)
+    # Le volume de compression est minimal à θ_Schmidt = phase
+    theta = angles(n_angles) + np.radians(phase)
+    c = _col(cycle["c"])
+    theta0 = _col(cycle["theta0"])
+    cos_rel = np.cos(theta) * np.cos(theta0) + np.sin(theta) * np.sin(theta0)  # cos(θ - θ0)
+    return _col(cycle["p_max"]) * (1 - c) / (1 + c * cos_rel)
+
+
+def efforts(d_cyl, rayon, L, p, rpm, p_carter=0.0, m_alt=0.0, m_rot=0.0):
+    """
+    Efforts d'un embiellage pour la pression p (Pa, (..., n_angles), θ depuis le PMH).
+
+    Pressions en Pa, masses alternatives / rotatives en g. Renvoie un dict de tableaux
+    (..., n_angles) : x (m), v (m/s), a (m/s²), beta (rad), F_gaz, F_inertie, F_piston
+    (le long du cylindre, positif vers le vilebrequin), F_bielle (positif en compression),
+    F_laterale, F_maneton_x / F_maneton_y (repère fixe, x vers la culasse), F_radiale
+    (positif vers l'extérieur) / F_tangentielle (repère de la manivelle), F_maneton,
+    F_palier (N) et couple (Nm), plus angle (n_angles).
+    """
+    p = np.asarray(p, dtype=float)
+    theta = angles(p.shape[-1])
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    omega = 2 * PI * _col(rpm) / 60
+    r = _col(rayon) / 1000
+    forme = _formes(r / (_col(L) / 1000), theta)
+
+    a = omega ** 2 * r * forme["d2x"]
+    F_gaz = (p - _col(p_carter)) * (PI / 4 * (_col(d_cyl) / 1000) ** 2)
+    F_inertie = -_col(m_alt) / 1000 * a
+    F = F_gaz + F_inertie
+    F_laterale = F * forme["tan_b"]
+    centrifuge = _col(m_rot) / 1000 * r * omega ** 2
+    Fx = centrifuge * cos_t - F
+    Fy = centrifuge * sin_t + F_laterale
+    F_tangentielle = Fy * cos_t - Fx * sin_t
+    F_maneton = np.hypot(Fx, Fy)
+    return {
+        "angle": theta,
+        "x": r * forme["x"],
+        "v": omega * r * forme["dx"],
+        "a": a,
+        "beta": np.broadcast_to(forme["beta"], F.shape),
+        "F_gaz": F_gaz,
+        "F_inertie": F_inertie,
+        "F_piston": F,
+        "F_bielle": F * forme["sec_b"],
+        "F_laterale": F_laterale,
+        "F_maneton_x": Fx,
+        "F_maneton_y": Fy,
+        "F_radiale": Fx * cos_t + Fy * sin_t,
+        "F_tangentielle": F_tangentielle,
+        "F_maneton": F_maneton,
+        "F_palier": F_maneton / 2,
+        "couple": F_tangentielle * r,
+    }
+
+
+def _conceptions(d_cyl, course, L, pression, t_chaude, t_froide, masse_piston, masse_bielle,
+                 configuration, phase, ratio_mort, p_carter, n_angles):
+    """Pression sur le piston, pression carter (Pa), rayon (mm), masses alternative / rotative (g)"""
+    V_balaye = PI / 4 * np.asarray(d_cyl, dtype=float) ** 2 * np.asarray(course, dtype=float) * 1e-9
+    p = pression_piston(configuration, V_balaye, pression, t_chaude, t_froide, phase, ratio_mort, n_angles)
+    p_carter = np.asarray(pression if p_carter is None else p_carter, dtype=float) * 1e5
+    masse_bielle = np.asarray(masse_bielle, dtype=float)
+    m_alt = np.asarray(masse_piston, dtype=float) + PART_ALTERNATIVE * masse_bielle
+    return p, p_carter, np.asarray(course, dtype=float) / 2, m_alt, (1 - PART_ALTERNATIVE) * masse_bielle
+
+
+@lru_cache(maxsize=64)
+def efforts_moteur(d_cyl, course, L, pression, rpm, t_chaude=650.0, t_froide=40.0, masse_piston=0.0,
+                   masse_bielle=0.0, configuration="alpha", phase=PHASE, ratio_mort=RATIO_MORT,
+                   p_carter=None, n_angles=N_ANGLES):
+    """
+    Efforts d'un cylindre sur un tour (dict de efforts(), tableaux en lecture seule), gardés
+    en mémoire pour les pages et analyses qui suivent. pression : moyenne du cycle (bar),
+    p_carter en bar (None : carter à la pression moyenne) ; la bielle compte pour
+    PART_ALTERNATIVE en masse alternative, le reste en masse rotative.
+    """
+    p, p_carter, rayon, m_alt, m_rot = _conceptions(d_cyl, course, L, pression, t_chaude, t_froide, masse_piston,
+                                                    masse_bielle, configuration, phase, ratio_mort, p_carter, n_angles)
+    res = efforts(d_cyl, rayon, L, p, rpm, p_carter, m_alt, m_rot)
+    for v in res.values():
+        v.setflags(write=False)
+    return res
+
+
+def extremes(res, champs=CHAMPS_CRETE):
+    """
+    Maxima des efforts le long de l'angle : F_bielle en compression, F_traction (traction
+    de bielle, positive), F_maneton, F_palier, F_gaz, F_laterale et couple en valeur absolue.
+    """
+    crete = {}
+    for champ in champs:
+        if champ == "F_traction":
+            crete[champ] = np.maximum(-res["F_bielle"].min(axis=-1), 0.0)
+        elif champ == "F_bielle":
+            crete[champ] = np.maximum(res["F_bielle"].max(axis=-1), 0.0)
+        else:
+            crete[champ] = np.abs(res[champ]).max(axis=-1)
+    return crete
+
+
+def amplitudes(res, champs=("F_bielle", "F_maneton", "couple")):
+    """Effort moyen et amplitude (demi crête à crête) sur le tour : {champ: (moyenne, amplitude)}"""
+    return {champ: (res[champ].mean(axis=-1), (res[champ].max(axis=-1) - res[champ].min(axis=-1)) / 2)
+            for champ in champs}
+
+
+def _crete_bloc(d_cyl, rayon, L, p, rpm, p_carter, m_alt, m_rot):
+    """extremes(efforts(...)) sans former les tableaux inutiles aux maxima"""
+    theta = angles(p.shape[-1])
+    omega = 2 * PI * _col(rpm) / 60
+    r = _col(rayon) / 1000
+    forme = _formes(r / (_col(L) / 1000), theta)
+    F_gaz = (p - _col(p_carter)) * (PI / 4 * (_col(d_cyl) / 1000) ** 2)
+    F = F_gaz - (_col(m_alt) / 1000 * omega ** 2 * r) * forme["d2x"]
+    centrifuge = _col(m_rot) / 1000 * r * omega ** 2
+    # |F_maneton|² = m_rot² r² ω⁴ + F² / cos² β - 2 m_rot r ω² F (cos θ - tan β sin θ)
+    F_bielle = F * forme["sec_b"]
+    F_maneton = (F_bielle ** 2 - 2 * centrifuge * F * (np.cos(theta) - forme["tan_b"] * np.sin(theta))).max(axis=-1)
+    F_maneton = np.sqrt(np.maximum(F_maneton + centrifuge[..., 0] ** 2, 0.0))
+    return {
+        "F_gaz": np.abs(F_gaz).max(axis=-1),
+        "F_bielle": np.maximum(F_bielle.max(axis=-1), 0.0),
+        "F_traction": np.maximum(-F_bielle.min(axis=-1), 0.0),
+        "F_laterale": np.abs(F * forme["tan_b"]).max(axis=-1),
+        "F_maneton": F_maneton,
+        "F_palier": F_maneton / 2,
+        "couple": np.abs(F * (np.sin(theta) + forme["tan_b"] * np.cos(theta))).max(axis=-1) * r[..., 0],
+    }
+
+
+def efforts_crete(d_cyl, course, L, pression, rpm, t_chaude, t_froide, masse_piston=0.0, masse_bielle=0.0,
+                  configuration="alpha", phase=PHASE, ratio_mort=RATIO_MORT, p_carter=None,
+                  n_angles=N_ANGLES_CRETE, taille_bloc=TAILLE_BLOC):
+    """
+    extremes() de conceptions en tableaux diffusables (balayages), calculés par blocs de
+    taille_bloc conceptions : la mémoire ne dépend pas du nombre de conceptions.
+    """
+    entrees = [d_cyl, course, L, pression, rpm, t_chaude, t_froide, masse_piston, masse_bielle]
+    if p_carter is not None:
+        entrees.append(p_carter)
+    entrees = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in entrees))
+    forme = entrees[0].shape
+    entrees = [np.ravel(e) for e in entrees]
+    crete = {champ: np.empty(entrees[0].size) for champ in CHAMPS_CRETE}
+    for i in range(0, entrees[0].size, taille_bloc):
+        d, c, L_b, P, n, T_h, T_c, m_p, m_b, *p_c = (e[i:i + taille_bloc] for e in entrees)
+        p, p_carter_b, rayon, m_alt, m_rot = _conceptions(d, c, L_b, P, T_h, T_c, m_p, m_b, configuration, phase,
+                                                          ratio_mort, p_c[0] if p_c else None, n_angles)
+        for champ, val in _crete_bloc(d, rayon, L_b, p, n, p_carter_b, m_alt, m_rot).items():
+            crete[champ][i:i + taille_bloc] = val
+    return {champ: val.reshape(forme) for champ, val in crete.items()}
+
+
+def crete_gaz(d_cyl, course, L, pression, t_chaude, t_froide, configuration="alpha", phase=PHASE,
+              ratio_mort=RATIO_MORT):
+    """
+    Crêtes des seuls efforts de gaz (carter à la pression moyenne, sans masses) sans grille
+    d'angles : la pression de Schmidt est extrême en θ0 + π - phase (p_max) et θ0 - phase
+    (p_min) ; F_gaz = |p - p_moy| S en ces angles, F_maneton = F_gaz / cos β au même angle
+    (cos β varie peu autour de la crête : écart à la crête exacte de l'ordre de 1e-4).
+    Pour le dimensionnement en masse ; efforts_crete() pour les pièces.
+    """
+    V = PI / 4 * np.asarray(d_cyl, dtype=float) ** 2 * np.asarray(course, dtype=float) * 1e-9
+    V_dh, V_r, V_dc = volumes_morts(V, ratio_mort)
+    p_moy = np.asarray(pression, dtype=float) * 1e5
+    cycle = schmidt(configuration, V, V, V_dh, V_dc, V_r, np.asarray(t_chaude) + 273.15,
+                    np.asarray(t_froide) + 273.15, p_moy, phase)
+    S = PI / 4 * (np.asarray(d_cyl, dtype=float) / 1000) ** 2
+    lam = np.asarray(course, dtype=float) / 2 / np.asarray(L, dtype=float)
+    theta0 = cycle["theta0"] - np.radians(phase)
+    F_haut, F_bas = (cycle["p_max"] - p_moy) * S, (p_moy - cycle["p_min"]) * S
+    sec_haut = 1 / np.sqrt(1 - (lam * np.sin(theta0 + PI)) ** 2)
+    sec_bas = 1 / np.sqrt(1 - (lam * np.sin(theta0)) ** 2)
+    return {
+        "F_gaz": np.maximum(F_haut, F_bas),
+        "F_maneton": np.maximum(F_haut * sec_haut, F_bas * sec_bas),
+    }
@@ -0,0 +1,324 @@
+# calculs/cotation.py
+"""
+Chaînes de cotes de l'embiellage Stirling : piston / cylindre / manivelle.
+
+Chaque pièce apporte ses cotes tolérancées (nominal, écarts inférieur et
+supérieur en mm, loi de fabrication) ; une chaîne est une combinaison
+linéaire de cotes (jeu = Σ c_j x_j) bornée par des limites fonctionnelles.
+Les chaînes d'un même assemblage forment une matrice C (chaînes × cotes) :
+les cotes communes (Ø maneton dans le jeu de tête de bielle et dans la
+garde au PMH, ...) corrèlent naturellement les résultats.
+
+- Tolérances ISO 286 : intervalles IT et écarts fondamentaux lus dans les
+  tableaux de la norme (valeurs arrondies de la norme, pas les formules
+  brutes de la tolérance unitaire) par palier de dimensions, arbres d à n,
+  alésages D à K : ecarts(d, "H7"), ecarts(d, "g6").
+- Pire cas : chaque cote à l'écart qui pousse la chaîne vers sa borne.
+- Quadratique (RSS) : moyenne ± 3 σ, σ_j = IT / (6 Cp) pour une loi
+  normale centrée, IT / √12 pour une loi uniforme.
+- Monte Carlo : la partie normale de toutes les chaînes est tirée d'un
+  coup par la racine de sa covariance C diag(σ²) Cᵀ (chaînes × chaînes,
+  quel que soit le nombre de cotes), les cotes uniformes par blocs ;
+  quantiles et probabilité de sortir des limites fonctionnelles.
+
+Cotes en mm, écarts ISO tabulés en µm et rendus en mm.
+"""
+
+import math
+import re
+
+import numpy as np
+
+from calculs.cinematique import RATIO_BIELLE
+from calculs.pieces_stirling import piston
+
+# Paliers de dimensions ISO 286 (mm) : au-dessus de PALIERS_ISO[k - 1] jusqu'à PALIERS_ISO[k] inclus
+PALIERS_ISO = np.array([0, 3, 6, 10, 18, 30, 50, 80, 120, 180, 250, 315, 400, 500], dtype=float)
+
+# ISO 286-1 tableau 1 : intervalles IT (µm) par palier
+INTERVALLES_IT = {q: np.array(v, dtype=float) for q, v in {
+    5: (4, 5, 6, 8, 9, 11, 13, 15, 18, 20, 23, 25, 27),
+    6: (6, 8, 9, 11, 13, 16, 19, 22, 25, 29, 32, 36, 40),
+    7: (10, 12, 15, 18, 21, 25, 30, 35, 40, 46, 52, 57, 63),
+    8: (14, 18, 22, 27, 33, 39, 46, 54, 63, 72, 81, 89, 97),
+    9: (25, 30, 36, 43, 52, 62, 74, 87, 100, 115, 130, 140, 155),
+    10: (40, 48, 58, 70, 84, 100, 120, 140, 160, 185, 210, 230, 250),
+    11: (60, 75, 90, 110, 130, 160, 190, 220, 250, 290, 320, 360, 400),
+    12: (100, 120, 150, 180, 210, 250, 300, 350, 400, 460, 520, 570, 630),
+    13: (140, 180, 220, 270, 330, 390, 460, 540, 630, 720, 810, 890, 970),
+    14: (250, 300, 360, 430, 520, 620, 740, 870, 1000, 1150, 1300, 1400, 1550),
+}.items()}
+
+# ISO 286-2 : écarts fondamentaux des arbres (µm) par palier ; es de d à h, ei de k (IT4 à IT7) et n
+ECARTS_FONDAMENTAUX = {c: np.array(v, dtype=float) for c, v in {
+    "d": (-20, -30, -40, -50, -65, -80, -100, -120, -145, -170, -190, -210, -230),
+    "e": (-14, -20, -25, -32, -40, -50, -60, -72, -85, -100, -110, -125, -135),
+    "f": (-6, -10, -13, -16, -20, -25, -30, -36, -43, -50, -56, -62, -68),
+    "g": (-2, -4, -5, -6, -7, -9, -10, -12, -14, -15, -17, -18, -20),
+    "h": (0,) * 13,
+    "k": (0, 1, 1, 1, 2, 2, 2, 3, 3, 4, 4, 4, 5),
+    "n": (4, 8, 10, 12, 15, 17, 20, 23, 27, 31, 34, 37, 40),
+}.items()}
+
+# Roulements de classe normale (ISO 492) : écart du diamètre d'alésage, 0 / -Δ (µm) par palier de d
+ALESAGE_ROULEMENT = ((10, 8), (18, 8), (30, 10), (50, 12), (80, 15), (120, 20), (180, 25))
+
+N_TIRAGES = 200_000             # tirages Monte Carlo des pages
+TAILLE_BLOC = 65536             # lignes tirées par bloc (cotes uniformes)
+PROBA_BORNES = (0.00135, 0.99865)   # ± 3 σ d'une loi normale : plage comparable au RSS
+
+AJUSTEMENT_PISTON = "g6"        # piston galette dans un alésage H7
+FUITE_JEU = 2.0                 # jeu radial maxi / jeu nominal avant fuite excessive autour du piston
+JEU_PALIER_LISSE = (0.0005, 0.003)  # jeu diamétral mini / maxi d'une tête de bielle lisse, × Ø
+GARDE_PMH = 0.5                 # mm, garde nominale piston / culasse au point mort haut
+CLASSE_LONGUEURS = "js9"        # entraxes, hauteurs (bielle, piston, bâti)
+CLASSE_RAYON = "js8"            # excentration du maneton
+
+_CLASSE = re.compile(r"^([a-zA-Z]{1,2})(\d{1,2})$")
+
+
+# ----------------- Tolérances ISO 286 -----------------
+
+def palier(d):
+    """Indice du palier ISO 286 de la cote d (mm, diffusable), au-dessus de 500 mm : dernier palier"""
+    d = np.clip(np.asarray(d, dtype=float), 1e-3, PALIERS_ISO[-1])
+    return np.searchsorted(PALIERS_ISO, d, side="left") - 1
+
+
+def intervalle(d, qualite):
+    """Intervalle de tolérance IT de la qualité donnée (µm, valeur tabulée ISO 286-1)"""
+    if qualite not in INTERVALLES_IT:
+        raise ValueError(f"Qualité IT{qualite} non prise en charge ({min(INTERVALLES_IT)} à {max(INTERVALLES_IT)})")
+    return INTERVALLES_IT[qualite][palier(d)]
+
+
+def qualite(d, tolerance):
+    """Qualité IT la plus grossière dont l'intervalle tient dans la tolérance (mm) saisie"""
+    retenue = min(INTERVALLES_IT)
+    for q in sorted(INTERVALLES_IT):
+        if np.all(intervalle(d, q) <= np.asarray(tolerance) * 1000 + 1e-9):
+            retenue = q
+    return retenue
+
+
+def _demi_js(IT, q):
+    """Demi-intervalle js / JS (µm) : de 7 à 11, un IT impair est ramené au pair inférieur (ISO 286-1)"""
+    return (2 * np.floor(IT / 2) if 7 <= q <= 11 else IT) / 2
+
+
+def _ecart_arbre(lettre, k, q, IT):
+    """Écarts (inf, sup) en µm d'un arbre de position lettre (k : indice du palier)"""
+    if lettre == "js":
+        return -_demi_js(IT, q), _demi_js(IT, q)
+    if lettre not in ECARTS_FONDAMENTAUX:
+        raise ValueError(f"Position d'arbre « {lettre} » non prise en charge (d, e, f, g, h, js, k, n)")
+    ecart = ECARTS_FONDAMENTAUX[lettre][k]
+    if lettre in ("k", "n"):
+        ei = ecart * (4 <= q <= 7) if lettre == "k" else ecart
+        return ei, ei + IT
+    return ecart - IT, ecart
+
+
+def ecarts(d, classe):
+    """
+    Écarts inférieur et supérieur (mm) de la classe ISO 286 (« H7 », « g6 », « js9 », ...)
+    à la cote d (mm, diffusable). Minuscules : arbres ; majuscules : alésages, symétriques
+    des arbres (EI = -es de D à H, règle Δ = IT_n - IT_(n-1) pour K jusqu'à IT8).
+    """
+    m = _CLASSE.match(classe.strip())
+    if m is None:
+        raise ValueError(f"Classe de tolérance « {classe} » illisible (ex. H7, g6, js9)")
+    lettre, q = m.group(1), int(m.group(2))
+    IT = intervalle(d, q)
+    k = palier(d)
+    if lettre.islower():
+        inf, sup = _ecart_arbre(lettre, k, q, IT)
+    elif lettre == "JS":
+        inf, sup = -_demi_js(IT, q), _demi_js(IT, q)
+    elif lettre == "K":
+        # Jusqu'à 3 mm : ES = 0 sans Δ
+        delta = IT - intervalle(d, q - 1) if q - 1 in INTERVALLES_IT else 0 * IT
+        sup = np.where((q <= 8) & (k > 0), -ECARTS_FONDAMENTAUX["k"][k] + delta, 0 * IT)
+        inf = sup - IT
+    elif lettre in ("D", "E", "F", "G", "H"):
+        _, es = _ecart_arbre(lettre.lower(), k, q, IT)
+        inf, sup = -es, -es + IT
+    else:
+        raise ValueError(f"Position d'alésage « {lettre} » non prise en charge (D, E, F, G, H, JS, K)")
+    return inf / 1000, sup / 1000
+
+
+def alesage_roulement(d):
+    """Écarts (inf, sup) en mm de l'alésage d'un roulement de classe normale"""
+    for borne, delta in ALESAGE_ROULEMENT:
+        if d <= borne:
+            return -delta / 1000, 0.0
+    return -ALESAGE_ROULEMENT[-1][1] / 1000, 0.0
+
+
+# ----------------- Cotes et chaînes -----------------
+
+def cote(nom, nominal, tolerance, loi="normale", cp=1.0):
+    """
+    Cote tolérancée (nom, nominal, écart inf, écart sup, loi, Cp) ; tolerance : classe ISO
+    (« H7 ») ou écarts (inf, sup) en mm ; loi « normale » (centrée, σ = IT / (6 Cp)) ou « uniforme ».
+    """
+    if loi not in ("normale", "uniforme"):
+        raise ValueError(f"Loi « {loi} » inconnue (normale, uniforme)")
+    inf, sup = ecarts(nominal, tolerance) if isinstance(tolerance, str) else tolerance
+    if float(sup) < float(inf):
+        raise ValueError(f"Cote {nom} : écart supérieur sous l'écart inférieur")
+    return nom, float(nominal), float(inf), float(sup), loi, float(cp)
+
+
+def matrice(cotes, chaines):
+    """
+    Matrice C (chaînes × cotes) des coefficients ; chaines : {nom: (termes {cote: coefficient},
+    mini, maxi)}, limites fonctionnelles None si absentes.
+    """
+    index = {c[0]: j for j, c in enumerate(cotes)}
+    C = np.zeros((len(chaines), len(cotes)))
+    for i, (nom, (termes, _, _)) in enumerate(chaines.items()):
+        for nom_cote, coeff in termes.items():
+            if nom_cote not in index:
+                raise ValueError(f"Chaîne {nom} : cote « {nom_cote} » absente")
+            C[i, index[nom_cote]] += coeff
+    return C
+
+
+def _tableaux(cotes):
+    nominal, inf, sup, cp = (np.array([c[k] for c in cotes], dtype=float) for k in (1, 2, 3, 5))
+    normale = np.array([c[4] == "normale" for c in cotes], dtype=bool)
+    centre = nominal + (inf + sup) / 2
+    sigma = np.where(normale, (sup - inf) / (6 * cp), (sup - inf) / np.sqrt(12))
+    return nominal, inf, sup, centre, sigma, normale
+
+
+def _limites(chaines):
+    mini = np.array([-np.inf if c[1] is None else c[1] for c in chaines.values()], dtype=float)
+    maxi = np.array([np.inf if c[2] is None else c[2] for c in chaines.values()], dtype=float)
+    return mini, maxi
+
+
+def pire_cas(cotes, chaines):
+    """Valeur nominale et bornes (mini, maxi) au pire cas de chaque chaîne"""
+    C = matrice(cotes, chaines)
+    nominal, inf, sup, _, _, _ = _tableaux(cotes)
+    positif, negatif = np.maximum(C, 0), np.minimum(C, 0)
+    return C @ nominal, C @ nominal + positif @ inf + negatif @ sup, C @ nominal + positif @ sup + negatif @ inf
+
+
+def quadratique(cotes, chaines):
+    """Moyenne et écart-type (somme quadratique) de chaque chaîne"""
+    C = matrice(cotes, chaines)
+    _, _, _, centre, sigma, _ = _tableaux(cotes)
+    return C @ centre, np.sqrt(C ** 2 @ sigma ** 2)
+
+
+def _proba_normale(moyenne, sigma, mini, maxi):
+    """P(X < mini) + P(X > maxi) pour X normale (sigma nul : 0 ou 1)"""
+    p = np.zeros(len(moyenne))
+    for i, (m, s, a, b) in enumerate(zip(moyenne, sigma, mini, maxi)):
+        if s <= 0:
+            p[i] = float(m < a or m > b)
+        else:
+            p[i] = 0.5 * (math.erfc((m - a) / (s * math.sqrt(2))) + math.erfc((b - m) / (s * math.sqrt(2))))
+    return p
+
+
+def monte_carlo(cotes, chaines, n=N_TIRAGES, graine=0, taille_bloc=TAILLE_BLOC):
+    """
+    Tirages (n, chaînes) des valeurs de chaîne. Partie normale : Z Aᵀ avec A Aᵀ = C_N diag(σ²) C_Nᵀ
+    (décomposition propre, robuste aux chaînes liées) ; cotes uniformes ajoutées par blocs.
+    """
+    C = matrice(cotes, chaines)
+    _, inf, sup, centre, sigma, normale = _tableaux(cotes)
+    rng = np.random.default_rng(graine)
+    C_N, C_U = C[:, normale], C[:, ~normale]
+    lam, V = np.linalg.eigh((C_N * sigma[normale] ** 2) @ C_N.T)
+    A = V * np.sqrt(np.maximum(lam, 0.0))
+    largeur = (sup - inf)[~normale]
+    valeurs = np.empty((n, len(chaines)))
+    for debut in range(0, n, taille_bloc):
+        bloc = valeurs[debut:debut + taille_bloc]
+        bloc[:] = rng.standard_normal((len(bloc), len(chaines))) @ A.T + C @ centre
+        if largeur.size:
+            bloc += (rng.random((len(bloc), largeur.size)) - 0.5) * largeur @ C_U.T
+    return valeurs
+
+
+def analyser(cotes, chaines, n=N_TIRAGES, graine=0):
+    """
+    Empilage complet par chaîne : {nom: {nominal, mini, maxi (limites fonctionnelles),
+    pire_cas (min, max), rss (moyenne ± 3 σ), p_rss (hors limites, loi normale),
+    monte_carlo (quantiles PROBA_BORNES), moyenne, ecart_type, p_hors (Monte Carlo)}}.
+    n = 0 : sans Monte Carlo.
+    """
+    nominal, bas, haut = pire_cas(cotes, chaines)
+    moyenne, sigma = quadratique(cotes, chaines)
+    mini, maxi = _limites(chaines)
+    p_rss = _proba_normale(moyenne, sigma, mini, maxi)
+    if n:
+        valeurs = monte_carlo(cotes, chaines, n, graine)
+        q = np.quantile(valeurs, PROBA_BORNES, axis=0)
+        p_hors = ((valeurs < mini) | (valeurs > maxi)).mean(axis=0)
+        moy_mc, ecart_mc = valeurs.mean(axis=0), valeurs.std(axis=0)
+    resultat = {}
+    for i, nom in enumerate(chaines):
+        resultat[nom] = {
+            "nominal": float(nominal[i]), "mini": float(mini[i]), "maxi": float(maxi[i]),
+            "pire_cas": (float(bas[i]), float(haut[i])),
+            "rss": (float(moyenne[i] - 3 * sigma[i]), float(moyenne[i] + 3 * sigma[i])),
+            "p_rss": float(p_rss[i]),
+        }
+        if n:
+            resultat[nom].update({
+                "monte_carlo": (float(q[0, i]), float(q[1, i])), "moyenne": float(moy_mc[i]),
+                "ecart_type": float(ecart_mc[i]), "p_hors": float(p_hors[i]),
+            })
+    return resultat
+
+
+# ----------------- Chaînes du moteur -----------------
+
+def chaine_piston(d_cyl, alesage="H7", ajustement=AJUSTEMENT_PISTON):
+    """
+    Jeu radial piston / cylindre : ½ Ø alésage - ½ Ø piston, cotes nominales de piston()
+    (même jeu de montage que les pages Piston et Cylindre) ; alesage : classe ISO ou écarts (mm).
+    Limites : pas de serrage à froid, jeu maxi FUITE_JEU × nominal.
+    """
+    cotes_piston = piston(d_cyl)
+    jeu = float(cotes_piston["jeu_lateral"])
+    cotes = [cote("alesage", d_cyl, alesage), cote("piston", float(cotes_piston["d_piston"]), ajustement)]
+    chaines = {"jeu_piston": ({"alesage": 0.5, "piston": -0.5}, 0.0, FUITE_JEU * jeu)}
+    return cotes, chaines
+
+
+def chaine_embiellage(d_cyl, rayon, d_maneton, d_palier, L_bielle=None, alesage="H7"):
+    """
+    Chaînes de l'embiellage d'un cylindre (cotes en mm) :
+    - jeu_piston : comme chaine_piston() ;
+    - jeu_maneton : jeu diamétral tête de bielle H7 / maneton g6, limites JEU_PALIER_LISSE ;
+    - serrage_palier : tourillon k6 dans l'alésage d'un roulement de classe normale (serrage > 0) ;
+    - garde_pmh : hauteur du bâti (axe vilebrequin -> culasse) - rayon - entraxe bielle
+      - hauteur de compression (axe au milieu de la galette) - ½ jeu de tête de bielle,
+      nominal GARDE_PMH, pas de contact.
+    """
+    L_bielle = RATIO_BIELLE * 2 * rayon if L_bielle is None else L_bielle
+    compression = float(piston(d_cyl)["epaisseur_piston"]) / 2
+    hauteur = rayon + L_bielle + compression + GARDE_PMH
+    cotes, chaines = chaine_piston(d_cyl, alesage)
+    cotes += [
+        cote("tete_bielle", d_maneton, "H7"), cote("maneton", d_maneton, "g6"),
+        cote("roulement", d_palier, alesage_roulement(d_palier)), cote("tourillon", d_palier, "k6"),
+        cote("hauteur_bati", hauteur, CLASSE_LONGUEURS), cote("rayon", rayon, CLASSE_RAYON),
+        cote("entraxe_bielle", L_bielle, CLASSE_LONGUEURS), cote("compression", compression, CLASSE_LONGUEURS),
+    ]
+    chaines.update({
+        "jeu_maneton": ({"tete_bielle": 1.0, "maneton": -1.0},
+                        JEU_PALIER_LISSE[0] * d_maneton, JEU_PALIER_LISSE[1] * d_maneton),
+        "serrage_palier": ({"tourillon": 1.0, "roulement": -1.0}, 0.0, None),
+        "garde_pmh": ({"hauteur_bati": 1.0, "rayon": -1.0, "entraxe_bielle": -1.0, "compression": -1.0,
+                       "tete_bielle": -0.5, "maneton": 0.5}, 0.0, None),
+    })
+    return cotes, chaines
@@ -0,0 +1,411 @@
+# calculs/dynamique_arbre.py
+"""
+Arbres étagés en éléments finis de poutre de Timoshenko : flèche, pentes aux
+paliers, contraintes et vitesses critiques (diagramme de Campbell).
+
+Arbre découpé en tronçons (longueur, diamètre extérieur / intérieur), maillés
+en éléments à deux nœuds (flèche v, rotation ψ), avec cisaillement
+(Φ = 12 E I / (κ G A L²), κ de Cowper) et inertie de rotation. Paliers :
+ressorts radiaux ; volant, manivelle : disques (masse, inerties diamétrale et
+polaire) en un nœud. Les matrices d'un arbre ne couplent que des nœuds
+voisins : elles sont gardées par blocs 2×2 (diagonale et sur-diagonale), et
+la factorisation de Cholesky par blocs coûte O(n) ; toutes les conceptions
+d'un tableau (même maillage, diamètres différents) avancent ensemble.
+
+- Statique : K u = F (poids propre, poids des disques, efforts imposés).
+- Modes à l'arrêt K φ = ω² M φ : Cholesky dense en petit, itération de
+  sous-espace sur la factorisation par blocs au-delà de MAX_DENSE degrés de
+  liberté (base réorthonormée à chaque pas ; contrôle sur un maillage fin :
+  python -m calculs.dynamique_arbre).
+- Rotor isotrope en coordonnée complexe r = y + i z, tournant à Ω :
+  M r̈ - i Ω G ṙ + K r = 0. Sur la base des modes à l'arrêt, les fréquences
+  de précession λ (avant > 0, arrière < 0) sont les valeurs propres de
+  λ² I - Ω λ G_r - K_r = 0 ; les vitesses critiques avant / arrière
+  (λ = ±Ω) celles de K_r = Ω² (I ∓ G_r).
+
+Cotes en mm, masses en kg, inerties en kg·m², E en MPa, densité en g/cm³ ;
+efforts en N, vitesses en tr/min.
+"""
+
+import numpy as np
+
+from calculs.selection_materiaux import NU
+
+PI = np.pi
+G_TERRE = 9.81
+
+TAILLE_ELEMENT = 5.0       # mm, longueur maxi d'un élément
+RAIDEUR_PALIER = 5e7       # N/m, roulement à billes courant
+MAX_DENSE = 240            # degrés de liberté : au-delà, itération de sous-espace
+N_MODES = 4                # vitesses critiques calculées
+TOL_SOUS_ESPACE = 1e-9
+MAX_ITERATIONS = 200
+N_VITESSES = 61            # points du diagramme de Campbell
+MARGE_CRITIQUE = 1.25      # 1re critique / vitesse maxi
+PENTE_MAX_PALIER = 1e-3    # rad, roulement à billes (rotule admissible)
+
+
+# ----------------- Maillage et matrices élémentaires -----------------
+
+def mailler(longueurs, diametres, d_int=0.0, taille=TAILLE_ELEMENT):
+    """
+    Maillage d'un arbre étagé : tronçons de longueurs (n_t) communes, diamètres (..., n_t)
+    propres à chaque conception. Renvoie x (nœuds, mm), L (éléments, mm), d, d_int
+    (..., éléments, mm) et troncon (tronçon de chaque élément).
+    """
+    longueurs = np.asarray(longueurs, dtype=float)
+    n = np.maximum(np.ceil(longueurs / taille).astype(int), 1)
+    troncon = np.repeat(np.arange(longueurs.size), n)
+    L = np.repeat(longueurs / n, n)
+    d = np.asarray(diametres, dtype=float)[..., troncon]
+    d_int = np.broadcast_to(np.asarray(d_int, dtype=float), np.shape(diametres))[..., troncon]
+    if np.any(d_int >= d):
+        raise ValueError("Diamètre intérieur supérieur ou égal au diamètre extérieur")
+    return {"x": np.concatenate(([0.0], np.cumsum(L))), "L": L, "d": d, "d_int": d_int, "troncon": troncon}
+
+
+def noeud(maillage, x):
+    """Indice du nœud le plus proche de chaque abscisse x (mm)"""
+    return np.abs(maillage["x"] - np.asarray(x, dtype=float)[..., None]).argmin(axis=-1)
+
+
+def _sections(d, d_int, nu):
+    """A (m²), I (m⁴) et coefficient de cisaillement de Cowper d'un tube"""
+    d, d_int = d / 1000, d_int / 1000
+    A = PI / 4 * (d ** 2 - d_int ** 2)
+    I = PI / 64 * (d ** 4 - d_int ** 4)
+    m2 = (d_int / d) ** 2
+    kappa = 6 * (1 + nu) * (1 + m2) ** 2 / ((7 + 6 * nu) * (1 + m2) ** 2 + (20 + 12 * nu) * m2)
+    return A, I, kappa
+
+
+def _motif(a, b, c, e, f, L):
+    """
+    Matrice symétrique 4×4 d'élément de poutre (v1, ψ1, v2, ψ2) :
+    [[a, bL, c, eL], [bL, f0 L², -eL, f1 L²], [c, -eL, a, -bL], [eL, f1 L², -bL, f0 L²]]
+    """
+    M = np.empty(np.shape(a) + (4, 4))
+    M[..., 0, 0] = M[..., 2, 2] = a
+    M[..., 0, 2] = M[..., 2, 0] = c
+    M[..., 0, 1] = M[..., 1, 0] = b * L
+    M[..., 2, 3] = M[..., 3, 2] = -b * L
+    M[..., 0, 3] = M[..., 3, 0] = e * L
+    M[..., 1, 2] = M[..., 2, 1] = -e * L
+    M[..., 1, 1] = M[..., 3, 3] = f[0] * L ** 2
+    M[..., 1, 3] = M[..., 3, 1] = f[1] * L ** 2
+    return M
+
+
+def elements(maillage, E, densite, nu=NU):
+    """
+    Matrices élémentaires de Timoshenko (..., éléments, 4, 4) : raideur K, masse M
+    (translation et rotation des sections) et gyroscopique G (inertie polaire).
+    """
+    L = maillage["L"] / 1000
+    A, I, kappa = _sections(maillage["d"], maillage["d_int"], nu)
+    E = np.asarray(E, dtype=float)[..., None] * 1e6
+    rho = np.asarray(densite, dtype=float)[..., None] * 1000
+    phi = 24 * (1 + nu) * I / (kappa * A * L ** 2)  # 12 E I / (κ G A L²)
+    p1 = 1 + phi
+
+    k = E * I / (p1 * L ** 3)
+    K = _motif(12 * k, 6 * k, -12 * k, 6 * k, ((4 + phi) * k, (2 - phi) * k), L)
+
+    mt = rho * A * L / p1 ** 2
+    Mt = _motif(mt * (13 / 35 + 7 * phi / 10 + phi ** 2 / 3),
+                mt * (11 / 210 + 11 * phi / 120 + phi ** 2 / 24),
+                mt * (9 / 70 + 3 * phi / 10 + phi ** 2 / 6),
+                -mt * (13 / 420 + 3 * phi / 40 + phi ** 2 / 24),
+                (mt * (1 / 105 + phi / 60 + phi ** 2 / 120), -mt * (1 / 140 + phi / 60 + phi ** 2 / 120)), L)
+    mr = rho * I / (L * p1 ** 2)
+    Mr = _motif(mr * 6 / 5, mr * (1 / 10 - phi / 2), -mr * 6 / 5, mr * (1 / 10 - phi / 2),
+                (mr * (2 / 15 + phi / 6 + phi ** 2 / 3), mr * (-1 / 30 - phi / 6 + phi ** 2 / 6)), L)
+    return {"K": K, "M": Mt + Mr, "G": 2 * Mr}
+
+
+# ----------------- Matrices par blocs -----------------
+
+def assembler(elem):
+    """Blocs 2×2 des matrices globales : diagonale (..., nœuds, 2, 2) et sur-diagonale (..., nœuds - 1, 2, 2)"""
+    blocs = {}
+    for nom, Me in elem.items():
+        forme = Me.shape[:-3]
+        n_e = Me.shape[-3]
+        diag = np.zeros(forme + (n_e + 1, 2, 2))
+        diag[..., :-1, :, :] += Me[..., :2, :2]
+        diag[..., 1:, :, :] += Me[..., 2:, 2:]
+        blocs[nom] = (diag, Me[..., :2, 2:].copy())
+    return blocs
+
+
+def ajouter(blocs, nom, noeuds, ddl, valeurs):
+    """Ajoute des valeurs (..., n_points) sur le degré de liberté ddl (0 : flèche, 1 : rotation) de nœuds"""
+    diag = blocs[nom][0]
+    valeurs = np.broadcast_to(np.asarray(valeurs, dtype=float), diag.shape[:-3] + (len(noeuds),))
+    for j, n in enumerate(noeuds):
+        diag[..., n, ddl, ddl] += valeurs[..., j]
+
+
+def produit(bloc, x):
+    """A x pour une matrice par blocs et x (..., nœuds, 2, p)"""
+    diag, sup = bloc
+    y = diag @ x
+    y[..., :-1, :, :] += sup @ x[..., 1:, :, :]
+    y[..., 1:, :, :] += np.swapaxes(sup, -1, -2) @ x[..., :-1, :, :]
+    return y
+
+
+def cholesky(bloc):
+    """
+    Factorisation A = L Lᵀ par blocs (L bidiagonale inférieure) : inverses des blocs
+    diagonaux de L et blocs sous-diagonaux. LinAlgError si A n'est pas définie positive.
+    """
+    diag, sup = bloc
+    n = diag.shape[-3]
+    inv = np.empty_like(diag)
+    sous = np.empty_like(sup)
+    D = diag[..., 0, :, :]
+    for i in range(n):
+        inv[..., i, :, :] = np.linalg.inv(np.linalg.cholesky(D))
+        if i < n - 1:
+            sous[..., i, :, :] = np.swapaxes(sup[..., i, :, :], -1, -2) @ np.swapaxes(inv[..., i, :, :], -1, -2)
+            D = diag[..., i + 1, :, :] - sous[..., i, :, :] @ np.swapaxes(sous[..., i, :, :], -1, -2)
+    return inv, sous
+
+
+def resoudre(facteurs, b):
+    """Solution de A x = b (b : (..., nœuds, 2, p)) à partir de cholesky(A)"""
+    inv, sous = facteurs
+    n = inv.shape[-3]
+    y = np.empty(np.broadcast_shapes(inv.shape[:-2], b.shape[:-2]) + (2, b.shape[-1]))
+    y[..., 0, :, :] = inv[..., 0, :, :] @ b[..., 0, :, :]
+    for i in range(1, n):
+        y[..., i, :, :] = inv[..., i, :, :] @ (b[..., i, :, :] - sous[..., i - 1, :, :] @ y[..., i - 1, :, :])
+    inv_t = np.swapaxes(inv, -1, -2)
+    sous_t = np.swapaxes(sous, -1, -2)
+    y[..., n - 1, :, :] = inv_t[..., n - 1, :, :] @ y[..., n - 1, :, :]
+    for i in range(n - 2, -1, -1):
+        y[..., i, :, :] = inv_t[..., i, :, :] @ (y[..., i, :, :] - sous_t[..., i, :, :] @ y[..., i + 1, :, :])
+    return y
+
+
+def dense(bloc):
+    """Matrice pleine (..., 2 nœuds, 2 nœuds) d'une matrice par blocs"""
+    diag, sup = bloc
+    n = diag.shape[-3]
+    A = np.zeros(diag.shape[:-3] + (2 * n, 2 * n))
+    i = 2 * np.arange(n)
+    for a in range(2):
+        for b in range(2):
+            A[..., i + a, i + b] = diag[..., a, b]
+            A[..., i[:-1] + a, i[1:] + b] = sup[..., a, b]
+            A[..., i[1:] + b, i[:-1] + a] = sup[..., a, b]
+    return A
+
+
+def _contracter(X, Y):
+    """Xᵀ Y pour des vecteurs par nœuds (..., nœuds, 2, p) et (..., nœuds, 2, q)"""
+    return np.einsum("...nap,...naq->...pq", X, Y)
+
+
+# ----------------- Modes propres -----------------
+
+def _ritz(Kr, Mr):
+    """Problème réduit Kr c = ω² Mr c : (ω², c normés en masse), ω² croissants"""
+    Kr = (Kr + np.swapaxes(Kr, -1, -2)) / 2
+    Mr = (Mr + np.swapaxes(Mr, -1, -2)) / 2
+    Lr = np.linalg.cholesky(Mr)
+    A = np.linalg.solve(Lr, np.swapaxes(np.linalg.solve(Lr, Kr), -1, -2))
+    w, Q = np.linalg.eigh((A + np.swapaxes(A, -1, -2)) / 2)
+    return w, np.linalg.solve(np.swapaxes(Lr, -1, -2), Q)
+
+
+def modes(blocs, n_modes=N_MODES, graine=0):
+    """
+    Premiers modes à l'arrêt K φ = ω² M φ : ω² (..., n_modes) en (rad/s)² et vecteurs
+    normés en masse (..., nœuds, 2, n_modes). Dense jusqu'à MAX_DENSE degrés de liberté,
+    itération de sous-espace sur la factorisation par blocs au-delà.
+    """
+    K, M = blocs["K"], blocs["M"]
+    n = K[0].shape[-3]
+    m = min(n_modes, 2 * n)
+    if 2 * n <= MAX_DENSE:
+        w, V = _ritz(dense(K), dense(M))
+        return w[..., :m], V[..., :m].reshape(V.shape[:-2] + (n, 2, m))
+    p = min(2 * m, m + 8, 2 * n)
+    facteurs = cholesky(K)
+    X = np.random.default_rng(graine).standard_normal(K[0].shape[:-3] + (n, 2, p))
+    precedent = np.inf
+    for _ in range(MAX_ITERATIONS):
+        Y = resoudre(facteurs, produit(M, X))                      # K Y = M X
+        # Base orthonormée de Y : ses colonnes deviennent presque colinéaires sur les maillages fins
+        Q = np.linalg.qr(Y.reshape(Y.shape[:-3] + (2 * n, p)))[0].reshape(Y.shape)
+        w, C = _ritz(_contracter(Q, produit(K, Q)), _contracter(Q, produit(M, Q)))
+        X = np.einsum("...nap,...pq->...naq", Q, C)
+        ecart = np.max(np.abs(w[..., :m] - precedent) / w[..., :m])
+        precedent = w[..., :m]
+        if ecart < TOL_SOUS_ESPACE:
+            break
+    return w[..., :m], X[..., :m]
+
+
+def critiques(omega2, Gr, n_modes=N_MODES):
+    """
+    Vitesses critiques (tr/min) avant et arrière du système réduit (modes normés en masse) :
+    K_r = Ω² (I ∓ G_r) ; inf pour les modes sans vitesse critique (disque gyroscopique).
+    """
+    racine = 1 / np.sqrt(omega2)
+    res = []
+    for signe in (-1, 1):
+        A = racine[..., :, None] * (np.eye(Gr.shape[-1]) + signe * Gr) * racine[..., None, :]
+        mu = np.linalg.eigvalsh(A)[..., ::-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            omega = np.where(mu > 1e-12 * mu[..., :1], 1 / np.sqrt(np.maximum(mu, 1e-300)), np.inf)
+        res.append(np.sort(omega, axis=-1)[..., :n_modes] * 60 / (2 * PI))
+    return tuple(res)
+
+
+def campbell(omega2, Gr, rpm, n_modes=N_MODES):
+    """
+    Fréquences de précession (tr/min, soit cycles/min) aux vitesses rpm (n_vitesses) :
+    avant et arrière (..., n_vitesses, n_modes), à comparer à la droite synchrone.
+    """
+    m = omega2.shape[-1]
+    Omega = 2 * PI * np.asarray(rpm, dtype=float) / 60
+    forme = omega2.shape[:-1] + (Omega.size, 2 * m, 2 * m)
+    A = np.zeros(forme)
+    A[..., :m, m:] = np.eye(m)
+    A[..., m:, :m] = np.eye(m) * omega2[..., None, None, :]
+    A[..., m:, m:] = Omega[:, None, None] * Gr[..., None, :, :]
+    lam = np.sort(np.linalg.eigvals(A).real, axis=-1) * 60 / (2 * PI)
+    return lam[..., m:][..., :n_modes], -lam[..., :m][..., ::-1][..., :n_modes]
+
+
+# ----------------- Arbre complet -----------------
+
+def _efforts_poids(maillage, elem_shape, densite):
+    """Poids propre (N) réparti en efforts nodaux cohérents (..., nœuds, 2)"""
+    L = maillage["L"] / 1000
+    A = _sections(maillage["d"], maillage["d_int"], NU)[0]
+    q = np.asarray(densite, dtype=float)[..., None] * 1000 * A * G_TERRE
+    fe = np.stack(np.broadcast_arrays(q * L / 2, q * L ** 2 / 12, q * L / 2, -q * L ** 2 / 12), axis=-1)
+    F = np.zeros(elem_shape[:-1] + (L.size + 1, 2))
+    F[..., :-1, :] += fe[..., :2]
+    F[..., 1:, :] += fe[..., 2:]
+    return F, fe
+
+
+def analyser(longueurs, diametres, paliers, d_int=0.0, disques=(), efforts=(), couple=0.0, E=210e3,
+             densite=7.85, raideur_palier=RAIDEUR_PALIER, rpm_max=None, n_modes=N_MODES,
+             n_vitesses=N_VITESSES, taille=TAILLE_ELEMENT):
+    """
+    Analyse d'arbres étagés de même découpage (diamètres (..., n_t) par conception).
+
+    paliers : abscisses (mm) ; disques : (x mm, masse kg, I_diamétrale, I_polaire kg·m²) ;
+    efforts : (x mm, effort radial N, dans le sens du poids) ; couple (Nm) transmis sur
+    toute la longueur. Mettre les paliers et disques en bout de tronçon pour qu'ils tombent
+    sur un nœud.
+
+    Renvoie un dict : maillage, fleche (..., nœuds, mm), pente (..., nœuds, rad),
+    pente_paliers, reactions (N), contrainte (..., éléments, MPa, von Mises flexion + torsion),
+    frequences (..., n_modes, Hz, à l'arrêt), critiques_avant / critiques_arriere (tr/min) et,
+    avec rpm_max, rpm (n_vitesses) et campbell_avant / campbell_arriere (tr/min).
+    """
+    maillage = mailler(longueurs, diametres, d_int, taille)
+    elem = elements(maillage, E, densite)
+    blocs = assembler(elem)
+    n_paliers = noeud(maillage, paliers)
+    if len(np.unique(n_paliers)) < 2:
+        raise ValueError("Il faut au moins deux paliers distincts")
+    ajouter(blocs, "K", n_paliers, 0, raideur_palier)
+    F, fe_poids = _efforts_poids(maillage, elem["K"].shape[:-2], densite)
+    for x, masse, I_d, I_p in disques:
+        n = noeud(maillage, [x])
+        ajouter(blocs, "M", n, 0, masse)
+        ajouter(blocs, "M", n, 1, I_d)
+        ajouter(blocs, "G", n, 1, I_p)
+        F[..., n[0], 0] += masse * G_TERRE
+    for x, effort in efforts:
+        F[..., noeud(maillage, [x])[0], 0] += effort
+
+    # Statique : déplacements, efforts intérieurs des éléments, contraintes
+    u = resoudre(cholesky(blocs["K"]), F[..., None])[..., 0]
+    ue = np.concatenate((u[..., :-1, :], u[..., 1:, :]), axis=-1)
+    interieurs = (elem["K"] @ ue[..., None])[..., 0] - fe_poids
+    moment = np.maximum(np.abs(interieurs[..., 1]), np.abs(interieurs[..., 3]))
+    A, I, _ = _sections(maillage["d"], maillage["d_int"], NU)
+    rayon = maillage["d"] / 2000
+    sigma = moment * rayon / I
+    tau = np.asarray(couple, dtype=float)[..., None] * rayon / (2 * I)
+    res = {
+        "maillage": maillage,
+        "fleche": u[..., 0] * 1000,
+        "pente": u[..., 1],
+        "pente_paliers": u[..., n_paliers, 1],
+        "reactions": -u[..., n_paliers, 0] * raideur_palier,
+        "contrainte": np.sqrt(sigma ** 2 + 3 * tau ** 2) / 1e6,
+    }
+
+    # Modes à l'arrêt (base de réduction élargie), effet gyroscopique sur la base
+    omega2, V = modes(blocs, 2 * n_modes + 2)
+    Gr = _contracter(V, produit(blocs["G"], V))
+    res["frequences"] = np.sqrt(omega2[..., :n_modes]) / (2 * PI)
+    res["critiques_avant"], res["critiques_arriere"] = critiques(omega2, Gr, n_modes)
+    if rpm_max:
+        rpm = np.linspace(0, rpm_max, n_vitesses)
+        res["rpm"] = rpm
+        res["campbell_avant"], res["campbell_arriere"] = campbell(omega2, Gr, rpm, n_modes)
+    return res
+
+
+def arbre_volant(longueur, entraxe, diametres, masse_volant=0.0, D_volant=0.0, couple=0.0, E=210e3,
+                 densite=7.85, rpm_max=None, recul=0.1, **options):
+    """
+    Arbre de sortie type : accouplement au vilebrequin en x = 0, paliers à recul × longueur
+    et recul × longueur + entraxe, volant (disque plein) en porte-à-faux au bout. diametres :
+    tronçons sur le dernier axe, (..., 1) arbre lisse ou (..., 3) par tronçon, un scalaire
+    valant un arbre lisse (une liste de Ø candidats se passe en candidats[:, None]).
+    Renvoie analyser().
+    """
+    x1 = recul * longueur
+    x2 = x1 + entraxe
+    if x2 >= longueur:
+        raise ValueError("Entraxe des paliers trop grand pour la longueur de l'arbre")
+    diametres = np.asarray(diametres, dtype=float)
+    if diametres.ndim == 0:
+        diametres = diametres[None]
+    if diametres.shape[-1] not in (1, 3):
+        raise ValueError(f"diametres : {diametres.shape[-1]} tronçons sur le dernier axe (1 ou 3 attendus)")
+    diametres = np.broadcast_to(diametres, diametres.shape[:-1] + (3,))
+    I_p = masse_volant * (D_volant / 1000) ** 2 / 8
+    disques = [(longueur, masse_volant, I_p / 2, I_p)] if masse_volant else []
+    return analyser([x1, entraxe, longueur - x2], diametres, [x1, x2], disques=disques, couple=couple,
+                    E=E, densite=densite, rpm_max=rpm_max, **options)
+
+
+def admissibles(res, rpm_max, contrainte_adm, marge=MARGE_CRITIQUE, pente_max=PENTE_MAX_PALIER):
+    """Conceptions tenant la contrainte (MPa), la pente aux paliers et la marge à la 1re critique avant"""
+    return ((res["contrainte"].max(axis=-1) <= contrainte_adm)
+            & (np.abs(res["pente_paliers"]).max(axis=-1) <= pente_max)
+            & (res["critiques_avant"][..., 0] >= marge * rpm_max))
+
+
+def verifier_maillage_fin(d=15.0, longueur=300.0, n_elements=1200, tol=1e-3):
+    """
+    Contrôle de l'itération de sous-espace : arbre Ø d maillé en n_elements (bien au-delà de
+    MAX_DENSE), seul et en tableau de conceptions, face au calcul dense d'un maillage grossier.
+    Renvoie l'écart relatif maxi des vitesses critiques avant ; ValueError au-delà de tol.
+    """
+    cas = dict(masse_volant=5.0, D_volant=200.0, couple=50.0, rpm_max=3000.0)
+    fin = arbre_volant(longueur, longueur / 2, np.array([[d], [2 * d]]), taille=longueur / n_elements, **cas)
+    grossier = arbre_volant(longueur, longueur / 2, np.array([[d], [2 * d]]), taille=longueur / 40, **cas)
+    if 2 * fin["maillage"]["L"].size <= MAX_DENSE:
+        raise ValueError("Maillage trop grossier pour passer par l'itération de sous-espace")
+    ecart = float(np.max(np.abs(fin["critiques_avant"] / grossier["critiques_avant"] - 1)))
+    if not ecart <= tol:
+        raise ValueError(f"Vitesses critiques du maillage fin écartées de {ecart:.2e} (tolérance {tol:.0e})")
+    return ecart
+
+
+if __name__ == "__main__":
+    print(f"Ø15, maillage fin : écart {verifier_maillage_fin():.2e} sur les vitesses critiques")
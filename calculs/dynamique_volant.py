@@ -0,0 +1,263 @@
+# calculs/dynamique_volant.py
+"""
+Dynamique de l'arbre moteur et dimensionnement du volant par simulation.
+
+L'arbre (inertie J) reçoit le couple cyclique du moteur C_m(θ) et le couple
+résistant de la charge C_r(ω). L'intégration se fait en angle sur l'énergie
+cinétique e = ω²/2 :
+
+    J de/dθ = C_m(θ) - C_r(ω)
+
+(trapèzes à pas fixe, un pas par point du profil de couple, vectorisée sur
+toutes les inerties candidates). Le couple résistant est traité de façon
+linéairement implicite, C_r(e + Δe) ≈ C_r(e) + C_r'(ω) / ω Δe : une inertie
+légère devant la pente de la charge (dθ C_r' / (J ω) > 1) rend le schéma
+explicite instable, pas celui-ci. Le temps se déduit de dt = dθ / ω. On en tire
+le coefficient de fluctuation réel δ = (ω_max - ω_min) / ω_moy du dernier
+tour, et depuis l'arrêt (vilebrequin lâché à l'angle de couple maxi) le
+temps de démarrage, ou le calage du moteur si le couple ne suffit pas.
+
+Le volant est dimensionné sur des géométries candidates (disque plein,
+jante à bras, jante à voile) × diamètres × matériaux : pour chaque candidat,
+l'inertie est linéaire en la largeur b. δ ne dépend que de J : une seule
+dichotomie (sur log J) donne l'inertie qui tient le δ visé, dont chaque
+candidat déduit sa largeur b = J / J_unitaire.
+
+Unités SI, sauf diamètres et largeurs en mm et masses en kg.
+"""
+
+import numpy as np
+
+from calculs.selection_materiaux import NU
+
+PI = np.pi
+
+CHARGES = ("quadratique", "lineaire", "constante")
+TYPES_VOLANT = ("disque", "jante", "voile")
+N_TOURS_REGIME = 2        # tours simulés depuis le régime nominal pour mesurer δ
+MAX_TOURS_DEMARRAGE = 5000
+SEUIL_DEMARRAGE = 0.99    # démarrage terminé à 99 % du régime nominal
+OMEGA_PENTE = 0.05        # ω / ω nominal plancher de la pente C_r' / ω (charge linéaire, ω -> 0)
+N_DICHOTOMIE = 14         # itérations (précision relative sur J ≈ 2e-4)
+N_ELARGISSEMENT = 12      # élargissements × 8 de l'encadrement de J avant la dichotomie
+
+# Proportions des volants à jante (rapportées au rayon extérieur R)
+EP_JANTE = 0.2            # épaisseur radiale de la jante
+R_MOYEU = 0.2             # rayon du moyeu
+N_BRAS = 6
+LARGEUR_BRAS = 0.12       # largeur tangentielle d'un bras
+EP_BRAS = 0.5             # épaisseur axiale des bras / largeur b
+EP_VOILE = 0.3            # épaisseur axiale du voile / largeur b
+B_MINI = 5.0              # mm
+B_MAXI = 0.5              # largeur maxi / diamètre
+
+
+def couple_charge(omega, omega_nominal, couple_nominal, charge="quadratique"):
+    """Couple résistant : égal au couple moteur moyen au régime nominal"""
+    if charge == "quadratique":    # hélice, ventilateur, pompe
+        return couple_nominal * (omega / omega_nominal) ** 2
+    if charge == "lineaire":       # génératrice sur charge résistive
+        return couple_nominal * omega / omega_nominal
+    if charge == "constante":
+        return np.where(omega > 0, couple_nominal, 0.0)
+    raise ValueError(f"Charge inconnue : {charge!r} ({', '.join(CHARGES)})")
+
+
+def pente_charge(omega, omega_nominal, couple_nominal, charge="quadratique"):
+    """dC_r / de = C_r'(ω) / ω (Nm par J/kg·m²), ω plancher OMEGA_PENTE × ω nominal"""
+    omega = np.maximum(omega, OMEGA_PENTE * omega_nominal)
+    if charge == "quadratique":
+        return np.full(np.shape(omega), 2 * couple_nominal / omega_nominal ** 2)
+    if charge == "lineaire":
+        return couple_nominal / (omega_nominal * omega)
+    if charge == "constante":
+        return np.zeros(np.shape(omega))
+    raise ValueError(f"Charge inconnue : {charge!r} ({', '.join(CHARGES)})")
+
+
+def simuler(couple, J, rpm, charge="quadratique", depart_arret=False,
+            n_tours=None, J_moteur=0.0):
+    """
+    Vitesse de l'arbre sous le couple cyclique couple (Nm, un tour à pas régulier)
+    pour toutes les inerties J (kg·m², + J_moteur des pièces tournantes).
+
+    Depuis le régime nominal (défaut) : n_tours tours (N_TOURS_REGIME).
+    Depuis l'arrêt : jusqu'à SEUIL_DEMARRAGE × régime nominal, calage ou n_tours
+    (MAX_TOURS_DEMARRAGE) ; chaque inertie s'arrête dès qu'elle a fini.
+
+    Renvoie un dict de tableaux de la forme de J : delta, omega_moy, omega_min,
+    omega_max (rad/s, dernier tour), tours, temps (s), demarre, cale, et omega
+    (forme de J + (N,), vitesse sur le dernier tour).
+    """
+    couple = np.asarray(couple, dtype=float)
+    N = couple.size
+    dtheta = 2 * PI / N
+    C_nom = couple.mean()
+    omega_n = 2 * PI * rpm / 60
+    forme = np.shape(J)
+    J_tot = np.ravel(np.asarray(J, dtype=float) + J_moteur)
+    n = J_tot.size
+    if n_tours is None:
+        n_tours = MAX_TOURS_DEMARRAGE if depart_arret else N_TOURS_REGIME
+    if depart_arret:
+        # Départ à l'angle de couple maxi (position de lancement)
+        couple = np.roll(couple, -int(np.argmax(couple)))
+    C_milieu = (couple + np.roll(couple, -1)) / 2
+
+    res = {cle: np.zeros(n) for cle in ("delta", "omega_moy", "omega_min", "omega_max", "temps")}
+    res["tours"] = np.zeros(n, dtype=np.int32)
+    res["demarre"] = np.zeros(n, dtype=bool)
+    res["cale"] = np.zeros(n, dtype=bool)
+    res["omega"] = np.zeros((n, N))
+
+    actifs = np.arange(n)
+    e = np.full(n, 0.0 if depart_arret else omega_n ** 2 / 2)
+    temps = np.zeros(n)
+    trace = np.empty((n, N))
+    for tour in range(1, n_tours + 1):
+        duree = np.zeros(actifs.size)
+        cale = np.zeros(actifs.size, dtype=bool)
+        omega = np.sqrt(2 * e)
+        for i in range(N):
+            # Trapèzes sur l'énergie cinétique, charge linéarisée implicite ; e ≥ 0 (pas de rotation arrière)
+            a = (C_milieu[i] - couple_charge(omega, omega_n, C_nom, charge)) / J_tot
+            amortissement = pente_charge(omega, omega_n, C_nom, charge) / J_tot
+            e = np.maximum(e + a * dtheta / (1 + amortissement * dtheta / 2), 0.0)
+            omega_suiv = np.sqrt(2 * e)
+            somme = omega + omega_suiv
+            cale |= somme <= 0
+            duree += 2 * dtheta / np.where(somme > 0, somme, np.inf)
+            omega = omega_suiv
+            trace[:, i] = omega
+        temps += duree
+        omega_moy = np.where(cale, 0.0, 2 * PI / np.where(duree > 0, duree, np.inf))
+
+        if depart_arret:
+            fini = cale | (omega_moy >= SEUIL_DEMARRAGE * omega_n)
+            if tour == n_tours:
+                fini[:] = True
+        else:
+            fini = np.full(actifs.size, tour == n_tours)
+        if fini.any():
+            j = actifs[fini]
+            w = trace[fini]
+            res["omega"][j] = w
+            res["omega_moy"][j] = omega_moy[fini]
+            res["omega_min"][j] = w.min(axis=1)
+            res["omega_max"][j] = w.max(axis=1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                res["delta"][j] = np.where(omega_moy[fini] > 0, (w.max(axis=1) - w.min(axis=1)) / omega_moy[fini], np.inf)
+            res["tours"][j] = tour
+            res["temps"][j] = temps[fini]
+            res["cale"][j] = cale[fini]
+            res["demarre"][j] = ~cale[fini] & (omega_moy[fini] >= SEUIL_DEMARRAGE * omega_n)
+            reste = ~fini
+            actifs = actifs[reste]
+            if not actifs.size:
+                break
+            e, temps, J_tot, trace = e[reste], temps[reste], J_tot[reste], trace[reste]
+    return {cle: v.reshape(forme + v.shape[1:]) for cle, v in res.items()}
+
+
+# ----------------- Géométries de volant -----------------
+
+DTYPE_VOLANT = np.dtype([
+    ("type", "i1"),            # indice dans TYPES_VOLANT
+    ("D", "f8"),               # mm
+    ("materiau", "i4"),        # indice dans le catalogue
+    ("densite", "f8"),         # kg/m³
+    ("Re", "f8"),              # MPa
+    ("cout_kg", "f8"),         # €/kg
+    ("J_unitaire", "f8"),      # kg·m² par mm de largeur
+    ("m_unitaire", "f8"),      # kg par mm de largeur
+    ("b", "f8"),               # mm
+    ("J", "f8"),               # kg·m²
+    ("masse", "f8"),           # kg
+    ("delta", "f8"),           # fluctuation simulée
+    ("sigma", "f8"),           # MPa, contrainte centrifuge
+    ("cout", "f8"),            # €
+    ("valide", "?"),
+])
+
+
+def _geometrie(type_volant, R, rho):
+    """(J, masse) par mètre de largeur b pour chaque type, R en m, ρ en kg/m³"""
+    R_i = (1 - EP_JANTE) * R
+    r_h = R_MOYEU * R
+    jante_J = PI / 2 * (R ** 4 - R_i ** 4) + PI / 2 * r_h ** 4
+    jante_m = PI * (R ** 2 - R_i ** 2) + PI * r_h ** 2
+    bras_J = N_BRAS * LARGEUR_BRAS * R * EP_BRAS * (R_i ** 3 - r_h ** 3) / 3
+    bras_m = N_BRAS * LARGEUR_BRAS * R * EP_BRAS * (R_i - r_h)
+    voile_J = EP_VOILE * PI / 2 * (R_i ** 4 - r_h ** 4)
+    voile_m = EP_VOILE * PI * (R_i ** 2 - r_h ** 2)
+    J = np.select([type_volant == 0, type_volant == 1], [PI / 2 * R ** 4, jante_J + bras_J], jante_J + voile_J)
+    m = np.select([type_volant == 0, type_volant == 1], [PI * R ** 2, jante_m + bras_m], jante_m + voile_m)
+    return rho * J, rho * m
+
+
+def candidats(cat, materiaux, D_max, n_diametres=16, D_min=None):
+    """Tableau DTYPE_VOLANT : types × diamètres (D_min…D_max mm) × matériaux (indices du catalogue)"""
+    D = np.linspace(D_min or 0.4 * D_max, D_max, n_diametres)
+    t, d, m = np.meshgrid(np.arange(len(TYPES_VOLANT)), D, np.asarray(materiaux), indexing="ij")
+    res = np.zeros(t.size, dtype=DTYPE_VOLANT)
+    res["type"], res["D"], res["materiau"] = t.ravel(), d.ravel(), m.ravel()
+    res["densite"] = np.asarray(cat["densite"])[res["materiau"]] * 1000
+    res["Re"] = np.asarray(cat["Re"])[res["materiau"]]
+    res["cout_kg"] = np.asarray(cat["cout"])[res["materiau"]]
+    J, masse = _geometrie(res["type"], res["D"] / 2000, res["densite"])
+    res["J_unitaire"], res["m_unitaire"] = J / 1000, masse / 1000
+    return res
+
+
+def dimensionner(couple, rpm, delta, cand, tol=0.2, charge="quadratique", J_moteur=0.0, b_mini=B_MINI):
+    """
+    Plus petite largeur de chaque candidat (au moins b_mini, mm) qui tient la fluctuation
+    delta (simulée), puis masse, contrainte centrifuge et validité. Remplit et renvoie cand.
+    Inertie hors de l'encadrement élargi : candidats invalides (δ simulé au-dessus de delta).
+    """
+    couple = np.asarray(couple, dtype=float)
+    omega_n = 2 * PI * rpm / 60
+    # Encadrement autour de l'estimation J = ΔE / (ω² δ), élargi tant que la cible n'y est pas
+    cumul = np.cumsum(couple - couple.mean()) * (2 * PI / couple.size)
+    J_est = max((cumul.max() - cumul.min()) / (omega_n ** 2 * delta) - J_moteur, 1e-9)
+    bas, haut = np.log(J_est / 8), np.log(J_est * 8)
+    tient = lambda log_J: simuler(couple, np.exp(log_J), rpm, charge, J_moteur=J_moteur)["delta"] <= delta
+    for _ in range(N_ELARGISSEMENT):
+        if tient(haut):
+            break
+        bas, haut = haut, haut + np.log(8)
+    for _ in range(N_ELARGISSEMENT):
+        if not tient(bas):
+            break
+        bas, haut = bas - np.log(8), bas
+    for _ in range(N_DICHOTOMIE):
+        milieu = (bas + haut) / 2
+        if tient(milieu):
+            haut = milieu
+        else:
+            bas = milieu
+    b = np.maximum(np.exp(haut) / cand["J_unitaire"], b_mini)
+    cand["b"] = b
+    cand["J"] = b * cand["J_unitaire"]
+    cand["masse"] = b * cand["m_unitaire"]
+    cand["cout"] = cand["masse"] * cand["cout_kg"]
+    # Une simulation par inertie distincte (celles des candidats au-dessus de b_mini se confondent)
+    J, inverse = np.unique(cand["J"], return_inverse=True)
+    cand["delta"] = simuler(couple, J, rpm, charge, J_moteur=J_moteur)["delta"][inverse]
+
+    omega_max = omega_n * (1 + delta / 2)
+    R = cand["D"] / 2000
+    coeff = np.where(cand["type"] == 0, (3 + NU) / 8, 1.0)  # disque : centre ; jante : anneau mince
+    cand["sigma"] = coeff * cand["densite"] * omega_max ** 2 * R ** 2 / 1e6
+    cand["valide"] = (b <= B_MAXI * cand["D"]) & (cand["sigma"] <= (1 - tol) * cand["Re"]) & (cand["delta"] <= delta * 1.001)
+    return cand
+
+
+def meilleur(cand, critere="masse"):
+    """Indice du candidat valide minimisant critere ("masse" ou "cout") ; -1 si aucun"""
+    idx = np.flatnonzero(cand["valide"])
+    if not idx.size:
+        return -1
+    # Arrondi : à géométrie égale, la masse ne dépend pas du matériau (départage par l'autre critère)
+    autre = "cout" if critere == "masse" else "masse"
+    return int(idx[np.lexsort((cand[autre][idx], np.round(cand[critere][idx], 9)))[0]])
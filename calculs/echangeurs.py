@@ -0,0 +1,213 @@
+# calculs/echangeurs.py
+"""
+Réchauffeur, refroidisseur et régénérateur du moteur Stirling : géométrie,
+pertes de charge, échanges thermiques et rendement qui en résulte.
+
+- Chaque échangeur occupe le volume mort que lui attribue volumes_morts()
+  (calculs/schmidt.py) : à diamètre hydraulique et longueur donnés, on en
+  déduit section de passage et surface mouillée (A_w = 4 V / d_h).
+- Échangeurs : faisceau de tubes ("tubes", d = diamètre intérieur) ou tête
+  à ailettes ("ailettes", d = largeur des fentes, canal plan de d_h = 2 d).
+  Matrices de régénérateur : toiles métalliques ("toile", d = diamètre du
+  fil) ou feuillard enroulé ("feuillard", d = épaisseur, canal plan).
+- Corrélations (facteur de Darcy f, Nusselt) : tubes et canaux laminaires
+  (64/Re, 96/Re ; Nu 3.66, 7.54), Petukhov + Gnielinski au-delà de
+  Re = 2300 ; toiles de Gedeon & Wood (f = 129/Re + 2.91 Re^-0.103,
+  Nu = (1 + 0.99 (Re Pr)^0.66) φ^1.79).
+- Écoulement alterné : débit massique ṁ_a |sin θ| d'amplitude ρ V_b ω / 2,
+  moyenné sur N_ANGLES_ECOULEMENT angles. Travail de pompage ∮ Δp ṁ/ρ dt,
+  conductance moyenne h A, efficacité du régénérateur NTU / (2 + NTU),
+  conduction axiale de la matrice.
+- Bilan : cycle de Schmidt entre les températures de gaz des échangeurs
+  (écarts de température gaz/paroi Q / hA, point fixe), corrigé vers le
+  modèle adiabatique (CORRECTION_ADIABATIQUE, calée sur
+  calculs/adiabatique.py), moins le pompage ; chaleur fournie = travail de
+  détente + perte du régénérateur + conduction. On en tire le rendement
+  thermique et le travail par cycle rapporté à p V_b, qui remplace la
+  constante RENDEMENT de dimensionner_moteur() quand echangeurs=True.
+
+Tout est diffusable : un balayage (d_fil, porosité, longueur) est un seul
+appel sur des tableaux de formes compatibles.
+Unités : d et longueurs en mm, volumes en m³, températures en K, pression
+en Pa, travaux et chaleurs en J par cycle et par cylindre.
+"""
+
+import numpy as np
+
+from calculs.gaz import table
+from calculs.schmidt import PHASE, PI, RATIO_MORT, schmidt, temperature_regenerateur, volumes_morts
+
+TYPES_ECHANGEUR = {"tubes": "tube", "ailettes": "canal"}
+TYPES_MATRICE = {"toile": "toile", "feuillard": "canal"}
+N_ANGLES_ECOULEMENT = 24
+RE_TRANSITION = 2300.0
+CORRECTION_ADIABATIQUE = 0.91   # travail adiabatique / Schmidt, échangeurs parfaits
+RENDEMENT_MECANIQUE = 0.85      # frottements de l'embiellage et des joints
+CONDUCTIVITE_MATRICE = 16.2     # W/(m·K), inox 304L
+CONTACT_TOILE = 0.1             # conduction d'un empilement de toiles / matériau plein
+N_ITERATIONS = 4                # point fixe des températures de gaz
+
+# Conception de référence : (type, d en mm, longueur / alésage) ; matrice : (type, d, porosité, longueur / alésage)
+CHAUD_REFERENCE = ("tubes", 3.0, 1.2)
+FROID_REFERENCE = ("tubes", 2.0, 1.0)
+REGENERATEUR_REFERENCE = ("toile", 0.035, 0.8, 0.3)
+
+# Balayage par défaut des matrices de régénérateur
+D_FILS = np.array([0.015, 0.02, 0.025, 0.035, 0.05, 0.08, 0.1])   # mm
+POROSITES = np.linspace(0.55, 0.95, 9)
+LONGUEURS_REGENERATEUR = np.linspace(0.05, 1.6, 32)                 # × alésage
+
+
+# ----------------- Corrélations -----------------
+
+def frottement_nusselt(forme, Re, Pr, porosite=1.0):
+    """Facteur de frottement de Darcy et nombre de Nusselt (forme "tube", "canal" ou "toile")"""
+    Re = np.maximum(np.asarray(Re, dtype=float), 1e-9)
+    if forme == "toile":
+        return 129 / Re + 2.91 * Re ** -0.103, (1 + 0.99 * (Re * Pr) ** 0.66) * np.asarray(porosite) ** 1.79
+    laminaire = Re < RE_TRANSITION
+    f_turb = (0.79 * np.log(np.maximum(Re, RE_TRANSITION)) - 1.64) ** -2
+    Nu_turb = f_turb / 8 * (Re - 1000) * Pr / (1 + 12.7 * np.sqrt(f_turb / 8) * (Pr ** (2 / 3) - 1))
+    f_lam, Nu_lam = (64.0, 3.66) if forme == "tube" else (96.0, 7.54)
+    return np.where(laminaire, f_lam / Re, f_turb), np.where(laminaire, Nu_lam, np.maximum(Nu_turb, Nu_lam))
+
+
+def _ecoulement(forme, d_h, longueur, volume, porosite, debit, T, p, gaz):
+    """
+    Écoulement alterné de débit ṁ_a |sin θ| (kg/s) dans un passage de diamètre hydraulique d_h (m),
+    de longueur (m) et de volume de gaz (m³) : pompage (J/cycle × f), conductance h A (W/K), NTU.
+    """
+    prop = table(gaz).interpoler(T, p, ("densite", "cp", "viscosite", "conductivite"))
+    rho, cp, mu, k = (prop[c] for c in ("densite", "cp", "viscosite", "conductivite"))
+    Pr = cp * mu / k
+    section = volume / longueur                       # passage libre (pores pour une matrice)
+    surface = 4 * volume / d_h
+    theta = (np.arange(N_ANGLES_ECOULEMENT) + 0.5) * (PI / N_ANGLES_ECOULEMENT)
+    ax = lambda v: np.asarray(v)[..., None]
+    m = ax(debit) * np.sin(theta)
+    G = m / ax(section)
+    Re = G * ax(d_h) / ax(mu)
+    f, Nu = frottement_nusselt(forme, Re, ax(Pr), ax(porosite))
+    dp = f * ax(longueur / d_h) * G ** 2 / (2 * ax(rho))
+    hA = (Nu * ax(k / d_h)).mean(axis=-1) * surface
+    m_moyen = 2 / PI * np.asarray(debit)
+    return {
+        "puissance_pompage": (dp * m).mean(axis=-1) / rho,
+        "hA": hA,
+        "NTU": hA / (m_moyen * cp),
+        "m_moyen": m_moyen,
+        "cp": cp,
+        "Re": Re.max(axis=-1),
+        "dp": dp.max(axis=-1),
+        "section": section,
+        "surface": surface,
+    }
+
+
+def debit_amplitude(V_balaye, freq, T, p, gaz="Air"):
+    """Amplitude du débit massique (kg/s) dans un échangeur à T (K) : ρ V_b ω / 2"""
+    return table(gaz)("densite", T, p) * np.asarray(V_balaye) * PI * np.asarray(freq)
+
+
+def echangeur(type_echangeur, d, longueur, volume, T, p, debit, gaz="Air"):
+    """Réchauffeur / refroidisseur : d (mm) diamètre des tubes ou largeur des fentes, longueur (mm)"""
+    forme = TYPES_ECHANGEUR[type_echangeur]
+    d_h = np.asarray(d, dtype=float) / 1000 * (1 if forme == "tube" else 2)
+    res = _ecoulement(forme, d_h, np.asarray(longueur) / 1000, volume, 1.0, debit, T, p, gaz)
+    # Nombre de tubes (ou fentes de périmètre πd équivalent) pour loger le volume
+    res["n_passages"] = res["section"] / (PI / 4 * d_h ** 2) if forme == "tube" else res["section"] / d_h ** 2
+    return res
+
+
+def regenerateur(type_matrice, d, porosite, longueur, volume, T_h, T_k, p, debit, gaz="Air", freq=1.0,
+                 conductivite=CONDUCTIVITE_MATRICE):
+    """
+    Régénérateur : d (mm) fil de toile ou épaisseur de feuillard, porosité, longueur (mm), volume de gaz (m³).
+    Ajoute efficacité, perte de régénération et conduction (J/cycle) et la section frontale (m²).
+    """
+    forme = TYPES_MATRICE[type_matrice]
+    porosite = np.asarray(porosite, dtype=float)
+    d = np.asarray(d, dtype=float) / 1000
+    d_h = porosite * d / (1 - porosite) * (1 if forme == "toile" else 2)
+    L = np.asarray(longueur, dtype=float) / 1000
+    T_r = temperature_regenerateur(T_h, T_k)
+    res = _ecoulement(forme, d_h, L, volume, porosite, debit, T_r, p, gaz)
+    efficacite = res["NTU"] / (2 + res["NTU"])
+    ecart = np.asarray(T_h) - np.asarray(T_k)
+    frontale = volume / porosite / L
+    k_matrice = (1 - porosite) * conductivite * (CONTACT_TOILE if forme == "toile" else 1.0)
+    res.update({
+        "d_h": d_h,
+        "efficacite": efficacite,
+        # Chaque soufflage chaud perd (1 - ε) cp ΔT par kg, la moitié du débit moyen par cycle
+        "Q_regeneration": (1 - efficacite) * res["cp"] * ecart * res["m_moyen"] / (2 * np.asarray(freq)),
+        "Q_conduction": k_matrice * frontale * ecart / L / np.asarray(freq),
+        "frontale": frontale,
+    })
+    return res
+
+
+# ----------------- Bilan du moteur -----------------
+
+def bilan(V_balaye, freq, p_moy, T_h, T_k, d_cyl, chaud=CHAUD_REFERENCE, froid=FROID_REFERENCE,
+          matrice=REGENERATEUR_REFERENCE, configuration="alpha", phase=PHASE, ratio_mort=RATIO_MORT, gaz="Air"):
+    """
+    Bilan par cylindre d'une conception (entrées diffusables) : échangeurs aux longueurs
+    relatives à l'alésage d_cyl (mm). dict : W_indique, W_arbre, Q_chaud (J/cycle),
+    rendement_thermique (arbre / chaleur), travail_specifique (W_arbre / p V_b, la grandeur
+    « rendement » de dimensionner_moteur), pertes détaillées et températures de gaz.
+    """
+    V_balaye, freq, p_moy, T_h, T_k, d_cyl = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (V_balaye, freq, p_moy, T_h, T_k, d_cyl)))
+    V_h, V_r, V_k = volumes_morts(V_balaye, ratio_mort)
+    rechauffeur = echangeur(chaud[0], chaud[1], chaud[2] * d_cyl, V_h, T_h, p_moy,
+                            debit_amplitude(V_balaye, freq, T_h, p_moy, gaz), gaz)
+    refroidisseur = echangeur(froid[0], froid[1], froid[2] * d_cyl, V_k, T_k, p_moy,
+                              debit_amplitude(V_balaye, freq, T_k, p_moy, gaz), gaz)
+    regen = regenerateur(matrice[0], matrice[1], matrice[2], matrice[3] * d_cyl, V_r, T_h, T_k, p_moy,
+                         debit_amplitude(V_balaye, freq, temperature_regenerateur(T_h, T_k), p_moy, gaz), gaz, freq)
+
+    # Températures de gaz : la paroi cède Q_h = W_e f au réchauffeur et reçoit -W_c f au refroidisseur
+    T_gh, T_gk = T_h, T_k
+    for _ in range(N_ITERATIONS):
+        cycle = schmidt(configuration, V_balaye, V_balaye, V_h, V_k, V_r, T_gh, T_gk, p_moy, phase)
+        T_gh = T_h - np.maximum(cycle["W_e"], 0.0) * freq / rechauffeur["hA"]
+        T_gk = T_k + np.maximum(-cycle["W_c"], 0.0) * freq / refroidisseur["hA"]
+        T_gh = np.maximum(T_gh, T_gk + 1.0)
+    cycle = schmidt(configuration, V_balaye, V_balaye, V_h, V_k, V_r, T_gh, T_gk, p_moy, phase)
+    W_pompage = (rechauffeur["puissance_pompage"] + refroidisseur["puissance_pompage"]
+                 + regen["puissance_pompage"]) / freq
+    W_indique = CORRECTION_ADIABATIQUE * cycle["W"] - W_pompage
+    Q_chaud = cycle["W_e"] + regen["Q_regeneration"] + regen["Q_conduction"]
+    W_arbre = RENDEMENT_MECANIQUE * W_indique
+    return {
+        "W_indique": W_indique,
+        "W_arbre": W_arbre,
+        "Q_chaud": Q_chaud,
+        "rendement_thermique": W_arbre / Q_chaud,
+        "travail_specifique": W_arbre / (p_moy * V_balaye),
+        "W_pompage": W_pompage,
+        "Q_regeneration": regen["Q_regeneration"],
+        "Q_conduction": regen["Q_conduction"],
+        "T_gaz_chaud": T_gh,
+        "T_gaz_froid": T_gk,
+        "rechauffeur": rechauffeur,
+        "refroidisseur": refroidisseur,
+        "regenerateur": regen,
+    }
+
+
+def optimiser_regenerateur(V_balaye, freq, p_moy, T_h, T_k, d_cyl, type_matrice="toile", d_fils=D_FILS,
+                           porosites=POROSITES, longueurs=LONGUEURS_REGENERATEUR, **options):
+    """
+    Balayage (d_fil × porosité × longueur relative) du régénérateur d'une conception (scalaires),
+    en un seul appel vectorisé ; critère : rendement thermique. Renvoie (matrice optimale
+    (type, d, porosité, longueur / alésage), bilan de l'optimum, carte des rendements).
+    """
+    d, phi, L = np.meshgrid(np.asarray(d_fils, dtype=float), np.asarray(porosites, dtype=float),
+                            np.asarray(longueurs, dtype=float), indexing="ij")
+    carte = bilan(V_balaye, freq, p_moy, T_h, T_k, d_cyl, matrice=(type_matrice, d, phi, L), **options)
+    rendement = np.where(carte["W_arbre"] > 0, carte["rendement_thermique"], -np.inf)
+    i = np.unravel_index(int(np.argmax(rendement)), rendement.shape)
+    meilleure = (type_matrice, float(d[i]), float(phi[i]), float(L[i]))
+    return meilleure, bilan(V_balaye, freq, p_moy, T_h, T_k, d_cyl, matrice=meilleure, **options), rendement
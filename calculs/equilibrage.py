@@ -0,0 +1,250 @@
+# calculs/equilibrage.py
+"""
+Équilibrage d'un moteur Stirling en ligne : forces libres, moments de
+basculement et contrepoids.
+
+Cylindres verticaux alignés le long du vilebrequin (positions z_i), manivelle
+du cylindre i calée à φ_i : son angle depuis le PMH est θ - φ_i, comme dans
+calculs/phasage.py. Repère du bâti : x vers la culasse, y transversal.
+
+- Masses alternatives (piston + part de bielle) : l'accélération exacte du
+  piston, r ω² g(θ), est développée en harmoniques g = Σ A_k cos kθ (ordres
+  1, 2, 4, 6, tirés de la cinématique exacte de calculs/cinematique.py). La
+  force d'ordre k sur le bâti, le long des cylindres, vaut
+  m_alt r ω² A_k Re(e^{ikθ} S_k) avec S_k = Σ exp(-i k φ_i), et le moment de
+  basculement (tangage) la même chose avec T_k = Σ z_i exp(-i k φ_i).
+- Masses rotatives (part de bielle, maneton) : m_rot r ω² tournant avec la
+  manivelle ; les contrepoids de chaque manivelle (masse m_cp ramenée au
+  rayon r) en retirent m_cp. Avec m_cp = m_rot + f m_alt, une fraction f du
+  primaire alternatif passe du plan des cylindres au plan transversal.
+
+Les forces libres et moments ne dépendent des phases que par S_k et T_k :
+desequilibres() évalue d'un coup des millions d'arrangements (phases,
+ordre des cylindres) et classer_calages() les trie. efforts_bati() donne les
+efforts sur un tour transmis au bâti, et charges_fixations() les répartit
+sur les vis de l'embase.
+
+Cotes en mm, masses en g, phases en degrés ; sorties SI (N, Nm).
+"""
+
+from functools import lru_cache
+from itertools import permutations
+from math import factorial
+
+import numpy as np
+
+from calculs.cinematique import N_ANGLES, _formes, angles
+
+PI = np.pi
+
+ORDRES = (1, 2, 4, 6)          # harmoniques retenues de l'accélération du piston (reste < λ⁷)
+FRACTION_ALTERNATIVE = 0.5     # part de la masse alternative reprise par les contrepoids
+ENTRAXE_CYLINDRES = 1.4        # entraxe des cylindres / alésage (cf. schéma de la page moteur)
+MAX_ORDRES = 40320             # ordres de cylindres évalués par jeu de phases (8!)
+
+CRITERES_EQUILIBRE = ("global", "F_primaire", "F_secondaire", "M_primaire", "M_secondaire")
+
+
+@lru_cache(maxsize=64)
+def _harmoniques(lam, n_angles):
+    A = np.fft.rfft(_formes(lam, angles(n_angles))["d2x"]).real * (2 / n_angles)
+    A = A[list(ORDRES)]
+    A.setflags(write=False)
+    return A
+
+
+def coefficients(lam, n_angles=N_ANGLES):
+    """Coefficients A_k (ORDRES) de l'accélération réduite du piston x''/r pour λ = r / L"""
+    return _harmoniques(float(lam), int(n_angles))
+
+
+def positions_cylindres(n_cyl, entraxe):
+    """Positions z (mm) des cylindres le long du vilebrequin, centrées sur le milieu du moteur"""
+    return (np.arange(n_cyl) - (n_cyl - 1) / 2) * entraxe
+
+
+def masse_contrepoids(m_rot, m_alt, fraction=FRACTION_ALTERNATIVE):
+    """Masse (g) à équilibrer par manivelle, ramenée au rayon de manivelle"""
+    return np.asarray(m_rot, dtype=float) + fraction * np.asarray(m_alt, dtype=float)
+
+
+def contrepoids(m_rot, m_alt, rayon, r_contrepoids=None, fraction=FRACTION_ALTERNATIVE):
+    """
+    Contrepoids d'une manivelle, opposés au maneton : masse totale (g) à leur rayon de
+    centre de gravité r_contrepoids (mm, par défaut le rayon de manivelle) et masse par bras.
+    """
+    rayon = np.asarray(rayon, dtype=float)
+    r_cp = rayon if r_contrepoids is None else np.asarray(r_contrepoids, dtype=float)
+    masse = masse_contrepoids(m_rot, m_alt, fraction) * rayon / r_cp
+    return {"masse": masse, "masse_bras": masse / 2, "balourd": masse * r_cp}  # balourd en g·mm
+
+
+def _sommes(phases, z):
+    """S_k et T_k (ORDRES) pour des phases (..., n_cyl) en degrés et des positions z (mm)"""
+    e1 = np.exp(-1j * np.radians(np.asarray(phases, dtype=float)))
+    z = np.asarray(z, dtype=float) / 1000
+    e2 = e1 * e1                                   # puissances plutôt qu'une exponentielle par ordre
+    e4 = e2 * e2
+    puissances = (e1, e2, e4, e4 * e2)
+    if z.ndim == 1:
+        # Mêmes positions pour tous les arrangements : un produit matriciel par ordre
+        poids = np.stack((np.ones_like(z), z), axis=1).astype(complex)
+        sommes = np.stack([e @ poids for e in puissances], axis=-2)
+        S, T = sommes[..., 0], sommes[..., 1]
+    else:
+        S = np.stack([e.sum(axis=-1) for e in puissances], axis=-1)
+        T = np.stack([(e * z).sum(axis=-1) for e in puissances], axis=-1)
+    return S, T
+
+
+def _premier_ordre(module, m_alt, m_rot, m_cp):
+    """Maximum sur le tour de la résultante d'ordre 1 : ellipse de demi-axes (plan des cylindres, transversal)"""
+    return module * np.maximum(np.abs(m_alt + m_rot - m_cp), np.abs(m_rot - m_cp))
+
+
+def desequilibres(phases, z, m_alt, m_rot, rayon, L, rpm, m_cp=None):
+    """
+    Forces libres et moments de basculement (amplitudes sur le tour) d'arrangements de phases.
+
+    phases (..., n_cyl) en degrés et z (n_cyl) ou (..., n_cyl) en mm ; masses en g par cylindre,
+    m_cp : contrepoids par manivelle ramené au rayon (None : masse_contrepoids()). Renvoie un
+    dict de tableaux (...) : F_primaire, F_secondaire (N), M_primaire, M_secondaire (Nm) et
+    F_ordres / M_ordres (..., len(ORDRES)) des masses alternatives seules.
+    """
+    m_alt, m_rot = float(m_alt) / 1000, float(m_rot) / 1000
+    m_cp = masse_contrepoids(m_rot, m_alt) if m_cp is None else float(m_cp) / 1000
+    r = float(rayon) / 1000
+    omega = 2 * PI * float(rpm) / 60
+    A = coefficients(r / (float(L) / 1000))
+    S, T = _sommes(phases, z)
+    echelle = r * omega ** 2
+    S, T = np.abs(S), np.abs(T)
+    return {
+        "F_primaire": _premier_ordre(echelle * S[..., 0], m_alt, m_rot, m_cp),
+        "F_secondaire": echelle * m_alt * np.abs(A[1]) * S[..., 1],
+        "M_primaire": _premier_ordre(echelle * T[..., 0], m_alt, m_rot, m_cp),
+        "M_secondaire": echelle * m_alt * np.abs(A[1]) * T[..., 1],
+        "F_ordres": echelle * m_alt * np.abs(A) * S,
+        "M_ordres": echelle * m_alt * np.abs(A) * T,
+    }
+
+
+def ordres_cylindres(phases, max_ordres=MAX_ORDRES, graine=0):
+    """
+    Répartitions d'un jeu de phases (n_cyl, degrés) sur les positions des cylindres :
+    toutes les permutations distinctes (une seule de chaque paire symétrique, même
+    équilibrage), ou max_ordres tirées au hasard au-delà.
+    """
+    phases = np.asarray(phases, dtype=float)
+    n = phases.size
+    if factorial(n) <= max_ordres:
+        ordres = np.array(list(permutations(range(n))), dtype=np.int32).reshape(-1, n)
+    else:
+        rng = np.random.default_rng(graine)
+        ordres = np.argsort(rng.random((max_ordres, n)), axis=1)
+    arrangements = np.unique(phases[ordres], axis=0)
+    if factorial(n) > max_ordres:
+        return arrangements
+    # Ordre renversé (moteur vu de l'autre bout) : mêmes amplitudes, on garde le plus petit des deux
+    diff = arrangements[:, ::-1] - arrangements
+    premier = np.argmax(diff != 0, axis=1)
+    garde = diff[np.arange(len(diff)), premier] >= 0
+    return arrangements[garde]
+
+
+def classer_calages(phases, z, m_alt, m_rot, rayon, L, rpm, critere="global", m_cp=None):
+    """
+    Classe des arrangements de phases (N, n_cyl) selon critere (un des CRITERES_EQUILIBRE ;
+    global : forces libres + moments rapportés à l'entraxe moyen des cylindres).
+    Renvoie le dict de desequilibres() trié, avec phases et score.
+    """
+    if critere not in CRITERES_EQUILIBRE:
+        raise ValueError(f"Critère inconnu : {critere!r} ({', '.join(CRITERES_EQUILIBRE)})")
+    phases = np.atleast_2d(np.asarray(phases, dtype=float))
+    res = desequilibres(phases, z, m_alt, m_rot, rayon, L, rpm, m_cp)
+    if critere == "global":
+        z = np.asarray(z, dtype=float)
+        bras = np.ptp(z) / max(z.shape[-1] - 1, 1) / 1000 if z.size > 1 else 0.0
+        score = res["F_primaire"] + res["F_secondaire"]
+        if bras > 0:
+            score = score + (res["M_primaire"] + res["M_secondaire"]) / bras
+    else:
+        score = res[critere]
+    ordre = np.argsort(np.round(score, 9), kind="stable")
+    res = {cle: v[ordre] for cle, v in res.items()}
+    res.update(phases=phases[ordre], score=score[ordre])
+    return res
+
+
+def meilleur_ordre(phases, z, m_alt, m_rot, rayon, L, rpm, critere="global", m_cp=None):
+    """Meilleure répartition d'un jeu de phases sur les cylindres : (phases, dict des déséquilibres)"""
+    res = classer_calages(ordres_cylindres(phases), z, m_alt, m_rot, rayon, L, rpm, critere, m_cp)
+    return res["phases"][0], {cle: v[0] for cle, v in res.items()}
+
+
+def efforts_bati(phases, z, m_alt, m_rot, rayon, L, rpm, m_cp=None, couple=None, n_angles=N_ANGLES):
+    """
+    Efforts d'inertie transmis au bâti sur un tour (θ = PMH du cylindre de phase 0) :
+    F_verticale (vers la culasse), F_transversale (N), M_tangage (autour de l'axe
+    transversal, issu des forces verticales) et M_lacet (autour de la verticale) en Nm,
+    de forme (..., n_angles). couple : couple moteur total sur un tour, depuis le même
+    PMH (grille régulière quelconque), dont la réaction sur le bâti donne M_roulis.
+    """
+    m_alt, m_rot = float(m_alt) / 1000, float(m_rot) / 1000
+    m_cp = masse_contrepoids(m_rot, m_alt) if m_cp is None else float(m_cp) / 1000
+    r = float(rayon) / 1000
+    omega = 2 * PI * float(rpm) / 60
+    A = coefficients(r / (float(L) / 1000), n_angles)
+    S, T = _sommes(phases, z)
+    theta = angles(n_angles)
+    tour = np.exp(1j * np.array(ORDRES)[:, None] * theta)                 # (K, n_angles)
+    echelle = r * omega ** 2
+    alt = echelle * m_alt * A
+    rot = echelle * (m_rot - m_cp)
+    res = {
+        "angle": theta,
+        "F_verticale": ((S * alt) @ tour).real + rot * (S[..., :1] * tour[0]).real,
+        "F_transversale": rot * (S[..., :1] * tour[0]).imag,
+        "M_tangage": ((T * alt) @ tour).real + rot * (T[..., :1] * tour[0]).real,
+        "M_lacet": rot * (T[..., :1] * tour[0]).imag,
+    }
+    if couple is not None:
+        couple = np.asarray(couple, dtype=float)
+        res["M_roulis"] = np.interp(theta, angles(couple.size), couple, period=2 * PI)
+    return res
+
+
+def charges_fixations(bati, trous, centre=(0.0, 0.0), hauteur=0.0):
+    """
+    Efforts dans les vis d'une embase sur un tour.
+
+    trous (n_trous, 2) : positions (u le long du vilebrequin, w transversal) en mm ;
+    centre : position du milieu du moteur sur l'embase, hauteur : axe du vilebrequin
+    au-dessus du plan de pose (mm). Efforts de efforts_bati() (M_roulis facultatif).
+    Plaque rigide : traction (positive, N) F/n + linéaire en (u, w) pour reprendre les
+    moments, cisaillement (N) de l'effort transversal et du lacet ; tableaux (n_trous, n_angles).
+    """
+    trous = np.asarray(trous, dtype=float)
+    n = len(trous)
+    c = trous.mean(axis=0)
+    d = (trous - c) / 1000
+    du, dw = (np.asarray(centre, dtype=float) - c) / 1000
+    h = hauteur / 1000
+    F = bati["F_verticale"]
+    F_t = bati["F_transversale"]
+    # Moments autour du barycentre des vis : positif soulève les vis du côté +u (tangage) / +w (roulis)
+    M_u = bati["M_tangage"] + F * du
+    M_w = bati.get("M_roulis", 0.0) + F * dw - F_t * h
+    M_z = bati["M_lacet"] + F_t * du
+    inertie = d.T @ d
+    if n < 3 or abs(np.linalg.det(inertie)) < 1e-12 * max(np.trace(inertie) ** 2, 1e-30):
+        raise ValueError("Il faut au moins 3 vis non alignées pour reprendre les moments")
+    a, b = np.linalg.solve(inertie, np.stack(np.broadcast_arrays(M_u, M_w)).reshape(2, -1))
+    traction = F.reshape(-1) / n + d[:, :1] * a + d[:, 1:] * b
+    polaire = (d ** 2).sum()
+    cis_u = -d[:, 1:] * M_z.reshape(-1) / polaire
+    cis_w = F_t.reshape(-1) / n + d[:, :1] * M_z.reshape(-1) / polaire
+    return {
+        "traction": traction,
+        "cisaillement": np.hypot(cis_u, cis_w),
+    }
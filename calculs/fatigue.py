@@ -0,0 +1,236 @@
+# calculs/fatigue.py
+"""
+Tenue en fatigue des pièces d'embiellage (bielle, maneton du vilebrequin).
+
+- Historiques de contrainte : issus de calculs/cinematique.py (un tour de
+  vilebrequin, répété) ou d'un CSV importé (une colonne par cas de charge).
+- Comptage rainflow (règle des 4 points) vectorisé : extraction des
+  points de rebroussement, puis passes successives qui retirent d'un coup
+  tous les couples (y_j, y_j+1) d'étendue au plus égale à celles de leurs
+  deux voisins ; le résultat ne dépend pas de l'ordre des retraits. Le
+  résidu compte pour des demi-cycles, ou, pour un historique périodique,
+  est refermé en le faisant commencer et finir à son maximum.
+- Contrainte moyenne : amplitude alternée équivalente de Goodman
+  σ_a / (1 - σ_m / Rm) ou de Gerber σ_a / (1 - (σ_m / Rm)²) ; une moyenne
+  de compression n'est pas comptée favorable.
+- Courbe S-N de Basquin par matériau (champs Sf et N_D de MATERIAUX) :
+  FRACTION_RM · Rm à N_REF cycles, Sf à N_D cycles, palier au-delà.
+- Cumul linéaire de Miner : dommage par historique et durée de vie en
+  heures au régime de calcul.
+
+Contraintes en MPa (traction positive). Plusieurs cas de charge sont
+comptés en parallèle sur un pool de processus (workers).
+"""
+
+import os
+from multiprocessing import get_context
+
+import numpy as np
+
+CORRECTIONS = ("goodman", "gerber", "aucune")
+N_REF = 1e3            # cycles de l'ancrage haut de la courbe S-N
+FRACTION_RM = 0.9      # contrainte alternée à N_REF cycles / Rm
+FACTEUR_SF = 0.4       # Sf / Rm par défaut (nuance sans donnée de fatigue)
+N_D_DEFAUT = 1e7       # cycles du coude par défaut
+N_FIBRES = 24          # fibres du maneton évaluées (pas de 15°)
+
+
+# ----------------- Comptage rainflow -----------------
+
+def rebroussements(x):
+    """Points de rebroussement (paliers retirés, extrémités gardées) d'un historique 1D"""
+    x = np.asarray(x, dtype=float).ravel()
+    if x.size < 2:
+        return x.copy()
+    d = np.diff(x)
+    mouvements = np.flatnonzero(d)
+    if mouvements.size == 0:
+        return x[:1].copy()
+    if mouvements.size == d.size:  # pas de palier : on évite une copie indexée
+        sens = d > 0
+        changements = np.flatnonzero(sens[1:] != sens[:-1]) + 1
+    else:
+        sens = d[mouvements] > 0
+        changements = mouvements[np.flatnonzero(sens[1:] != sens[:-1]) + 1]
+    return x[np.concatenate(([0], changements, [x.size - 1]))]
+
+
+def _extraire(y, plages, moyennes):
+    """Retire de y tous les cycles fermés (règle des 4 points) ; renvoie le résidu"""
+    while y.size >= 4:
+        r = np.abs(np.diff(y))
+        # Couple j = (y_j, y_j+1), 1 <= j <= n-3, encadré par les étendues r_j-1 et r_j+1
+        ferme = (r[1:-1] <= r[:-2]) & (r[1:-1] <= r[2:])
+        ferme[1:] &= ~ferme[:-1]  # deux couples voisins partagent un point : un seul par passe
+        j = np.flatnonzero(ferme) + 1
+        if j.size == 0:
+            break
+        plages.append(r[j])
+        moyennes.append((y[j] + y[j + 1]) / 2)
+        garde = np.ones(y.size, dtype=bool)
+        garde[j] = False
+        garde[j + 1] = False
+        y = y[garde]  # y_j-1 et y_j+2 sont de sens opposés : la suite reste alternée
+    return y
+
+
+def rainflow(x, periodique=False):
+    """
+    Cycles d'un historique : (étendues, moyennes, comptes), comptes de 1 (cycle) ou 0.5
+    (demi-cycle du résidu). periodique : l'historique se répète (un tour de vilebrequin),
+    tout le résidu se referme en cycles.
+    """
+    plages, moyennes = [], []
+    residu = _extraire(rebroussements(x), plages, moyennes)
+    n_complets = sum(p.size for p in plages)
+    if periodique and residu.size > 1:
+        # Le résidu répété commence et finit à son maximum : il se ferme entièrement
+        debut = int(np.argmax(residu))
+        residu = rebroussements(np.concatenate((residu[debut:], residu[1:debut + 1])))
+        residu = _extraire(residu, plages, moyennes)
+        if residu.size == 3:  # maximum, minimum, maximum : le plus grand cycle
+            plages.append(np.abs(residu[1:2] - residu[:1]))
+            moyennes.append((residu[:1] + residu[1:2]) / 2)
+            residu = residu[:1]
+        n_complets = sum(p.size for p in plages)
+    if residu.size > 1:
+        plages.append(np.abs(np.diff(residu)))
+        moyennes.append((residu[1:] + residu[:-1]) / 2)
+    plages = np.concatenate(plages) if plages else np.empty(0)
+    moyennes = np.concatenate(moyennes) if moyennes else np.empty(0)
+    comptes = np.full(plages.size, 0.5)
+    comptes[:n_complets] = 1.0
+    return plages, moyennes, comptes
+
+
+# ----------------- Courbe S-N et contrainte moyenne -----------------
+
+def courbe_sn(mat):
+    """(Rm, Sf, N_D) d'un matériau (dict de MATERIAUX ou du catalogue), valeurs par défaut si absentes"""
+    Rm = float(mat.get("Rm") or mat["Re"])
+    Sf = mat.get("Sf")
+    Sf = FACTEUR_SF * Rm if Sf is None or not np.isfinite(Sf) else float(Sf)
+    N_D = mat.get("N_D")
+    N_D = N_D_DEFAUT if N_D is None or not np.isfinite(N_D) else float(N_D)
+    return Rm, Sf, N_D
+
+
+def amplitude_equivalente(amplitude, moyenne, Rm, correction="goodman"):
+    """Amplitude alternée (moyenne nulle) équivalente ; inf si la moyenne atteint Rm"""
+    if correction not in CORRECTIONS:
+        raise ValueError(f"Correction inconnue : {correction!r} ({', '.join(CORRECTIONS)})")
+    amplitude = np.asarray(amplitude, dtype=float)
+    if correction == "aucune":
+        return amplitude
+    rapport = np.maximum(np.asarray(moyenne, dtype=float), 0.0) / Rm
+    marge = 1 - rapport if correction == "goodman" else 1 - rapport ** 2
+    with np.errstate(divide="ignore"):
+        return np.where(marge > 0, amplitude / np.where(marge > 0, marge, 1), np.inf)
+
+
+def cycles_admissibles(amplitude, mat):
+    """Nombre de cycles à rupture sous une amplitude alternée (MPa) : Basquin, palier au-delà de N_D"""
+    Rm, Sf, N_D = courbe_sn(mat)
+    S_ref = FRACTION_RM * Rm
+    k = np.log(N_D / N_REF) / np.log(S_ref / Sf)  # pente : S^k N = constante
+    amplitude = np.asarray(amplitude, dtype=float)
+    with np.errstate(divide="ignore", over="ignore"):
+        N = N_REF * (S_ref / amplitude) ** k
+    N = np.where(amplitude <= Sf, np.inf, N)
+    return np.where(amplitude >= Rm, 1.0, N)
+
+
+# ----------------- Dommage -----------------
+
+def dommage_cycles(plages, moyennes, comptes, mat, correction="goodman", coeff=1.0):
+    """Dommage de Miner Σ n / N des cycles (contraintes multipliées par coeff, ex. concentration)"""
+    Rm = courbe_sn(mat)[0]
+    amplitude = amplitude_equivalente(np.asarray(plages) / 2 * coeff, np.asarray(moyennes) * coeff, Rm, correction)
+    return float(np.sum(np.asarray(comptes) / cycles_admissibles(amplitude, mat)))
+
+
+def _tache(args):
+    x, mat, correction, coeff, periodique = args
+    plages, moyennes, comptes = rainflow(x, periodique)
+    amplitude = plages / 2 * coeff
+    return dommage_cycles(plages, moyennes, comptes, mat, correction, coeff), float(amplitude.max(initial=0.0)), plages.size
+
+
+def dommages(histoires, mat, correction="goodman", coeff=1.0, periodique=True, workers=1):
+    """
+    Rainflow et dommage de Miner de plusieurs cas de charge (liste d'historiques ou tableau
+    (cas, échantillons)), répartis sur workers processus (None : tous les cœurs).
+    Renvoie (dommage par passage de chaque historique, amplitude maxi, nombre de cycles).
+    """
+    taches = [(np.asarray(x, dtype=float), dict(mat), correction, coeff, periodique) for x in histoires]
+    workers = min(workers or os.cpu_count() or 1, len(taches))
+    if workers <= 1:
+        resultats = [_tache(t) for t in taches]
+    else:
+        with get_context("spawn").Pool(workers) as pool:
+            resultats = pool.map(_tache, taches)
+    D, amplitude, n_cycles = (np.array(v) for v in zip(*resultats)) if resultats else (np.empty(0),) * 3
+    return D, amplitude, n_cycles
+
+
+def duree_vie(dommage_par_tour, rpm):
+    """Durée de vie (h) pour un dommage par tour de vilebrequin au régime rpm (inf si aucun dommage)"""
+    with np.errstate(divide="ignore"):
+        return 1 / (np.asarray(dommage_par_tour, dtype=float) * np.asarray(rpm, dtype=float) * 60)
+
+
+# ----------------- Historiques de contrainte des pièces -----------------
+
+def contrainte_bielle(charges, section):
+    """Contrainte normale dans le corps de bielle (MPa, traction positive), section en mm²"""
+    return -np.asarray(charges["F_bielle"]) / section
+
+
+def contraintes_maneton(charges, d_maneton, portee, n_fibres=N_FIBRES):
+    """
+    Contrainte équivalente (MPa) sur n_fibres fibres du maneton, liées à la manivelle :
+    flexion de la charge radiale / tangentielle (appuis simples sur la portée, mm) et
+    torsion du couple du cylindre, combinées par von Mises au signe de la flexion.
+    Tableau (n_fibres, n_angles) : un cas de charge par fibre.
+    """
+    W = np.pi / 32 * (d_maneton / 1000) ** 3              # module de flexion (m³)
+    moment = np.stack([charges["F_radiale"], charges["F_tangentielle"]]) * (portee / 1000 / 4)
+    psi = np.linspace(0, 2 * np.pi, n_fibres, endpoint=False)
+    sigma = (np.cos(psi)[:, None] * moment[0] + np.sin(psi)[:, None] * moment[1]) / W / 1e6
+    tau = np.asarray(charges["couple"]) / (2 * W) / 1e6
+    return np.sign(sigma) * np.sqrt(sigma ** 2 + 3 * tau ** 2)
+
+
+def lire_historiques(chemin):
+    """
+    Historiques de contrainte d'un CSV (séparateur , ou ; avec virgule décimale) : une colonne
+    numérique par cas -> (noms, liste de tableaux). Cellules vides : historiques de longueurs
+    différentes ; cellule illisible : ValueError.
+    """
+    with open(chemin, encoding="utf-8-sig") as f:
+        lignes = [ligne.rstrip("\r\n") for ligne in f]
+    lignes = [ligne for ligne in lignes if ligne.strip()]
+    if not lignes:
+        raise ValueError(f"{chemin} : fichier vide")
+    sep = ";" if lignes[0].count(";") > lignes[0].count(",") else ","
+    lire = (lambda c: float(c.replace(",", "."))) if sep == ";" else float
+    entetes = [h.strip() for h in lignes[0].split(sep)]
+    try:
+        [lire(h) for h in entetes]
+        entetes = [f"cas {i + 1}" for i in range(len(entetes))]
+    except ValueError:
+        lignes = lignes[1:]
+    colonnes = [[] for _ in entetes]
+    for ligne in lignes:
+        cellules = [c.strip() for c in ligne.split(sep)]
+        if len(cellules) > len(colonnes):
+            raise ValueError(f"{chemin} : {len(cellules)} colonnes pour {len(colonnes)} en-têtes")
+        for colonne, cellule in zip(colonnes, cellules):
+            if cellule:
+                try:
+                    colonne.append(lire(cellule))
+                except ValueError:
+                    raise ValueError(f"{chemin} : valeur illisible « {cellule} »") from None
+    garde = [len(c) > 0 for c in colonnes]
+    return ([e for e, g in zip(entetes, garde) if g],
+            [np.array(c, dtype=float) for c, g in zip(colonnes, garde) if g])
@@ -0,0 +1,197 @@
+# calculs/gaz.py
+"""
+Propriétés des gaz de travail des moteurs Stirling (air, hélium, hydrogène, azote).
+
+Les tables (T, P) de densité, cp, cv, viscosité, conductivité et facteur de
+compressibilité Z sont construites au premier usage de chaque gaz puis
+gardées dans le cache disque ; une lecture est une interpolation bilinéaire
+sur grille régulière, vectorisée (plusieurs millions d'états par seconde).
+
+- gaz réel : équation d'état de Peng-Robinson (Z, densité, écarts de cp et
+  cv au gaz parfait) ; ω = 0 pour l'hélium, gaz quantique très loin de son
+  point critique pour lequel la fonction α(T) usuelle n'a plus de sens ;
+- cp du gaz parfait : polynôme a + bT + cT² + dT³ (J/mol/K) ;
+- viscosité et conductivité : loi de Sutherland (gaz dilué, effet de la
+  pression négligé).
+
+Hors de la grille (150–1500 K, 1–300 bar), les valeurs sont celles du bord.
+Unités SI : T en K, P en Pa, densité en kg/m³, cp et cv en J/kg/K,
+viscosité en Pa·s, conductivité en W/m/K.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from cache_disque import dossier_cache, ecrire_atomique
+
+R_MOLAIRE = 8.314462618  # J/mol/K
+
+# M (kg/mol) ; Tc (K), Pc (Pa), ω ; cp gaz parfait (J/mol/K) ; Sutherland (valeur à 273.15 K, S en K)
+GAZ = {
+    "Air": {"M": 28.965e-3, "Tc": 132.5, "Pc": 37.7e5, "omega": 0.035,
+            "cp": (28.11, 0.1967e-2, 0.4802e-5, -1.966e-9),
+            "viscosite": (1.716e-5, 110.4), "conductivite": (0.0241, 194.0)},
+    "Hélium": {"M": 4.0026e-3, "Tc": 5.19, "Pc": 2.27e5, "omega": 0.0,
+               "cp": (20.786, 0.0, 0.0, 0.0),
+               "viscosite": (1.87e-5, 79.4), "conductivite": (0.1417, 79.4)},
+    "Hydrogène": {"M": 2.016e-3, "Tc": 33.19, "Pc": 13.13e5, "omega": -0.216,
+                  "cp": (29.11, -0.1916e-2, 0.4003e-5, -0.8704e-9),
+                  "viscosite": (8.411e-6, 97.0), "conductivite": (0.1684, 120.0)},
+    "Azote": {"M": 28.013e-3, "Tc": 126.2, "Pc": 33.98e5, "omega": 0.037,
+              "cp": (28.90, -0.1571e-2, 0.8081e-5, -2.873e-9),
+              "viscosite": (1.663e-5, 107.0), "conductivite": (0.0242, 150.0)},
+}
+
+# Constante massique (J/kg/K)
+R_GAZ = {nom: R_MOLAIRE / c["M"] for nom, c in GAZ.items()}
+
+CHAMPS = ("densite", "cp", "cv", "viscosite", "conductivite", "Z")
+GRILLE_T = (150.0, 1500.0, 271)     # K : min, max, points (pas de 5 K)
+GRILLE_P = (1e5, 300e5, 300)        # Pa : pas de 1 bar
+VERSION_TABLES = 1
+
+_TABLES = {}
+
+
+# ----------------- Construction des tables -----------------
+
+def peng_robinson(gaz, T, P):
+    """Propriétés du gaz réel en (T, P) diffusables : dict des CHAMPS (calcul direct, sans table)"""
+    c = GAZ[gaz]
+    T, P = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(P, dtype=float))
+    R, M, Tc = R_MOLAIRE, c["M"], c["Tc"]
+    a = 0.45724 * (R * Tc) ** 2 / c["Pc"]
+    b = 0.07780 * R * Tc / c["Pc"]
+    w = c["omega"]
+    kappa = 0.37464 + 1.54226 * w - 0.26992 * w ** 2
+    racine = np.sqrt(T * Tc)
+    f = 1 + kappa * (1 - np.sqrt(T / Tc))
+    alpha = f ** 2
+    d_alpha = -kappa * f / racine
+    d2_alpha = kappa ** 2 / (2 * T * Tc) + kappa * f / (2 * T * racine)
+
+    # Z : racine du polynôme cubique par Newton depuis le gaz parfait (état supercritique)
+    A = a * alpha * P / (R * T) ** 2
+    B = b * P / (R * T)
+    c2, c1, c0 = -(1 - B), A - 3 * B ** 2 - 2 * B, -(A * B - B ** 2 - B ** 3)
+    Z = 1 + B
+    for _ in range(50):
+        dZ = (((Z + c2) * Z + c1) * Z + c0) / ((3 * Z + 2 * c2) * Z + c1)
+        Z = Z - dZ
+        if np.all(np.abs(dZ) < 1e-12):
+            break
+
+    v = Z * R * T / P  # m³/mol
+    D = v ** 2 + 2 * b * v - b ** 2
+    dP_dT = R / (v - b) - a * d_alpha / D
+    dP_dv = -R * T / (v - b) ** 2 + a * alpha * (2 * v + 2 * b) / D ** 2
+    L = np.log((v + (1 - np.sqrt(2)) * b) / (v + (1 + np.sqrt(2)) * b))
+    cv_res = -a * T * d2_alpha * L / (2 * np.sqrt(2) * b)
+
+    ca, cb, cc, cd = c["cp"]
+    cp0 = ca + cb * T + cc * T ** 2 + cd * T ** 3
+    cv = cp0 - R + cv_res
+    cp = cv - T * dP_dT ** 2 / dP_dv
+
+    def sutherland(ref, S):
+        return ref * (T / 273.15) ** 1.5 * (273.15 + S) / (T + S)
+
+    return {
+        "densite": M / v,
+        "cp": cp / M,
+        "cv": cv / M,
+        "viscosite": sutherland(*c["viscosite"]),
+        "conductivite": sutherland(*c["conductivite"]),
+        "Z": Z,
+    }
+
+
+def _axes():
+    return np.linspace(*GRILLE_T), np.linspace(*GRILLE_P)
+
+
+def construire_table(gaz):
+    """Tableau (len(CHAMPS), nT, nP) sur la grille GRILLE_T × GRILLE_P"""
+    T, P = _axes()
+    prop = peng_robinson(gaz, T[:, None], P[None, :])
+    return np.stack([prop[champ] for champ in CHAMPS])
+
+
+def _cle(gaz):
+    h = hashlib.blake2b(digest_size=12)
+    h.update(json.dumps([VERSION_TABLES, gaz, GAZ[gaz], CHAMPS, GRILLE_T, GRILLE_P],
+                        sort_keys=True, ensure_ascii=False).encode())
+    return h.hexdigest()
+
+
+def table(gaz):
+    """Table du gaz : calculée au premier appel, puis relue depuis le cache disque"""
+    if gaz not in _TABLES:
+        if gaz not in GAZ:
+            raise ValueError(f"Gaz inconnu : {gaz!r} ({', '.join(GAZ)})")
+        valeurs = None
+        dossier = dossier_cache("gaz")
+        chemin = os.path.join(dossier, f"{_cle(gaz)}.npy") if dossier else None
+        if chemin and os.path.exists(chemin):
+            try:
+                valeurs = np.load(chemin)
+            except (OSError, ValueError):
+                valeurs = None  # cache illisible : on le régénère
+        if valeurs is None or valeurs.shape != (len(CHAMPS), GRILLE_T[2], GRILLE_P[2]):
+            valeurs = construire_table(gaz)
+            if chemin:
+                ecrire_atomique(chemin, lambda f: np.save(f, valeurs))
+        _TABLES[gaz] = TableGaz(gaz, valeurs)
+    return _TABLES[gaz]
+
+
+# ----------------- Lecture -----------------
+
+class TableGaz:
+    def __init__(self, nom, valeurs):
+        self.nom = nom
+        self.R = R_GAZ[nom]
+        self.T_min, self.T_max, self.n_T = GRILLE_T
+        self.P_min, self.P_max, self.n_P = GRILLE_P
+        # Une ligne par champ, grille aplatie : un seul take() par champ
+        self.valeurs = np.ascontiguousarray(valeurs, dtype=float).reshape(len(CHAMPS), -1)
+
+    def _poids(self, T, P):
+        """Indices aplatis du coin inférieur et poids bilinéaires"""
+        x = (np.asarray(T, dtype=float) - self.T_min) * ((self.n_T - 1) / (self.T_max - self.T_min))
+        y = (np.asarray(P, dtype=float) - self.P_min) * ((self.n_P - 1) / (self.P_max - self.P_min))
+        x = np.clip(x, 0, self.n_T - 1)
+        y = np.clip(y, 0, self.n_P - 1)
+        i = np.minimum(x.astype(np.intp), self.n_T - 2)
+        j = np.minimum(y.astype(np.intp), self.n_P - 2)
+        u, v = x - i, y - j
+        k = i * self.n_P + j
+        return np.broadcast_arrays(k, u, v)
+
+    def interpoler(self, T, P, champs=CHAMPS):
+        """dict champ -> tableau aux états (T, P) diffusables entre eux"""
+        k, u, v = self._poids(T, P)
+        res = {}
+        for champ in champs:
+            z = self.valeurs[CHAMPS.index(champ)]
+            z00, z01 = z.take(k), z.take(k + 1)
+            z10, z11 = z.take(k + self.n_P), z.take(k + self.n_P + 1)
+            bas = z00 + v * (z01 - z00)
+            haut = z10 + v * (z11 - z10)
+            res[champ] = bas + u * (haut - bas)
+        return res
+
+    def __call__(self, champ, T, P):
+        return self.interpoler(T, P, (champ,))[champ]
+
+    def gamma(self, T, P):
+        prop = self.interpoler(T, P, ("cp", "cv"))
+        return prop["cp"] / prop["cv"]
+
+
+def proprietes(gaz, T, P, champs=CHAMPS):
+    """Raccourci : table(gaz).interpoler(T, P, champs)"""
+    return table(gaz).interpoler(T, P, champs)
@@ -0,0 +1,304 @@
+# calculs/incertitudes.py
+"""
+Propagation des incertitudes dans la chaîne des pièces du moteur Stirling.
+
+Une conception nominale (dimensionner_moteur() puis dimensionner_pieces())
+est « fabriquée » et « exploitée » n fois : cotes tirées dans leurs
+tolérances, Re / E des matériaux dispersés, pression, régime et
+températures de service fluctuants. Chaque tirage repasse par les formules
+vectorisées (efforts_crete() du cycle de Schmidt, contraintes de la bielle,
+du maneton, de l'arbre, jeu piston/cylindre à chaud) et donne des marges :
+défaillance quand une marge passe sous 1 (jeu sous 0).
+
+- Lois (VARIABLES) : "relative" (normale, coefficient de variation),
+  "absolue" (normale, écart-type), "lognormale" (coefficient de variation,
+  moyenne nominale : Re catalogue pris comme moyenne, prudent),
+  "tolerance" (classe ISO 286 prise au diamètre nominal, écarts inf/sup
+  en mm, ou clé de la conception : alésage -0/+tol de la page Cylindre ;
+  normale centrée dans l'intervalle, σ = IT / 6, procédé capable Cp = 1),
+  "uniforme" (mêmes écarts, loi uniforme).
+- Jeu à chaud : champs thermiques linéaires (calculs/thermique.py) ; trois
+  calculs à la conception nominale (ΔT chaud, ΔT froid, pression unitaires)
+  donnent des coefficients d'influence, superposés pour chaque tirage au
+  point de jeu minimal nominal.
+- Sensibilités : indices de Sobol du premier ordre (Saltelli 2010) et
+  totaux (Jansen) sur le plan A, B, A_B^i : n_base (d + 2) évaluations.
+- Tout s'accumule par blocs (sommes, histogrammes aux bornes fixées par un
+  tirage pilote, comptes de défaillance) : la mémoire ne dépend pas du
+  nombre de tirages et les blocs se répartissent sur des processus
+  (balayage_stirling.py incertitudes).
+"""
+
+import numpy as np
+
+from materiaux import proprietes
+from calculs.cinematique import efforts_crete
+from calculs.cotation import ecarts
+from calculs.moteur_stirling import dimensionner_moteur
+from calculs.phasage import facteurs_calage
+from calculs.pieces_stirling import (
+    MATERIAUX_BIELLE, RATIO_PORTEE, RE_ARBRE, RE_VILEBREQUIN, dimensionner_pieces,
+)
+from calculs.thermique import T_MONTAGE, cylindre_thermique, piston_thermique
+
+PI = np.pi
+
+EPAISSEUR_CYLINDRE = 4.0        # mm, défaut de PageCylindreStirling
+TOL_ALESAGE = 0.040             # mm, tolérance d'alésage par défaut de PageCylindreStirling
+MATERIAUX_PISTON = ("Aluminium 2017", "Graphite", "Titane Grade 5", "Inox 304L", "Inox 310S")
+N_CLASSES = 4096                # classes des histogrammes (quantiles)
+N_PILOTE = 4096                 # tirages pilotes pour les bornes des histogrammes
+QUANTILES = (0.001, 0.01, 0.05, 0.5, 0.95, 0.99, 0.999)
+
+# (nom, loi, paramètres) ; tolérances : classe ISO 286, écarts (inf, sup) en mm ou clé de la conception
+VARIABLES = [
+    ("pression", "relative", 0.03),
+    ("rpm", "relative", 0.02),
+    ("t_chaude", "absolue", 15.0),
+    ("t_froide", "absolue", 3.0),
+    ("d_cyl", "tolerance", "tol_alesage"),           # alésage -0/+tol (PageCylindreStirling)
+    ("d_piston", "tolerance", "g6"),
+    ("d_maneton", "tolerance", "h6"),
+    ("d_arbre", "tolerance", "h6"),
+    ("largeur_bielle", "tolerance", -0.1, 0.1),
+    ("epaisseur_bielle", "tolerance", -0.1, 0.1),
+    ("Re_bielle", "lognormale", 0.07),
+    ("E_bielle", "relative", 0.03),
+    ("Re_vilebrequin", "lognormale", 0.07),
+    ("Re_arbre", "lognormale", 0.07),
+]
+
+# Sorties : seuil de défaillance (valeur < seuil) ou None (grandeur suivie seulement)
+SORTIES = {
+    "F_bielle": None,               # N, crête compression/traction
+    "couple": None,                 # Nm, crête du couple de gaz par cylindre
+    "marge_bielle": 1.0,            # Re de la section ajourée / effort
+    "marge_flambage": 1.0,          # Euler / compression
+    "marge_maneton": 1.0,           # 0.6 Re / cisaillement équivalent
+    "marge_arbre": 1.0,             # 0.5 Re / cisaillement de torsion
+    "jeu_chaud": 0.0,               # mm, négatif : serrage
+    "defaillance": None,            # 1 si l'un des critères est franchi
+}
+
+
+# ----------------- Conception nominale -----------------
+
+def conception_nominale(puissance, n_cyl, pression, rpm, t_chaude, t_froide, tol=0.2,
+                        materiau_cylindre="Inox 304L", materiau_piston=None,
+                        epaisseur_cylindre=EPAISSEUR_CYLINDRE, tol_alesage=TOL_ALESAGE):
+    """
+    dict de scalaires : moteur et pièces dimensionnés (tol des pages), propriétés des matériaux
+    retenus, tolérance d'alésage (mm) et coefficients d'influence du jeu à chaud (mm par K
+    chaud, par K froid, par bar).
+    materiau_piston None : parmi MATERIAUX_PISTON qui tiennent la température chaude corrigée,
+    le moins dilatable (le piston chauffe plus que l'alésage côté froid). ValueError si un
+    matériau imposé ne la tient pas (t_max < t_chaude).
+    """
+    moteur = dimensionner_moteur(puissance, n_cyl, pression, rpm, t_chaude, t_froide, echangeurs=True)
+    t_service = moteur["t_chaude"].item()
+    if materiau_piston is None:
+        tenus = [m for m in MATERIAUX_PISTON if proprietes(m)["t_max"] >= t_service] or [MATERIAUX_PISTON[-1]]
+        materiau_piston = min(tenus, key=lambda m: proprietes(m)["alpha"])
+    for role, nom in (("cylindre", materiau_cylindre), ("piston", materiau_piston)):
+        t_max = proprietes(nom)["t_max"]
+        if t_max < t_service:
+            raise ValueError(f"Matériau du {role} « {nom} » : t_max {t_max:.0f} °C "
+                             f"< température chaude {t_service:.0f} °C")
+    pieces = dimensionner_pieces(moteur, tol)
+    nominal = {c: moteur[c].item() for c in moteur.dtype.names}
+    nominal.update({c: pieces[c].item() for c in pieces.dtype.names})
+    mat = MATERIAUX_BIELLE[nominal["materiau_bielle"]]
+    nominal.update({
+        "Re_bielle": float(mat["Re"]), "E_bielle": float(mat["E"]), "densite_bielle": float(mat["densite"]),
+        "Re_vilebrequin": RE_VILEBREQUIN / 1e6, "Re_arbre": RE_ARBRE / 1e6,
+        "materiau_cylindre": materiau_cylindre, "materiau_piston": materiau_piston,
+        "tol_alesage": float(tol_alesage),
+        "d_arbre": nominal["d_arbre_std"],
+        "energie_calage": float(facteurs_calage(nominal["n_cyl"])[0]),
+        "crete_calage": float(facteurs_calage(nominal["n_cyl"])[1]),
+    })
+    efforts = efforts_crete(nominal["d_cyl"], nominal["course"], nominal["L_bielle"], nominal["pression"],
+                            nominal["rpm"], nominal["t_chaude"], nominal["t_froide"],
+                            nominal["masse_piston"], nominal["masse_bielle"])
+    nominal["couple_gaz"] = float(efforts["couple"])
+
+    # Jeu à chaud : cas unitaires superposés (champs et dilatations linéaires)
+    d, h = nominal["d_cyl"], nominal["course"] + nominal["epaisseur_piston"]
+    cyl, pis = proprietes(materiau_cylindre), proprietes(materiau_piston)
+    T_h = T_MONTAGE + np.array([1.0, 0.0])
+    T_k = T_MONTAGE + np.array([0.0, 1.0])
+    paroi = cylindre_thermique(d, epaisseur_cylindre, h, T_h, T_k, cyl)
+    paroi_p = cylindre_thermique(d, epaisseur_cylindre, h, T_MONTAGE, T_MONTAGE, cyl, pression=1.0)
+    galette = piston_thermique(nominal["d_piston"], nominal["epaisseur_piston"], T_h, T_k, pis)
+    dT = np.array([nominal["t_chaude"] - T_MONTAGE, nominal["t_froide"] - T_MONTAGE])
+    u_int = dT @ paroi["u_int"] + nominal["pression"] * paroi_p["u_int"]
+    u_ext = dT @ galette["u_ext"]
+    i, j = int(np.argmin(u_int)), int(np.argmax(u_ext))
+    nominal.update({
+        "jeu_dT_chaud": float(paroi["u_int"][0, i] - galette["u_ext"][0, j]),
+        "jeu_dT_froid": float(paroi["u_int"][1, i] - galette["u_ext"][1, j]),
+        "jeu_pression": float(paroi_p["u_int"][i]),
+    })
+    return nominal
+
+
+# ----------------- Tirages et modèle -----------------
+
+def ecarts_tolerance(nominal, nom, p):
+    """
+    Écarts inf / sup (mm) d'une variable « tolerance » ou « uniforme » : (inf, sup) donnés, clé de la
+    conception (alésage -0/+valeur) ou classe ISO 286 au diamètre nominal.
+    """
+    if len(p) == 2:
+        return p
+    if p[0] in nominal:
+        return 0.0, nominal[p[0]]
+    return tuple(float(e) for e in ecarts(nominal[nom], p[0]))
+
+
+def tirer(nominal, n, rng, variables=VARIABLES):
+    """dict nom -> n tirages autour des valeurs nominales"""
+    x = {}
+    for nom, loi, *p in variables:
+        v0 = nominal[nom]
+        if loi == "relative":
+            x[nom] = v0 * (1 + p[0] * rng.standard_normal(n))
+        elif loi == "absolue":
+            x[nom] = v0 + p[0] * rng.standard_normal(n)
+        elif loi == "lognormale":
+            s = np.sqrt(np.log1p(p[0] ** 2))
+            x[nom] = v0 * np.exp(s * rng.standard_normal(n) - s ** 2 / 2)
+        elif loi == "tolerance":
+            inf, sup = ecarts_tolerance(nominal, nom, p)
+            x[nom] = v0 + (inf + sup) / 2 + (sup - inf) / 6 * rng.standard_normal(n)
+        elif loi == "uniforme":
+            inf, sup = ecarts_tolerance(nominal, nom, p)
+            x[nom] = v0 + inf + (sup - inf) * rng.random(n)
+        else:
+            raise ValueError(f"Loi inconnue : {loi!r} (relative, absolue, lognormale, tolerance, uniforme)")
+    return x
+
+
+def evaluer(nominal, x):
+    """Sorties (dict de SORTIES) des tirages x (dict nom -> tableau, valeurs nominales à défaut)"""
+    v = lambda nom: np.asarray(x.get(nom, nominal[nom]), dtype=float)
+    course, L = nominal["course"], nominal["L_bielle"]
+    efforts = efforts_crete(v("d_cyl"), course, L, v("pression"), v("rpm"), v("t_chaude"), v("t_froide"),
+                            nominal["masse_piston"], nominal["masse_bielle"])
+    F = np.maximum(efforts["F_bielle"], efforts["F_traction"])
+    l, e = v("largeur_bielle"), v("epaisseur_bielle")
+    marge_bielle = 0.5 * v("Re_bielle") * l * e / F
+    marge_flambage = PI ** 2 * v("E_bielle") * l * e ** 3 / 12 / L ** 2 / np.maximum(efforts["F_bielle"], 1e-9)
+
+    # Couples : le couple moyen suit le couple de gaz (pression, températures, alésage)
+    echelle = efforts["couple"] / nominal["couple_gaz"]
+    C_cyl = nominal["C_nom"] * echelle
+    moment = efforts["F_maneton"] * RATIO_PORTEE * v("d_cyl") / 1000 / 4
+    C_eq = np.hypot(moment, C_cyl * nominal["crete_calage"])
+    marge_maneton = 0.6 * v("Re_vilebrequin") * 1e6 * PI * (v("d_maneton") / 1000) ** 3 / (16 * C_eq)
+    C_arbre = nominal["puissance"] / (2 * PI * nominal["freq"]) * echelle
+    marge_arbre = 0.5 * v("Re_arbre") * 1e6 * PI * (v("d_arbre") / 1000) ** 3 / (16 * C_arbre)
+
+    jeu_chaud = ((v("d_cyl") - v("d_piston")) / 2 + nominal["jeu_dT_chaud"] * (v("t_chaude") - T_MONTAGE)
+                 + nominal["jeu_dT_froid"] * (v("t_froide") - T_MONTAGE) + nominal["jeu_pression"] * v("pression"))
+    sorties = {
+        "F_bielle": F, "couple": efforts["couple"], "marge_bielle": marge_bielle,
+        "marge_flambage": marge_flambage, "marge_maneton": marge_maneton, "marge_arbre": marge_arbre,
+        "jeu_chaud": jeu_chaud,
+    }
+    sorties["defaillance"] = np.any([sorties[s] < seuil for s, seuil in SORTIES.items()
+                                     if seuil is not None], axis=0).astype(float)
+    return sorties
+
+
+# ----------------- Accumulation par blocs -----------------
+
+def bornes_histogrammes(nominal, graine=0, variables=VARIABLES):
+    """Bornes (min, max) des histogrammes : étendue d'un tirage pilote élargie de part et d'autre"""
+    s = evaluer(nominal, tirer(nominal, N_PILOTE, np.random.default_rng([graine, 1]), variables))
+    bornes = {}
+    for nom, val in s.items():
+        a, b = float(np.min(val)), float(np.max(val))
+        marge = max(b - a, 1e-9 * max(abs(a), 1.0))
+        bornes[nom] = (a - marge, b + marge)
+    return bornes
+
+
+def statistiques_bloc(nominal, bornes, n_base, graine, indice, sobol=True, variables=VARIABLES):
+    """
+    Sommes d'un bloc de n_base lignes de plan (A, B et, avec sobol, les d matrices A_B^i) :
+    tirages reproductibles par (graine, indice) quel que soit le découpage en processus.
+    """
+    rng = np.random.default_rng([graine, 0, indice])
+    A, B = tirer(nominal, n_base, rng, variables), tirer(nominal, n_base, rng, variables)
+    noms = [v[0] for v in variables]
+    plans = [A, B] + ([{**A, nom: B[nom]} for nom in noms] if sobol else [])
+    x = {nom: np.concatenate([p[nom] for p in plans]) for nom in noms}
+    s = evaluer(nominal, x)
+    partiel = {"n": 2 * n_base}
+    for nom, val in s.items():
+        val = val.reshape(len(plans), n_base)
+        ech = val[:2].ravel()
+        a, b = bornes[nom]
+        classes = np.clip(((ech - a) / (b - a) * N_CLASSES).astype(np.int64), 0, N_CLASSES - 1)
+        seuil = SORTIES[nom]
+        partiel[nom] = {
+            "somme": ech.sum(), "somme2": (ech ** 2).sum(), "min": ech.min(), "max": ech.max(),
+            "histogramme": np.bincount(classes, minlength=N_CLASSES),
+            "hors_bornes": int(np.count_nonzero((ech < a) | (ech > b))),
+            "defaillances": 0 if seuil is None else int(np.count_nonzero(ech < seuil)),
+        }
+        if sobol:
+            # Sorties centrées (milieu des bornes pilotes) : estimateurs bien moins bruités
+            f_A, f_B, f_AB = val[0] - (a + b) / 2, val[1] - (a + b) / 2, val[2:] - (a + b) / 2
+            partiel[nom]["premier_ordre"] = (f_B * (f_AB - f_A)).sum(axis=-1)
+            partiel[nom]["total"] = ((f_A - f_AB) ** 2).sum(axis=-1)
+    return partiel
+
+
+def cumuler(total, partiel):
+    """Ajoute les sommes d'un bloc au total (None au départ) ; renvoie le total"""
+    if total is None:
+        return partiel
+    total["n"] += partiel["n"]
+    for nom, p in partiel.items():
+        if nom == "n":
+            continue
+        t = total[nom]
+        for cle, val in p.items():
+            t[cle] = min(t[cle], val) if cle == "min" else max(t[cle], val) if cle == "max" else t[cle] + val
+    return total
+
+
+def resultats(total, bornes, variables=VARIABLES):
+    """
+    Synthèse par sortie : moyenne, ecart_type, min, max, quantiles (dict q -> valeur, interpolés
+    dans les histogrammes), P_defaillance et son erreur type, hors_bornes ; avec Sobol,
+    premier_ordre et total (dict variable -> indice).
+    """
+    n = total["n"]
+    noms = [v[0] for v in variables]
+    synthese = {}
+    for nom, t in total.items():
+        if nom == "n":
+            continue
+        moyenne = t["somme"] / n
+        variance = max(t["somme2"] / n - moyenne ** 2, 0.0)
+        a, b = bornes[nom]
+        bords = np.linspace(a, b, N_CLASSES + 1)
+        cumul = np.concatenate([[0], np.cumsum(t["histogramme"])]) / n
+        r = {
+            "moyenne": moyenne, "ecart_type": np.sqrt(variance), "min": t["min"], "max": t["max"],
+            "quantiles": {q: float(np.interp(q, cumul, bords)) for q in QUANTILES},
+            "hors_bornes": t["hors_bornes"],
+        }
+        if SORTIES[nom] is not None or nom == "defaillance":
+            p = t["defaillances"] / n if nom != "defaillance" else moyenne
+            r["P_defaillance"], r["erreur_type"] = p, np.sqrt(p * (1 - p) / n)
+        if "premier_ordre" in t:
+            n_base = n // 2
+            with np.errstate(divide="ignore", invalid="ignore"):
+                r["premier_ordre"] = dict(zip(noms, t["premier_ordre"] / n_base / variance))
+                r["total"] = dict(zip(noms, t["total"] / (2 * n_base) / variance))
+        synthese[nom] = r
+    return synthese
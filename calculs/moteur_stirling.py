@@ -0,0 +1,261 @@
+# calculs/moteur_stirling.py
+"""
+Dimensionnement du moteur Stirling sans interface graphique.
+
+Toutes les formules de PageMoteurStirling sont écrites sur des tableaux NumPy :
+un seul appel à dimensionner_moteur() dimensionne des millions de variantes.
+Les scalaires Python sont acceptés partout (tableaux de dimension 0).
+
+Le rendement (travail par cycle rapporté à p V_b) vaut RENDEMENT par défaut.
+Avec echangeurs=True, il résulte du bilan des échangeurs (calculs/echangeurs.py)
+à la géométrie obtenue, par point fixe à partir de RENDEMENT sur les seules
+variantes non convergées : bien plus coûteux, réservé aux pages et aux
+analyses d'une conception (rendement thermique, refroidissement).
+"""
+
+import numpy as np
+
+from calculs.cinematique import RATIO_BIELLE, crete_gaz
+from calculs.echangeurs import bilan
+from calculs.gaz import table
+
+PI = np.pi
+
+RENDEMENT = 0.22            # rendement global estimé (point de départ du bilan des échangeurs)
+RENDEMENT_MIN = 0.02        # plancher du point fixe (conceptions dominées par les pertes)
+N_ITERATIONS_RENDEMENT = 6  # point fixe volume balayé -> géométrie -> bilan des échangeurs (maxi)
+TOLERANCE_RENDEMENT = 1e-3  # écart de rendement entre deux passes jugé convergé
+V_PISTON_MAX = 1.8          # m/s, limite d'usure piston
+RATIO_COURSE = 0.85         # course / alésage
+REDUCTION_COURSE = 0.96     # réduction de course par pas de correction
+N_REDUCTIONS_MAX = 15       # nombre maximal de pas de correction
+TAU_ADM_VILEBREQUIN = 160e6  # Pa
+TAILLE_BLOC = 8192          # lignes traitées par bloc dans dimensionner_moteur
+
+# Tables des recommandations : seuils de puissance (W) -> valeur recommandée
+SEUILS_N_CYL = np.array([200, 1000, 4000, 12000, 25000, 70000, 150000])
+VALEURS_N_CYL = np.array([1, 2, 4, 6, 8, 12, 16, 24])
+SEUILS_PRESSION = np.array([300, 1000, 5000, 20000, 70000])
+VALEURS_PRESSION = np.array([10, 15, 20, 28, 38, 55])
+SEUILS_RPM = np.array([1000, 5000, 20000, 50000, 120000])
+VALEURS_RPM = np.array([1600, 1500, 1400, 1200, 950, 700])
+
+# Structure des résultats (une ligne par variante)
+DTYPE_MOTEUR = np.dtype([
+    ("puissance", "f8"),       # W (entrées corrigées)
+    ("n_cyl", "i4"),
+    ("pression", "f8"),        # bar
+    ("rpm", "f8"),             # tr/min
+    ("t_chaude", "f8"),        # °C
+    ("t_froide", "f8"),        # °C
+    ("freq", "f8"),            # Hz
+    ("rendement", "f8"),       # travail arbre / (p V_b) par cycle
+    ("rendement_thermique", "f8"),  # travail arbre / chaleur fournie (bilan des échangeurs, NaN sans)
+    ("P_cyl", "f8"),           # W
+    ("V_balaye", "f8"),        # m³
+    ("d_cyl", "f8"),           # mm
+    ("course", "f8"),          # mm
+    ("v_piston", "f8"),        # m/s
+    ("n_reductions", "i4"),    # pas de réduction de course appliqués
+    ("vitesse_ok", "?"),       # v_piston <= V_PISTON_MAX après correction
+    ("S_piston", "f8"),        # m²
+    ("F_piston_max", "f8"),    # N, crête des efforts de gaz (carter à la pression moyenne)
+    ("effort_maneton", "f8"),  # N, crête de la charge du maneton (gaz, cinématique exacte)
+    ("C_nom", "f8"),           # Nm par cylindre
+    ("d_vilebrequin", "f8"),   # mm
+    ("masse_air", "f8"),       # g par cycle et par cylindre
+])
+
+
+def _scalaire(val):
+    """Rend un scalaire Python si le résultat est de dimension 0"""
+    val = np.asarray(val)
+    return val.item() if val.ndim == 0 else val
+
+
+def borned(val, vmin, vmax):
+    """Contrainte une valeur entre vmin et vmax (vmin l'emporte si vmin > vmax)"""
+    return np.maximum(vmin, np.minimum(val, vmax))
+
+
+def recommandation_n_cyl(puissance):
+    """Renvoie un nombre réaliste de cylindres selon la puissance"""
+    idx = np.searchsorted(SEUILS_N_CYL, puissance, side="right")
+    return _scalaire(VALEURS_N_CYL[idx])
+
+
+def pression_recommandee(puissance, n_cyl=None):
+    """Valeur indicative de pression maximale selon la puissance (plus la puissance est grande, plus la pression doit augmenter)"""
+    idx = np.searchsorted(SEUILS_PRESSION, puissance, side="right")
+    return _scalaire(VALEURS_PRESSION[idx])
+
+
+def rpm_recommandee(puissance):
+    """Valeur indicative de régime maximal selon puissance"""
+    idx = np.searchsorted(SEUILS_RPM, puissance, side="right")
+    return _scalaire(VALEURS_RPM[idx])
+
+
+def temperature_chaude_reco():
+    """Valeur industrielle standard en °C pour moteur robuste avec air ou hélium (hors haute techno)"""
+    return 650
+
+
+def temperature_froide_reco():
+    return 40
+
+
+def corriger_entrees(P_tot, n_cyl, P_bar, rpm, T_chaud, T_froide):
+    """Version vectorisée de sanitize_inputs : renvoie six tableaux corrigés"""
+    P_tot, n_cyl, P_bar, rpm, T_chaud, T_froide = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (P_tot, n_cyl, P_bar, rpm, T_chaud, T_froide)))
+
+    rec_n_cyl = np.asarray(recommandation_n_cyl(P_tot))
+    n_cyl = np.trunc(borned(n_cyl, 1, 32))
+    n_cyl = np.where(n_cyl > 2 * rec_n_cyl, rec_n_cyl, n_cyl).astype(np.int32)
+
+    # Corrige la pression service en bar
+    rec_P_bar = np.asarray(pression_recommandee(P_tot, n_cyl))
+    P_bar = borned(P_bar, 6, rec_P_bar * 1.2)
+    P_bar = np.where(np.abs(P_bar - rec_P_bar) > rec_P_bar * 0.5, rec_P_bar, P_bar)
+
+    # Corrige régime cible
+    rec_rpm = np.asarray(rpm_recommandee(P_tot))
+    rpm = borned(rpm, 400, rec_rpm * 1.25)
+    rpm = np.where(rpm > rec_rpm * 1.15, rec_rpm, rpm)
+
+    # Températures réalistes
+    T_chaud = borned(T_chaud, 450, 800)
+    T_froide = borned(T_froide, -20, 90)
+    T_chaud = np.where(T_chaud < T_froide + 100, T_froide + 120, T_chaud)
+
+    return (P_tot.astype(float), n_cyl, P_bar.astype(float), rpm.astype(float),
+            T_chaud.astype(float), T_froide.astype(float))
+
+
+def sanitize_inputs(P_tot, n_cyl, P_bar, rpm, T_chaud, T_froide):
+    """Corrige dynamiquement les entrées irréalistes"""
+    P_tot, n_cyl, P_bar, rpm, T_chaud, T_froide = corriger_entrees(P_tot, n_cyl, P_bar, rpm, T_chaud, T_froide)
+    return float(P_tot), int(n_cyl), float(P_bar), float(rpm), float(T_chaud), float(T_froide)
+
+
+def geometrie_cylindre(V_balaye, freq):
+    """
+    Alésage (mm), course (mm), vitesse piston (m/s) et nombre de réductions de course.
+
+    Forme fermée de la correction itérative « course *= 0.96 » : le nombre de pas k
+    est le plus petit entier tel que la vitesse moyenne du piston repasse sous
+    V_PISTON_MAX, plafonné à N_REDUCTIONS_MAX. L'alésage est recalculé pour
+    conserver le volume balayé.
+    """
+    d0 = np.cbrt(4 * V_balaye / (PI * RATIO_COURSE)) * 1000
+    course0 = RATIO_COURSE * d0
+    v0 = 2 * course0 * freq / 1000
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.ceil(np.log(V_PISTON_MAX / v0) / np.log(REDUCTION_COURSE) - 1e-12)
+    k = np.clip(np.nan_to_num(k, nan=0.0, posinf=N_REDUCTIONS_MAX, neginf=0.0), 0, N_REDUCTIONS_MAX).astype(np.int32)
+    course = course0 * REDUCTION_COURSE ** k
+    d_cyl = np.sqrt(4 * V_balaye * 1e9 / (PI * course))
+    v_piston = 2 * course * freq / 1000
+    return d_cyl, course, v_piston, k
+
+
+def dimensionner_moteur(puissance, n_cyl, pression, rpm, t_chaude, t_froide, corriger=True, rendement=None,
+                       echangeurs=False):
+    """
+    Dimensionne toutes les variantes en une passe vectorisée.
+
+    Les entrées sont des tableaux (ou scalaires) diffusables entre eux.
+    rendement None (ou NaN par variante) : RENDEMENT, ou avec echangeurs=True le point fixe
+    du bilan des échangeurs ; sinon la valeur imposée fixe le volume balayé.
+    echangeurs=True remplit aussi rendement_thermique (NaN sinon, 0 si le moteur ne produit rien).
+    Renvoie un tableau structuré de dtype DTYPE_MOTEUR, de la forme de la diffusion.
+    """
+    entrees = np.broadcast_arrays(*(np.asarray(v, dtype=float)
+                                    for v in (puissance, n_cyl, pression, rpm, t_chaude, t_froide,
+                                              np.nan if rendement is None else rendement)))
+    forme = entrees[0].shape
+    entrees = [np.ravel(e) for e in entrees]
+    res = np.empty(entrees[0].size, dtype=DTYPE_MOTEUR)
+    # Traitement par blocs : le tableau structuré reste en cache pendant le remplissage
+    for i in range(0, res.size, TAILLE_BLOC):
+        bloc = slice(i, i + TAILLE_BLOC)
+        _dimensionner_bloc(res[bloc], *(e[bloc] for e in entrees), corriger=corriger, echangeurs=echangeurs)
+    return res.reshape(forme)
+
+
+def _rendement_echangeurs(r, impose, P_cyl, P, f, T_h, T_k):
+    """
+    Point fixe V_b -> alésage -> bilan des échangeurs -> rendement, itéré sur les seules variantes
+    dont le rendement bouge encore de plus de TOLERANCE_RENDEMENT ; les imposées ne passent
+    qu'une fois (rendement thermique). Le rendement retenu est celui de la géométrie du
+    dernier bilan. Renvoie (rendement, rendement thermique).
+    """
+    r = r.copy()
+    rendement_th = np.full(r.shape, np.nan)
+    actif = np.arange(r.size)
+    for n in range(N_ITERATIONS_RENDEMENT):
+        V_balaye = P_cyl[actif] / (P[actif] * f[actif] * r[actif])
+        d_cyl = geometrie_cylindre(V_balaye, f[actif])[0]
+        echanges = bilan(V_balaye, f[actif], P[actif], T_h[actif], T_k[actif], d_cyl)
+        rendement_th[actif] = np.maximum(echanges["rendement_thermique"], 0.0)
+        nouveau = np.where(impose[actif], r[actif], np.maximum(echanges["travail_specifique"], RENDEMENT_MIN))
+        bouge = np.abs(nouveau - r[actif]) > TOLERANCE_RENDEMENT
+        if n == N_ITERATIONS_RENDEMENT - 1 or not bouge.any():
+            break
+        actif = actif[bouge]
+        r[actif] = nouveau[bouge]
+    return r, rendement_th
+
+
+def _dimensionner_bloc(res, P_tot, n_cyl, P_bar, rpm, T_chaud, T_froide, rendement, corriger=True, echangeurs=False):
+    """Remplit res (vue sur un bloc de DTYPE_MOTEUR) à partir d'entrées 1D"""
+    if corriger:
+        P_tot, n_cyl, P_bar, rpm, T_chaud, T_froide = corriger_entrees(P_tot, n_cyl, P_bar, rpm, T_chaud, T_froide)
+    else:
+        n_cyl = n_cyl.astype(np.int32)
+
+    # ---- CALCULS ----
+    f = rpm / 60
+    P = P_bar * 1e5
+    P_cyl = P_tot / n_cyl
+
+    # Volume balayé/cylindre (respecte les contraintes d'usure piston) ; sur demande, le rendement
+    # non imposé suit la géométrie : pertes des échangeurs dimensionnés sur l'alésage
+    impose = ~np.isnan(rendement)
+    rendement = np.where(impose, rendement, RENDEMENT)
+    rendement_th = np.full(rendement.shape, np.nan)
+    if echangeurs:
+        rendement, rendement_th = _rendement_echangeurs(rendement, impose, P_cyl, P, f,
+                                                        T_chaud + 273.15, T_froide + 273.15)
+    V_balaye = P_cyl / (P * f * rendement)
+    d_cyl, course, v_piston, k = geometrie_cylindre(V_balaye, f)
+
+    S_piston = PI / 4 * (d_cyl / 1000) ** 2
+    # Crêtes des efforts de gaz (cycle de Schmidt, masses inconnues ici) en forme fermée :
+    # la grille d'angles de efforts_crete() reste aux pièces (dimensionner_pieces, pages)
+    crete = crete_gaz(d_cyl, course, RATIO_BIELLE * course, P_bar, T_chaud, T_froide)
+    C_nom = P_cyl / (2 * PI * f)
+
+    res["puissance"] = P_tot
+    res["n_cyl"] = n_cyl
+    res["pression"] = P_bar
+    res["rpm"] = rpm
+    res["t_chaude"] = T_chaud
+    res["t_froide"] = T_froide
+    res["freq"] = f
+    res["rendement"] = rendement
+    res["rendement_thermique"] = rendement_th
+    res["P_cyl"] = P_cyl
+    res["V_balaye"] = V_balaye
+    res["d_cyl"] = d_cyl
+    res["course"] = course
+    res["v_piston"] = v_piston
+    res["n_reductions"] = k
+    res["vitesse_ok"] = v_piston <= V_PISTON_MAX * (1 + 1e-9)
+    res["S_piston"] = S_piston
+    res["F_piston_max"] = crete["F_gaz"]
+    res["effort_maneton"] = crete["F_maneton"]
+    res["C_nom"] = C_nom
+    res["d_vilebrequin"] = np.cbrt((16 * C_nom) / (PI * TAU_ADM_VILEBREQUIN)) * 1000
+    res["masse_air"] = table("Air")("densite", T_chaud + 273.15, P) * V_balaye * 1000
@@ -0,0 +1,215 @@
+# calculs/phasage.py
+"""
+Calage des manetons d'un moteur Stirling multicylindre et ondulation de couple.
+
+Le couple instantané d'un cylindre vient du cycle de Schmidt :
+C(θ) = (p(θ) - p_moy) dV/dθ (carter à la pression moyenne), dont la moyenne
+est le travail du cycle / 2π. Pour un calage φ_1…φ_n, le couple total est
+Σ C(θ - φ_i) ; ses harmoniques sont celles d'un cylindre multipliées par
+S_k = Σ exp(-i k φ_i), ce qui permet d'évaluer des millions de calages sans
+reconstruire les courbes :
+
+- ondulation efficace (Parseval) : √(2 Σ |C_k S_k|²) / couple moyen ;
+- ondulation crête à crête, couple crête et énergie de fluctuation
+  ΔE = max - min de ∫(C - C_moy) dθ sur les meilleurs calages seulement.
+
+Recherche des calages (phases multiples de 360° / n_positions, par défaut
+au moins 24 positions dont le calage régulier 360° / n_cyl) :
+le couple ne dépend que de l'ensemble des phases (ordre des cylindres
+indifférent) et d'une rotation d'ensemble près, donc le cylindre 1 est fixé
+à 0° et seules les suites d'écarts minimales parmi leurs rotations sont
+gardées. Au-delà de MAX_CANDIDATS, recherche locale vectorisée (déplacement
+d'un cylindre à la fois, tous les déplacements évalués ensemble) depuis une
+population de calages aléatoires et le calage régulier.
+"""
+
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from math import comb
+
+import numpy as np
+
+from calculs.schmidt import PHASE, PI, RATIO_MORT, coefficients_volumes, schmidt, volumes_morts
+
+N_ANGLES = 720           # points par tour des courbes de couple
+N_HARMONIQUES = 24       # harmoniques retenues pour le classement
+MAX_CANDIDATS = 500_000
+N_GARDES = 256           # calages évalués en temporel après classement
+POPULATION = 64          # recherche locale : calages de départ
+POSITIONS = 24           # positions de calage par tour, au moins (multiple de n_cyl)
+
+
+def couple_cylindre(configuration="alpha", phase=PHASE, ratio_mort=RATIO_MORT,
+                    T_h=923.15, T_c=313.15, p_moy=20e5, V_balaye=1e-4, n_angles=N_ANGLES):
+    """Couple instantané (Nm) d'un cylindre sur un tour, θ = 0 au point mort du volume de détente"""
+    V_dh, V_r, V_dc = volumes_morts(V_balaye, ratio_mort)
+    cycle = schmidt(configuration, V_balaye, V_balaye, V_dh, V_dc, V_r, T_h, T_c, p_moy, phase, n_angles=n_angles)
+    (_, ec, es), (_, cc, cs) = coefficients_volumes(configuration, V_balaye, V_balaye, V_dh, V_dc, phase)
+    theta = cycle["angle"]
+    dV = (es + cs) * np.cos(theta) - (ec + cc) * np.sin(theta)
+    return (cycle["p"] - p_moy) * dV
+
+
+def forme_couple(configuration="alpha", phase=PHASE, ratio_mort=RATIO_MORT, n_angles=N_ANGLES):
+    """Couple d'un cylindre rapporté à son couple moyen (moyenne 1)"""
+    C = couple_cylindre(configuration, phase, ratio_mort, n_angles=n_angles)
+    return C / C.mean()
+
+
+def _somme_phases(phases, k):
+    """S_k = Σ_i exp(-i k φ_i) pour des phases (..., n_cyl) en radians"""
+    return np.exp(-1j * phases[..., None] * k).sum(axis=-2)
+
+
+def _ondulation_efficace(harm, S):
+    """Ondulation efficace / couple moyen à partir des harmoniques d'un cylindre (moyenne réelle harm[0])"""
+    n_cyl_moyen = harm[0].real * S[..., 0].real
+    return np.sqrt(2 * (np.abs(harm[1:] * S[..., 1:]) ** 2).sum(axis=-1)) / n_cyl_moyen
+
+
+def _canoniques(positions, n_positions):
+    """Garde un représentant par classe de rotation : suite d'écarts minimale parmi ses rotations"""
+    ecarts = np.diff(positions, axis=1, append=positions[:, :1] + n_positions)
+    garde = np.ones(len(positions), dtype=bool)
+    for s in range(1, positions.shape[1]):
+        autre = np.roll(ecarts, -s, axis=1)
+        diff = autre - ecarts
+        premier = np.argmax(diff != 0, axis=1)
+        signe = diff[np.arange(len(diff)), premier]
+        garde &= signe >= 0  # rotation strictement plus petite : doublon
+    return positions[garde]
+
+
+def _enumerer(n_cyl, n_positions):
+    if n_cyl == 1:
+        return np.zeros((1, 1), dtype=np.int32)
+    combinaisons = combinations_with_replacement(range(n_positions), n_cyl - 1)
+    reste = np.fromiter((p for c in combinaisons for p in c), dtype=np.int32,
+                        count=comb(n_positions + n_cyl - 2, n_cyl - 1) * (n_cyl - 1))
+    positions = np.column_stack([np.zeros(len(reste) // max(n_cyl - 1, 1), dtype=np.int32),
+                                 reste.reshape(-1, n_cyl - 1)])
+    return _canoniques(positions, n_positions)
+
+
+def _recherche_locale(harm, k, n_cyl, n_positions, population, graine):
+    """Descente par déplacements d'un cylindre ; renvoie toutes les positions finales (population, n_cyl)"""
+    rng = np.random.default_rng(graine)
+    positions = rng.integers(0, n_positions, size=(population, n_cyl))
+    positions[0] = np.round(np.arange(n_cyl) * n_positions / n_cyl).astype(int) % n_positions
+    pas = 2 * PI / n_positions
+    rotor = np.exp(-1j * pas * np.arange(n_positions)[:, None] * k)  # (n_positions, K)
+    lignes = np.arange(population)
+    while True:
+        S = rotor[positions].sum(axis=1)                                   # (P, K)
+        actuel = _ondulation_efficace(harm, S)
+        # Tous les déplacements (cylindre i -> position j) en un seul calcul
+        S_mouv = S[:, None, None, :] - rotor[positions][:, :, None, :] + rotor[None, None, :, :]
+        score = _ondulation_efficace(harm, S_mouv).reshape(population, -1)
+        meilleur = score.argmin(axis=1)
+        progres = score[lignes, meilleur] < actuel - 1e-9
+        if not progres.any():
+            return positions
+        i, j = np.divmod(meilleur[progres], n_positions)
+        positions[lignes[progres], i] = j
+
+
+CRITERES = ("ondulation", "ondulation_eff", "energie", "couple_crete")
+
+
+def optimiser_calage(forme, n_cyl, n_positions=None, critere="ondulation", max_candidats=MAX_CANDIDATS,
+                     n_gardes=N_GARDES, population=POPULATION, graine=0):
+    """
+    Meilleurs calages de n_cyl cylindres de couple forme(θ) (un tour, pas régulier).
+
+    Les calages sont classés sur l'ondulation efficace, puis les n_gardes premiers sont
+    reclassés selon critere (un des CRITERES), calculé sur les courbes complètes.
+
+    Renvoie un dict : phases (n_gardes, n_cyl) en degrés triées par critere croissant,
+    ondulation_eff, ondulation (crête à crête / moyen), couple_crete, energie (J, ΔE pour
+    le couple de forme), harmoniques (|C_k S_k| / moyen, k = 1…N_HARMONIQUES),
+    couple (courbes totales), n_evalues (calages classés), exhaustif.
+    """
+    forme = np.asarray(forme, dtype=float)
+    N = forme.size
+    n_positions = n_positions or n_cyl * -(-POSITIONS // n_cyl)
+    spectre = np.fft.rfft(forme) / N
+    K = min(N_HARMONIQUES, spectre.size - 1)
+    k = np.arange(K + 1)
+    harm = spectre[:K + 1]
+
+    exhaustif = comb(n_positions + n_cyl - 2, n_cyl - 1) <= max_candidats
+    if exhaustif:
+        positions = _enumerer(n_cyl, n_positions)
+    else:
+        positions = _recherche_locale(harm, k, n_cyl, n_positions, population, graine)
+        positions = np.unique(np.sort((positions - positions[:, :1]) % n_positions, axis=1), axis=0)
+    phases = positions * (2 * PI / n_positions)
+    n_evalues = len(phases)
+
+    # Classement sur les harmoniques, par paquets pour borner la mémoire
+    ondulation_eff = np.empty(len(phases))
+    for d in range(0, len(phases), 65536):
+        ondulation_eff[d:d + 65536] = _ondulation_efficace(harm, _somme_phases(phases[d:d + 65536], k))
+    ordre = np.argsort(ondulation_eff, kind="stable")[:n_gardes]
+    phases, ondulation_eff = phases[ordre], ondulation_eff[ordre]
+
+    # Courbes complètes des calages retenus
+    S = _somme_phases(phases, np.arange(spectre.size))
+    couple = np.fft.irfft(spectre * S * N, n=N)
+    moyen = couple.mean(axis=1)
+    cumul = np.cumsum(couple - moyen[:, None], axis=1) * (2 * PI / N)
+    res = {
+        "phases": np.degrees(phases),
+        "ondulation_eff": ondulation_eff,
+        "ondulation": (couple.max(axis=1) - couple.min(axis=1)) / moyen,
+        "couple_crete": couple.max(axis=1),
+        "energie": cumul.max(axis=1) - cumul.min(axis=1),
+        "harmoniques": np.abs(harm[1:] * S[:, 1:K + 1]) / (harm[0].real * n_cyl),
+        "couple": couple,
+    }
+    ordre = np.argsort(res[critere], kind="stable")
+    res = {cle: v[ordre] for cle, v in res.items()}
+    res.update(n_evalues=n_evalues, exhaustif=exhaustif)
+    return res
+
+
+@lru_cache(maxsize=64)
+def calage_optimal(n_cyl, configuration="alpha", phase=PHASE, ratio_mort=RATIO_MORT, n_positions=None,
+                   critere="ondulation"):
+    """
+    Meilleur calage pour un couple moyen de 1 Nm par cylindre (résultats à multiplier
+    par le couple moyen par cylindre) : phases (°), ondulation, couple_crete (Nm / Nm),
+    energie (J / Nm), harmoniques.
+    """
+    res = optimiser_calage(forme_couple(configuration, phase, ratio_mort), int(n_cyl), n_positions, critere)
+    return {
+        "phases": res["phases"][0],
+        "ondulation": float(res["ondulation"][0]),
+        "ondulation_eff": float(res["ondulation_eff"][0]),
+        "couple_crete": float(res["couple_crete"][0]),
+        "energie": float(res["energie"][0]),
+        "harmoniques": res["harmoniques"][0],
+        "exhaustif": res["exhaustif"],
+    }
+
+
+def facteurs_calage(n_cyl, **options):
+    """
+    Pour un tableau de nombres de cylindres (calage optimal de chacun) :
+    (énergie de fluctuation en J, couple crête total en Nm) par Nm de couple moyen par cylindre.
+    """
+    n_cyl = np.asarray(n_cyl)
+    uniques, inverse = np.unique(n_cyl, return_inverse=True)
+    calages = [calage_optimal(int(n), **options) for n in uniques]
+    energie = np.array([c["energie"] for c in calages])[inverse].reshape(n_cyl.shape)
+    crete = np.array([c["couple_crete"] for c in calages])[inverse].reshape(n_cyl.shape)
+    return energie, crete
+
+
+def couple_moteur(n_cyl, couple_moyen, configuration="alpha", phase=PHASE, ratio_mort=RATIO_MORT,
+                  n_angles=N_ANGLES):
+    """Couple instantané total (Nm) sur un tour, cylindres au calage optimal, de moyenne couple_moyen"""
+    forme = forme_couple(configuration, phase, ratio_mort, n_angles)
+    phases = np.radians(calage_optimal(int(n_cyl), configuration, phase, ratio_mort)["phases"])
+    spectre = np.fft.rfft(forme) * _somme_phases(phases, np.arange(n_angles // 2 + 1))
+    return np.fft.irfft(spectre, n=n_angles) * (couple_moyen / n_cyl)
@@ -0,0 +1,210 @@
+# calculs/pieces_stirling.py
+"""
+Formules des pièces du moteur Stirling (piston, bielle, vilebrequin, volant, arbre),
+vectorisées sur des tableaux NumPy et sans interface graphique.
+
+Chaque fonction reprend le calcul de la page correspondante ; les pages et le
+balayage en ligne de commande partagent ainsi les mêmes formules.
+"""
+
+import numpy as np
+
+from materiaux import proprietes
+from calculs.cinematique import RATIO_BIELLE, efforts_crete
+from calculs.phasage import facteurs_calage
+
+PI = np.pi
+
+DENSITE_PISTON = 2.8          # g/cm³, alu 2017A par défaut
+RE_BIELLE_MINI = 400e6        # Pa, acier mini retenu pour la section de bielle
+RE_VILEBREQUIN = 355e6        # Pa, acier S355 par défaut
+RE_ARBRE = 900e6              # Pa, acier 42CrMo4 par défaut
+DIAMETRES_ARBRE_STD = np.array([15, 18, 20, 22, 25, 30, 35, 40])  # mm
+RATIO_PORTEE = 0.5            # portée du maneton entre bras / alésage (balayage)
+
+# Matériaux candidats pour la bielle du balayage (extraits de la base unique)
+MATERIAUX_BIELLE = [proprietes(nom) for nom in ("Acier 42CrMo4", "Acier S355", "Alu 7075-T6", "Titane Grade 5")]
+_RE_BIELLE = np.array([m["Re"] for m in MATERIAUX_BIELLE], dtype=float)
+_DENSITE_BIELLE = np.array([m["densite"] for m in MATERIAUX_BIELLE])
+
+DTYPE_PIECES = np.dtype([
+    # Piston galette
+    ("jeu_lateral", "f8"),          # mm
+    ("d_piston", "f8"),             # mm
+    ("epaisseur_piston", "f8"),     # mm
+    ("epaisseur_fond", "f8"),       # mm
+    ("masse_piston", "f8"),         # g
+    # Bielle
+    ("rayon_manivelle", "f8"),      # mm
+    ("L_bielle", "f8"),             # mm
+    ("section_bielle", "f8"),       # mm²
+    ("largeur_bielle", "f8"),       # mm
+    ("epaisseur_bielle", "f8"),     # mm
+    ("materiau_bielle", "i4"),      # index dans MATERIAUX_BIELLE
+    ("masse_bielle", "f8"),         # g
+    # Vilebrequin
+    ("d_maneton", "f8"),            # mm
+    ("d_palier", "f8"),             # mm
+    ("effort_radial", "f8"),        # N
+    # Volant
+    ("J_volant", "f8"),             # kg·m²
+    ("masse_volant", "f8"),         # kg
+    # Arbre de sortie
+    ("d_arbre", "f8"),              # mm
+    ("d_arbre_std", "f8"),          # mm
+])
+
+
+def piston(d_cyl, densite=DENSITE_PISTON):
+    """Cotes et masse du piston galette (cf. PagePistonStirling)"""
+    d_cyl = np.asarray(d_cyl, dtype=float)
+    jeu_lateral = np.maximum(np.round(0.0004 * d_cyl + 0.02, 4), 0.03)
+    d_piston = np.round(d_cyl - 2 * jeu_lateral, 3)
+    epaisseur_piston = np.round(np.maximum(0.165 * d_cyl, 7), 3)
+    epaisseur_fond = np.round(0.12 * d_cyl, 3)
+    surface = PI * (d_piston / 2) ** 2
+    volume = surface * epaisseur_piston
+    return {
+        "jeu_lateral": jeu_lateral,
+        "d_piston": d_piston,
+        "epaisseur_piston": epaisseur_piston,
+        "epaisseur_fond": epaisseur_fond,
+        "surface_piston": surface,
+        "volume_piston": volume,
+        "masse_piston": volume * densite / 1000,
+    }
+
+
+def meilleur_materiau_bielle(F_max, section_min):
+    """Index du matériau de bielle le plus léger qui tient l'effort (section en mm²)"""
+    F_max = np.asarray(F_max, dtype=float)
+    adm = _RE_BIELLE * 1e6 * 0.5  # coeff sécurité, section ajourée
+    tient = F_max[..., None] <= adm * np.asarray(section_min, dtype=float)[..., None] * 1e-6
+    masse = np.where(tient, _DENSITE_BIELLE, np.inf)
+    idx = np.argmin(masse, axis=-1)
+    return np.where(np.any(tient, axis=-1), idx, 0)
+
+
+def bielle(d_cyl, F_max, L, tol=0.2):
+    """Section, cotes, matériau et masse de la bielle (cf. PageBielleStirling)"""
+    d_cyl = np.asarray(d_cyl, dtype=float)
+    # Section rectangulaire ajourée (coeff 0.5), acier mini 400 MPa, 1.6 de marge d'usinage
+    section_min = np.asarray(F_max, dtype=float) / (0.5 * RE_BIELLE_MINI * (1 - tol)) * 1.6 * 1e6  # mm²
+    largeur = np.maximum(0.22 * d_cyl, 8)
+    epaisseur = np.maximum(section_min / largeur, 4)
+    mat = meilleur_materiau_bielle(F_max, section_min)
+    densite = _DENSITE_BIELLE[mat]
+    masse = largeur * epaisseur * np.asarray(L, dtype=float) * densite * 1e-3  # g
+    return {
+        "section_bielle": section_min,
+        "largeur_bielle": largeur,
+        "epaisseur_bielle": epaisseur,
+        "materiau_bielle": mat,
+        "masse_bielle": masse,
+    }
+
+
+def vilebrequin(couple_cyl, n_cyl, rayon_manivelle, tol=0.2, Re=RE_VILEBREQUIN, couple_crete=None,
+                effort_maneton=None, portee=0.0):
+    """
+    Diamètres maneton/paliers et effort radial (cf. PageVilebrequinStirling).
+    couple_crete : couple instantané maxi des cylindres calés (calculs/phasage.py) ;
+    à défaut, le couple moyen total.
+    effort_maneton : crête de la charge du maneton (calculs/cinematique.py), qui le fléchit
+    sur sa portée entre bras (mm, appuis simples) ; le maneton est alors dimensionné au
+    couple équivalent √(M² + C²) et l'effort radial est cette charge.
+    """
+    couple_tot = np.asarray(couple_cyl, dtype=float) * n_cyl
+    couple_crete = couple_tot if couple_crete is None else np.asarray(couple_crete, dtype=float)
+    tau_adm = 0.6 * (1 - tol) * Re
+    r = np.asarray(rayon_manivelle, dtype=float) / 1000
+    if effort_maneton is None:
+        couple_eq = couple_crete
+        with np.errstate(divide="ignore", invalid="ignore"):
+            effort_radial = np.where(r > 0, couple_tot / r, 0.0)
+    else:
+        effort_radial = np.asarray(effort_maneton, dtype=float)
+        moment = effort_radial * np.asarray(portee, dtype=float) / 1000 / 4
+        couple_eq = np.hypot(moment, couple_crete)
+    d_m = np.maximum(np.cbrt((16 * couple_eq) / (PI * tau_adm)) * 1000, 12)
+    return {
+        "couple_tot": couple_tot,
+        "couple_crete": couple_crete,
+        "d_maneton": d_m,
+        "d_palier": d_m * 1.15,
+        "effort_radial": effort_radial,
+    }
+
+
+def volant(couple, rpm, delta=0.04, D_max=200, tol=0.2, E_fluctuation=None):
+    """
+    Inertie et masse du volant plein (cf. PageVolantStirling).
+
+    J = ΔE / (ω² δ) : l'énergie de fluctuation ΔE est encaissée par le volant
+    avec une variation relative de vitesse δ. ΔE vient du couple instantané des
+    cylindres calés (calculs/phasage.py) ; à défaut, énergie d'un cycle C·2π.
+    """
+    omega = 2 * PI * np.asarray(rpm, dtype=float) / 60
+    if E_fluctuation is None:
+        E_fluctuation = np.asarray(couple, dtype=float) * 2 * PI
+    J_min = np.asarray(E_fluctuation, dtype=float) / (omega ** 2 * delta) * (1 + tol)
+    R = np.asarray(D_max, dtype=float) / 2 / 1000
+    return {
+        "J_volant": J_min,
+        "masse_volant": J_min / (0.5 * R ** 2),
+    }
+
+
+def arbre(couple, tol=0.2, Re=RE_ARBRE):
+    """Diamètre mini sous torsion et diamètre commercial (cf. PageArbreStirling)"""
+    tau_adm = 0.5 * (1 - tol) * Re
+    d_arbre = np.cbrt((16 * np.asarray(couple, dtype=float)) / (PI * tau_adm)) * 1000
+    idx = np.searchsorted(DIAMETRES_ARBRE_STD, d_arbre, side="left")
+    std = np.append(DIAMETRES_ARBRE_STD, 0)[idx]
+    return {
+        "d_arbre": d_arbre,
+        "d_arbre_std": np.where(idx < len(DIAMETRES_ARBRE_STD), std, np.round(d_arbre + 2)),
+    }
+
+
+def dimensionner_pieces(moteur, tol=0.2, delta_volant=0.04, D_volant=200):
+    """
+    Enchaîne les formules des pièces sur un tableau DTYPE_MOTEUR.
+
+    Renvoie un tableau structuré DTYPE_PIECES de même forme.
+    """
+    res = np.empty(moteur.shape, dtype=DTYPE_PIECES)
+    d_cyl = moteur["d_cyl"]
+    course = moteur["course"]
+    omega = 2 * PI * moteur["freq"]
+
+    for cle, val in piston(d_cyl).items():
+        if cle in DTYPE_PIECES.names:
+            res[cle] = val
+
+    rayon = course / 2
+    L = RATIO_BIELLE * course
+    res["rayon_manivelle"] = rayon
+    res["L_bielle"] = L
+    # Efforts sur un tour (gaz + inertie du piston) ; la bielle, dimensionnée sur leur crête,
+    # ajoute ensuite sa propre masse aux efforts du maneton
+    entrees = (d_cyl, course, L, moteur["pression"], moteur["rpm"], moteur["t_chaude"], moteur["t_froide"])
+    efforts = efforts_crete(*entrees, res["masse_piston"])
+    for cle, val in bielle(d_cyl, np.maximum(efforts["F_bielle"], efforts["F_traction"]), L, tol).items():
+        res[cle] = val
+    efforts = efforts_crete(*entrees, res["masse_piston"], res["masse_bielle"])
+
+    # Couple instantané des cylindres au calage optimal (par Nm de couple moyen par cylindre)
+    energie, crete = facteurs_calage(moteur["n_cyl"])
+    C_cyl = moteur["C_nom"]
+    for cle, val in vilebrequin(C_cyl, moteur["n_cyl"], rayon, tol, couple_crete=C_cyl * crete,
+                                effort_maneton=efforts["F_maneton"], portee=RATIO_PORTEE * d_cyl).items():
+        if cle in DTYPE_PIECES.names:
+            res[cle] = val
+
+    couple_tot = moteur["puissance"] / omega
+    for cle, val in volant(couple_tot, moteur["rpm"], delta_volant, D_volant, tol, C_cyl * energie).items():
+        res[cle] = val
+    for cle, val in arbre(couple_tot, tol).items():
+        res[cle] = val
+    return res
@@ -0,0 +1,269 @@
+# calculs/refroidissement.py
+"""
+Circuit de refroidissement côté froid : boucle d'eau et radiateur air/eau.
+
+- Chaleur rejetée : bilan du moteur (rendement thermique de
+  dimensionner_moteur(), calculs/echangeurs.py) : Q = P (1 / η - 1), les
+  frottements mécaniques finissant dans l'eau ; pertes du côté chaud vers
+  l'ambiance négligées (majorant pour le radiateur).
+- Boucle d'eau : débit réglé pour un échauffement ECART_EAU dans le moteur,
+  paroi froide ECART_CHEMISE au-dessus de l'eau moyenne.
+- Radiateur : tubes plats horizontaux au pas PAS_TUBES, ailettes planes en
+  aluminium au pas p_f, faisceau carré de surface frontale A et de
+  profondeur D, ventilateur à vitesse frontale imposée. Canaux d'air et
+  d'eau en conduite plane (frottement_nusselt(), mêmes corrélations que les
+  échangeurs du moteur), efficacité d'ailette tanh(mL)/mL, ε-NTU à courants
+  croisés non brassés. Capacité ε C_min (W/K) : Q = ε C_min (T_eau,entrée - T_air).
+- Dimensionnement : balayage (pas d'ailettes × profondeur × vitesse de
+  ventilateur × surface) diffusé sur les conceptions, plus petit faisceau
+  tenant la T° froide visée avec un ventilateur de puissance bornée.
+- Couplage : la T° froide dépend du radiateur, le rendement (donc la chaleur
+  rejetée) de la T° froide ; point fixe moteur -> radiateur -> T° froide,
+  contractant (|dT_k' / dT_k| ≈ 0.1, jusqu'à 0.8 aux faibles rendements)
+  et accéléré par la pente sécante, sur les seules conceptions non
+  convergées.
+
+Unités : températures en °C, puissances en W, cotes en mm (surfaces en m²).
+"""
+
+import numpy as np
+
+from calculs.echangeurs import frottement_nusselt
+from calculs.gaz import table
+from calculs.moteur_stirling import dimensionner_moteur
+
+T_AMBIANTE = 25.0               # °C
+P_ATMOSPHERE = 101325.0         # Pa
+ECART_EAU = 6.0                 # K, échauffement de l'eau dans le moteur
+ECART_CHEMISE = 8.0             # K, paroi froide du moteur / eau moyenne
+VITESSE_FRONTALE = 4.0          # m/s, air devant le faisceau (radiateur() seul)
+RENDEMENT_VENTILATEUR = 0.4
+FRACTION_VENTILATEUR = 0.03     # puissance de ventilateur admise / puissance du moteur
+TOLERANCE = 0.1                 # K, convergence du point fixe
+N_ITERATIONS = 8
+
+# Eau de refroidissement (glycolée 0 %, vers 50 °C)
+EAU = {"densite": 988.0, "cp": 4181.0, "viscosite": 5.5e-4, "conductivite": 0.64}
+
+# Faisceau : tubes plats (pas, épaisseur, paroi) et ailettes aluminium, mm et W/(m·K)
+PAS_TUBES = 10.0
+EPAISSEUR_TUBE = 2.0
+PAROI_TUBE = 0.3
+EPAISSEUR_AILETTE = 0.1
+CONDUCTIVITE_AILETTE = 200.0
+
+# Balayage par défaut
+PAS_AILETTES = np.linspace(1.0, 4.0, 7)                         # mm
+PROFONDEURS = np.array([16.0, 20.0, 26.0, 32.0, 40.0, 52.0, 64.0])  # mm
+VITESSES = np.array([1.5, 2.0, 3.0, 4.0, 5.0])                  # m/s, vitesse frontale du ventilateur
+FACTEURS_SURFACE = np.geomspace(0.5, 8.0, 25)                  # × Q / (ρ c_p v ΔT disponible)
+TAILLE_BALAYAGE = 2_000_000     # points (conceptions × faisceaux) par bloc
+
+
+def chaleur_rejetee(puissance, rendement_thermique):
+    """Chaleur (W) à évacuer par l'eau : P (1 / η - 1) ; NaN si le moteur ne produit pas de travail"""
+    eta = np.asarray(rendement_thermique, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(eta > 0, np.asarray(puissance, dtype=float) * (1 / eta - 1), np.nan)
+
+
+def debit_eau(Q, ecart=ECART_EAU):
+    """Débit d'eau (kg/s) pour un échauffement ecart (K) dans le moteur"""
+    return np.asarray(Q, dtype=float) / (EAU["cp"] * ecart)
+
+
+def efficacite_croise(NTU, C_r):
+    """Efficacité ε-NTU d'un échangeur à courants croisés, deux fluides non brassés"""
+    NTU, C_r = np.asarray(NTU, dtype=float), np.maximum(np.asarray(C_r, dtype=float), 1e-9)
+    return 1 - np.exp(NTU ** 0.22 / C_r * (np.exp(-C_r * NTU ** 0.78) - 1))
+
+
+def radiateur(surface, profondeur, pas_ailettes, debit, t_air=T_AMBIANTE, vitesse=VITESSE_FRONTALE):
+    """
+    Performances d'un faisceau carré de surface frontale (m²), profondeur et pas d'ailettes (mm)
+    traversé par debit d'eau (kg/s) : dict capacite (ε C_min, W/K), efficacite, NTU, UA,
+    puissance_ventilateur, dp_air (Pa), dp_eau (Pa), n_tubes. Entrées diffusables.
+    """
+    surface = np.asarray(surface, dtype=float)
+    D = np.asarray(profondeur, dtype=float) / 1000
+    p_f, p_t = np.asarray(pas_ailettes, dtype=float) / 1000, PAS_TUBES / 1000
+    t_f, e_t, paroi = EPAISSEUR_AILETTE / 1000, EPAISSEUR_TUBE / 1000, PAROI_TUBE / 1000
+
+    # Côté air : canaux (p_f - t_f) × (p_t - e_t) entre ailettes et tubes
+    air = table("Air").interpoler(np.asarray(t_air, dtype=float) + 273.15, P_ATMOSPHERE,
+                                  ("densite", "cp", "viscosite", "conductivite"))
+    rho, cp, mu, k = (air[c] for c in ("densite", "cp", "viscosite", "conductivite"))
+    fente, hauteur = p_f - t_f, p_t - e_t
+    d_h = 2 * fente * hauteur / (fente + hauteur)
+    passage = fente * hauteur / (p_f * p_t)
+    m_air = rho * vitesse * surface
+    G = m_air / (passage * surface)
+    Re = G * d_h / mu
+    f, Nu = frottement_nusselt("canal", Re, cp * mu / k)
+    h = Nu * k / d_h
+    A_ailettes = surface * D * 2 * hauteur / (p_f * p_t)
+    A_air = A_ailettes + surface * D * 2 * fente / (p_f * p_t)
+    mL = np.sqrt(2 * h / (CONDUCTIVITE_AILETTE * t_f)) * hauteur / 2
+    eta_surface = 1 - A_ailettes / A_air * (1 - np.tanh(mL) / mL)
+    dp_air = f * D / d_h * G ** 2 / (2 * rho)
+
+    # Côté eau : tubes plats en parallèle sur la hauteur du faisceau, longueur = largeur
+    cote = np.sqrt(surface)
+    n_tubes = np.maximum(np.floor(cote / p_t), 1.0)
+    a, b = e_t - 2 * paroi, D - 2 * paroi
+    d_eau = 2 * a * b / (a + b)
+    debit = np.asarray(debit, dtype=float)
+    G_eau = debit / (n_tubes * a * b)
+    Re_eau = G_eau * d_eau / EAU["viscosite"]
+    f_eau, Nu_eau = frottement_nusselt("canal", Re_eau, EAU["cp"] * EAU["viscosite"] / EAU["conductivite"])
+    h_eau = Nu_eau * EAU["conductivite"] / d_eau
+    A_eau = n_tubes * 2 * (a + b) * cote
+
+    UA = 1 / (1 / (eta_surface * h * A_air) + 1 / (h_eau * A_eau))
+    C_air, C_eau = m_air * cp, debit * EAU["cp"]
+    C_min, C_max = np.minimum(C_air, C_eau), np.maximum(C_air, C_eau)
+    NTU = UA / C_min
+    efficacite = efficacite_croise(NTU, C_min / C_max)
+    return {
+        "capacite": efficacite * C_min,
+        "efficacite": efficacite,
+        "NTU": NTU,
+        "UA": UA,
+        "puissance_ventilateur": dp_air * m_air / rho / RENDEMENT_VENTILATEUR,
+        "dp_air": dp_air,
+        "dp_eau": f_eau * cote / d_eau * G_eau ** 2 / (2 * EAU["densite"]),
+        "n_tubes": n_tubes,
+    }
+
+
+def temperature_froide(Q, capacite, t_air=T_AMBIANTE):
+    """T° (°C) de paroi froide du moteur qu'impose un radiateur de capacité ε C_min (W/K)"""
+    return np.asarray(t_air) + np.asarray(Q) / np.asarray(capacite) - ECART_EAU / 2 + ECART_CHEMISE
+
+
+def _balayer(Q, ecart, puissance, t_air, p_f, D, v, facteurs, fraction_ventilateur, critere):
+    """Balayage d'un bloc de conceptions (1D) : indice du faisceau retenu et grandeurs du balayage"""
+    ax = lambda x: x[:, None, None, None, None]
+    air = table("Air").interpoler(t_air + 273.15, P_ATMOSPHERE, ("densite", "cp"))
+    reference = Q / (air["densite"] * air["cp"] * np.maximum(ecart, 1.0))
+    A = ax(reference) / v * facteurs
+    debit = debit_eau(Q)
+    perf = radiateur(A, D, p_f, ax(debit), ax(t_air), v)
+    thermique = (perf["capacite"] * ax(ecart) >= ax(Q)) & ax(ecart > 0)
+    faisable = thermique & (perf["puissance_ventilateur"] <= fraction_ventilateur * ax(puissance))
+    volume = A * D
+    # Plus petit faisceau faisable ; à défaut ventilateur le plus sobre tenant la T°, sinon la plus grande capacité
+    cout = np.where(faisable, volume if critere == "volume" else A + 1e-6 * volume, np.where(thermique, 1e9 + perf["puissance_ventilateur"], 1e18 - perf["capacite"]))
+    forme = cout.shape
+    i = np.argmin(cout.reshape(Q.size, -1), axis=-1)[:, None]
+    choisir = lambda x: np.take_along_axis(np.broadcast_to(x, forme).reshape(Q.size, -1), i, -1)[:, 0]
+    surface = choisir(A)
+    return {
+        "surface": surface,
+        "cote": np.sqrt(surface) * 1000,
+        "profondeur": choisir(D),
+        "pas_ailettes": choisir(p_f),
+        "vitesse": choisir(v),
+        "volume": choisir(volume),
+        "capacite": choisir(perf["capacite"]),
+        "puissance_ventilateur": choisir(perf["puissance_ventilateur"]),
+        "debit_eau": debit,
+        "n_tubes": choisir(perf["n_tubes"]),
+        "faisable": choisir(faisable),
+    }
+
+
+def dimensionner_radiateur(Q, t_froide, puissance, t_air=T_AMBIANTE, pas_ailettes=PAS_AILETTES,
+                           profondeurs=PROFONDEURS, vitesses=VITESSES, facteurs_surface=FACTEURS_SURFACE,
+                           fraction_ventilateur=FRACTION_VENTILATEUR, critere="volume"):
+    """
+    Plus petit faisceau (critere "volume" A D ou "surface" frontale A) évacuant Q (W) à la T° froide visée (°C) avec un ventilateur
+    ≤ fraction_ventilateur × puissance : balayage (pas × profondeur × vitesse × surface) diffusé
+    sur les conceptions, par blocs. dict de tableaux de la forme des entrées : surface (m²),
+    cote, profondeur, pas_ailettes (mm), vitesse (m/s), volume (dm³), capacite (W/K),
+    puissance_ventilateur, debit_eau, n_tubes, faisable. Sans solution faisable : ventilateur
+    le plus sobre tenant la T°, sinon faisceau de plus grande capacité (faisable = False).
+    """
+    entrees = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (Q, t_froide, puissance, t_air)))
+    forme = entrees[0].shape
+    Q, t_froide, puissance, t_air = (np.ravel(e) for e in entrees)
+    ecart = t_froide - ECART_CHEMISE + ECART_EAU / 2 - t_air
+    grille = (np.asarray(pas_ailettes, dtype=float)[:, None, None, None],
+              np.asarray(profondeurs, dtype=float)[None, :, None, None],
+              np.asarray(vitesses, dtype=float)[None, None, :, None],
+              np.asarray(facteurs_surface, dtype=float))
+    taille = max(1, TAILLE_BALAYAGE // np.prod([np.size(x) for x in grille]))
+    blocs = [_balayer(Q[b], ecart[b], puissance[b], t_air[b], *grille, fraction_ventilateur, critere)
+             for b in (slice(i, i + taille) for i in range(0, Q.size, taille))]
+    return {c: np.concatenate([r[c] for r in blocs]).reshape(forme) for c in blocs[0]}
+
+
+def equilibre_froid(puissance, n_cyl, pression, rpm, t_chaude, surface, profondeur, pas_ailettes,
+                    vitesse=VITESSE_FRONTALE, t_air=T_AMBIANTE, t_froide=None, tolerance=TOLERANCE,
+                    n_max=N_ITERATIONS, corriger=True):
+    """
+    T° froide cohérente entre le moteur et un radiateur donné (surface m², profondeur et pas mm,
+    vitesse frontale m/s) :
+    point fixe T_k -> dimensionner_moteur -> chaleur rejetée -> radiateur -> T_k, itéré sur les
+    seules conceptions non convergées. Renvoie (moteur DTYPE_MOTEUR à l'équilibre, dict :
+    t_froide, Q, capacite, iterations, converge).
+    """
+    entrees = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (
+        puissance, n_cyl, pression, rpm, t_chaude, surface, profondeur, pas_ailettes, vitesse, t_air,
+        t_air + 2 * ECART_CHEMISE if t_froide is None else t_froide)))
+    forme = entrees[0].shape
+    P, n, p, N, T_c, A, D, p_f, v, T_a, T_k = (np.ravel(e) for e in entrees)
+    T_k = T_k.copy()
+    moteur = dimensionner_moteur(P, n, p, N, T_c, T_k, corriger=corriger, echangeurs=True)
+    Q, capacite = np.full(P.size, np.nan), np.full(P.size, np.nan)
+    iterations = np.zeros(P.size, dtype=np.int32)
+    T_prec, F_prec = np.full(P.size, np.nan), np.full(P.size, np.nan)
+    actif = np.arange(P.size)
+    for _ in range(n_max):
+        m = moteur[actif]
+        Q[actif] = chaleur_rejetee(m["puissance"], m["rendement_thermique"])
+        capacite[actif] = radiateur(A[actif], D[actif], p_f[actif], debit_eau(Q[actif]), T_a[actif],
+                                     v[actif])["capacite"]
+        T, F = m["t_froide"], temperature_froide(Q[actif], capacite[actif], T_a[actif])
+        iterations[actif] += 1
+        ecart = np.abs(F - T)
+        # Relaxation de la pente sécante s = dF/dT : T + (F - T) / (1 - s), pas simple au premier tour
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pente = (F - F_prec[actif]) / (T - T_prec[actif])
+        pente = np.clip(np.nan_to_num(pente, nan=0.0, posinf=0.0, neginf=0.0), -1.0, 0.9)
+        T_prec[actif], F_prec[actif] = T, F
+        T_k[actif] = np.where(ecart > tolerance, T + (F - T) / (1 - pente), F)
+        # Conceptions sans travail (Q NaN) : abandon ; T° froide au-delà de la borne du moteur : jamais convergée
+        actif = actif[ecart > tolerance]
+        if actif.size == 0:
+            break
+        moteur[actif] = dimensionner_moteur(P[actif], n[actif], p[actif], N[actif], T_c[actif], T_k[actif],
+                                            corriger=corriger, echangeurs=True)
+    converge = np.ones(P.size, dtype=bool)
+    converge[actif] = False
+    converge &= np.isfinite(T_k)
+    return moteur.reshape(forme), {
+        "t_froide": T_k.reshape(forme),
+        "Q": Q.reshape(forme),
+        "capacite": capacite.reshape(forme),
+        "iterations": iterations.reshape(forme),
+        "converge": converge.reshape(forme),
+    }
+
+
+def dimensionner_refroidissement(puissance, n_cyl, pression, rpm, t_chaude, t_froide, t_air=T_AMBIANTE,
+                                 corriger=True, **options):
+    """
+    Radiateur le plus compact tenant la T° froide visée, puis T° froide d'équilibre avec ce
+    faisceau (grille discrète : un peu sous la cible). Renvoie (moteur à l'équilibre,
+    radiateur (dict de dimensionner_radiateur), équilibre (dict de equilibre_froid)).
+    """
+    moteur = dimensionner_moteur(puissance, n_cyl, pression, rpm, t_chaude, t_froide, corriger=corriger,
+                                echangeurs=True)
+    Q = chaleur_rejetee(moteur["puissance"], moteur["rendement_thermique"])
+    rad = dimensionner_radiateur(Q, moteur["t_froide"], moteur["puissance"], t_air, **options)
+    moteur, equilibre = equilibre_froid(moteur["puissance"], moteur["n_cyl"], moteur["pression"], moteur["rpm"],
+                                        moteur["t_chaude"], rad["surface"], rad["profondeur"], rad["pas_ailettes"],
+                                        rad["vitesse"], t_air, moteur["t_froide"], corriger=corriger)
+    rad["debit_eau"] = debit_eau(equilibre["Q"])
+    return moteur, rad, equilibre
@@ -0,0 +1,165 @@
+# calculs/schmidt.py
+"""
+Analyse de Schmidt (cycle isotherme) des moteurs Stirling alpha, bêta et gamma.
+
+Volumes sinusoïdaux, gaz parfait, espaces chaud / régénérateur / froid à
+température constante (régénérateur à la moyenne logarithmique). Chaque
+volume s'écrit v0 + vc cos θ + vs sin θ, donc
+
+    V_e/T_h + V_r/T_r + V_c/T_c = S (1 + c cos(θ - θ0))
+    p(θ) = p_moy √(1 - c²) / (1 + c cos(θ - θ0))
+
+et le travail indiqué par cycle a une forme fermée :
+
+    W = ∮ p dV = 2π p_moy (√(1 - c²) - 1) / c × (vs cos θ0 - vc sin θ0)
+
+schmidt() évalue cette forme fermée pour des tableaux de conceptions
+(plusieurs millions par seconde, utilisable dans les balayages) et, si on
+le demande, les courbes p(θ), V(θ) sur une grille d'angles de vilebrequin
+(axe ajouté en dernier) pour tracer le diagramme P-V.
+
+Unités SI : volumes en m³, pressions en Pa, températures en K, phase en degrés
+(avance du volume de détente sur le volume de compression).
+"""
+
+import numpy as np
+
+from calculs.gaz import R_GAZ, table
+
+PI = np.pi
+
+CONFIGURATIONS = ("alpha", "beta", "gamma")
+N_ANGLES = 3600
+PHASE = 90.0                     # degrés
+RATIO_MORT = 1.0                 # volume mort total / volume balayé
+FRACTION_MORT = (0.3, 0.4, 0.3)  # répartition réchauffeur / régénérateur / refroidisseur
+
+
+def temperature_regenerateur(T_h, T_c):
+    """Moyenne logarithmique (profil linéaire dans le régénérateur)"""
+    T_h = np.asarray(T_h, dtype=float)
+    T_c = np.asarray(T_c, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        T_r = (T_h - T_c) / np.log(T_h / T_c)
+    return np.where(np.isclose(T_h, T_c), T_h, T_r)
+
+
+def coefficients_volumes(configuration, V_se, V_sc, V_de, V_dc, phase=PHASE):
+    """
+    (v0, vc, vs) des volumes de détente et de compression : V = v0 + vc cos θ + vs sin θ.
+    V_se : volume balayé côté chaud (piston chaud ou déplaceur), V_sc : piston froid / moteur.
+    """
+    if configuration not in CONFIGURATIONS:
+        raise ValueError(f"Configuration inconnue : {configuration!r} ({', '.join(CONFIGURATIONS)})")
+    V_se, V_sc, V_de, V_dc = (np.asarray(v, dtype=float) for v in (V_se, V_sc, V_de, V_dc))
+    phi = np.radians(phase)
+    e = (V_se / 2 + V_de, -V_se / 2, np.zeros_like(V_se))
+    c0 = V_sc / 2 + V_dc
+    cc = -V_sc / 2 * np.cos(phi)
+    cs = -V_sc / 2 * np.sin(phi)
+    if configuration != "alpha":
+        # Le déplaceur chasse le gaz de l'espace chaud vers l'espace froid
+        c0 = c0 + V_se / 2
+        cc = cc + V_se / 2
+    if configuration == "beta":
+        # Recouvrement des courses déplaceur / piston dans le même cylindre
+        c0 = c0 - (V_se + V_sc - np.sqrt(V_se ** 2 + V_sc ** 2 - 2 * V_se * V_sc * np.cos(phi))) / 2
+    return e, (c0, cc, cs)
+
+
+def schmidt(configuration, V_se, V_sc, V_de, V_dc, V_r, T_h, T_c, p_moy, phase=PHASE, freq=None, n_angles=0):
+    """
+    Cycle de Schmidt de toutes les conceptions (entrées diffusables entre elles).
+
+    Renvoie un dict de tableaux : W_e, W_c, W (J/cycle), puissance (W, si freq),
+    p_max, p_min (Pa), c, theta0 (rad, angle de pression minimale), mR (J/K), et avec n_angles > 0 : angle (rad), V_e, V_c, V, p
+    de forme (..., n_angles).
+    """
+    T_h = np.asarray(T_h, dtype=float)
+    T_c = np.asarray(T_c, dtype=float)
+    T_r = temperature_regenerateur(T_h, T_c)
+    p_moy = np.asarray(p_moy, dtype=float)
+    (e0, ec, es), (c0, cc, cs) = coefficients_volumes(configuration, V_se, V_sc, V_de, V_dc, phase)
+
+    S = e0 / T_h + np.asarray(V_r, dtype=float) / T_r + c0 / T_c
+    Bc = ec / T_h + cc / T_c
+    Bs = es / T_h + cs / T_c
+    B = np.hypot(Bc, Bs)
+    c = B / S
+    cos0 = np.where(B > 0, Bc / np.where(B > 0, B, 1), 1.0)
+    sin0 = np.where(B > 0, Bs / np.where(B > 0, B, 1), 0.0)
+    racine = np.sqrt(1 - c ** 2)
+    # 2π (√(1-c²) - 1) / c, écrit sans perte de précision quand c -> 0
+    k = np.where(c > 0, -2 * PI * c / (1 + racine), 0.0) * p_moy
+    W_e = k * (es * cos0 - ec * sin0)
+    W_c = k * (cs * cos0 - cc * sin0)
+
+    res = {
+        "W_e": W_e,
+        "W_c": W_c,
+        "W": W_e + W_c,
+        "p_max": p_moy * racine / (1 - c),
+        "p_min": p_moy * racine / (1 + c),
+        "c": c,
+        "theta0": np.arctan2(sin0, cos0),
+        "mR": p_moy * racine * S,  # masse de gaz × constante massique (J/K)
+    }
+    if freq is not None:
+        res["puissance"] = res["W"] * np.asarray(freq, dtype=float)
+    if n_angles:
+        theta = np.linspace(0, 2 * PI, n_angles, endpoint=False)
+        cos_t, sin_t = np.cos(theta), np.sin(theta)
+        ax = lambda v: np.asarray(v)[..., None]
+        V_e = ax(e0) + ax(ec) * cos_t + ax(es) * sin_t
+        V_c = ax(c0) + ax(cc) * cos_t + ax(cs) * sin_t
+        cos_rel = cos_t * ax(cos0) + sin_t * ax(sin0)  # cos(θ - θ0)
+        res.update({
+            "angle": theta,
+            "V_e": V_e,
+            "V_c": V_c,
+            "V": V_e + V_c + ax(V_r),
+            "p": ax(p_moy * racine) / (1 + ax(c) * cos_rel),
+        })
+    return res
+
+
+def volumes_morts(V_balaye, ratio_mort=RATIO_MORT, fractions=FRACTION_MORT):
+    """(V_dh, V_r, V_dc) à partir du volume balayé et du ratio de volume mort"""
+    V_mort = np.asarray(V_balaye, dtype=float) * ratio_mort
+    return tuple(V_mort * f for f in fractions)
+
+
+def masse_gaz(res, gaz="Air", T=None, p=None):
+    """
+    Masse de gaz de travail (kg) : p V / T est constant sur le cycle isotherme.
+    Avec T, p (état moyen, ex. régénérateur et pression moyenne), correction de gaz réel par Z.
+    """
+    m = res["mR"] / R_GAZ[gaz]
+    if T is not None and p is not None:
+        m = m / table(gaz)("Z", T, p)
+    return m
+
+
+# ----------------- Balayages -----------------
+
+DTYPE_SCHMIDT = np.dtype([
+    ("W_schmidt", "f8"),        # J par cycle et par cylindre
+    ("P_schmidt", "f8"),        # W, tous cylindres
+    ("p_max_cycle", "f8"),      # bar
+    ("p_min_cycle", "f8"),      # bar
+])
+
+
+def schmidt_moteur(moteur, configuration="alpha", phase=PHASE, ratio_mort=RATIO_MORT):
+    """Cycle de Schmidt d'un tableau DTYPE_MOTEUR (pression de service = pression moyenne)"""
+    V = moteur["V_balaye"]
+    V_dh, V_r, V_dc = volumes_morts(V, ratio_mort)
+    cycle = schmidt(configuration, V, V, V_dh, V_dc, V_r,
+                    moteur["t_chaude"] + 273.15, moteur["t_froide"] + 273.15,
+                    moteur["pression"] * 1e5, phase, moteur["freq"])
+    res = np.empty(moteur.shape, dtype=DTYPE_SCHMIDT)
+    res["W_schmidt"] = cycle["W"]
+    res["P_schmidt"] = cycle["puissance"] * moteur["n_cyl"]
+    res["p_max_cycle"] = cycle["p_max"] / 1e5
+    res["p_min_cycle"] = cycle["p_min"] / 1e5
+    return res
@@ -0,0 +1,150 @@
+# calculs/selection_materiaux.py
+"""
+Moteur de sélection des matériaux, vectorisé sur tout le catalogue.
+
+cat est un Catalogue (materiaux.py) ou tout objet dont cat["Re"] etc. sont
+des colonnes NumPy. Chaque critère évalue en un seul broadcast tous les matériaux (axe 0) face
+à tous les cas de charge (axe 1) : la pièce est dimensionnée pour le cas le
+plus sévère (dimension mini de fabrication comprise), puis on en déduit
+masse, marge de sécurité et coût matière.
+
+Le résultat est un tableau structuré DTYPE_SELECTION (une ligne par
+matériau) dont le champ "pareto" marque le front masse / marge / coût :
+aucun autre matériau valide n'est à la fois plus léger, plus sûr et moins
+cher. Un matériau est invalide si sa température maxi est dépassée ou si
+sa marge (Re / contrainte du cas le plus sévère) reste sous 1 / (1 - tol).
+Une nuance importée sans température maxi (NaN) est gardée et signalée
+par le champ "t_max_inconnue" : à vérifier avant de la retenir à chaud.
+
+    cat = catalogue()
+    res = traction(cat, F=[800, 1200], L=120, tol=0.2, section_mini=30)
+    for i in front(res):
+        print(cat.noms[i], res["masse"][i], res["marge"][i])
+"""
+
+import numpy as np
+
+PI = np.pi
+NU = 0.3  # coefficient de Poisson (disque de volant)
+
+DTYPE_SELECTION = np.dtype([
+    ("dimension", "f8"),  # section (mm²), diamètre (mm) ou épaisseur (mm) selon le critère
+    ("masse", "f8"),      # g
+    ("marge", "f8"),      # Re / contrainte du cas le plus sévère
+    ("cout", "f8"),       # €
+    ("valide", "?"),
+    ("pareto", "?"),
+    ("t_max_inconnue", "?"),  # t_max non renseignée : température de service non contrôlée
+])
+
+
+def contrainte_admissible(cat, tol, t_service=None, E_mini=0.0):
+    """
+    Re abattu de la tolérance (Pa) ; 0 si t_max est dépassée ou si le module E (MPa) est trop
+    faible. Une t_max inconnue (NaN) ne déclasse pas la nuance.
+    """
+    adm = cat["Re"] * 1e6 * (1 - tol)
+    if t_service is not None:
+        adm = np.where(~(cat["t_max"] < t_service), adm, 0.0)
+    if E_mini:
+        adm = np.where(cat["E"] >= E_mini, adm, 0.0)
+    return adm
+
+
+def _cas(valeurs):
+    """Cas de charge en ligne (1, k) pour le broadcast contre les matériaux (n, 1)"""
+    return np.atleast_1d(np.asarray(valeurs, dtype=float))[None, :]
+
+
+def _resultat(cat, dimension, masse, marge, tol):
+    res = np.zeros(len(cat), dtype=DTYPE_SELECTION)
+    res["dimension"] = dimension
+    res["masse"] = masse
+    res["marge"] = marge
+    res["cout"] = masse * 1e-3 * cat["cout"]
+    res["t_max_inconnue"] = np.isnan(cat["t_max"])
+    res["valide"] = np.isfinite(masse) & (marge * (1 - tol) >= 1 - 1e-9)
+    res["pareto"] = front_pareto(np.column_stack([res["masse"], -res["marge"], res["cout"]]), res["valide"])
+    return res
+
+
+def traction(cat, F, L, tol=0.2, section_mini=0.0, coeff=1.0, t_service=None, E_mini=0.0):
+    """
+    Barre en traction/compression (bielle, tirant) : section mini pour les efforts F (N),
+    longueur L (mm). coeff < 1 pour une section ajourée.
+    """
+    adm = coeff * contrainte_admissible(cat, tol, t_service, E_mini)[:, None]
+    F = np.abs(_cas(F))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        section = np.max(F / adm, axis=1) * 1e6                  # mm², cas le plus sévère
+        section = np.maximum(section, section_mini)
+        marge = np.min(adm * section[:, None] * 1e-6 / F, axis=1) / (1 - tol)
+    masse = cat["densite"] * section * L * 1e-3                 # g
+    return _resultat(cat, section, masse, marge, tol)
+
+
+def torsion(cat, T, L, tol=0.2, d_mini=0.0, t_service=None):
+    """Arbre plein en torsion (couples T en N·m, longueur L en mm) : τ adm = 0.6 Re"""
+    tau = 0.6 * contrainte_admissible(cat, tol, t_service)[:, None]
+    T = np.abs(_cas(T))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d = np.cbrt(np.max(16 * T / (PI * tau), axis=1)) * 1000   # mm
+        d = np.maximum(d, d_mini)
+        marge = np.min(tau * PI * (d[:, None] / 1000) ** 3 / 16 / T, axis=1) / (1 - tol)
+    masse = cat["densite"] * PI * d ** 2 / 4 * L * 1e-3
+    return _resultat(cat, d, masse, marge, tol)
+
+
+def volant(cat, J, rpm, D, tol=0.2, e_mini=0.0, t_service=None):
+    """
+    Volant disque plein de diamètre D (mm) : la masse découle de l'inertie J (kg·m²),
+    l'épaisseur de la densité. Contrainte au centre σ = (3+ν)/8 ρ ω² R² aux régimes rpm.
+    """
+    adm = contrainte_admissible(cat, tol, t_service)[:, None]
+    R = D / 2 / 1000
+    rho = cat["densite"] * 1000                                  # kg/m³
+    J = np.max(_cas(J))
+    omega = 2 * PI * _cas(rpm) / 60
+    m = 2 * J / R ** 2                                           # kg, identique pour tous
+    e = np.maximum(m / (rho * PI * R ** 2) * 1000, e_mini)       # mm
+    sigma = (3 + NU) / 8 * rho[:, None] * omega ** 2 * R ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        marge = np.min(adm / sigma, axis=1) / (1 - tol)
+    masse = rho * PI * R ** 2 * e                                # g (épaisseur mini comprise)
+    return _resultat(cat, e, masse, marge, tol)
+
+
+def front_pareto(objectifs, valide=None):
+    """
+    Masque des points non dominés (tous les objectifs à minimiser).
+    Chaque point retenu élimine d'un coup tous ceux qu'il domine : le coût est
+    en O(n × taille du front) au lieu de O(n²). Les doublons exacts ne gardent
+    qu'un représentant.
+    """
+    objectifs = np.asarray(objectifs, dtype=float)
+    masque = np.zeros(len(objectifs), dtype=bool)
+    idx = np.arange(len(objectifs)) if valide is None else np.flatnonzero(valide)
+    # Parcours par premier objectif croissant : le premier point restant est toujours non dominé
+    idx = idx[np.lexsort(objectifs[idx].T[::-1])]
+    pts = objectifs[idx]
+    k = 0
+    while k < len(pts):
+        garde = np.any(pts < pts[k], axis=1)
+        garde[k] = True
+        idx, pts = idx[garde], pts[garde]
+        k = int(np.count_nonzero(garde[:k])) + 1
+    masque[idx] = True
+    return masque
+
+
+def front(res, critere="masse"):
+    """Indices du front de Pareto, triés selon le critère ("masse", "cout", "marge")"""
+    idx = np.flatnonzero(res["pareto"])
+    cle = -res["marge"][idx] if critere == "marge" else res[critere][idx]
+    return idx[np.argsort(cle, kind="stable")]
+
+
+def meilleur(res, critere="masse"):
+    """Indice du matériau retenu (premier du front selon le critère), -1 si aucun ne convient"""
+    idx = front(res, critere)
+    return int(idx[0]) if idx.size else -1
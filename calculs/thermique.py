@@ -0,0 +1,268 @@
+# calculs/thermique.py
+"""
+Conduction thermique axisymétrique (r, z) et contraintes thermiques du
+piston galette et de la paroi du cylindre, jeu piston/cylindre à chaud.
+
+- Volumes finis sur une grille r × z régulière (cellule i, j de volume
+  r_i Δr Δz par radian). Chaque bord échange avec un milieu (h, T) par la
+  conductance 1 / (Δ / 2λ + 1 / h) ; h = inf impose la température.
+- L'opérateur est séparable : A T = K_r T D_z + D_r T K_z (matrices 1D
+  tridiagonales). Résolution par diagonalisation rapide : valeurs propres
+  denses de l'axe le plus court, puis un système tridiagonal par mode le
+  long de l'autre axe (Thomas vectorisé sur les modes). La factorisation
+  (modes + pivots) est mise en cache : seuls les seconds membres changent
+  d'un cas de charge à l'autre, et plusieurs cas se résolvent d'un coup.
+  10⁵ nœuds : quelques dizaines de ms.
+- Contraintes : chaque tranche z est traitée comme un tube long
+  (déformation plane généralisée, extrémités libres) ou, pour le piston,
+  comme un disque plein (contrainte plane) : termes thermiques classiques
+  en ∫ T r dr plus Lamé pour la pression intérieure. Les tranches sont
+  indépendantes : les gradients axiaux (flexion de coque près de la tête
+  chaude, gradient à travers la galette) n'ajoutent pas de contrainte.
+- Dilatation radiale u = r (α ΔT + (σ_θ - ν (σ_r + σ_z)) / E) au bord,
+  d'où le jeu à chaud le long de la paroi.
+
+Unités : cotes en mm, températures en °C, h en W/(m²·K), contraintes en
+MPa, pression en bar ; propriétés matériau de materiaux.py (alpha en
+10⁻⁶/K, conductivite en W/(m·K)).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+H_GAZ = 500.0           # W/(m²·K), gaz de travail sous pression, écoulement alterné
+H_AMBIANT = 10.0        # W/(m²·K), convection naturelle extérieure
+T_MONTAGE = 20.0        # °C, température de référence des cotes
+PAS_MAILLAGE = 0.25     # mm, pas visé des grilles
+N_MAILLES_MIN = 8       # mailles mini par direction
+DEFAUTS_THERMIQUES = {"alpha": 12.0, "conductivite": 50.0, "nu": 0.3, "E": 210e3}  # acier
+
+
+def proprietes_thermiques(mat):
+    """(conductivité W/(m·K), α 1/K, E Pa, ν) d'un matériau (dict de MATERIAUX ou du catalogue)"""
+    valeurs = {}
+    for champ, defaut in DEFAUTS_THERMIQUES.items():
+        v = mat.get(champ)
+        valeurs[champ] = defaut if v is None or not np.isfinite(v) else float(v)
+    return valeurs["conductivite"], valeurs["alpha"] * 1e-6, valeurs["E"] * 1e6, valeurs["nu"]
+
+
+def mailles(longueur, pas=PAS_MAILLAGE):
+    """Nombre de mailles d'une longueur (mm) au pas visé"""
+    return max(N_MAILLES_MIN, int(np.ceil(longueur / pas)))
+
+
+# ----------------- Opérateur et factorisation -----------------
+
+def _conductance(pas, conductivite, h):
+    """Conductance surfacique (W/(m²·K)) entre le centre d'une cellule de bord et le milieu"""
+    return 1 / (pas / (2 * conductivite) + (0.0 if np.isinf(h) else 1 / h)) if h > 0 else 0.0
+
+
+def _operateur(faces, pas, conductivite, h_debut, h_fin):
+    """
+    Opérateur 1D d'un axe (diagonale, sur-diagonale) et conductances des deux bords : faces (n + 1)
+    pondère les flux (rayon des faces en m en radial, 1 en axial).
+    """
+    g = conductivite * faces[1:-1] / pas
+    diag = np.zeros(faces.size - 1)
+    diag[:-1] += g
+    diag[1:] += g
+    bords = (_conductance(pas, conductivite, h_debut) * faces[0], _conductance(pas, conductivite, h_fin) * faces[-1])
+    diag[0] += bords[0]
+    diag[-1] += bords[1]
+    return diag, -g, bords
+
+
+@lru_cache(maxsize=32)
+def _factoriser(r_int, r_ext, hauteur, nr, nz, conductivite, h_int, h_ext, h_bas, h_haut):
+    """Modes de l'axe court et pivots de Thomas des systèmes tridiagonaux de l'axe long"""
+    faces_r = np.linspace(r_int, r_ext, nr + 1) / 1000
+    faces_z = np.full(nz + 1, 1.0)
+    dr, dz = (r_ext - r_int) / nr / 1000, hauteur / nz / 1000
+    d_r, e_r, bords_r = _operateur(faces_r, dr, conductivite, h_int, h_ext)
+    d_z, e_z, bords_z = _operateur(faces_z, dz, conductivite, h_bas, h_haut)
+    poids_r = (faces_r[:-1] + faces_r[1:]) / 2 * dr          # r_i Δr
+    poids_z = np.full(nz, dz)                                 # Δz
+    # A T = K_r T D_z + D_r T K_z : on diagonalise l'axe le plus court (axe 1 après transposition)
+    transpose = nr < nz
+    (d0, e0, w0), (d1, e1, w1) = ((d_z, e_z, poids_z), (d_r, e_r, poids_r)) if transpose else \
+        ((d_r, e_r, poids_r), (d_z, e_z, poids_z))
+    racine = 1 / np.sqrt(w1)
+    K1 = np.diag(d1) + np.diag(e1, 1) + np.diag(e1, -1)
+    lam, Y = np.linalg.eigh(racine[:, None] * K1 * racine[None, :])
+    V = Y * racine[:, None]                                   # Vᵀ D1 V = I, K1 V = D1 V Λ
+    # Pour chaque mode m : (K0 + λ_m D0) u_m = (B V)_m, tridiagonal de diagonale d0 + λ_m w0
+    diag = d0[:, None] + w0[:, None] * lam[None, :]
+    pivots = np.empty_like(diag)
+    facteurs = np.zeros_like(diag)
+    pivots[0] = diag[0]
+    for i in range(1, diag.shape[0]):
+        facteurs[i] = e0[i - 1] / pivots[i - 1]
+        pivots[i] = diag[i] - facteurs[i] * e0[i - 1]
+    fact = {
+        "transpose": transpose, "V": V, "pivots": pivots, "facteurs": facteurs, "sur_diag": e0,
+        "bords_r": bords_r, "bords_z": bords_z, "poids_r": poids_r, "poids_z": poids_z,
+    }
+    for v in fact.values():
+        if isinstance(v, np.ndarray):
+            v.flags.writeable = False
+    return fact
+
+
+def _resoudre(fact, B):
+    """Résout A T = B pour des seconds membres (..., nr, nz) avec la factorisation en cache"""
+    if fact["transpose"]:
+        B = np.swapaxes(B, -1, -2)
+    U = B @ fact["V"]
+    pivots, facteurs, e = fact["pivots"], fact["facteurs"], fact["sur_diag"]
+    n = U.shape[-2]
+    for i in range(1, n):
+        U[..., i, :] -= facteurs[i] * U[..., i - 1, :]
+    U[..., n - 1, :] /= pivots[n - 1]
+    for i in range(n - 2, -1, -1):
+        U[..., i, :] = (U[..., i, :] - e[i] * U[..., i + 1, :]) / pivots[i]
+    T = U @ fact["V"].T
+    return np.swapaxes(T, -1, -2) if fact["transpose"] else T
+
+
+def champ_temperature(r_int, r_ext, hauteur, conductivite, milieux, nr=None, nz=None):
+    """
+    Champ de température (°C) d'une couronne r_int…r_ext × 0…hauteur (mm ; r_int = 0 : disque
+    plein). milieux : {"int", "ext", "bas", "haut"} -> (h, T), h en W/(m²·K) (inf : température
+    imposée ; 0 ou côté absent : adiabatique), T diffusable vers (..., n) le long du bord
+    (n = nz pour int / ext, nr pour bas / haut) : scalaire, profil, ou un cas de charge par
+    ligne ((cas, 1) ou (cas, n)). Tous les cas partagent la même factorisation.
+    Renvoie (r, z, T) : centres des cellules (mm) et champ (..., nr, nz).
+    """
+    nr = nr or mailles(r_ext - r_int)
+    nz = nz or mailles(hauteur)
+    h = {cote: float(milieux[cote][0]) if cote in milieux else 0.0 for cote in ("int", "ext", "bas", "haut")}
+    if r_int == 0:
+        h["int"] = 0.0
+    fact = _factoriser(float(r_int), float(r_ext), float(hauteur), int(nr), int(nz), float(conductivite),
+                       h["int"], h["ext"], h["bas"], h["haut"])
+    (b_int, b_ext), (b_bas, b_haut) = fact["bords_r"], fact["bords_z"]
+    dz, poids_r = fact["poids_z"][0], fact["poids_r"]
+    conductances = {"int": (b_int * dz, nz), "ext": (b_ext * dz, nz), "bas": (b_bas * poids_r, nr), "haut": (b_haut * poids_r, nr)}
+    apports = {}
+    for cote, (conductance, n) in conductances.items():
+        T = np.asarray(milieux[cote][1] if cote in milieux else 0.0, dtype=float)
+        apports[cote] = np.broadcast_to(T, np.broadcast_shapes(T.shape, (n,))) * conductance
+    forme = np.broadcast_shapes(*(v.shape[:-1] for v in apports.values()))
+    B = np.zeros(forme + (nr, nz))
+    B[..., 0, :] += apports["int"]
+    B[..., -1, :] += apports["ext"]
+    B[..., :, 0] += apports["bas"]
+    B[..., :, -1] += apports["haut"]
+    r = np.linspace(r_int, r_ext, nr + 1)
+    z = np.linspace(0, hauteur, nz + 1)
+    return (r[:-1] + r[1:]) / 2, (z[:-1] + z[1:]) / 2, _resoudre(fact, B)
+
+
+# ----------------- Contraintes et dilatations -----------------
+
+def _contraintes(rayons, I, dT, I_tot, a, b, alpha, E, nu, pression, tube):
+    """σ_r, σ_θ, σ_z (Pa) aux rayons (m) d'une tranche, I = ∫_a^r ΔT r dr, I_tot = I(b)"""
+    facteur = alpha * E / (1 - nu) if tube else alpha * E
+    rayons2 = np.where(rayons > 0, rayons ** 2, 1.0)
+    sigma_r = facteur / rayons2 * ((rayons ** 2 - a ** 2) / (b ** 2 - a ** 2) * I_tot - I)
+    sigma_t = facteur / rayons2 * ((rayons ** 2 + a ** 2) / (b ** 2 - a ** 2) * I_tot + I - dT * rayons ** 2)
+    sigma_z = facteur * (2 * I_tot / (b ** 2 - a ** 2) - dT) if tube else np.zeros_like(sigma_r)
+    if pression:
+        # Lamé, pression intérieure, fonds fermés
+        p = pression * a ** 2 / (b ** 2 - a ** 2)
+        sigma_r = sigma_r + p * (1 - b ** 2 / rayons2)
+        sigma_t = sigma_t + p * (1 + b ** 2 / rayons2)
+        sigma_z = sigma_z + p
+    return sigma_r, sigma_t, sigma_z
+
+
+def contraintes_thermiques(r, T, r_int, r_ext, mat, pression=0.0, T_ref=T_MONTAGE, tube=True):
+    """
+    Contraintes (MPa, (..., nr, nz)) d'un champ T (°C) sur les centres r (mm), tranche par tranche :
+    tube long en déformation plane généralisée (tube=True) ou disque en contrainte plane,
+    pression intérieure en bar. Dilatations radiales u_int et u_ext (mm, (..., nz)) aux bords.
+    """
+    _, alpha, E, nu = proprietes_thermiques(mat)
+    a, b, rc = r_int / 1000, r_ext / 1000, np.asarray(r) / 1000
+    dr = (b - a) / rc.size
+    dT = np.asarray(T) - T_ref
+    poids = dT * (rc * dr)[:, None]
+    I_tot = poids.sum(axis=-2)
+    # ∫ r dr exact sur la demi-maille intérieure (la maille de l'axe compte)
+    I = np.cumsum(poids, axis=-2) - poids + dT * ((rc ** 2 - (rc - dr / 2) ** 2) / 2)[:, None]
+    p = pression * 1e5
+    sigma_r, sigma_t, sigma_z = _contraintes(rc[:, None], I, dT, I_tot[..., None, :], a, b, alpha, E, nu, p, tube)
+    # Bords : température extrapolée d'une demi-maille
+    dT_bord = (1.5 * dT[..., 0, :] - 0.5 * dT[..., 1, :], 1.5 * dT[..., -1, :] - 0.5 * dT[..., -2, :])
+    u = []
+    for rayon, I_bord, dT_b in ((a, np.zeros_like(I_tot), dT_bord[0]), (b, I_tot, dT_bord[1])):
+        if rayon == 0:
+            u.append(np.zeros_like(I_tot))
+            continue
+        s_r, s_t, s_z = _contraintes(rayon, I_bord, dT_b, I_tot, a, b, alpha, E, nu, p, tube)
+        u.append(rayon * (alpha * dT_b + (s_t - nu * (s_r + s_z)) / E) * 1000)
+    von_mises = np.sqrt(((sigma_r - sigma_t) ** 2 + (sigma_t - sigma_z) ** 2 + (sigma_z - sigma_r) ** 2) / 2)
+    return {
+        "sigma_r": sigma_r / 1e6, "sigma_t": sigma_t / 1e6, "sigma_z": sigma_z / 1e6,
+        "von_mises": von_mises / 1e6, "u_int": u[0], "u_ext": u[1],
+    }
+
+
+def _resultat(r, z, T, contraintes):
+    res = dict(contraintes, r=r, z=z, T=T)
+    res["T_max"] = T.max(axis=(-2, -1))
+    res["von_mises_max"] = contraintes["von_mises"].max(axis=(-2, -1))
+    return res
+
+
+# ----------------- Pièces -----------------
+
+def cylindre_thermique(d_int, epaisseur, hauteur, T_chaude, T_froide, mat, pression=0.0, T_ambiante=T_MONTAGE,
+                       h_gaz=H_GAZ, h_ext=H_AMBIANT, nr=None, nz=None):
+    """
+    Paroi du cylindre : bout froid (z = 0) à T_froide, tête chaude (z = hauteur) à T_chaude,
+    gaz intérieur au profil linéaire T_froide -> T_chaude, air ambiant à l'extérieur.
+    T_chaude / T_froide scalaires ou tableaux de cas de charge (une seule factorisation).
+    dict : r, z, T, contraintes (MPa), u_int / u_ext (mm, le long de z), T_max, von_mises_max.
+    """
+    r_int = d_int / 2
+    nr = nr or mailles(epaisseur)
+    nz = nz or mailles(hauteur)
+    T_chaude, T_froide = (np.asarray(T, dtype=float)[..., None] for T in (T_chaude, T_froide))
+    z = (np.arange(nz) + 0.5) / nz
+    milieux = {
+        "int": (h_gaz, T_froide + (T_chaude - T_froide) * z), "ext": (h_ext, T_ambiante),
+        "bas": (np.inf, T_froide), "haut": (np.inf, T_chaude),
+    }
+    r, z, T = champ_temperature(r_int, r_int + epaisseur, hauteur, proprietes_thermiques(mat)[0], milieux, nr, nz)
+    return _resultat(r, z, T, contraintes_thermiques(r, T, r_int, r_int + epaisseur, mat, pression))
+
+
+def piston_thermique(d_piston, epaisseur, T_chaude, T_froide, mat, h_gaz=H_GAZ, h_lateral=0.0, T_lateral=None,
+                     nr=None, nz=None):
+    """
+    Piston galette plein : face froide (z = 0) et face chaude (z = epaisseur) au contact du gaz,
+    bord latéral adiabatique par défaut (segment et jeu de gaz) ou échangeant h_lateral avec la
+    paroi à T_lateral. Disques en contrainte plane tranche par tranche. Mêmes clés que
+    cylindre_thermique() ; u_ext est la dilatation du rayon du piston.
+    """
+    R = d_piston / 2
+    nr = nr or mailles(R)
+    nz = nz or mailles(epaisseur)
+    T_chaude, T_froide = (np.asarray(T, dtype=float)[..., None] for T in (T_chaude, T_froide))
+    milieux = {"bas": (h_gaz, T_froide), "haut": (h_gaz, T_chaude)}
+    if h_lateral:
+        milieux["ext"] = (h_lateral, (T_chaude + T_froide) / 2 if T_lateral is None else T_lateral)
+    r, z, T = champ_temperature(0.0, R, epaisseur, proprietes_thermiques(mat)[0], milieux, nr, nz)
+    return _resultat(r, z, T, contraintes_thermiques(r, T, 0.0, R, mat, tube=False))
+
+
+def jeu_chaud(jeu_froid, cylindre, piston):
+    """
+    Jeu radial à chaud (mm) le long de la paroi (..., nz du cylindre) : jeu au montage + dilatation
+    de l'alésage - plus forte dilatation du rayon du piston. Négatif : serrage (grippage).
+    """
+    return jeu_froid + cylindre["u_int"] - piston["u_ext"].max(axis=-1, keepdims=True)
@@ -0,0 +1,164 @@
+# calculs/torsion.py
+"""
+Vibrations de torsion de la ligne d'arbre : manivelles, volant, génératrice.
+
+Modèle à masses concentrées en chaîne : une inertie par manivelle (masses
+rotatives et moitié des masses alternatives au rayon r, contrepoids), puis
+le volant et la génératrice, reliés par des raideurs de torsion (manivelle
+de Carter entre deux cylindres, arbre de sortie, accouplement élastique).
+La chaîne est libre aux deux bouts : le premier mode est le mode rigide.
+
+- Modes propres : J^(-1/2) K J^(-1/2) symétrique, valeurs propres denses
+  (numpy.linalg.eigh), pour des tableaux de conceptions de même nombre de
+  masses ; formes normées en inertie (φᵀ J φ = I).
+- Excitation : couple d'un cylindre (cycle de Schmidt, calculs/phasage.py)
+  développé en harmoniques C_k ; la manivelle i calée à φ_i reçoit
+  C_k exp(-i k φ_i) à la pulsation k Ω.
+- Réponse forcée par superposition modale avec amortissement modal ζ :
+  couples vibratoires dans chaque tronçon, pour toutes les vitesses, tous
+  les ordres et toutes les conceptions d'un coup (cartes de résonance).
+- Ordres critiques : vitesses de résonance 60 f_r / k des modes élastiques,
+  signalées quand elles tombent près du régime de service et que le
+  calage excite réellement le mode (somme des phases non nulle).
+
+Unités SI : inerties en kg·m², raideurs en Nm/rad, vitesses en tr/min,
+cotes en mm pour raideur_manivelle().
+"""
+
+import numpy as np
+
+from calculs.phasage import N_ANGLES, N_HARMONIQUES, forme_couple
+from calculs.schmidt import PHASE, PI, RATIO_MORT
+
+AMORTISSEMENT = 0.02            # amortissement modal ζ (acier, sans amortisseur de torsion)
+MARGE_RESONANCE = 0.15          # bande ± autour du régime de service
+SEUIL_EXCITATION = 0.05         # couple vibratoire / couple moyen d'un cylindre jugé significatif
+RAIDEUR_ACCOUPLEMENT = 10.0     # accouplement élastique : raideur / couple nominal (rad⁻¹, 0.1 rad au nominal)
+COEFF_GENERATEUR = (0.003, 1.2)  # inertie de rotor (kg·m²) ≈ a · P(kW)^b, machines 4 pôles courantes
+G_ACIER = 81e9                  # Pa
+
+
+def raideur_manivelle(d_palier, d_maneton, rayon, l_palier, l_maneton, e_bras, h_bras, G=G_ACIER):
+    """
+    Raideur de torsion (Nm/rad) d'une manivelle par la longueur équivalente de Carter,
+    rapportée au diamètre de palier : l_e = (l_p + 0.8 e) + 0.75 l_m (d_p/d_m)⁴ + 1.5 r d_p⁴ / (e h³),
+    e épaisseur et h largeur des bras (cotes en mm).
+    """
+    d_p, d_m = np.asarray(d_palier, dtype=float), np.asarray(d_maneton, dtype=float)
+    l_e = (np.asarray(l_palier) + 0.8 * np.asarray(e_bras) + 0.75 * np.asarray(l_maneton) * (d_p / d_m) ** 4
+           + 1.5 * np.asarray(rayon) * d_p ** 4 / (np.asarray(e_bras) * np.asarray(h_bras) ** 3))
+    return G * PI * (d_p / 1000) ** 4 / 32 / (l_e / 1000)
+
+
+def inertie_manivelle(m_rot, m_alt, rayon, m_contrepoids=0.0):
+    """Inertie (kg·m²) d'une manivelle : masses rotatives et contrepoids au rayon, moitié de l'alternative (g, mm)"""
+    r2 = (np.asarray(rayon, dtype=float) / 1000) ** 2
+    return (np.asarray(m_rot) + np.asarray(m_alt) / 2 + np.asarray(m_contrepoids)) / 1000 * r2
+
+
+def inertie_generatrice(puissance, coeff=COEFF_GENERATEUR):
+    """Inertie (kg·m²) estimée du rotor de la génératrice de puissance donnée (W), à défaut de catalogue"""
+    a, b = coeff
+    return a * (np.asarray(puissance, dtype=float) / 1000) ** b
+
+
+def chaine(n_cyl, J_manivelle, k_manivelle, J_volant, k_arbre, J_generateur=0.0, k_accouplement=0.0):
+    """
+    Inerties (..., n) et raideurs (..., n - 1) de la chaîne manivelles -> volant (-> génératrice
+    si J_generateur > 0). Entrées diffusables (une valeur par conception).
+    """
+    J_manivelle, k_manivelle, J_volant, k_arbre = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (J_manivelle, k_manivelle, J_volant, k_arbre)))
+    J = [np.repeat(J_manivelle[..., None], n_cyl, axis=-1), J_volant[..., None]]
+    k = [np.repeat(k_manivelle[..., None], n_cyl - 1, axis=-1), k_arbre[..., None]]
+    if np.any(np.asarray(J_generateur) > 0):
+        J.append(np.broadcast_to(np.asarray(J_generateur, dtype=float), J_volant.shape)[..., None])
+        k.append(np.broadcast_to(np.asarray(k_accouplement, dtype=float), J_volant.shape)[..., None])
+    return np.concatenate(J, axis=-1), np.concatenate(k, axis=-1)
+
+
+def matrice_raideur(k):
+    """Matrice de raideur (..., n, n) d'une chaîne libre de raideurs k (..., n - 1)"""
+    n = k.shape[-1] + 1
+    K = np.zeros(k.shape[:-1] + (n, n))
+    i = np.arange(n - 1)
+    K[..., i, i] += k
+    K[..., i + 1, i + 1] += k
+    K[..., i, i + 1] = -k
+    K[..., i + 1, i] = -k
+    return K
+
+
+def modes(J, k):
+    """
+    Fréquences propres (Hz, (..., n), la première nulle : mode rigide) et formes propres
+    (..., n masses, n modes) normées en inertie.
+    """
+    racine = 1 / np.sqrt(J)
+    A = racine[..., :, None] * matrice_raideur(k) * racine[..., None, :]
+    w2, V = np.linalg.eigh(A)
+    return np.sqrt(np.maximum(w2, 0.0)) / (2 * PI), V * racine[..., :, None]
+
+
+def harmoniques(couple_moyen, configuration="alpha", phase=PHASE, ratio_mort=RATIO_MORT, n_ordres=N_HARMONIQUES):
+    """Harmoniques complexes C_k (k = 1…n_ordres, Nm) du couple d'un cylindre de moyenne couple_moyen"""
+    spectre = np.fft.rfft(forme_couple(configuration, phase, ratio_mort)) * (2 / N_ANGLES)
+    return np.asarray(couple_moyen, dtype=float)[..., None] * spectre[1:n_ordres + 1]
+
+
+def _participations(formes, C_k, phases, n_cyl):
+    """Forces modales P (..., ordres, modes) : Σ_i φ_ir C_k exp(-i k φ_i) sur les manivelles"""
+    k = np.arange(1, C_k.shape[-1] + 1)
+    excitation = C_k[..., :, None] * np.exp(-1j * k[:, None] * np.radians(np.asarray(phases, dtype=float))[..., None, :])
+    return np.einsum("...ki,...ir->...kr", excitation, formes[..., :n_cyl, :])
+
+
+def reponse(frequences, formes, k, C_k, phases, rpm, amortissement=AMORTISSEMENT):
+    """
+    Couples vibratoires (Nm, amplitudes) dans les tronçons de la chaîne aux vitesses rpm (n_vitesses) :
+    par ordre (..., n_vitesses, ordres, n - 1) et enveloppe tous ordres confondus (somme des
+    amplitudes, ..., n_vitesses, n - 1). Les modes élastiques seuls tordent la ligne.
+    """
+    n_cyl = np.shape(phases)[-1]
+    P = _participations(formes, C_k, phases, n_cyl)[..., 1:]                    # (..., K, r)
+    torsion = k[..., :, None] * np.diff(formes, axis=-2)[..., 1:]               # (..., n - 1, r)
+    w_r = 2 * PI * frequences[..., 1:]
+    ordres = np.arange(1, C_k.shape[-1] + 1)
+    w = 2 * PI * np.asarray(rpm, dtype=float)[:, None] / 60 * ordres            # (n_vitesses, K)
+    H = 1 / (w_r[..., None, None, :] ** 2 - w[..., None] ** 2
+             + 2j * amortissement * w_r[..., None, None, :] * w[..., None])     # (..., n_vitesses, K, r)
+    couple = np.abs(np.einsum("...vkr,...kr,...er->...vke", H, P, torsion, optimize=True))
+    return {"par_ordre": couple, "enveloppe": couple.sum(axis=-2)}
+
+
+def ordres_critiques(frequences, formes, k, C_k, phases, rpm_service, couple_moyen, rpm_max=None,
+                     marge=MARGE_RESONANCE, seuil=SEUIL_EXCITATION, amortissement=AMORTISSEMENT):
+    """
+    Résonances (mode élastique r, ordre k) d'une conception jusqu'à rpm_max (par défaut
+    (1 + marge) × le plus grand régime de service) : liste de dict {mode, ordre, frequence (Hz),
+    rpm, couple (couple vibratoire maxi à la résonance, Nm), excite, dangereux}, triée par vitesse.
+    Dangereux : à moins de marge d'un des régimes de service (scalaire ou liste) et
+    couple > seuil × couple_moyen.
+    """
+    rpm_service = np.atleast_1d(np.asarray(rpm_service, dtype=float))
+    rpm_max = rpm_max or (1 + marge) * float(rpm_service.max())
+    n_cyl = np.shape(phases)[-1]
+    P = _participations(formes, C_k, phases, n_cyl)[..., 1:]
+    torsion = k[:, None] * np.diff(formes, axis=0)[:, 1:]
+    w_r = 2 * PI * frequences[1:]
+    # À la résonance, l'amplification du mode vaut 1 / (2 ζ ω_r²)
+    crete = np.abs(P)[:, None, :] * np.abs(torsion)[None, :, :] / (2 * amortissement * w_r ** 2)
+    crete = crete.max(axis=1)                                                   # (K, r)
+    resultats = []
+    for ordre in range(1, C_k.shape[-1] + 1):
+        for r, f in enumerate(frequences[1:]):
+            rpm = 60 * f / ordre
+            if rpm > rpm_max:
+                continue
+            couple = float(crete[ordre - 1, r])
+            excite = couple > seuil * float(couple_moyen)
+            resultats.append({
+                "mode": r + 1, "ordre": ordre, "frequence": float(f), "rpm": float(rpm), "couple": couple,
+                "excite": bool(excite), "dangereux": bool(excite and np.any(np.abs(rpm - rpm_service) <= marge * rpm_service)),
+            })
+    return sorted(resultats, key=lambda res: res["rpm"])
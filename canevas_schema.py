@@ -0,0 +1,137 @@
+# canevas_schema.py
+"""
+Canevas de schéma persistant pour les pages pièces.
+
+Une seule Figure/Axes par page : chaque élément du croquis est identifié par
+une clé et créé au premier tracé, puis seulement déplacé/redimensionné aux
+calculs suivants (Rectangle.set_bounds, Line2D.set_data…). Les éléments en
+nombre variable (cylindres, vis, rainures) sont indexés ("vis", i) et ceux qui
+ne servent plus sont masqués : la mémoire reste constante sur toute la session.
+
+    self.schema = CanevasSchema(self, figsize=(6, 2), pady=5)
+    s = self.schema
+    s.rectangle("corps", (0, 0), L, e, color="#bbb")
+    s.cote("L", f"{L:.0f} mm", (L/2, 1), (L/2, 2))
+    s.limites((-10, L + 10), (-1, 3))
+    s.rafraichir()
+"""
+
+
+class CanevasSchema:
+    def __init__(self, master, figsize=(6, 2.5), dpi=100, blit=False, **options_pack):
+        # matplotlib n'est importé qu'au premier schéma affiché
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.ax = self.fig.add_subplot(111)
+        self.ax.axis("off")
+        self.canvas = FigureCanvasTkAgg(self.fig, master=master)
+        self.options_pack = options_pack
+        self.blit = blit
+        self._artistes = {}
+        self._utilises = set()
+        self._fond = None
+        self._fond_valide = False
+        if blit:
+            self.canvas.mpl_connect("draw_event", self._memoriser_fond)
+        self.afficher()
+
+    # ---- affichage du widget ----
+    def afficher(self):
+        widget = self.canvas.get_tk_widget()
+        if not widget.winfo_ismapped():
+            widget.pack(**self.options_pack)
+
+    def masquer(self):
+        """Cache le croquis (erreur de saisie) sans détruire la figure"""
+        self.canvas.get_tk_widget().pack_forget()
+
+    # ---- éléments du croquis (créés une fois, mis à jour ensuite) ----
+    def _obtenir(self, cle, creer):
+        artiste = self._artistes.get(cle)
+        if artiste is None:
+            artiste = creer()
+            if self.blit:
+                artiste.set_animated(True)
+            self._artistes[cle] = artiste
+        artiste.set_visible(True)
+        self._utilises.add(cle)
+        return artiste
+
+    def rectangle(self, cle, xy, largeur, hauteur, **style):
+        from matplotlib.patches import Rectangle
+        r = self._obtenir(cle, lambda: self.ax.add_patch(Rectangle(xy, largeur, hauteur, **style)))
+        r.set_bounds(xy[0], xy[1], largeur, hauteur)
+        return r
+
+    def cercle(self, cle, centre, rayon, **style):
+        from matplotlib.patches import Circle
+        c = self._obtenir(cle, lambda: self.ax.add_patch(Circle(centre, rayon, **style)))
+        c.set_center(centre)
+        c.set_radius(rayon)
+        return c
+
+    def ligne(self, cle, x, y, **style):
+        ligne = self._obtenir(cle, lambda: self.ax.plot(x, y, **style)[0])
+        ligne.set_data(x, y)
+        return ligne
+
+    def texte(self, cle, xy, texte, **style):
+        t = self._obtenir(cle, lambda: self.ax.text(xy[0], xy[1], texte, **style))
+        t.set_position(xy)
+        t.set_text(texte)
+        return t
+
+    def cote(self, cle, texte, xy, xytext=None, **style):
+        """Annotation (avec flèche si arrowprops) : point visé xy, texte en xytext"""
+        xytext = xy if xytext is None else xytext
+        a = self._obtenir(cle, lambda: self.ax.annotate(texte, xy=xy, xytext=xytext, **style))
+        a.xy = xy
+        a.set_position(xytext)
+        a.set_text(texte)
+        return a
+
+    # ---- cadre ----
+    def limites(self, xlim, ylim):
+        if tuple(self.ax.get_xlim()) != tuple(xlim) or tuple(self.ax.get_ylim()) != tuple(ylim):
+            self.ax.set_xlim(*xlim)
+            self.ax.set_ylim(*ylim)
+            self._fond_valide = False
+
+    def titre(self, texte, **style):
+        if self.ax.get_title() != texte:
+            self.ax.set_title(texte, **style)
+            self._fond_valide = False
+
+    def taille(self, largeur, hauteur):
+        """Taille de la figure en pouces (le widget suit)"""
+        w, h = self.fig.get_size_inches()
+        if (round(w, 3), round(h, 3)) != (round(largeur, 3), round(hauteur, 3)):
+            self.fig.set_size_inches(largeur, hauteur, forward=True)
+            self._fond_valide = False
+
+    # ---- rendu ----
+    def rafraichir(self):
+        """Masque les éléments non redessinés depuis le dernier appel, puis rend le croquis"""
+        for cle, artiste in self._artistes.items():
+            if cle not in self._utilises:
+                artiste.set_visible(False)
+        self._utilises = set()
+        self.afficher()
+        if self.blit and self._fond_valide and self._fond is not None:
+            self.canvas.restore_region(self._fond)
+            self._dessiner_animes()
+            self.canvas.blit(self.fig.bbox)
+        else:
+            self.canvas.draw_idle()
+
+    def _memoriser_fond(self, event=None):
+        self._fond = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._fond_valide = True
+        self._dessiner_animes()
+
+    def _dessiner_animes(self):
+        for artiste in self._artistes.values():
+            if artiste.get_visible():
+                self.ax.draw_artist(artiste)
@@ -0,0 +1,179 @@
+# etat_conception.py
+"""
+État de conception partagé du moteur Stirling (remplace le dict memo_moteur_stirling).
+
+- Champs typés, stockés dans des __slots__ (None = pas encore calculé).
+- maj(**valeurs) n'incrémente la version que si une valeur change réellement,
+  puis prévient une seule fois chaque abonné concerné avec l'ensemble des
+  champs modifiés.
+- Chaque champ a sa propre version : modifie_depuis(v) indique ce qui a
+  changé depuis une version déjà vue, pour ne rien recalculer inutilement.
+- instantane() / restaurer() / diff() : variantes de conception en mémoire
+  (un instantané n'est qu'un tuple de valeurs).
+"""
+
+# Champ -> type (conversion à l'écriture)
+CHAMPS = {
+    "puissance": float,      # W
+    "n_cyl": int,
+    "pression": float,       # bar
+    "rpm": float,            # tr/min
+    "t_chaude": float,       # °C
+    "t_froide": float,       # °C
+    "d_cyl": float,          # mm
+    "course": float,         # mm
+    "P_cyl": float,          # W
+    "h_cyl_utile": float,    # mm
+    "d_vilebrequin": float,  # mm (maneton mini)
+}
+NOMS = tuple(CHAMPS)
+_INDEX = {nom: i for i, nom in enumerate(NOMS)}
+
+
+def remplir_champ(entry, valeur, fmt="{}"):
+    """Écrit valeur dans un Entry, sauf s'il contient déjà cette valeur (évite de réécrire une saisie en cours)"""
+    if valeur is None:
+        return False
+    texte = entry.get()
+    try:
+        if float(texte) == float(fmt.format(valeur)):
+            return False
+    except ValueError:
+        if texte == fmt.format(valeur):
+            return False
+    entry.delete(0, "end")
+    entry.insert(0, fmt.format(valeur))
+    return True
+
+
+class Instantane:
+    """Copie figée de l'état (variante de conception)"""
+    __slots__ = ("version", "valeurs", "nom")
+
+    def __init__(self, version, valeurs, nom=""):
+        self.version = version
+        self.valeurs = valeurs
+        self.nom = nom
+
+    def __getitem__(self, champ):
+        return self.valeurs[_INDEX[champ]]
+
+    def get(self, champ, defaut=None):
+        v = self.valeurs[_INDEX[champ]]
+        return defaut if v is None else v
+
+    def en_dict(self):
+        return {nom: v for nom, v in zip(NOMS, self.valeurs) if v is not None}
+
+    def __repr__(self):
+        return f"Instantane({self.nom!r}, v{self.version}, {self.en_dict()})"
+
+
+class EtatConception:
+    __slots__ = NOMS + ("version", "_versions", "_abonnes")
+
+    def __init__(self, **valeurs):
+        for nom in NOMS:
+            object.__setattr__(self, nom, None)
+        object.__setattr__(self, "version", 0)
+        object.__setattr__(self, "_versions", [0] * len(NOMS))
+        object.__setattr__(self, "_abonnes", [])
+        if valeurs:
+            self.maj(**valeurs)
+
+    # ---- écriture ----
+    def __setattr__(self, nom, valeur):
+        if nom not in _INDEX:
+            raise AttributeError(f"Champ inconnu : {nom}")
+        self.maj(**{nom: valeur})
+
+    def maj(self, **valeurs):
+        """Met à jour plusieurs champs d'un coup ; renvoie l'ensemble des champs réellement modifiés"""
+        changes = set()
+        for nom, valeur in valeurs.items():
+            if nom not in _INDEX:
+                raise AttributeError(f"Champ inconnu : {nom}")
+            if valeur is not None:
+                valeur = CHAMPS[nom](valeur)
+            if getattr(self, nom) != valeur:
+                changes.add(nom)
+                object.__setattr__(self, nom, valeur)
+        if changes:
+            version = self.version + 1
+            object.__setattr__(self, "version", version)
+            for nom in changes:
+                self._versions[_INDEX[nom]] = version
+            self._notifier(frozenset(changes))
+        return changes
+
+    # ---- lecture (compatible avec l'ancien dict) ----
+    def get(self, champ, defaut=None):
+        v = getattr(self, champ, None) if champ in _INDEX else None
+        return defaut if v is None else v
+
+    def __getitem__(self, champ):
+        v = self.get(champ)
+        if v is None:
+            raise KeyError(champ)
+        return v
+
+    def __contains__(self, champ):
+        return self.get(champ) is not None
+
+    def __bool__(self):
+        return any(getattr(self, nom) is not None for nom in NOMS)
+
+    def en_dict(self):
+        return {nom: getattr(self, nom) for nom in NOMS if getattr(self, nom) is not None}
+
+    # ---- versions ----
+    def version_champ(self, champ):
+        return self._versions[_INDEX[champ]]
+
+    def modifie_depuis(self, version, champs=None):
+        """Champs (parmi champs, ou tous) modifiés après la version donnée"""
+        noms = NOMS if champs is None else champs
+        return {nom for nom in noms if self._versions[_INDEX[nom]] > version}
+
+    # ---- abonnements ----
+    def abonner(self, rappel, champs=None, immediat=True):
+        """
+        rappel(etat, changes) est appelé à chaque maj touchant l'un des champs suivis.
+        Avec immediat=True, il est aussi appelé tout de suite avec les champs déjà renseignés.
+        Renvoie une fonction de désabonnement.
+        """
+        suivis = frozenset(NOMS if champs is None else champs)
+        inconnus = suivis - set(NOMS)
+        if inconnus:
+            raise AttributeError(f"Champs inconnus : {sorted(inconnus)}")
+        abonne = (rappel, suivis)
+        self._abonnes.append(abonne)
+        if immediat:
+            deja = frozenset(nom for nom in suivis if getattr(self, nom) is not None)
+            if deja:
+                rappel(self, deja)
+        return lambda: self._abonnes.remove(abonne) if abonne in self._abonnes else None
+
+    def _notifier(self, changes):
+        for rappel, suivis in list(self._abonnes):
+            concernes = changes & suivis
+            if concernes:
+                rappel(self, concernes)
+
+    # ---- variantes ----
+    def instantane(self, nom=""):
+        return Instantane(self.version, tuple(getattr(self, n) for n in NOMS), nom)
+
+    def restaurer(self, instantane):
+        """Recharge une variante ; seuls les champs qui diffèrent sont notifiés"""
+        return self.maj(**dict(zip(NOMS, instantane.valeurs)))
+
+    @staticmethod
+    def diff(a, b):
+        """{champ: (valeur a, valeur b)} pour les champs qui diffèrent (états ou instantanés)"""
+        va = a.valeurs if isinstance(a, Instantane) else tuple(getattr(a, n) for n in NOMS)
+        vb = b.valeurs if isinstance(b, Instantane) else tuple(getattr(b, n) for n in NOMS)
+        return {nom: (x, y) for nom, x, y in zip(NOMS, va, vb) if x != y}
+
+    def __repr__(self):
+        return f"EtatConception(v{self.version}, {self.en_dict()})"
@@ -0,0 +1,167 @@
+# liste_materiaux.py
+"""
+Widgets de choix de matériau adossés au catalogue (materiaux.catalogue()).
+
+- FiltreIncremental : applique le mini-langage "re>400 densite<3 acier" ;
+  quand la nouvelle saisie ne fait que préciser la précédente (lettre
+  ajoutée, borne resserrée), seul le résultat précédent est refiltré.
+- ListeVirtuelle : liste à colonnes qui ne crée des items que pour les
+  lignes visibles et les recycle au défilement (coût indépendant de la
+  taille du catalogue).
+- ComboMateriau : combobox qui propose au fil de la frappe les nuances
+  correspondant au texte saisi.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+from materiaux import analyser_requete, catalogue
+from styles import COULEURS
+
+MAX_PROPOSITIONS = 200
+
+
+def _plus_strict(nouvelles, anciennes):
+    """Les bornes nouvelles retiennent-elles un sous-ensemble des anciennes ?"""
+    for champ, (mini, maxi) in anciennes.items():
+        n_mini, n_maxi = nouvelles.get(champ, (None, None))
+        if mini is not None and (n_mini is None or n_mini < mini):
+            return False
+        if maxi is not None and (n_maxi is None or n_maxi > maxi):
+            return False
+    return True
+
+
+class FiltreIncremental:
+    def __init__(self):
+        self._dernier = None  # (catalogue, mots, bornes, indices)
+
+    def filtrer(self, texte):
+        cat = catalogue()
+        texte, bornes = analyser_requete(texte)
+        mots = texte.lower().split()
+        parmi = None
+        if self._dernier is not None:
+            ancien_cat, anciens_mots, anciennes_bornes, indices = self._dernier
+            if (ancien_cat is cat and len(mots) >= len(anciens_mots)
+                    and all(a in m for a, m in zip(anciens_mots, mots))
+                    and _plus_strict(bornes, anciennes_bornes)):
+                parmi = indices
+        indices = cat.requete(" ".join(mots), parmi=parmi, **bornes)
+        self._dernier = (cat, mots, bornes, indices)
+        return indices
+
+
+class ListeVirtuelle(tk.Frame):
+    """
+    colonnes : [(titre, largeur en px, texte(indice) -> str)] ;
+    afficher(indices) remplace les lignes ; sur_selection(indice) au clic.
+    """
+
+    def __init__(self, master, colonnes, hauteur_ligne=22, sur_selection=None, **options):
+        super().__init__(master, bg=COULEURS["fond"], **options)
+        self.colonnes = colonnes
+        self.h = hauteur_ligne
+        self.sur_selection = sur_selection
+        self.lignes = np.empty(0, dtype=np.int64)
+        self.premier = 0
+        self.selection = None
+        self._pool = []  # par ligne visible : (fond, [textes])
+
+        largeur = sum(l for _, l, _ in colonnes)
+        entete = tk.Canvas(self, height=self.h, width=largeur, bg=COULEURS["bordure"], highlightthickness=0)
+        x = 0
+        for titre, l, _ in colonnes:
+            entete.create_text(x + 6, self.h / 2, text=titre, anchor="w", font=("Segoe UI", 10, "bold"))
+            x += l
+        entete.grid(row=0, column=0, sticky="ew")
+        self.canvas = tk.Canvas(self, width=largeur, height=12 * self.h, bg="white", highlightthickness=0)
+        self.canvas.grid(row=1, column=0, sticky="nsew")
+        self.barre = tk.Scrollbar(self, orient="vertical", command=self._defiler)
+        self.barre.grid(row=1, column=1, sticky="ns")
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda e: self._redessiner())
+        self.canvas.bind("<Button-1>", self._clic)
+        self.canvas.bind("<MouseWheel>", lambda e: self._avancer(-1 if e.delta > 0 else 1, "units"))
+        self.canvas.bind("<Button-4>", lambda e: self._avancer(-1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self._avancer(1, "units"))
+
+    def afficher(self, lignes):
+        self.lignes = np.asarray(lignes)
+        self.premier = 0
+        self._redessiner()
+
+    @property
+    def n_visibles(self):
+        return max(1, self.canvas.winfo_height() // self.h)
+
+    def _redessiner(self):
+        n = self.n_visibles + 1
+        while len(self._pool) < n:
+            k = len(self._pool)
+            fond = self.canvas.create_rectangle(0, k * self.h, 10000, (k + 1) * self.h, width=0, fill="white")
+            textes, x = [], 0
+            for _, l, _ in self.colonnes:
+                textes.append(self.canvas.create_text(x + 6, k * self.h + self.h / 2, anchor="w", font=("Segoe UI", 10)))
+                x += l
+            self._pool.append((fond, textes))
+        for k, (fond, textes) in enumerate(self._pool):
+            r = self.premier + k
+            if k < n and r < len(self.lignes):
+                i = int(self.lignes[r])
+                couleur = "#cfe3ff" if i == self.selection else ("white" if r % 2 == 0 else "#f3f6f8")
+                self.canvas.itemconfigure(fond, fill=couleur, state="normal")
+                for t, (_, _, texte) in zip(textes, self.colonnes):
+                    self.canvas.itemconfigure(t, text=texte(i), state="normal")
+            else:
+                self.canvas.itemconfigure(fond, state="hidden")
+                for t in textes:
+                    self.canvas.itemconfigure(t, state="hidden")
+        total = max(len(self.lignes), 1)
+        self.barre.set(self.premier / total, min(1.0, (self.premier + self.n_visibles) / total))
+
+    def _aller(self, premier):
+        premier = int(min(max(premier, 0), max(len(self.lignes) - self.n_visibles, 0)))
+        if premier != self.premier:
+            self.premier = premier
+            self._redessiner()
+
+    def _avancer(self, n, unite):
+        self._aller(self.premier + n * (self.n_visibles if unite == "pages" else 3))
+
+    def _defiler(self, action, valeur, unite=None):
+        if action == "moveto":
+            self._aller(float(valeur) * len(self.lignes))
+        else:
+            self._avancer(int(valeur), unite)
+
+    def _clic(self, event):
+        r = self.premier + int(event.y // self.h)
+        if r < len(self.lignes):
+            self.selection = int(self.lignes[r])
+            self._redessiner()
+            if self.sur_selection:
+                self.sur_selection(self.selection)
+
+
+class ComboMateriau(ttk.Combobox):
+    """Combobox de matériau : la liste déroulante ne propose que les nuances qui correspondent à la saisie"""
+
+    def __init__(self, master, textvariable, **options):
+        super().__init__(master, textvariable=textvariable, postcommand=self._proposer, **options)
+        self._filtre = FiltreIncremental()
+        self.bind("<KeyRelease>", self._saisie)
+
+    def _proposer(self):
+        texte = self.get()
+        # Nom exact (valeur déjà choisie) : on propose tout le catalogue
+        indices = self._filtre.filtrer("" if texte in catalogue() else texte)
+        self.configure(values=[str(n) for n in catalogue().noms[indices[:MAX_PROPOSITIONS]]])
+
+    def _saisie(self, event):
+        if event.keysym not in ("Up", "Down", "Return", "Escape", "Tab"):
+            self._proposer()
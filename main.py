@@ -1,25 +1,51 @@
 # main.py
+import time
+_T0 = time.perf_counter()  # référence du profil de démarrage
+
+import os
+import sys
+import importlib
 import tkinter as tk
-from styles import COULEURS, bouton_flat  # widgets/couleurs personnalisés
-
-# --- Import de toutes les pages (à adapter si tu ajoutes de nouvelles pages) ---
-from pages.page_calculs import PageCalculs
-from pages.page_materiaux import PageMateriaux
-from pages.page_parametres import PageParametres
-from pages.page_moteur_stirling import PageMoteurStirling
-from pages.page_piston_stirling import PagePistonStirling
-from pages.page_drone_structure import PageDroneStructure
-from pages.page_drone_propulsion import PageDronePropulsion
-from pages.page_drone_ia import PageDroneIA
-from pages.page_simulation_mission import PageSimulationMission
-from pages.page_boite_crabot import PageBoiteCrabot
-from pages.page_vilebrequin_stirling import PageVilebrequinStirling
-from pages.page_dimensionnement_stirling import PageDimensionnementStirling
-from pages.page_accueil import PageAccueil
+from styles import COULEURS  # couleurs personnalisées
+from etat_conception import EtatConception
+
+
+def _fabrique(module, classe):
+    """Fabrique de page : le module n'est importé qu'à la première construction"""
+    def construire(parent, controller):
+        PageClass = getattr(importlib.import_module(module), classe)
+        return PageClass(parent=parent, controller=controller)
+    return construire
+
+
+# --- Registre des pages (nom de classe -> fabrique). Ajouter ici toute nouvelle page ---
+FABRIQUES_PAGES = {
+    "PageAccueil": _fabrique("pages.page_accueil", "PageAccueil"),
+    "PageCalculs": _fabrique("pages.page_calculs", "PageCalculs"),
+    "PageMateriaux": _fabrique("pages.page_materiaux", "PageMateriaux"),
+    "PageParametres": _fabrique("pages.page_parametres", "PageParametres"),
+    "PageMoteurStirling": _fabrique("pages.page_moteur_stirling", "PageMoteurStirling"),
+    "PagePistonStirling": _fabrique("pages.page_piston_stirling", "PagePistonStirling"),
+    "PageCylindreStirling": _fabrique("pages.page_cylindre_stirling", "PageCylindreStirling"),
+    "PageVilebrequinStirling": _fabrique("pages.page_vilebrequin_stirling", "PageVilebrequinStirling"),
+    "PageBielleStirling": _fabrique("pages.page_bielle_stirling", "PageBielleStirling"),
+    "PageVolantStirling": _fabrique("pages.page_volant_stirling", "PageVolantStirling"),
+    "PageArbreStirling": _fabrique("pages.page_arbre_stirling", "PageArbreStirling"),
+    "PageEmbaseStirling": _fabrique("pages.page_embase_stirling", "PageEmbaseStirling"),
+    "PageVisserieStirling": _fabrique("pages.page_visserie_stirling", "PageVisserieStirling"),
+    "PageDimensionnementStirling": _fabrique("pages.page_dimensionnement_stirling", "PageDimensionnementStirling"),
+    "PageDroneStructure": _fabrique("pages.page_drone_structure", "PageDroneStructure"),
+    "PageDronePropulsion": _fabrique("pages.page_drone_propulsion", "PageDronePropulsion"),
+    "PageDroneIA": _fabrique("pages.page_drone_ia", "PageDroneIA"),
+    "PageSimulationMission": _fabrique("pages.page_simulation_mission", "PageSimulationMission"),
+    "PageBoiteCrabot": _fabrique("pages.page_boite_crabot", "PageBoiteCrabot"),
+}
+
+AUTOSAUVEGARDE_MS = 5000  # relevé des saisies ; l'écriture se fait en arrière-plan
 
 # ----------------- Application principale avec structure multi-pages -----------------
 class AssistantCAO(tk.Tk):
-    def __init__(self):
+    def __init__(self, profil=None):
         super().__init__()
         self.title("Assistant de CAO")
         self.attributes('-fullscreen', True)
@@ -27,44 +53,178 @@ class AssistantCAO(tk.Tk):
         self.bind("<Escape>", lambda e: self.attributes('-fullscreen', False))
 
         self.configure(bg=COULEURS["fond"])
+        self.profil = profil
+        self.code_sortie = 0
 
-        # Mémoire partagée pour les pages (ex : données moteur, paramètres globaux…)
+        # État de conception partagé (les pages s'y abonnent, cf. EtatConception.abonner)
+        # Les pages sont construites au premier affichage (cf. FABRIQUES_PAGES)
         self.frames = {}
-        self.memo_moteur_stirling = {}
-
-        container = tk.Frame(self, bg=COULEURS["fond"])
-        container.pack(fill="both", expand=True)
-
-        # --- Instanciation et enregistrement de chaque page ---
-        pages = (
-            PageAccueil,
-            PageCalculs,
-            PageMateriaux,
-            PageParametres,
-            PageMoteurStirling,
-            PagePistonStirling,
-            PageDroneStructure,
-            PageDronePropulsion,
-            PageDroneIA,
-            PageSimulationMission,
-            PageBoiteCrabot,
-            PageVilebrequinStirling,
-            PageDimensionnementStirling,
-        )
-
-        for PageClass in pages:
-            frame = PageClass(parent=container, controller=self)
-            self.frames[PageClass] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        self.etat = EtatConception()
+        self.variantes = []            # instantanés de l'état (cf. EtatConception.instantane)
+        self.saisies_en_attente = {}   # saisies chargées pour des pages pas encore construites
+        self.fichier_projet = None
+        self._fichier_session = None   # autosauvegarde hors projet
+        self._autosauvegarde = None
 
-        self.afficher_page(PageAccueil)
+        self.container = tk.Frame(self, bg=COULEURS["fond"])
+        self.container.pack(fill="both", expand=True)
 
-    def afficher_page(self, page_class):
-        """Affiche la page demandée (par classe)"""
-        frame = self.frames[page_class]
+        self._creer_menu()
+        self.protocol("WM_DELETE_WINDOW", self.quitter)
+
+        self.afficher_page("PageAccueil")
+        if self.profil:
+            self.after_idle(self._fin_demarrage)
+        self.after(AUTOSAUVEGARDE_MS, self._autosauvegarder)
+
+    def construire_page(self, nom):
+        """Construit (une seule fois) la page enregistrée sous ce nom"""
+        if nom not in self.frames:
+            if self.profil:
+                with self.profil.etape(f"construction {nom}"):
+                    frame = FABRIQUES_PAGES[nom](self.container, self)
+            else:
+                frame = FABRIQUES_PAGES[nom](self.container, self)
+            self.frames[nom] = frame
+            frame.grid(row=0, column=0, sticky="nsew")
+            if nom in self.saisies_en_attente:
+                from projet import restaurer_saisies
+                restaurer_saisies(frame, *self.saisies_en_attente.pop(nom))
+        return self.frames[nom]
+
+    def afficher_page(self, page):
+        """Affiche la page demandée (classe ou nom de classe), construite au premier appel"""
+        nom = page if isinstance(page, str) else page.__name__
+        frame = self.construire_page(nom)
         frame.tkraise()
 
+    # ----------------- Projet : ouverture, enregistrement, autosauvegarde -----------------
+    def _creer_menu(self):
+        menu = tk.Menu(self)
+        fichier = tk.Menu(menu, tearoff=0)
+        fichier.add_command(label="Ouvrir un projet…", accelerator="Ctrl+O", command=self.ouvrir_projet)
+        fichier.add_command(label="Enregistrer", accelerator="Ctrl+S", command=self.enregistrer_projet)
+        fichier.add_command(label="Enregistrer sous…", command=self.enregistrer_projet_sous)
+        fichier.add_command(label="Restaurer la dernière session", command=self.restaurer_session)
+        fichier.add_separator()
+        fichier.add_command(label="Quitter", command=self.quitter)
+        menu.add_cascade(label="Fichier", menu=fichier)
+        variantes = tk.Menu(menu, tearoff=0, postcommand=lambda: self._remplir_menu_variantes(variantes))
+        menu.add_cascade(label="Variantes", menu=variantes)
+        self.config(menu=menu)
+        self.bind_all("<Control-s>", lambda e: self.enregistrer_projet())
+        self.bind_all("<Control-o>", lambda e: self.ouvrir_projet())
+
+    # ----------------- Variantes : instantanés de l'état, comparaison, restauration -----------------
+    def _remplir_menu_variantes(self, menu):
+        """Menu reconstruit à chaque ouverture : les variantes changent (mémorisation, projet ouvert)"""
+        menu.delete(0, "end")
+        menu.add_command(label="Mémoriser l'état courant…", command=self.memoriser_variante)
+        comparer, restaurer = tk.Menu(menu, tearoff=0), tk.Menu(menu, tearoff=0)
+        for variante in self.variantes:
+            comparer.add_command(label=variante.nom, command=lambda v=variante: self.comparer_variante(v))
+            restaurer.add_command(label=variante.nom, command=lambda v=variante: self.restaurer_variante(v))
+        etat = "normal" if self.variantes else "disabled"
+        menu.add_cascade(label="Comparer à", menu=comparer, state=etat)
+        menu.add_cascade(label="Restaurer", menu=restaurer, state=etat)
+
+    def memoriser_variante(self):
+        from tkinter import simpledialog
+        nom = simpledialog.askstring("Variante", "Nom de la variante :", parent=self,
+                                     initialvalue=f"Variante {len(self.variantes) + 1}")
+        if nom:
+            self.variantes.append(self.etat.instantane(nom.strip()))
+
+    def comparer_variante(self, variante):
+        from tkinter import messagebox
+        ecarts = EtatConception.diff(variante, self.etat)
+        val = lambda v: "-" if v is None else (f"{v:.4g}" if isinstance(v, float) else str(v))
+        texte = "\n".join(f"{nom} : {val(a)} → {val(b)}" for nom, (a, b) in ecarts.items()) or "Aucune différence."
+        messagebox.showinfo(f"Variante « {variante.nom} » → état courant", texte)
+
+    def restaurer_variante(self, variante):
+        self.etat.restaurer(variante)
+
+    def ouvrir_projet(self, chemin=None):
+        import projet
+        from tkinter import filedialog, messagebox
+        chemin = chemin or filedialog.askopenfilename(title="Ouvrir un projet",
+                                                      filetypes=[("Projet CAO", "*" + projet.EXTENSION)])
+        if not chemin:
+            return
+        fichier = projet.FichierProjet(chemin)
+        try:
+            projet.appliquer_sections(self, fichier.lire())
+        except (OSError, ValueError, projet.ErreurProjet) as e:
+            messagebox.showerror("Projet", f"Impossible d'ouvrir {chemin} :\n{e}")
+            return
+        self._changer_fichier(fichier)
+
+    def enregistrer_projet(self):
+        if self.fichier_projet is None:
+            return self.enregistrer_projet_sous()
+        import projet
+        self.fichier_projet.ecrire(projet.sections_application(self), incremental=True)
+
+    def enregistrer_projet_sous(self):
+        import projet
+        from tkinter import filedialog
+        chemin = filedialog.asksaveasfilename(title="Enregistrer le projet", defaultextension=projet.EXTENSION,
+                                              filetypes=[("Projet CAO", "*" + projet.EXTENSION)])
+        if not chemin:
+            return
+        fichier = projet.FichierProjet(chemin)
+        fichier.ecrire(projet.sections_application(self), incremental=False)
+        self._changer_fichier(fichier)
+
+    def restaurer_session(self):
+        """Recharge l'autosauvegarde hors projet de la session précédente"""
+        import projet
+        chemin = projet.chemin_autosauvegarde(precedente=True)
+        if chemin and os.path.exists(chemin):
+            projet.appliquer_sections(self, projet.FichierProjet(chemin).lire())
+
+    def _changer_fichier(self, fichier):
+        if self._autosauvegarde is not None:
+            self._autosauvegarde.arreter()
+            self._autosauvegarde = None
+        self.fichier_projet = fichier
+        self.title(f"Assistant de CAO – {os.path.basename(fichier.chemin)}")
+
+    def _autosauvegarder(self):
+        """Relevé des saisies (rapide, thread Tk) ; empreintes et écriture dans le thread d'autosauvegarde"""
+        import projet
+        if self._autosauvegarde is None:
+            if self.fichier_projet is None and self._fichier_session is None:
+                self._fichier_session = projet.nouvelle_autosauvegarde_session()
+            fichier = self.fichier_projet or self._fichier_session
+            if fichier is not None:
+                self._autosauvegarde = projet.Autosauvegarde(
+                    fichier, sur_erreur=lambda e: print(f"Autosauvegarde : {e}", file=sys.stderr))
+        if self._autosauvegarde is not None:
+            self._autosauvegarde.demander(projet.sections_application(self))
+        self.after(AUTOSAUVEGARDE_MS, self._autosauvegarder)
+
+    def quitter(self):
+        if self._autosauvegarde is not None:
+            import projet
+            self._autosauvegarde.demander(projet.sections_application(self))
+            self._autosauvegarde.arreter()
+        self.destroy()
+
+    def _fin_demarrage(self):
+        self.update_idletasks()
+        self.profil.terminer()
+        print(self.profil.rapport(), file=sys.stderr)
+        if self.profil.budget_ms is not None:
+            self.code_sortie = 0 if self.profil.budget_respecte() else 1
+            self.destroy()
+
+
 # --- Lancement de l’application ---
 if __name__ == "__main__":
-    app = AssistantCAO()
+    from profil_demarrage import ProfilDemarrage
+    profil = ProfilDemarrage.depuis_arguments(sys.argv[1:], t0=_T0)
+    app = AssistantCAO(profil=profil)
     app.mainloop()
+    sys.exit(app.code_sortie)
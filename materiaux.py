@@ -1,19 +1,357 @@
 # fichier : materiaux.py
+"""
+Base matériaux unique de l'application.
+
+MATERIAUX contient les nuances livrées avec l'application ; des catalogues
+fournisseurs (CSV ou JSON, plusieurs dizaines de milliers de nuances) s'y
+ajoutent avec importer(). catalogue() renvoie l'ensemble sous forme d'un
+Catalogue :
+
+- stockage en colonnes (un .npy par propriété) dans le cache disque, ouvert
+  en mémoire partagée (np.load(mmap_mode="r")) : les sources ne sont relues
+  que si elles changent ;
+- index triés sur E, Re et densité : une requête par plage est une
+  recherche dichotomique, puis un filtre sur le seul sous-ensemble retenu ;
+- recherche par nom, et mini-langage de filtre "re>400 densite<3 acier".
+
+Unités : E, Re, Rm en MPa ; densité en g/cm³ ; t_max (température de
+service maxi) en °C ; coût matière en €/kg. Fatigue (courbe S-N, cf.
+calculs/fatigue.py) : Sf limite de fatigue en flexion alternée (MPa,
+éprouvette polie) atteinte à N_D cycles, coude de la courbe ; non
+renseignées dans un catalogue importé, elles sont estimées depuis Rm.
+Thermique (cf. calculs/thermique.py) : alpha dilatation en 10⁻⁶/K,
+conductivite en W/(m·K), nu coefficient de Poisson ; valeurs d'acier
+par défaut si absentes.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+
+from cache_disque import dossier_cache, ecrire_atomique
 
 MATERIAUX = {
-    "Acier": {"E": 210e3, "Re": 235},
-    "Inox": {"E": 193e3, "Re": 250},
-    "Aluminium": {"E": 70e3, "Re": 120},
-    "Aluminium 2017": {"E": 73e3, "Re": 395},
-    "Titane": {"E": 116e3, "Re": 950},
-    "Cuivre": {"E": 110e3, "Re": 210},
-    "Laiton": {"E": 100e3, "Re": 200},
-    "ABS": {"E": 2.3e3, "Re": 45},
-    "Bakelite": {"E": 3.5e3, "Re": 90},
-    "Composite Carbone": {"E": 150e3, "Re": 600},
-    "PEEK": {"E": 3.6e3, "Re": 100},
-    "Nylon": {"E": 2.5e3, "Re": 50},
-    "PVC": {"E": 3e3, "Re": 60},
-    "Verre": {"E": 70e3, "Re": 50},
-    "Bois (chêne)": {"E": 11e3, "Re": 90},
+    "Acier": {"E": 210e3, "Re": 235, "Rm": 360, "densite": 7.85, "t_max": 400, "cout": 1.0, "Sf": 180, "N_D": 1e7, "alpha": 12, "conductivite": 50, "nu": 0.3, "usage": "usage général"},
+    "Acier S235": {"E": 210e3, "Re": 235, "Rm": 360, "densite": 7.85, "t_max": 400, "cout": 1.0, "Sf": 180, "N_D": 1e7, "alpha": 12, "conductivite": 50, "nu": 0.3, "usage": "standard, masse élevée"},
+    "Acier S355": {"E": 210e3, "Re": 355, "Rm": 510, "densite": 7.85, "t_max": 400, "cout": 1.2, "Sf": 245, "N_D": 1e7, "alpha": 12, "conductivite": 50, "nu": 0.3, "usage": "moyenne charge"},
+    "Acier 42CrMo4": {"E": 210e3, "Re": 900, "Rm": 1100, "densite": 7.85, "t_max": 450, "cout": 2.5, "Sf": 500, "N_D": 1e7, "alpha": 12.3, "conductivite": 42, "nu": 0.3, "usage": "standard / haute charge"},
+    "Fonte GGG40": {"E": 169e3, "Re": 250, "Rm": 400, "densite": 7.1, "t_max": 350, "cout": 1.5, "Sf": 180, "N_D": 1e7, "alpha": 12.5, "conductivite": 36, "nu": 0.275, "usage": "inertie, anti-vibratoire"},
+    "Inox": {"E": 193e3, "Re": 250, "Rm": 520, "densite": 8.0, "t_max": 800, "cout": 4.0, "Sf": 240, "N_D": 1e7, "alpha": 17.3, "conductivite": 16, "nu": 0.29, "usage": "corrosion"},
+    "Inox 304L": {"E": 193e3, "Re": 215, "Rm": 500, "densite": 8.0, "t_max": 800, "cout": 4.5, "Sf": 220, "N_D": 1e7, "alpha": 17.3, "conductivite": 16.2, "nu": 0.29, "usage": "cylindre, tête chaude"},
+    "Inox 310S": {"E": 200e3, "Re": 205, "Rm": 515, "densite": 7.9, "t_max": 1100, "cout": 8.0, "Sf": 220, "N_D": 1e7, "alpha": 15.9, "conductivite": 14.2, "nu": 0.29, "usage": "réfractaire > 400 °C"},
+    "Aluminium": {"E": 70e3, "Re": 120, "Rm": 180, "densite": 2.7, "t_max": 150, "cout": 3.0, "Sf": 55, "N_D": 5e8, "alpha": 23.6, "conductivite": 220, "nu": 0.33, "usage": "usage général"},
+    "Aluminium 2017": {"E": 73e3, "Re": 395, "Rm": 430, "densite": 2.8, "t_max": 150, "cout": 5.0, "Sf": 125, "N_D": 5e8, "alpha": 22.9, "conductivite": 134, "nu": 0.33, "usage": "léger, petits moteurs"},
+    "Alu 6061-T6": {"E": 69e3, "Re": 276, "Rm": 310, "densite": 2.7, "t_max": 150, "cout": 4.0, "Sf": 95, "N_D": 5e8, "alpha": 23.6, "conductivite": 167, "nu": 0.33, "usage": "structure, usinage"},
+    "Alu 7075-T6": {"E": 72e3, "Re": 500, "Rm": 560, "densite": 2.8, "t_max": 120, "cout": 7.0, "Sf": 160, "N_D": 5e8, "alpha": 23.4, "conductivite": 130, "nu": 0.33, "usage": "léger / compétition"},
+    "Titane": {"E": 116e3, "Re": 950, "Rm": 1000, "densite": 4.5, "t_max": 400, "cout": 30.0, "Sf": 480, "N_D": 1e7, "alpha": 8.6, "conductivite": 22, "nu": 0.32, "usage": "haute perf"},
+    "Titane Grade 5": {"E": 114e3, "Re": 830, "Rm": 900, "densite": 4.43, "t_max": 400, "cout": 30.0, "Sf": 500, "N_D": 1e7, "alpha": 8.6, "conductivite": 6.7, "nu": 0.34, "usage": "haute perf / aviation"},
+    "Cuivre": {"E": 110e3, "Re": 210, "Rm": 250, "densite": 8.96, "t_max": 200, "cout": 9.0, "Sf": 70, "N_D": 1e8, "alpha": 17, "conductivite": 390, "nu": 0.34, "usage": "échangeurs"},
+    "Laiton": {"E": 100e3, "Re": 200, "Rm": 350, "densite": 8.5, "t_max": 200, "cout": 7.0, "Sf": 100, "N_D": 1e8, "alpha": 19, "conductivite": 110, "nu": 0.34, "usage": "bagues, frottement"},
+    "Graphite": {"E": 11e3, "Re": 40, "Rm": 45, "densite": 1.9, "t_max": 300, "cout": 20.0, "Sf": 15, "N_D": 1e7, "alpha": 4, "conductivite": 120, "nu": 0.2, "usage": "piston sec, autolubrifiant"},
+    "ABS": {"E": 2.3e3, "Re": 45, "Rm": 45, "densite": 1.04, "t_max": 80, "cout": 3.0, "Sf": 12, "N_D": 1e7, "alpha": 90, "conductivite": 0.17, "nu": 0.35, "usage": "prototypes"},
+    "Bakelite": {"E": 3.5e3, "Re": 90, "Rm": 90, "densite": 1.3, "t_max": 150, "cout": 4.0, "Sf": 25, "N_D": 1e7, "alpha": 25, "conductivite": 0.2, "nu": 0.35, "usage": "isolant"},
+    "Composite Carbone": {"E": 150e3, "Re": 600, "Rm": 600, "densite": 1.55, "t_max": 120, "cout": 40.0, "Sf": 300, "N_D": 1e7, "alpha": 2, "conductivite": 5, "nu": 0.3, "usage": "structure légère"},
+    "PEEK": {"E": 3.6e3, "Re": 100, "Rm": 100, "densite": 1.3, "t_max": 250, "cout": 90.0, "Sf": 40, "N_D": 1e7, "alpha": 47, "conductivite": 0.25, "nu": 0.4, "usage": "isolant chaud"},
+    "Nylon": {"E": 2.5e3, "Re": 50, "Rm": 70, "densite": 1.15, "t_max": 90, "cout": 4.0, "Sf": 20, "N_D": 1e7, "alpha": 100, "conductivite": 0.25, "nu": 0.4, "usage": "pignons, guides"},
+    "PVC": {"E": 3e3, "Re": 60, "Rm": 60, "densite": 1.4, "t_max": 60, "cout": 2.0, "Sf": 15, "N_D": 1e7, "alpha": 70, "conductivite": 0.17, "nu": 0.38, "usage": "carters"},
+    "Verre": {"E": 70e3, "Re": 50, "Rm": 50, "densite": 2.5, "t_max": 500, "cout": 3.0, "Sf": 20, "N_D": 1e7, "alpha": 9, "conductivite": 1, "nu": 0.22, "usage": "hublots"},
+    "Bois (chêne)": {"E": 11e3, "Re": 90, "Rm": 90, "densite": 0.75, "t_max": 100, "cout": 3.0, "Sf": 25, "N_D": 1e7, "alpha": 5, "conductivite": 0.17, "nu": 0.3, "usage": "bâtis"},
 }
+
+CHAMPS = ("E", "Re", "Rm", "densite", "t_max", "cout", "Sf", "N_D", "alpha", "conductivite", "nu")
+CHAMPS_INDEXES = ("E", "Re", "densite")
+VERSION_STOCKAGE = 3
+
+# En-têtes usuels des catalogues fournisseurs -> champ
+ALIAS = {
+    "nom": "nom", "name": "nom", "nuance": "nom", "grade": "nom", "designation": "nom", "désignation": "nom",
+    "e": "E", "young": "E", "module": "E",
+    "re": "Re", "rp02": "Re", "rp0.2": "Re", "yield": "Re", "limite_elastique": "Re",
+    "rm": "Rm", "uts": "Rm", "tensile": "Rm",
+    "densite": "densite", "densité": "densite", "rho": "densite", "density": "densite", "masse_volumique": "densite",
+    "t_max": "t_max", "tmax": "t_max", "temperature_max": "t_max",
+    "cout": "cout", "coût": "cout", "prix": "cout", "price": "cout", "cost": "cout",
+    "sf": "Sf", "se": "Sf", "fatigue": "Sf", "endurance": "Sf", "limite_fatigue": "Sf",
+    "n_d": "N_D", "nd": "N_D", "cycles_coude": "N_D",
+    "alpha": "alpha", "dilatation": "alpha", "cte": "alpha",
+    "conductivite": "conductivite", "conductivité": "conductivite", "lambda": "conductivite", "conductivity": "conductivite",
+    "nu": "nu", "poisson": "nu",
+}
+
+_CATALOGUE = None
+
+
+# ----------------- Lecture des sources -----------------
+
+def _nombre(texte):
+    if texte is None:
+        return np.nan
+    texte = str(texte).strip().replace("\u00a0", "").replace("\u202f", "").replace(" ", "").replace(",", ".")
+    try:
+        return float(texte)
+    except ValueError:
+        return np.nan
+
+
+def lire_source(chemin):
+    """Lit un catalogue CSV (séparateur , ou ;) ou JSON -> (noms, {champ: valeurs})"""
+    ext = os.path.splitext(chemin)[1].lower()
+    if ext == ".json":
+        with open(chemin, encoding="utf-8") as f:
+            donnees = json.load(f)
+        if isinstance(donnees, dict):  # format MATERIAUX : {nom: {propriétés}}
+            donnees = [dict(props, nom=nom) for nom, props in donnees.items()]
+        lignes = [{ALIAS.get(str(k).strip().lower(), k): v for k, v in d.items()} for d in donnees]
+    elif ext in (".csv", ".txt"):
+        with open(chemin, encoding="utf-8-sig", newline="") as f:
+            echantillon = f.read(4096)
+            f.seek(0)
+            try:
+                dialecte = csv.Sniffer().sniff(echantillon, delimiters=",;\t")
+            except csv.Error:
+                dialecte = csv.excel
+            lecteur = csv.reader(f, dialecte)
+            entetes = [ALIAS.get(h.strip().lower(), h.strip()) for h in next(lecteur)]
+            lignes = [dict(zip(entetes, ligne)) for ligne in lecteur if ligne]
+    else:
+        raise ValueError(f"Format de catalogue non pris en charge : {ext}")
+    if lignes and "nom" not in lignes[0]:
+        raise ValueError(f"{os.path.basename(chemin)} : colonne de nom introuvable")
+    noms = [str(l.get("nom", "")).strip() for l in lignes]
+    colonnes = {champ: np.array([_nombre(l.get(champ)) for l in lignes], dtype=float) for champ in CHAMPS}
+    garder = np.array([bool(n) for n in noms], dtype=bool) & ~np.isnan(colonnes["Re"])
+    return [n for n, g in zip(noms, garder) if g], {c: v[garder] for c, v in colonnes.items()}
+
+
+def _source_interne():
+    noms = list(MATERIAUX)
+    return noms, {c: np.array([MATERIAUX[n].get(c, np.nan) for n in noms], dtype=float) for c in CHAMPS}
+
+
+# ----------------- Catalogue -----------------
+
+class Catalogue:
+    """Colonnes de propriétés + index triés ; cat["Re"] renvoie la colonne, len(cat) le nombre de nuances"""
+
+    def __init__(self, noms, colonnes, index=None, noms_min=None):
+        self.noms = noms
+        self._colonnes = colonnes
+        self._noms_min = noms_min
+        if index is None:
+            index = {}
+            for champ in CHAMPS_INDEXES:
+                ordre = np.argsort(colonnes[champ], kind="stable").astype(np.int32)
+                index[champ] = (colonnes[champ][ordre], ordre)
+        self._index = index
+        self._positions = None
+
+    @classmethod
+    def depuis_sources(cls, sources):
+        """Assemble MATERIAUX et les fichiers fournisseurs (en mémoire)"""
+        morceaux = [_source_interne()] + [lire_source(s) for s in sources]
+        noms = np.array([n for m in morceaux for n in m[0]])
+        colonnes = {c: np.concatenate([m[1][c] for m in morceaux]) for c in CHAMPS}
+        # Rm non renseigné : on retient Re
+        colonnes["Rm"] = np.where(np.isnan(colonnes["Rm"]), colonnes["Re"], colonnes["Rm"])
+        return cls(noms, colonnes)
+
+    # ---- stockage en colonnes ----
+    def enregistrer(self, dossier):
+        fichiers = {"noms": self.noms, "noms_min": self._noms_minuscules(), **self._colonnes}
+        for champ, (valeurs, ordre) in self._index.items():
+            fichiers[f"tri_{champ}"] = valeurs
+            fichiers[f"ordre_{champ}"] = ordre
+        for nom, tableau in fichiers.items():
+            ecrire_atomique(os.path.join(dossier, f"{nom}.npy"), lambda f, t=tableau: np.save(f, np.asarray(t)))
+        # Marqueur écrit en dernier : un stockage incomplet n'est jamais relu
+        ecrire_atomique(os.path.join(dossier, "complet"), lambda f: f.write(b"1"))
+
+    @classmethod
+    def ouvrir(cls, dossier):
+        if not os.path.exists(os.path.join(dossier, "complet")):
+            return None
+        ouvrir = lambda nom: np.load(os.path.join(dossier, f"{nom}.npy"), mmap_mode="r")
+        index = {c: (ouvrir(f"tri_{c}"), ouvrir(f"ordre_{c}")) for c in CHAMPS_INDEXES}
+        return cls(ouvrir("noms"), {c: ouvrir(c) for c in CHAMPS}, index, ouvrir("noms_min"))
+
+    # ---- accès ----
+    def __len__(self):
+        return len(self.noms)
+
+    def __getitem__(self, champ):
+        return self._colonnes[champ]
+
+    def __contains__(self, nom):
+        return nom in self._positions_noms()
+
+    def _positions_noms(self):
+        if self._positions is None:
+            self._positions = {str(n): i for i, n in enumerate(self.noms)}
+        return self._positions
+
+    def indice(self, nom):
+        try:
+            return self._positions_noms()[nom]
+        except KeyError:
+            raise ValueError(f"Matériau '{nom}' introuvable dans la base.") from None
+
+    def proprietes(self, nom_ou_indice):
+        """dict {nom, E, Re, …} d'une nuance (les nuances internes gardent leur description)"""
+        i = nom_ou_indice if isinstance(nom_ou_indice, (int, np.integer)) else self.indice(nom_ou_indice)
+        nom = str(self.noms[i])
+        if nom in MATERIAUX:
+            return dict(MATERIAUX[nom], nom=nom)
+        return dict({c: float(self._colonnes[c][i]) for c in CHAMPS}, nom=nom)
+
+    # ---- requêtes ----
+    def plage(self, champ, mini=None, maxi=None):
+        """Indices des nuances avec mini <= champ <= maxi (recherche dichotomique sur l'index trié)"""
+        valeurs, ordre = self._index[champ]
+        debut = 0 if mini is None else np.searchsorted(valeurs, mini, side="left")
+        fin = np.searchsorted(valeurs, np.inf if maxi is None else maxi, side="right")
+        return ordre[debut:fin]
+
+    def requete(self, texte="", parmi=None, **bornes):
+        """
+        Indices (ordre du catalogue) des nuances dont le nom contient tous les mots de texte
+        et qui respectent les bornes champ=(mini, maxi), inclusives, None = pas de borne.
+        La plage indexée la plus sélective est prise en premier ; les autres bornes ne
+        filtrent que ce sous-ensemble.
+        """
+        idx = None if parmi is None else np.asarray(parmi)
+        indexees = [c for c in bornes if c in self._index]
+        if indexees and idx is None:
+            plages = [self.plage(c, *bornes[c]) for c in indexees]
+            idx = min(plages, key=len)
+        if idx is None:
+            idx = np.arange(len(self))
+        for champ, (mini, maxi) in bornes.items():
+            if idx.size == 0:
+                break
+            v = self._colonnes[champ][idx]
+            garde = np.ones(idx.size, dtype=bool)
+            if mini is not None:
+                garde &= v >= mini
+            if maxi is not None:
+                garde &= v <= maxi
+            idx = idx[garde]
+        if texte.strip() and idx.size:
+            noms = self._noms_minuscules()
+            for mot in texte.lower().split():
+                idx = idx[np.char.find(noms[idx], mot) >= 0]
+        return np.sort(idx)
+
+    def _noms_minuscules(self):
+        if self._noms_min is None:
+            self._noms_min = np.array([n.lower() for n in np.asarray(self.noms).tolist()])
+        return self._noms_min
+
+
+# Mini-langage de filtre : "re>400 densite<3 inox"
+_ALIAS_REQUETE = {"e": "E", "re": "Re", "rm": "Rm", "rho": "densite", "densite": "densite", "densité": "densite",
+                  "tmax": "t_max", "t_max": "t_max", "cout": "cout", "coût": "cout", "prix": "cout",
+                  "sf": "Sf"}
+_CONDITION = re.compile(r"^([a-zé_]+)\s*(<=|>=|<|>|=)\s*([-+0-9.,eE]+)$", re.IGNORECASE)
+
+
+def analyser_requete(texte):
+    """"re>400 densite<3 acier" -> ("acier", {"Re": (400, None), "densite": (None, 3)})"""
+    mots, bornes = [], {}
+    # Colle les opérateurs isolés ("re > 400") à leurs voisins
+    texte = re.sub(r"\s*(<=|>=|<|>|=)\s*", r"\1", texte)
+    for morceau in texte.split():
+        m = _CONDITION.match(morceau)
+        champ = _ALIAS_REQUETE.get(m.group(1).lower()) if m else None
+        valeur = _nombre(m.group(3)) if m else np.nan
+        if champ is None or np.isnan(valeur):
+            mots.append(morceau)
+            continue
+        mini, maxi = bornes.get(champ, (None, None))
+        op = m.group(2)
+        if op in (">", ">=", "="):
+            mini = valeur if mini is None else max(mini, valeur)
+        if op in ("<", "<=", "="):
+            maxi = valeur if maxi is None else min(maxi, valeur)
+        bornes[champ] = (mini, maxi)
+    return " ".join(mots), bornes
+
+
+# ----------------- Catalogue de l'application -----------------
+
+def _fichier_sources():
+    dossier = dossier_cache("materiaux")
+    return os.path.join(dossier, "sources.json") if dossier else None
+
+
+def sources():
+    """Catalogues fournisseurs importés (chemins existants)"""
+    chemin = _fichier_sources()
+    if not chemin or not os.path.exists(chemin):
+        return []
+    try:
+        with open(chemin, encoding="utf-8") as f:
+            return [s for s in json.load(f) if os.path.exists(s)]
+    except (OSError, ValueError):
+        return []
+
+
+def _cle(liste_sources):
+    h = hashlib.blake2b(digest_size=12)
+    h.update(json.dumps([VERSION_STOCKAGE, MATERIAUX], sort_keys=True).encode())
+    for s in liste_sources:
+        st = os.stat(s)
+        h.update(f"{os.path.abspath(s)}|{st.st_size}|{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+
+def catalogue():
+    """Catalogue complet (MATERIAUX + sources importées), ouvert en mémoire partagée depuis le cache"""
+    global _CATALOGUE
+    if _CATALOGUE is None:
+        liste = sources()
+        racine = dossier_cache("materiaux")
+        if racine is None:
+            _CATALOGUE = Catalogue.depuis_sources(liste)
+            return _CATALOGUE
+        dossier = os.path.join(racine, _cle(liste))
+        cat = Catalogue.ouvrir(dossier)
+        if cat is None:
+            os.makedirs(dossier, exist_ok=True)
+            Catalogue.depuis_sources(liste).enregistrer(dossier)
+            cat = Catalogue.ouvrir(dossier)
+            # Stockages périmés (sources modifiées ou retirées)
+            for nom in os.listdir(racine):
+                ancien = os.path.join(racine, nom)
+                if ancien != dossier and os.path.isdir(ancien):
+                    shutil.rmtree(ancien, ignore_errors=True)
+        _CATALOGUE = cat
+    return _CATALOGUE
+
+
+def importer(chemin):
+    """Ajoute un catalogue fournisseur (CSV/JSON), retenu pour les sessions suivantes ; renvoie le nombre de nuances lues"""
+    noms, _ = lire_source(chemin)  # lève ValueError si le fichier est illisible
+    global _CATALOGUE
+    liste = sources()
+    chemin = os.path.abspath(chemin)
+    if chemin not in liste:
+        liste.append(chemin)
+    fichier = _fichier_sources()
+    if fichier:
+        ecrire_atomique(fichier, lambda f: f.write(json.dumps(liste, ensure_ascii=False).encode()))
+        _CATALOGUE = None
+    else:
+        _CATALOGUE = Catalogue.depuis_sources(liste)
+    return len(noms)
+
+
+def proprietes(nom):
+    """Propriétés d'un matériau avec son nom (dict du type MATERIAUX_BIELLE)"""
+    if nom in MATERIAUX:
+        return dict(MATERIAUX[nom], nom=nom)
+    return catalogue().proprietes(nom)
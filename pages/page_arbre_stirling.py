@@ -2,9 +2,12 @@
 
 import tkinter as tk
 from styles import COULEURS, bouton_flat
+from etat_conception import remplir_champ
+from canevas_schema import CanevasSchema
 import numpy as np
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from materiaux import catalogue
+from calculs.pieces_stirling import DIAMETRES_ARBRE_STD, arbre
+from calculs.dynamique_arbre import MARGE_CRITIQUE, PENTE_MAX_PALIER, admissibles, arbre_volant
 
 class PageArbreStirling(tk.Frame):
     def __init__(self, parent, controller):
@@ -16,7 +19,8 @@ class PageArbreStirling(tk.Frame):
 
         descr = (
             "Cette page calcule les dimensions principales de l'arbre de sortie du moteur Stirling :\n"
-            "résistance à la torsion, choix de l’acier, tolérance ajustée selon l’assemblage (palier, volant, poulie, etc.)."
+            "résistance à la torsion, choix de l’acier, tolérance ajustée selon l’assemblage (palier, volant, poulie, etc.).\n"
+            "Chaque Ø standard est vérifié en éléments finis (Timoshenko) : flexion, pente aux paliers, vitesses critiques."
         )
         tk.Label(self, text=descr, bg=COULEURS["fond"], fg=COULEURS["texte"], font=("Segoe UI", 10)).pack()
 
@@ -27,16 +31,21 @@ class PageArbreStirling(tk.Frame):
         self.L_arbre = self._champ(form, "Longueur arbre (mm)", 1, default="110")
         self.tol = self._champ(form, "Tolérance sécurité (%)", 2, default="20")
         self.mat_arbre = self._champ(form, "Matériau (ex: 42CrMo4 ou S355)", 3, default="Acier 42CrMo4")
+        self.rpm_max = self._champ(form, "Vitesse maxi (tr/min)", 4, default="1500")
+        self.entraxe = self._champ(form, "Entraxe paliers (mm)", 5, default="70")
+        self.masse_volant = self._champ(form, "Masse volant en bout (kg)", 6, default="2")
+        self.D_volant = self._champ(form, "Ø volant (mm)", 7, default="200")
 
         bouton_flat(form, "Calculer l’arbre", self.calculer_arbre).grid(row=8, columnspan=2, pady=10)
-        bouton_flat(form, "Retour", lambda: controller.afficher_page(controller.frames.keys()[0])).grid(row=9, columnspan=2, pady=4)
+        bouton_flat(form, "Retour", lambda: controller.afficher_page("PageAccueil")).grid(row=9, columnspan=2, pady=4)
 
         self.resultat = tk.Label(self, text="", bg=COULEURS["fond"], fg=COULEURS["accent"],
                                  font=("Consolas", 10), justify="left")
         self.resultat.pack(pady=10)
-        self.canvas = None
+        self.schema = None
+        self.campbell = None
 
-        self.prefill_from_memo()
+        self.controller.etat.abonner(self.prefill_from_memo, ["puissance", "d_cyl", "rpm"])
 
     def _champ(self, parent, label, row, default=""):
         tk.Label(parent, text=label, bg=COULEURS["fond"], fg=COULEURS["texte"],
@@ -46,15 +55,14 @@ class PageArbreStirling(tk.Frame):
         e.grid(row=row, column=1, padx=7)
         return e
 
-    def prefill_from_memo(self):
-        memo = getattr(self.controller, "memo_moteur_stirling", {})
-        if memo.get("puissance") and memo.get("d_cyl"):
-            P = float(memo["puissance"])
-            d_cyl = float(memo["d_cyl"])
+    def prefill_from_memo(self, etat, changes):
+        if "puissance" in changes and etat.get("d_cyl"):
+            P = etat.puissance
             # Estimation couple typique pour démarrage
             C = P / (2 * np.pi * 400 / 60)  # à 400 tr/min par défaut
-            self.couple.delete(0, tk.END)
-            self.couple.insert(0, f"{C:.2f}")
+            remplir_champ(self.couple, C, "{:.2f}")
+        if "rpm" in changes and etat.rpm:
+            remplir_champ(self.rpm_max, 1.5 * etat.rpm, "{:.0f}")  # emballement à vide
 
     def calculer_arbre(self):
         try:
@@ -62,6 +70,10 @@ class PageArbreStirling(tk.Frame):
             L = float(self.L_arbre.get())
             tol = float(self.tol.get()) / 100
             mat = self.mat_arbre.get().strip() or "Acier 42CrMo4"
+            rpm_max = float(self.rpm_max.get())
+            entraxe = float(self.entraxe.get())
+            masse_volant = float(self.masse_volant.get())
+            D_volant = float(self.D_volant.get())
 
             # Résistance admissible (Pa) pour acier courants
             if "42crmo4" in mat.lower():
@@ -71,13 +83,26 @@ class PageArbreStirling(tk.Frame):
             else:
                 Re = 600e6  # Valeur prudente
 
-            tau_adm = 0.5 * (1 - tol) * Re
-
-            # Ø arbre mini sous torsion (formule EN 10277-2)
-            d_arbre = ((16 * C) / (np.pi * tau_adm)) ** (1/3) * 1000  # mm
-
-            # Conseil : choisir un diamètre commercial standard (arrondi)
-            diam_std = min([x for x in [15, 18, 20, 22, 25, 30, 35, 40] if x >= d_arbre], default=round(d_arbre+2))
+            try:
+                props = catalogue().proprietes(mat)
+                E, densite = float(props["E"]), float(props["densite"])
+            except ValueError:
+                E, densite = 210e3, 7.85  # acier
+
+            # Ø arbre mini sous torsion (formule EN 10277-2), puis tous les Ø standard au-dessus
+            # analysés ensemble en éléments finis ; on garde le plus petit qui tient la contrainte
+            # (von Mises), la pente aux paliers et la marge à la 1re vitesse critique
+            cotes = arbre(C, tol, Re)
+            d_arbre = float(cotes["d_arbre"])
+            candidats = np.unique(np.append(DIAMETRES_ARBRE_STD[DIAMETRES_ARBRE_STD >= d_arbre], float(cotes["d_arbre_std"])))
+            res = arbre_volant(L, entraxe, candidats[:, None], masse_volant, D_volant, C, E, densite, rpm_max)
+            sigma_adm = np.sqrt(3) * 0.5 * (1 - tol) * Re / 1e6
+            ok = admissibles(res, rpm_max, sigma_adm)
+            i = int(np.argmax(ok)) if ok.any() else len(candidats) - 1
+            diam_std = float(candidats[i])
+            critique, critique_ar = float(res["critiques_avant"][i, 0]), float(res["critiques_arriere"][i, 0])
+            pente = float(np.abs(res["pente_paliers"][i]).max())
+            verdict = "" if ok[i] else "\n⚠️ Aucun Ø standard ne tient tous les critères : revoir l'entraxe des paliers ou le porte-à-faux."
 
             # Usinage/assemblage
             tolerance_arbre = "h6" if diam_std < 40 else "h7"
@@ -92,6 +117,11 @@ class PageArbreStirling(tk.Frame):
                 f"- Matériau conseillé : {mat} (Re={Re/1e6:.0f} MPa)\n"
                 f"- Diamètre mini calculé : {d_arbre:.2f} mm\n"
                 f"- Ø nominal recommandé : {diam_std:.1f} mm (tolérance {tolerance_arbre})\n"
+                f"- Contrainte maxi (flexion + torsion) : {float(res['contrainte'][i].max()):.1f} MPa (admissible {sigma_adm:.0f} MPa)\n"
+                f"- Flèche au volant : {float(res['fleche'][i, -1]) * 1000:.1f} µm, pente aux paliers "
+                f"{pente * 1000:.2f} mrad (maxi {PENTE_MAX_PALIER * 1000:.1f})\n"
+                f"- 1re vitesse critique : {critique:.0f} tr/min en précession directe, {critique_ar:.0f} en rétrograde "
+                f"(à {critique / rpm_max:.1f} × la vitesse maxi, mini {MARGE_CRITIQUE}){verdict}\n"
                 f"- Finition : surface usinée Ra ≤ 1.6 µm, congés aux épaulements"
             )
 
@@ -103,30 +133,47 @@ class PageArbreStirling(tk.Frame):
 - Graissage conseillé pour montage dans les paliers (bague bronze ou roulement à billes).
 """)
             self.afficher_schema(diam_std, L)
+            self.afficher_campbell(res, i, rpm_max)
         except Exception as e:
             self.resultat.config(text=f"Erreur : {str(e)}")
-            if self.canvas:
-                self.canvas.get_tk_widget().destroy()
-                self.canvas = None
+            if self.schema:
+                self.schema.masquer()
+            if self.campbell:
+                self.campbell.masquer()
 
     def afficher_schema(self, d, L):
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-        import matplotlib.patches as mpatches
-        fig = Figure(figsize=(6, 1.2), dpi=100)
-        ax = fig.add_subplot(111)
+        if self.schema is None:
+            self.schema = CanevasSchema(self, figsize=(6, 1.2), pady=5)
+        s = self.schema
         y0 = 0.7
         # Arbre (vue de côté)
-        ax.add_patch(mpatches.Rectangle((0, y0 - d/200), L, d/100, color="#bbb", label="Arbre"))
+        s.rectangle("arbre", (0, y0 - d/200), L, d/100, color="#bbb", label="Arbre")
         # Côtes
-        ax.annotate(f"{L:.0f} mm", xy=(L/2, y0 + d/80), xytext=(L/2, y0 + d/30),
-                    ha="center", arrowprops=dict(arrowstyle="<->"))
-        ax.annotate(f"Ø {d:.1f} mm", xy=(L + 8, y0), xytext=(L + 14, y0),
-                    ha="left", va="center")
-        ax.set_xlim(-10, L + 40)
-        ax.set_ylim(y0 - 0.2, y0 + 0.3)
-        ax.axis("off")
-        ax.set_title("Croquis technique arbre (vue latérale)")
-        self.canvas = FigureCanvasTkAgg(fig, master=self)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(pady=5)
+        s.cote("L", f"{L:.0f} mm", (L/2, y0 + d/80), (L/2, y0 + d/30),
+               ha="center", arrowprops=dict(arrowstyle="<->"))
+        s.cote("d", f"Ø {d:.1f} mm", (L + 8, y0), (L + 14, y0),
+               ha="left", va="center")
+        s.limites((-10, L + 40), (y0 - 0.2, y0 + 0.3))
+        s.titre("Croquis technique arbre (vue latérale)")
+        s.rafraichir()
+
+    def afficher_campbell(self, res, i, rpm_max):
+        """Diagramme de Campbell du Ø retenu : précessions directe / rétrograde et droite synchrone"""
+        if self.campbell is None:
+            self.campbell = CanevasSchema(self, figsize=(6, 2.6), pady=5)
+            ax = self.campbell.ax
+            ax.axis("on")
+            ax.set_xlabel("Vitesse (tr/min)")
+            ax.set_ylabel("Fréquence (cycles/min)")
+            ax.grid(True, alpha=0.3)
+            self.campbell.fig.tight_layout()
+        s = self.campbell
+        rpm = res["rpm"]
+        for k in range(res["campbell_avant"].shape[-1]):
+            s.ligne(("avant", k), rpm, res["campbell_avant"][i, :, k], color=COULEURS["primaire"], lw=1.5)
+            s.ligne(("arriere", k), rpm, res["campbell_arriere"][i, :, k], color="#d9534f", lw=1, ls="--")
+        s.ligne("synchrone", rpm, rpm, color="k", lw=1)
+        haut = max(float(res["campbell_avant"][i, -1, 0]), rpm_max) * 1.2
+        s.limites((0, rpm_max), (0, haut))
+        s.titre("Diagramme de Campbell (directe —, rétrograde --)", fontsize=10)
+        s.rafraichir()
@@ -1,32 +1,40 @@
 # pages\page_bielle_stirling.py
 
 import tkinter as tk
+from tkinter import filedialog
 from styles import COULEURS, bouton_flat
+from etat_conception import remplir_champ
+from canevas_schema import CanevasSchema
 import numpy as np
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-# Propriétés matériaux courants pour la bielle (Re en MPa, densité en g/cm3)
-MATERIAUX_BIELLE = [
-    {"nom": "Acier 42CrMo4", "Re": 900, "Rm": 1100, "densite": 7.85, "usage": "standard / haute charge"},
-    {"nom": "Acier S355", "Re": 355, "Rm": 510, "densite": 7.85, "usage": "moyenne charge"},
-    {"nom": "Alu 7075-T6", "Re": 500, "Rm": 560, "densite": 2.8, "usage": "léger / compétition"},
-    {"nom": "Titane Grade 5", "Re": 830, "Rm": 900, "densite": 4.4, "usage": "haute perf / aviation"},
-]
-
-def meilleur_materiau(Fmax, section_min):
-    """Propose le matériau optimal selon la contrainte et la masse finale"""
-    # Recherche du matériau ayant la contrainte requise et masse la plus faible
-    mini = None
-    best = None
-    for mat in MATERIAUX_BIELLE:
-        adm = mat["Re"] * 1e6 * 0.5  # coeff sécurité, section ajourée
-        if Fmax <= adm * section_min:
-            masse = section_min * 1000 * mat["densite"]  # volume = section*1mm, masse = densité*volume
-            if mini is None or masse < mini:
-                mini = masse
-                best = mat
-    return best or MATERIAUX_BIELLE[0]
+
+from materiaux import catalogue
+from calculs.pieces_stirling import bielle, piston
+from calculs.cinematique import efforts_moteur, extremes, amplitudes
+from calculs.selection_materiaux import traction, front, meilleur
+from calculs.fatigue import contrainte_bielle, dommages, duree_vie, lire_historiques
+
+E_MINI_BIELLE = 50e3  # MPa : écarte les matériaux trop souples (flambement, ovalisation des œils)
+
+def meilleur_materiau(Fmax, section_min, L, tol=0.2):
+    """
+    Matériau optimal sur tout le catalogue (section ajourée, coeff 0.5) : le plus léger
+    du front masse / marge / coût, la section géométrique section_min (mm²) étant un minimum.
+    Renvoie (propriétés, sélection, front [(nom, sélection)]).
+    """
+    cat = catalogue()
+    sel = traction(cat, Fmax, L, tol, section_mini=section_min, coeff=0.5, E_mini=E_MINI_BIELLE)
+    i = meilleur(sel, "masse")
+    if i < 0:
+        raise ValueError("Aucun matériau du catalogue ne tient l'effort.")
+    return cat.proprietes(i), sel[i], [(str(cat.noms[j]), sel[j]) for j in front(sel)]
+
+def texte_duree(heures):
+    return "illimitée" if not np.isfinite(heures) else f"{heures:.3g} h"
+
+
+def texte_repetitions(dommage):
+    return "illimité" if dommage <= 0 else f"{1 / dommage:.3g} répétitions"
+
 
 class PageBielleStirling(tk.Frame):
     def __init__(self, parent, controller):
@@ -48,21 +56,24 @@ class PageBielleStirling(tk.Frame):
 
         self.d_cyl = self._champ(form, "Diamètre cylindre (mm)", 0)
         self.rayon_manivelle = self._champ(form, "Rayon excentrique vilebrequin (mm)", 1)
-        self.f_max = self._champ(form, "Effort max transmis (N)", 2)
+        self.pression = self._champ(form, "Pression moyenne de cycle (bar)", 2)
         self.L_bielle = self._champ(form, "Longueur totale bielle (mm)", 3)
         self.d_tete_piston = self._champ(form, "Diamètre œil côté piston (mm)", 4)
         self.d_tete_vilebrequin = self._champ(form, "Diamètre œil côté maneton (mm)", 5)
         self.tol = self._champ(form, "Tolérance sécurité (%)", 6, default="20")
+        self.rpm = self._champ(form, "Régime (tr/min)", 7)
 
         bouton_flat(form, "Calculer la bielle", self.calculer_bielle).grid(row=8, columnspan=2, pady=10)
-        bouton_flat(form, "Retour", lambda: controller.afficher_page(list(self.controller.frames.keys())[0])).grid(row=9, columnspan=2, pady=4)
+        bouton_flat(form, "Fatigue d'un historique CSV…", self.fatigue_csv).grid(row=9, columnspan=2, pady=4)
+        bouton_flat(form, "Retour", lambda: controller.afficher_page("PageAccueil")).grid(row=10, columnspan=2, pady=4)
 
         self.resultat = tk.Label(self, text="", bg=COULEURS["fond"], fg=COULEURS["accent"],
                                  font=("Consolas", 10), justify="left")
         self.resultat.pack(pady=10)
-        self.canvas = None
+        self.schema = None
+        self.materiau = None  # matériau retenu au dernier calcul (fatigue d'un historique importé)
 
-        self.prefill_from_memo()
+        self.controller.etat.abonner(self.prefill_from_memo, ["d_cyl", "pression", "rpm"])
 
     def _champ(self, parent, label, row, default=""):
         tk.Label(parent, text=label, bg=COULEURS["fond"], fg=COULEURS["texte"],
@@ -72,45 +83,77 @@ class PageBielleStirling(tk.Frame):
         e.grid(row=row, column=1, padx=7)
         return e
 
-    def prefill_from_memo(self):
-        memo = getattr(self.controller, "memo_moteur_stirling", {})
-        if memo.get("d_cyl"):
-            self.d_cyl.delete(0, tk.END)
-            self.d_cyl.insert(0, str(memo["d_cyl"]))
-        if memo.get("d_cyl") and not self.rayon_manivelle.get():
-            self.rayon_manivelle.insert(0, f"{float(memo['d_cyl'])/2*0.6:.1f}")
-        if self.rayon_manivelle.get() and not self.L_bielle.get():
-            self.L_bielle.insert(0, f"{float(self.rayon_manivelle.get())*3:.1f}")
-        if memo.get("d_cyl"):
-            d_cyl = float(memo["d_cyl"])
-            self.d_tete_piston.insert(0, f"{max(0.35*d_cyl, 10):.1f}")
-            self.d_tete_vilebrequin.insert(0, f"{max(0.3*d_cyl, 8):.1f}")
-        if memo.get("pression") and memo.get("d_cyl"):
-            P = float(memo["pression"])*1e5
-            A = np.pi * (float(memo["d_cyl"])/2/1000)**2
-            self.f_max.insert(0, f"{P*A:.1f}")
+    def prefill_from_memo(self, etat, changes):
+        """Met à jour les cotes déduites des seuls champs moteur modifiés"""
+        d_cyl = etat.get("d_cyl")
+        if "d_cyl" in changes:
+            remplir_champ(self.d_cyl, d_cyl)
+            if not self.rayon_manivelle.get():
+                self.rayon_manivelle.insert(0, f"{d_cyl/2*0.6:.1f}")
+            if self.rayon_manivelle.get() and not self.L_bielle.get():
+                self.L_bielle.insert(0, f"{float(self.rayon_manivelle.get())*3:.1f}")
+            remplir_champ(self.d_tete_piston, max(0.35*d_cyl, 10), "{:.1f}")
+            remplir_champ(self.d_tete_vilebrequin, max(0.3*d_cyl, 8), "{:.1f}")
+        if "pression" in changes:
+            remplir_champ(self.pression, etat.pression)
+        if "rpm" in changes:
+            remplir_champ(self.rpm, etat.rpm)
 
     def calculer_bielle(self):
         try:
             d_cyl = float(self.d_cyl.get())
             r = float(self.rayon_manivelle.get())
-            F_max = float(self.f_max.get())
+            P_bar = float(self.pression.get())
+            rpm = float(self.rpm.get())
             L = float(self.L_bielle.get())
             d_t_pist = float(self.d_tete_piston.get())
             d_t_vil = float(self.d_tete_vilebrequin.get())
             tol = float(self.tol.get())/100
-
-            # Calculs section mini (sécurité intégrée)
-            # On cherche la section minimale avec la tolérance (ex: 20%)
-            # Hypothèse section rectangulaire ajourée, coeff 0.5
-            section_min = F_max / (0.5 * 400e6 * (1-tol)) * 1.6  # 400MPa: mini acier, 1.6 marge d’usinage
-
-            largeur_bielle = max(0.22*d_cyl, 8)
-            epaisseur_bielle = max(section_min / largeur_bielle, 4)
-
-            mat = meilleur_materiau(F_max, section_min)
-            masse_bielle = largeur_bielle * epaisseur_bielle * L * mat["densite"] * 1e-3 / 1000
-
+            etat = self.controller.etat
+            T_chaud, T_froide = etat.get("t_chaude", 650.0), etat.get("t_froide", 40.0)
+            masse_piston = round(float(piston(d_cyl)["masse_piston"]), 1)
+
+            # Efforts sur un tour (cycle de Schmidt, bielle-manivelle exacte, inertie du piston),
+            # puis une seconde passe avec la masse de la bielle retenue
+            masse_bielle = 0.0
+            for _ in range(2):
+                charges = efforts_moteur(d_cyl, 2 * r, L, P_bar, rpm, T_chaud, T_froide, masse_piston, masse_bielle)
+                crete = extremes(charges)
+                F_max = max(float(crete["F_bielle"]), float(crete["F_traction"]))
+                # Section mini (sécurité intégrée) : section rectangulaire ajourée, coeff 0.5
+                cotes = bielle(d_cyl, F_max, L, tol)
+                largeur_bielle = float(cotes["largeur_bielle"])
+                epaisseur_bielle = float(cotes["epaisseur_bielle"])
+                # Matériau : la section de fabrication est un minimum, un matériau plus faible l'épaissit
+                mat, choix, pareto = meilleur_materiau(F_max, largeur_bielle * epaisseur_bielle, L, tol)
+                masse_bielle = round(float(choix["masse"]), 1)
+            section_min = float(choix["dimension"])
+            epaisseur_bielle = section_min / largeur_bielle
+            masse_bielle = float(choix["masse"])
+            moyen, amplitude = amplitudes(charges, ("F_bielle",))["F_bielle"]
+            self.materiau = mat
+
+            # Fatigue : contrainte du corps sur un tour, répété à chaque tour (rainflow + Miner)
+            sigma = contrainte_bielle(charges, section_min)
+            D_goodman = float(dommages([sigma], mat, "goodman")[0][0])
+            D_gerber = float(dommages([sigma], mat, "gerber")[0][0])
+            fatigue_txt = (
+                f"- Contrainte : {sigma.mean():.1f} ± {(sigma.max() - sigma.min()) / 2:.1f} MPa "
+                f"(Sf {mat.get('Sf', float('nan')):.0f} MPa)\n"
+                f"- Durée de vie à {rpm:.0f} tr/min : Goodman {texte_duree(duree_vie(D_goodman, rpm))}, "
+                f"Gerber {texte_duree(duree_vie(D_gerber, rpm))}\n"
+            )
+            alternatives = "\n".join(
+                f"   {nom:<18} {r['masse']:8.1f} g  marge {r['marge']:5.2f}  {r['cout']:6.2f} €"
+                for nom, r in pareto[:6])
+
+            efforts_txt = (
+                f"- Compression crête : {float(crete['F_bielle']):.1f} N | traction crête : {float(crete['F_traction']):.1f} N\n"
+                f"- Effort cyclique : {float(moyen):.1f} ± {float(amplitude):.1f} N "
+                f"(gaz crête {float(crete['F_gaz']):.1f} N, inertie crête {np.abs(charges['F_inertie']).max():.1f} N)\n"
+                f"- Obliquité maxi : {np.degrees(charges['beta'].max()):.1f}° | poussée latérale maxi : {float(crete['F_laterale']):.1f} N\n"
+                f"- Accélération piston maxi : {np.abs(charges['a']).max():.0f} m/s² (piston {masse_piston:.0f} g)\n"
+            )
             plan_tech = (
                 f"- Longueur axe à axe : {L:.2f} mm\n"
                 f"- Largeur bielle : {largeur_bielle:.2f} mm\n"
@@ -135,42 +178,65 @@ class PageBielleStirling(tk.Frame):
             self.resultat.config(text=f"""
 🔩 **PLAN TECHNIQUE DE BIELLE - Moteur Stirling**\n
 {plan_tech}
+Efforts sur un tour ({rpm:.0f} tr/min, {P_bar:.1f} bar moyens) :
+{efforts_txt}
+Fatigue (rainflow, cumul de Miner) :
+{fatigue_txt}
 Masse estimée : {masse_bielle:.1f} g
 
+Front de Pareto matériaux (masse / marge / coût) :
+{alternatives}
+
 {conseils}
 """)
             self.afficher_schema(L, largeur_bielle, epaisseur_bielle, d_t_pist, d_t_vil)
         except Exception as e:
             self.resultat.config(text=f"Erreur : {str(e)}")
-            if self.canvas:
-                self.canvas.get_tk_widget().destroy()
-                self.canvas = None
+            if self.schema:
+                self.schema.masquer()
+
+    def fatigue_csv(self):
+        """Dommage d'historiques de contrainte importés (MPa, une colonne par cas) pour le matériau retenu"""
+        if self.materiau is None:
+            self.resultat.config(text="Calculer d'abord la bielle : le matériau retenu sert à la courbe S-N.")
+            return
+        chemin = filedialog.askopenfilename(title="Historiques de contrainte (MPa)",
+                                            filetypes=[("CSV", "*.csv *.txt"), ("Tous les fichiers", "*.*")])
+        if not chemin:
+            return
+        try:
+            noms, historiques = lire_historiques(chemin)
+            # Pool de processus seulement si le comptage l'emporte sur son démarrage
+            workers = None if sum(h.size for h in historiques) > 2_000_000 and len(historiques) > 1 else 1
+            lignes = []
+            for correction in ("goodman", "gerber"):
+                D, amplitude, n_cycles = dommages(historiques, self.materiau, correction, periodique=False, workers=workers)
+                lignes += [f"   {nom:<16} {correction:<8} {n:9d} cycles  amplitude maxi {a:7.1f} MPa  "
+                           f"dommage {d:.3g} -> {texte_repetitions(d)}"
+                           for nom, d, a, n in zip(noms, D, amplitude, n_cycles)]
+            self.resultat.config(text=f"Fatigue de {len(noms)} historique(s), {self.materiau['nom']} :\n" + "\n".join(lignes))
+        except (OSError, ValueError) as e:
+            self.resultat.config(text=f"Erreur : {str(e)}")
 
     def afficher_schema(self, L, largeur, epaisseur, d_t_pist, d_t_vil):
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-        import matplotlib.patches as mpatches
-        fig = Figure(figsize=(7, 1.8), dpi=100)
-        ax = fig.add_subplot(111)
+        if self.schema is None:
+            self.schema = CanevasSchema(self, figsize=(7, 1.8), pady=5)
+        s = self.schema
         y0 = 0.8
 
         # Œil piston
-        ax.add_patch(mpatches.Circle((0, y0), d_t_pist/20, color="#b6cef2", label="Œil piston"))
+        s.cercle("oeil_piston", (0, y0), d_t_pist/20, color="#b6cef2", label="Œil piston")
         # Corps bielle
-        ax.add_patch(mpatches.Rectangle((0, y0-epaisseur/30), L, epaisseur/15, color="#aaaaaa", label="Corps bielle"))
+        s.rectangle("corps", (0, y0-epaisseur/30), L, epaisseur/15, color="#aaaaaa", label="Corps bielle")
         # Œil maneton
-        ax.add_patch(mpatches.Circle((L, y0), d_t_vil/20, color="#ef767a", label="Œil maneton"))
-
-        ax.text(0, y0+0.19, "Œil piston", ha="center", color="#345")
-        ax.text(L/2, y0-0.17, "Corps bielle", ha="center", color="#555")
-        ax.text(L, y0+0.19, "Œil maneton", ha="center", color="#a33")
-
-        ax.annotate(f"{L:.1f} mm", xy=(L/2, y0+0.13), xytext=(L/2, y0+0.25),
-                    ha="center", arrowprops=dict(arrowstyle="<->"))
-        ax.set_xlim(-L*0.15, L*1.15)
-        ax.set_ylim(y0-0.4, y0+0.45)
-        ax.axis("off")
-        ax.set_title("Croquis technique bielle (vue de dessus)")
-        self.canvas = FigureCanvasTkAgg(fig, master=self)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(pady=5)
+        s.cercle("oeil_maneton", (L, y0), d_t_vil/20, color="#ef767a", label="Œil maneton")
+
+        s.texte("txt_piston", (0, y0+0.19), "Œil piston", ha="center", color="#345")
+        s.texte("txt_corps", (L/2, y0-0.17), "Corps bielle", ha="center", color="#555")
+        s.texte("txt_maneton", (L, y0+0.19), "Œil maneton", ha="center", color="#a33")
+
+        s.cote("L", f"{L:.1f} mm", (L/2, y0+0.13), (L/2, y0+0.25),
+               ha="center", arrowprops=dict(arrowstyle="<->"))
+        s.limites((-L*0.15, L*1.15), (y0-0.4, y0+0.45))
+        s.titre("Croquis technique bielle (vue de dessus)")
+        s.rafraichir()
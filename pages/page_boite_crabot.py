@@ -1,14 +1,4 @@
 import tkinter as tk
-import os
-from PIL import Image, ImageTk
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-from mpl_toolkits.basemap import Basemap
-from materiaux import MATERIAUX
-import math
-import pandas as pd
-import matplotlib.pyplot as plt
 from styles import COULEURS, bouton_flat
 
 class PageBoiteCrabot(tk.Frame):
@@ -44,19 +34,25 @@ class PageBoiteCrabot(tk.Frame):
                                  fg=COULEURS["texte"], font=("Segoe UI", 11), justify="left")
         self.resultat.pack(pady=10)
 
-        bouton_flat(self, "Retour", lambda: controller.afficher_page(PageAccueil)).pack(pady=10)
+        bouton_flat(self, "Retour", lambda: controller.afficher_page("PageAccueil")).pack(pady=10)
+
+        # Version de l'état moteur déjà importée (-1 : rien importé)
+        self.version_importee = -1
 
     def charger_depuis_stirling(self):
         """Pré-remplit les champs avec les valeurs du moteur Stirling s'ils existent."""
-        data = self.controller.memo_moteur_stirling if hasattr(self.controller, "memo_moteur_stirling") else {}
+        data = self.controller.etat
 
         if data:
-            if data.get("rpm"):
+            # Seuls les champs modifiés depuis le dernier import sont recopiés
+            changes = data.modifie_depuis(self.version_importee, ["rpm", "d_vilebrequin"])
+            self.version_importee = data.version
+            if "rpm" in changes and data.get("rpm"):
                 self.champs["v_in"].delete(0, tk.END)
                 self.champs["v_in"].insert(0, f"{data['rpm']:.0f}")
-            if data.get("vilebrequin"):
+            if "d_vilebrequin" in changes and data.get("d_vilebrequin"):
                 self.champs["d_arbre"].delete(0, tk.END)
-                self.champs["d_arbre"].insert(0, f"{data['vilebrequin']:.2f}")
+                self.champs["d_arbre"].insert(0, f"{data['d_vilebrequin']:.2f}")
             # Tu peux aussi pré-remplir "module" si tu le veux (par défaut à 2)
             self.champs["module"].delete(0, tk.END)
             self.champs["module"].insert(0, "2.0")
@@ -77,15 +73,13 @@ class PageBoiteCrabot(tk.Frame):
 
             # Remplissage automatique si possible
             if not v_in:
-                data = self.controller.memo_moteur_stirling if hasattr(self.controller, "memo_moteur_stirling") else {}
-                v_in = data.get("rpm", 1500)
+                v_in = self.controller.etat.get("rpm", 1500)
                 self.champs["v_in"].insert(0, str(int(v_in)))
             if not n:
                 n = 4
                 self.champs["nb_rapports"].insert(0, "4")
             if not d:
-                data = self.controller.memo_moteur_stirling if hasattr(self.controller, "memo_moteur_stirling") else {}
-                d = data.get("vilebrequin", 20)
+                d = self.controller.etat.get("d_vilebrequin", 20)
                 self.champs["d_arbre"].insert(0, f"{float(d):.2f}")
             if not m:
                 m = 2.0
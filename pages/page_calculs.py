@@ -1,15 +1,9 @@
 # pages\page_calculs.py
 import tkinter as tk
-import os
-from PIL import Image, ImageTk
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
-from mpl_toolkits.basemap import Basemap
-from materiaux import MATERIAUX
-import math
-import pandas as pd
-import matplotlib.pyplot as plt
+from materiaux import catalogue
+from liste_materiaux import ComboMateriau
+from calculs.selection_materiaux import traction, front
 from styles import COULEURS, bouton_flat
 
 class PageCalculs(tk.Frame):
@@ -31,7 +25,7 @@ class PageCalculs(tk.Frame):
         # Sélection du matériau
         tk.Label(self, text="Matériau :", bg=COULEURS["fond"], fg=COULEURS["texte"]).pack()
         self.materiau_var = tk.StringVar(value="Acier")
-        tk.OptionMenu(self, self.materiau_var, *MATERIAUX.keys()).pack()
+        ComboMateriau(self, self.materiau_var, width=28).pack()
 
         # Tolérance de sécurité
         tk.Label(self, text="Tolérance (%) :", bg=COULEURS["fond"], fg=COULEURS["texte"]).pack()
@@ -58,7 +52,7 @@ class PageCalculs(tk.Frame):
         self.resultat_label.pack(pady=10)
 
         bouton_flat(self, "Calculer les contraintes", self.calculer).pack(pady=10)
-        bouton_flat(self, "Retour", lambda: controller.afficher_page(PageAccueil)).pack(pady=10)
+        bouton_flat(self, "Retour", lambda: controller.afficher_page("PageAccueil")).pack(pady=10)
 
     def convertir_masse(self):
         try:
@@ -73,7 +67,7 @@ class PageCalculs(tk.Frame):
         try:
             tol = float(self.tolerance_var.get() or "20") / 100
             mat_selectionne = self.materiau_var.get()
-            prop = MATERIAUX[mat_selectionne]
+            prop = catalogue().proprietes(mat_selectionne)
             E = prop["E"]
             Re = prop["Re"]
 
@@ -125,16 +119,17 @@ class PageCalculs(tk.Frame):
             tau_torsion = T * (L / 2) / I if I else 0
             flambement = (np.pi ** 2 * E * I) / (L ** 2) if I else 0
 
-            # 6) Recherche meilleur matériau
-            meilleurs = []
-            for nom, props in MATERIAUX.items():
-                Re_mat = props["Re"]
-                if Re_mat == 0: continue
-                A_calc = (F / ((1 - tol) * Re_mat)) * 1e6 if F else 0
-                meilleurs.append((nom, A_calc))
-            meilleurs = [t for t in meilleurs if t[1] > 0]
-            meilleurs.sort(key=lambda x: x[1])
-            meilleur_mat, meilleure_section = (meilleurs[0] if meilleurs else ("-", 0))
+            # 6) Recherche meilleur matériau : tout le catalogue en un seul calcul
+            cat = catalogue()
+            meilleur_mat, meilleure_section, pareto = "-", 0, []
+            if F:
+                sel = traction(cat, F, L * 1000, tol)
+                valides = np.flatnonzero(sel["valide"])
+                if valides.size:
+                    i = valides[np.argmin(sel["dimension"][valides])]
+                    meilleur_mat, meilleure_section = cat.noms[i], sel["dimension"][i]
+                    pareto = [f"{cat.noms[j]} : {sel['masse'][j]:.1f} g, marge {sel['marge'][j]:.2f}, {sel['cout'][j]:.2f} €"
+                              for j in front(sel)[:5]]
 
             resultat = ""
             if log_auto:
@@ -150,6 +145,7 @@ Résistance limite du matériau : {Re:.2f} Pa
 """
             if meilleur_mat != "-":
                 resultat += f"\n✅ Meilleur matériau : {meilleur_mat}\n👉 Section minimale requise : {meilleure_section:.2f} mm²\n"
+                resultat += "\nFront de Pareto (masse / marge / coût) :\n- " + "\n- ".join(pareto) + "\n"
 
             self.resultat_label.config(text=resultat.strip())
         except Exception as e:
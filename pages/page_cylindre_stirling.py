@@ -3,7 +3,12 @@
 import tkinter as tk
 import numpy as np
 from styles import COULEURS, bouton_flat
-from materiaux import MATERIAUX
+from etat_conception import remplir_champ
+from canevas_schema import CanevasSchema
+from materiaux import MATERIAUX, proprietes
+from calculs.pieces_stirling import piston
+from calculs.cotation import AJUSTEMENT_PISTON, analyser, chaine_piston, qualite
+from calculs.thermique import cylindre_thermique, jeu_chaud, piston_thermique
 
 class PageCylindreStirling(tk.Frame):
     def __init__(self, parent, controller):
@@ -23,16 +28,17 @@ class PageCylindreStirling(tk.Frame):
         self.t_chaude = self._champ(form, "Température max (°C)", 3)
         self.tol = self._champ(form, "Tolérance (µm)", 4, default="40")
         self.materiau = self._champ(form, "Matériau", 5, default="Inox 304L")
+        self.materiau_piston = self._champ(form, "Matériau piston", 6, default="Aluminium 2017")
 
-        bouton_flat(form, "Calculer le cylindre", self.calculer).pack(pady=10)
+        bouton_flat(form, "Calculer le cylindre", self.calculer).grid(row=7, columnspan=2, pady=10)
         self.resultat = tk.Label(self, text="", bg=COULEURS["fond"], fg=COULEURS["accent"], font=("Consolas", 10), justify="left", anchor="w")
         self.resultat.pack(pady=10, fill="x")
 
-        self.canvas = None
+        self.schema = None
         bouton_flat(self, "Retour", lambda: controller.afficher_page("PageMoteurStirling")).pack(pady=15)
 
-        # Pré-remplir avec données moteur si dispo
-        self.precharge_data()
+        # Pré-remplir avec données moteur si dispo, puis suivre leurs modifications
+        self.controller.etat.abonner(self.precharge_data, ["d_cyl", "t_chaude", "h_cyl_utile"])
 
     def _champ(self, parent, label, row, default=""):
         tk.Label(parent, text=label, bg=COULEURS["fond"], fg=COULEURS["texte"],
@@ -42,13 +48,11 @@ class PageCylindreStirling(tk.Frame):
         e.grid(row=row, column=1, padx=10)
         return e
 
-    def precharge_data(self):
-        # Recharge depuis le moteur si dispo
-        memo = self.controller.memo_moteur_stirling
-        if memo:
-            if "d_cyl" in memo: self.d_cyl.delete(0, tk.END); self.d_cyl.insert(0, memo["d_cyl"])
-            if "t_chaude" in memo: self.t_chaude.delete(0, tk.END); self.t_chaude.insert(0, memo["t_chaude"])
-            if "h_cyl_utile" in memo: self.h_utile.delete(0, tk.END); self.h_utile.insert(0, memo["h_cyl_utile"])
+    def precharge_data(self, etat, changes):
+        # Recharge depuis le moteur les seuls champs modifiés
+        champs = {"d_cyl": self.d_cyl, "t_chaude": self.t_chaude, "h_cyl_utile": self.h_utile}
+        for cle in changes:
+            remplir_champ(champs[cle], etat.get(cle))
 
     def calculer(self):
         try:
@@ -63,7 +67,9 @@ class PageCylindreStirling(tk.Frame):
 
             # Calculs de base
             d_ext = d + 2 * ep
-            jeu_piston = 0.02 * d  # 2% du diamètre (ajustable)
+            # Jeu de montage de piston() avec l'alésage -0/+tol et le piston g6 : pire cas, RSS, Monte Carlo
+            qualite_alesage = qualite(d, tol / 1000)
+            empilage = analyser(*chaine_piston(d, (0.0, tol / 1000)))["jeu_piston"]
             rugosite = "Ra ≤ 0.4 µm"
             usinage = "Alesage, honage final, polissage intérieur"
             mat_rec = mat
@@ -72,65 +78,85 @@ class PageCylindreStirling(tk.Frame):
             vol_mm3 = np.pi * ((d_ext/2)**2 - (d/2)**2) * h
             masse = vol_mm3 * 8.0e-3 / 1000  # en g
 
+            # Paroi entre bout froid et tête chaude (gaz sous pression moyenne), piston galette entre les
+            # deux gaz : champs de température, contraintes, puis jeu piston/cylindre à chaud
+            etat = self.controller.etat
+            props = proprietes(mat)
+            props_piston = proprietes(self.materiau_piston.get().strip() or "Aluminium 2017")
+            t_froide = etat.get("t_froide", 40.0)
+            paroi = cylindre_thermique(d, ep, h, tmax, t_froide, props, etat.get("pression", 0.0))
+            cotes = piston(d, props_piston["densite"])
+            galette = piston_thermique(float(cotes["d_piston"]), float(cotes["epaisseur_piston"]), tmax, t_froide, props_piston)
+            jeu = jeu_chaud(float(cotes["jeu_lateral"]), paroi, galette)
+            i_min = int(np.argmin(jeu))
+            T_paroi, sigma_paroi = float(paroi["T_max"]), float(paroi["von_mises_max"])
+            alertes = ""
+            if T_paroi > props["t_max"] or sigma_paroi > props["Re"]:
+                alertes += (f"⚠️ Paroi hors limites : {T_paroi:.0f} °C (maxi {props['t_max']:.0f} °C), "
+                            f"{sigma_paroi:.0f} MPa (Re {props['Re']:.0f} MPa).\n")
+            if empilage["p_hors"] > 0.0027:
+                alertes += (f"⚠️ Jeu de montage hors [{empilage['mini']:.3f}, {empilage['maxi']:.3f}] mm pour "
+                            f"{empilage['p_hors']*100:.2f} % des pistons : resserrer la tolérance d'alésage.\n")
+            if jeu[i_min] <= 0:
+                alertes += (f"⚠️ Serrage à chaud à {paroi['z'][i_min]:.0f} mm du bout froid : augmenter le jeu "
+                            f"ou changer de matériau piston.\n")
+
             # Résumé fabrication + conseils SolidWorks
             plan = (
                 f"PLAN TECHNIQUE : CYLINDRE STIRLING\n"
                 f"---------------------------------------------------\n"
-                f"1. Ø intérieur (alésage) : {d:.2f} mm (tolérance -0/+{tol:.1f} µm)\n"
+                f"1. Ø intérieur (alésage) : {d:.2f} mm (tolérance -0/+{tol:.1f} µm, qualité IT{qualite_alesage})\n"
                 f"2. Ø extérieur : {d_ext:.2f} mm\n"
                 f"3. Épaisseur : {ep:.2f} mm (min 4 mm recommandé)\n"
                 f"4. Hauteur utile : {h:.2f} mm\n"
                 f"5. Température max service : {tmax:.1f} °C\n"
-                f"6. Jeu piston/cylindre : {jeu_piston:.2f} mm\n"
+                f"6. Jeu piston/cylindre (radial, piston {AJUSTEMENT_PISTON}) : {empilage['nominal']:.3f} mm nominal, "
+                f"{empilage['pire_cas'][0]:.3f} à {empilage['pire_cas'][1]:.3f} mm au pire cas,\n"
+                f"     {empilage['rss'][0]:.3f} à {empilage['rss'][1]:.3f} mm (RSS), {empilage['monte_carlo'][0]:.3f} "
+                f"à {empilage['monte_carlo'][1]:.3f} mm (Monte Carlo ± 3σ)\n"
                 f"7. Rugosité intérieure : {rugosite}\n"
                 f"8. Masse cylindre estimée : {masse:.1f} g\n"
                 f"9. Matériau recommandé : {mat_rec}\n"
+                f"10. Paroi à chaud : {T_paroi:.0f} °C maxi (limite {props['t_max']:.0f} °C), "
+                f"von Mises {sigma_paroi:.1f} MPa (Re {props['Re']:.0f} MPa, pression et gradient thermique)\n"
+                f"11. Jeu piston/cylindre à chaud : {jeu[i_min]:.3f} mm mini à {paroi['z'][i_min]:.0f} mm du bout froid "
+                f"(montage {float(cotes['jeu_lateral']):.3f} mm, piston {props_piston['nom']})\n"
                 f"\n"
                 f"Instructions SolidWorks :\n"
                 f"- Croquis extrudé sur {h:.2f} mm, Ø intérieur {d:.2f} mm.\n"
                 f"- Ø extérieur {d_ext:.2f} mm (épaisseur {ep:.2f} mm).\n"
-                f"- Appliquer la tolérance h7 (-0/+{tol:.1f} µm) sur l'alésage.\n"
+                f"- Appliquer la tolérance H{qualite_alesage} (-0/+{tol:.1f} µm) sur l'alésage.\n"
                 f"- Prévoir rainure(s) pour joints toriques si besoin.\n"
                 f"\n"
                 f"💡 Conseil : polir parfaitement l’alésage pour limiter usure piston.\n"
                 f"⚠️ Utiliser inox réfractaire si >400°C.\n"
+                + alertes
             )
             self.resultat.config(text=plan)
             self.afficher_schema(d, d_ext, h, ep)
         except Exception as e:
             self.resultat.config(text=f"Erreur : {str(e)}")
-            if self.canvas:
-                self.canvas.get_tk_widget().destroy()
-                self.canvas = None
+            if self.schema:
+                self.schema.masquer()
 
     def afficher_schema(self, d_int, d_ext, h, ep):
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-        import matplotlib.patches as mpatches
-        from matplotlib.figure import Figure
-        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-        fig = Figure(figsize=(5, 2.5), dpi=100)
-        ax = fig.add_subplot(111)
+        if self.schema is None:
+            self.schema = CanevasSchema(self, figsize=(5, 2.5), pady=8)
+            self.schema.fig.tight_layout()
+        s = self.schema
 
         # Coupe du cylindre (vue de côté)
         y0 = 0
-        ax.add_patch(mpatches.Rectangle((0, y0), ep, h, color="#ccc", label="Paroi"))
-        ax.add_patch(mpatches.Rectangle((ep, y0), d_int, h, color="#8ecae6", label="Alésage (gaz)"))
-        ax.add_patch(mpatches.Rectangle((ep + d_int, y0), ep, h, color="#ccc"))
+        s.rectangle("paroi_g", (0, y0), ep, h, color="#ccc", label="Paroi")
+        s.rectangle("alesage", (ep, y0), d_int, h, color="#8ecae6", label="Alésage (gaz)")
+        s.rectangle("paroi_d", (ep + d_int, y0), ep, h, color="#ccc")
 
         # Cotes et repères
-        ax.annotate(f"Ø int. {d_int:.1f} mm", xy=(ep + d_int/2, y0 + h + 2), ha="center", color="#1976d2")
-        ax.annotate(f"Ø ext. {d_ext:.1f} mm", xy=(d_ext/2, y0 + h + 7), ha="center", color="#222")
-        ax.annotate(f"Ép. {ep:.1f} mm", xy=(ep/2, y0 + h/2), ha="center", color="#333")
-        ax.annotate(f"Hauteur {h:.1f} mm", xy=(d_ext + 2, h/2), va="center", color="#333", rotation=90)
-
-        ax.set_xlim(0, d_ext + 12)
-        ax.set_ylim(-5, h + 20)
-        ax.axis("off")
-        ax.set_title("Croquis industriel du cylindre – coupe longitudinale")
-        fig.tight_layout()
-
-        self.canvas = FigureCanvasTkAgg(fig, master=self)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(pady=8)
+        s.cote("d_int", f"Ø int. {d_int:.1f} mm", (ep + d_int/2, y0 + h + 2), ha="center", color="#1976d2")
+        s.cote("d_ext", f"Ø ext. {d_ext:.1f} mm", (d_ext/2, y0 + h + 7), ha="center", color="#222")
+        s.cote("ep", f"Ép. {ep:.1f} mm", (ep/2, y0 + h/2), ha="center", color="#333")
+        s.cote("h", f"Hauteur {h:.1f} mm", (d_ext + 2, h/2), va="center", color="#333", rotation=90)
+
+        s.limites((0, d_ext + 12), (-5, h + 20))
+        s.titre("Croquis industriel du cylindre – coupe longitudinale")
+        s.rafraichir()
@@ -1,15 +1,21 @@
 import tkinter as tk
-import os
-from PIL import Image, ImageTk
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
-from mpl_toolkits.basemap import Basemap
-from materiaux import MATERIAUX
-import math
-import pandas as pd
-import matplotlib.pyplot as plt
 from styles import COULEURS, bouton_flat
+from canevas_schema import CanevasSchema
+from calculs.schmidt import CONFIGURATIONS, N_ANGLES, FRACTION_MORT, schmidt, masse_gaz, temperature_regenerateur
+from calculs.gaz import GAZ, proprietes
+
+
+def borne_ronde(x):
+    """Arrondi supérieur à 1, 2 ou 5 × 10^n : les axes du diagramme ne bougent pas à chaque pas de curseur"""
+    if x <= 0:
+        return 1.0
+    puissance = 10 ** np.floor(np.log10(x))
+    for m in (1, 2, 5, 10):
+        if x <= m * puissance:
+            return m * puissance
+    return 10 * puissance
+
 
 class PageDimensionnementStirling(tk.Frame):
     def __init__(self, parent, controller):
@@ -35,7 +41,10 @@ class PageDimensionnementStirling(tk.Frame):
             ("Course piston (mm)", "course", ""),
             ("Fréquence (Hz)", "freq", ""),
             ("Type de gaz", "gaz", "Air"),
-            ("Rendement moteur (%)", "rendement_moteur", "35"),
+            ("Configuration", "configuration", "alpha"),
+            ("Déphasage (°)", "phase", "90"),
+            ("Volume mort (% du balayé)", "volume_mort", "100"),
+            ("Rendement moteur / Schmidt (%)", "rendement_moteur", "35"),
             ("Rendement mécanique (%)", "rendement_mec", "80"),
             ("Rendement génératrice (%)", "rendement_gen", "90"),
             ("Nombre de cylindres", "nb_cyl", "1"),
@@ -44,30 +53,56 @@ class PageDimensionnementStirling(tk.Frame):
             l = tk.Label(left_col, text=label, font=("Segoe UI", 11), width=26, anchor="w",
                          bg=COULEURS["fond"], fg=COULEURS["texte"])
             l.grid(row=i+1, column=0, sticky="w", padx=6, pady=5)
-            if cle == "gaz":
+            if cle in ("gaz", "configuration"):
                 var = tk.StringVar(value=default)
-                menu = tk.OptionMenu(left_col, var, "Air", "Hélium", "Hydrogène", "Azote")
+                choix = tuple(GAZ) if cle == "gaz" else CONFIGURATIONS
+                menu = tk.OptionMenu(left_col, var, *choix)
                 menu.config(bg=COULEURS["fond"], fg=COULEURS["texte"], font=("Segoe UI", 11), highlightthickness=0)
                 menu.grid(row=i+1, column=1, padx=6, pady=5)
+                var.trace_add("write", lambda *_: self.planifier())
+                self.champs[cle] = var
+            elif cle in ("phase", "volume_mort"):
+                # Curseurs : le diagramme P-V suit le glissement
+                var = tk.StringVar(value=default)
+                bornes = (30, 150) if cle == "phase" else (10, 300)
+                tk.Scale(left_col, variable=var, from_=bornes[0], to=bornes[1], orient="horizontal",
+                         length=130, bg=COULEURS["fond"], highlightthickness=0,
+                         command=lambda _: self.planifier()).grid(row=i+1, column=1, padx=6, pady=0)
                 self.champs[cle] = var
             else:
                 entry = tk.Entry(left_col, width=13, font=("Segoe UI", 11))
                 if default:
                     entry.insert(0, default)
                 entry.grid(row=i+1, column=1, padx=6, pady=5)
+                entry.bind("<KeyRelease>", lambda e: self.planifier())
                 self.champs[cle] = entry
 
         # Boutons
         btns = tk.Frame(left_col, bg=COULEURS["fond"])
         btns.grid(row=len(donnees)+2, column=0, columnspan=2, pady=(10, 20))
         bouton_flat(btns, "Calculer", self.calculer).pack(side="left", padx=14)
-        bouton_flat(btns, "Retour", lambda: controller.afficher_page(PageAccueil)).pack(side="left", padx=14)
+        bouton_flat(btns, "Retour", lambda: controller.afficher_page("PageAccueil")).pack(side="left", padx=14)
 
         # Résultats
         self.resultat = tk.Label(left_col, text="", bg="#f4f7fb", fg=COULEURS["accent"],
                                  font=("Consolas", 11), justify="left", anchor="w", width=64)
         self.resultat.grid(row=len(donnees)+3, column=0, columnspan=2, sticky="w", padx=2, pady=(2, 8))
 
+        # --------- DIAGRAMME P-V ---------
+        self.cadre_pv = tk.Frame(self, bg=COULEURS["fond"])
+        self.cadre_pv.grid(row=0, column=1, sticky="n", padx=(0, 24), pady=60)
+        self.pv = None
+        self._tache = None
+
+    def planifier(self):
+        """Regroupe les événements de curseur/frappe en un seul recalcul"""
+        if self._tache is None:
+            self._tache = self.after_idle(self._recalcul_direct)
+
+    def _recalcul_direct(self):
+        self._tache = None
+        self.calculer()
+
     def calculer(self):
         try:
             def safe_float(key, default=None):
@@ -120,7 +155,8 @@ class PageDimensionnementStirling(tk.Frame):
                 course_auto = True
 
             # 2. Calcul volume balayé V (m3)
-            V = np.pi * (d_cyl/2)**2 * course * 1e-9 * nb_cyl
+            V_cyl = np.pi * (d_cyl/2)**2 * course * 1e-9
+            V = V_cyl * nb_cyl
 
             # 3. Si fréquence manquante, déduire pour respecter V_piston_max
             # Vitesse piston moyenne = 2 * course * freq (en m/s)
@@ -131,8 +167,20 @@ class PageDimensionnementStirling(tk.Frame):
             rpm = freq * 60
             P_Pa = P_bar_val * 1e5
 
-            # Puissance théorique simplifiée
-            P_th = P_Pa * V * freq * eta_carnot * rendement_moteur  # W
+            # Cycle de Schmidt (isotherme) par cylindre : pression de travail = pression moyenne
+            configuration = self.champs["configuration"].get()
+            phase = float(self.champs["phase"].get())
+            ratio_mort = float(self.champs["volume_mort"].get()) / 100
+            V_dh, V_r, V_dc = (V_cyl * ratio_mort * f for f in FRACTION_MORT)
+            cycle = schmidt(configuration, V_cyl, V_cyl, V_dh, V_dc, V_r, T_hot, T_cold, P_Pa,
+                            phase, freq, n_angles=N_ANGLES)
+            P_schmidt = float(cycle["puissance"]) * nb_cyl
+            # Gaz réel à l'état moyen (régénérateur, pression moyenne)
+            T_r = float(temperature_regenerateur(T_hot, T_cold))
+            prop = {k: float(v) for k, v in proprietes(gaz, T_r, P_Pa).items()}
+
+            # Puissance réelle : Schmidt corrigé des pertes (rendement moteur)
+            P_th = P_schmidt * rendement_moteur  # W
 
             # Puissance nette électrique
             P_elec = P_th * rendement_mec * rendement_gen
@@ -166,11 +214,42 @@ class PageDimensionnementStirling(tk.Frame):
 
 🛠️ Volume balayé : {V*1e6:.2f} cm³
 🛞 Tours/minute : {rpm:.0f}
+🔁 Cycle de Schmidt ({configuration}, {phase:.0f}°, volume mort {ratio_mort*100:.0f} %) : {float(cycle["W"]):.1f} J/cycle/cyl.
+   Puissance indiquée : {P_schmidt:.1f} W, pression {float(cycle["p_min"])/1e5:.1f} à {float(cycle["p_max"])/1e5:.1f} bar
+   Masse de {gaz} : {float(masse_gaz(cycle, gaz, T_r, P_Pa))*1000:.2f} g par cylindre
+   {gaz} à {T_r - 273.15:.0f} °C : ρ={prop["densite"]:.2f} kg/m³, cp={prop["cp"]:.0f} J/kg/K, γ={prop["cp"]/prop["cv"]:.3f}, Z={prop["Z"]:.3f}
 ⚡️ Puissance nette électrique : {P_elec:.1f} W
 ⛓️ Couple arbre : {couple:.2f} Nm
 
 🧱 Dimension mini arbre : Ø {d_arbre:.2f} mm × {l_arbre:.2f} mm
 """)
+            self.afficher_pv(cycle, configuration, P_schmidt)
 
         except Exception as e:
-            self.resultat.config(text=f"Erreur : {str(e)}")
\ No newline at end of file
+            self.resultat.config(text=f"Erreur : {str(e)}")
+            if self.pv:
+                self.pv.masquer()
+
+    def afficher_pv(self, cycle, configuration, P_schmidt):
+        """Diagramme P-V redessiné par blitting (seules les courbes bougent)"""
+        if self.pv is None:
+            self.pv = CanevasSchema(self.cadre_pv, figsize=(5.4, 4.4), dpi=100, blit=True)
+            ax = self.pv.ax
+            ax.axis("on")
+            ax.set_xlabel("Volume (cm³)")
+            ax.set_ylabel("Pression (bar)")
+            ax.grid(True, alpha=0.3)
+            self.pv.fig.tight_layout()
+        s = self.pv
+        p = cycle["p"] / 1e5
+        V = cycle["V"] * 1e6
+        # Boucles fermées : on répète le premier point
+        boucle = lambda x: np.append(x, x[:1])
+        s.ligne("total", boucle(V), boucle(p), color=COULEURS["primaire"], lw=2)
+        s.ligne("detente", boucle(cycle["V_e"] * 1e6), boucle(p), color="#d9534f", lw=1, ls="--")
+        s.ligne("compression", boucle(cycle["V_c"] * 1e6), boucle(p), color="#1976d2", lw=1, ls="--")
+        s.texte("travail", (0.03, 0.04), f"W = {float(cycle['W']):.1f} J/cycle – {P_schmidt:.0f} W",
+                transform=s.ax.transAxes, fontsize=10, color=COULEURS["texte"])
+        s.limites((0, borne_ronde(V.max() * 1.05)), (0, borne_ronde(p.max() * 1.1)))
+        s.titre(f"Diagramme P-V (Schmidt, {configuration})", fontsize=12)
+        s.rafraichir()
\ No newline at end of file
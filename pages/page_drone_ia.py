@@ -1,14 +1,4 @@
 import tkinter as tk
-import os
-from PIL import Image, ImageTk
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-from mpl_toolkits.basemap import Basemap
-from materiaux import MATERIAUX
-import math
-import pandas as pd
-import matplotlib.pyplot as plt
 from styles import COULEURS, bouton_flat
 
 class PageDroneIA(tk.Frame):
@@ -35,7 +25,7 @@ class PageDroneIA(tk.Frame):
                                        fg=COULEURS["texte"], font=("Segoe UI", 11), justify="left")
         self.resultat_label.pack(pady=10)
 
-        bouton_flat(self, "Retour", lambda: controller.afficher_page(PageAccueil)).pack(pady=10)
+        bouton_flat(self, "Retour", lambda: controller.afficher_page("PageAccueil")).pack(pady=10)
 
     def _champ(self, parent, label, row):
         tk.Label(parent, text=label, bg=COULEURS["fond"], fg=COULEURS["texte"],
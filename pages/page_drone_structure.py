@@ -1,14 +1,5 @@
 import tkinter as tk
-import os
-from PIL import Image, ImageTk
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
-from mpl_toolkits.basemap import Basemap
-from materiaux import MATERIAUX
-import math
-import pandas as pd
-import matplotlib.pyplot as plt
 from styles import COULEURS, bouton_flat
 
 class PageDroneStructure(tk.Frame):
@@ -28,7 +19,7 @@ class PageDroneStructure(tk.Frame):
 
         bouton_flat(self, "Afficher le profil", self.afficher_profil).pack(pady=15)
         bouton_flat(self, "Exporter CSV SolidWorks", self.exporter_csv).pack(pady=5)
-        bouton_flat(self, "Retour", lambda: controller.afficher_page(PageAccueil)).pack(pady=10)
+        bouton_flat(self, "Retour", lambda: controller.afficher_page("PageAccueil")).pack(pady=10)
 
         self.canvas = None
         self.coord_label = tk.Label(self, text="", bg=COULEURS["fond"], fg="#333333", font=("Consolas", 8))
@@ -94,6 +85,8 @@ class PageDroneStructure(tk.Frame):
         coords = np.vstack([X, Y]).T
 
         # Affichage du profil (en mm)
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
         fig = Figure(figsize=(7, 2.5), dpi=100)
         ax = fig.add_subplot(111)
         ax.plot(xu, yu, label="Extrados", color='blue')
@@ -4,9 +4,29 @@
 
 import tkinter as tk
 from styles import COULEURS, bouton_flat
+from canevas_schema import CanevasSchema
+from etat_conception import remplir_champ
+from calculs.pieces_stirling import bielle, piston
+from calculs.phasage import calage_optimal, couple_moteur
+from calculs.schmidt import PHASE
+from calculs.cinematique import PART_ALTERNATIVE, RATIO_BIELLE, efforts_moteur, extremes
+from calculs.equilibrage import ENTRAXE_CYLINDRES, charges_fixations, efforts_bati, meilleur_ordre, positions_cylindres
 import numpy as np
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+# Vis classe 8.8 : (désignation, section résistante mm²) ; effort admissible 0.5 Re = 320 MPa
+VIS_88 = [("M6", 20.1), ("M8", 36.6), ("M10", 58.0), ("M12", 84.3), ("M16", 157.0)]
+CONTRAINTE_VIS = 320.0  # MPa
+
+
+def positions_trous(longueur, largeur, nb_trous):
+    """Trous de fixation (mm) : aux coins à 10 mm des bords, puis au centre"""
+    positions = [
+        (10, 10), (longueur-10, 10), (10, largeur-10), (longueur-10, largeur-10)
+    ]
+    if nb_trous > 4:
+        positions.append((longueur/2, largeur/2))
+    return positions[:nb_trous]
+
 
 class PageEmbaseStirling(tk.Frame):
     def __init__(self, parent, controller):
@@ -18,8 +38,9 @@ class PageEmbaseStirling(tk.Frame):
         ).pack(pady=18)
 
         descr = (
-            "Cette page calcule les dimensions typiques et la disposition d'une embase pour un Stirling mono-cylindre, "
+            "Cette page calcule les dimensions typiques et la disposition d'une embase pour un Stirling en ligne, "
             "permettant de supporter le moteur, absorber les vibrations et assurer un ancrage robuste.\n"
+            "Les vis reprennent les forces libres et moments d'inertie du moteur (données moteur) et la réaction du couple.\n"
             "L'embase doit offrir stabilité, rigidité, et permettre l'assemblage avec la visserie adaptée."
         )
         tk.Label(self, text=descr, bg=COULEURS["fond"], fg=COULEURS["texte"], font=("Segoe UI", 10)).pack()
@@ -33,14 +54,23 @@ class PageEmbaseStirling(tk.Frame):
         self.nb_trous = self._champ(form, "Nb trous fixation", 3, default="4")
         self.diam_trou = self._champ(form, "Diamètre trous (mm)", 4, default="10")
         self.mat_embase = self._champ(form, "Matériau", 5, default="Alu 5083 ou Acier S235")
+        self.entraxe = self._champ(form, "Entraxe cylindres (mm)", 6, default=f"{ENTRAXE_CYLINDRES * 40:.1f}")
+        self.hauteur = self._champ(form, "Hauteur axe vilebrequin (mm)", 7, default="80")
 
-        bouton_flat(form, "Calculer l'embase", self.calculer_embase).grid(row=6, columnspan=2, pady=10)
-        bouton_flat(form, "Retour", lambda: controller.afficher_page(self.controller.frames.keys()[0])).grid(row=7, columnspan=2, pady=4)
+        bouton_flat(form, "Calculer l'embase", self.calculer_embase).grid(row=8, columnspan=2, pady=10)
+        bouton_flat(form, "Retour", lambda: controller.afficher_page("PageAccueil")).grid(row=9, columnspan=2, pady=4)
 
         self.resultat = tk.Label(self, text="", bg=COULEURS["fond"], fg=COULEURS["accent"],
                                  font=("Consolas", 10), justify="left")
         self.resultat.pack(pady=10)
-        self.canvas = None
+        self.schema = None
+
+        self.controller.etat.abonner(self.synchroniser, ["d_cyl"])
+
+    def synchroniser(self, etat, changes):
+        """L'entraxe des cylindres suit l'alésage (cf. schéma de la page moteur)"""
+        if etat.d_cyl:
+            remplir_champ(self.entraxe, ENTRAXE_CYLINDRES * etat.d_cyl, "{:.1f}")
 
     def _champ(self, parent, label, row, default=""):
         tk.Label(parent, text=label, bg=COULEURS["fond"], fg=COULEURS["texte"],
@@ -58,12 +88,21 @@ class PageEmbaseStirling(tk.Frame):
             nb_trous = int(self.nb_trous.get())
             diam_trou = float(self.diam_trou.get())
             mat = self.mat_embase.get().strip() or "Alu 5083"
+            entraxe = float(self.entraxe.get())
+            hauteur = float(self.hauteur.get())
 
             # Masse estimée
             masse = largeur * longueur * epaisseur * 2.7e-3 / 1000 if "alu" in mat.lower() else largeur * longueur * epaisseur * 7.85e-3 / 1000
 
-            # Visserie recommandée (M8 pour 10 mm, rondelles larges)
-            visserie = f"{nb_trous}x Vis CHC M8x{int(epaisseur*1.2)} (classe 8.8) + rondelles larges Ø10, écrous Nylstop"
+            charges = self.charges_vis(longueur, largeur, nb_trous, entraxe, hauteur)
+            traction = float(charges["traction"].max())
+            cisaillement = float(charges["cisaillement"].max())
+
+            # Visserie : plus petite vis 8.8 (M8 au moins, rondelles larges) tenant traction et
+            # cisaillement combinés (von Mises) de la vis la plus chargée
+            effort_eq = np.hypot(max(traction, 0.0), np.sqrt(3) * cisaillement)
+            vis = next((nom for nom, section in VIS_88[1:] if section * CONTRAINTE_VIS >= effort_eq), VIS_88[-1][0])
+            visserie = f"{len(charges['traction'])}x Vis CHC {vis}x{int(epaisseur*1.2)} (classe 8.8) + rondelles larges, écrous Nylstop"
 
             # Plan technique/résumé
             plan = (
@@ -73,6 +112,11 @@ class PageEmbaseStirling(tk.Frame):
                 f"- Matériau : {mat}\n"
                 f"- Masse estimée : {masse:.1f} kg\n"
                 f"- Visserie recommandée : {visserie}\n"
+                f"- Moteur : {charges['n_cyl']} cyl., calage {charges['phases']}, forces libres "
+                f"{charges['F_primaire']:.1f} N (1er ordre) / {charges['F_secondaire']:.1f} N (2e ordre), moments "
+                f"{charges['M_primaire']:.2f} / {charges['M_secondaire']:.2f} Nm\n"
+                f"- Vis la plus chargée : traction {traction:.0f} N, cisaillement {cisaillement:.0f} N "
+                f"(inertie, couple {charges['couple']:.2f} Nm moyen, axe à {hauteur:.0f} mm)\n"
                 f"- Tolérance générale : ±0,2 mm sur les cotes, trous H13"
             )
 
@@ -92,36 +136,51 @@ class PageEmbaseStirling(tk.Frame):
             self.afficher_schema(longueur, largeur, epaisseur, nb_trous, diam_trou)
         except Exception as e:
             self.resultat.config(text=f"Erreur : {str(e)}")
-            if self.canvas:
-                self.canvas.get_tk_widget().destroy()
-                self.canvas = None
+            if self.schema:
+                self.schema.masquer()
+
+    def charges_vis(self, longueur, largeur, nb_trous, entraxe, hauteur):
+        """Efforts des vis sur un tour : moteur des données de conception, centré sur l'embase, vilebrequin dans la longueur"""
+        etat = self.controller.etat
+        n_cyl = int(etat.get("n_cyl", 1))
+        d_cyl, course = etat.get("d_cyl", 40.0), etat.get("course", 20.0)
+        P_bar, rpm = etat.get("pression", 20.0), etat.get("rpm", 900.0)
+        puissance = etat.get("puissance", 1000.0)
+        T_chaud, T_froide = etat.get("t_chaude", 650.0), etat.get("t_froide", 40.0)
+
+        # Masses de l'embiellage comme sur la page Vilebrequin (mêmes efforts en mémoire)
+        L_bielle = RATIO_BIELLE * course
+        masse_piston = round(float(piston(d_cyl)["masse_piston"]), 1)
+        crete = extremes(efforts_moteur(d_cyl, course, L_bielle, P_bar, rpm, T_chaud, T_froide, masse_piston))
+        masse_bielle = round(float(bielle(d_cyl, max(crete["F_bielle"], crete["F_traction"]), L_bielle)["masse_bielle"]), 1)
+        m_alt = masse_piston + PART_ALTERNATIVE * masse_bielle
+        m_rot = (1 - PART_ALTERNATIVE) * masse_bielle
+
+        # Contrepoids par manivelle (m_rot + 50 % m_alt), manetons dans l'ordre le mieux équilibré
+        z = positions_cylindres(n_cyl, entraxe)
+        phases, equilibre = meilleur_ordre(calage_optimal(n_cyl)["phases"], z, m_alt, m_rot, course / 2, L_bielle, rpm)
+        # Couple total au calage (Schmidt, θ depuis le volume de détente mini) ramené au PMH du piston de compression
+        couple = couple_moteur(n_cyl, puissance / (2 * np.pi * rpm / 60))
+        couple = np.roll(couple, -round(PHASE / 360 * couple.size))
+        bati = efforts_bati(phases, z, m_alt, m_rot, course / 2, L_bielle, rpm, couple=couple)
+        res = charges_fixations(bati, positions_trous(longueur, largeur, nb_trous), (longueur / 2, largeur / 2), hauteur)
+        res.update({cle: float(equilibre[cle]) for cle in ("F_primaire", "F_secondaire", "M_primaire", "M_secondaire")})
+        res.update(n_cyl=n_cyl, phases=", ".join(f"{p:g}°" for p in phases), couple=float(bati["M_roulis"].mean()))
+        return res
 
     def afficher_schema(self, longueur, largeur, epaisseur, nb_trous, diam_trou):
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-        import matplotlib.patches as mpatches
-        fig = Figure(figsize=(6, 2.6), dpi=100)
-        ax = fig.add_subplot(111)
+        if self.schema is None:
+            self.schema = CanevasSchema(self, figsize=(6, 2.6), pady=5)
+            self.schema.ax.set_aspect("equal")
+        s = self.schema
 
         # Contour principal
-        rect = mpatches.Rectangle((0, 0), longueur, largeur, color="#b6cef2", alpha=0.7)
-        ax.add_patch(rect)
+        s.rectangle("plaque", (0, 0), longueur, largeur, color="#b6cef2", alpha=0.7)
 
         # Trous de fixation aux coins et au centre
-        positions = [
-            (10, 10), (longueur-10, 10), (10, largeur-10), (longueur-10, largeur-10)
-        ]
-        if nb_trous > 4:
-            positions.append((longueur/2, largeur/2))
-        for x, y in positions[:nb_trous]:
-            ax.add_patch(mpatches.Circle((x, y), diam_trou/2, color="#ef767a", alpha=0.8))
-
-        ax.set_xlim(-10, longueur+10)
-        ax.set_ylim(-10, largeur+10)
-        ax.set_aspect("equal")
-        ax.axis("off")
-        ax.set_title("Croquis technique – Embase (vue de dessus)")
-
-        self.canvas = FigureCanvasTkAgg(fig, master=self)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(pady=5)
+        for i, (x, y) in enumerate(positions_trous(longueur, largeur, nb_trous)):
+            s.cercle(("trou", i), (x, y), diam_trou/2, color="#ef767a", alpha=0.8)
+
+        s.limites((-10, longueur+10), (-10, largeur+10))
+        s.titre("Croquis technique – Embase (vue de dessus)")
+        s.rafraichir()
@@ -1,16 +1,9 @@
 # pages\page_materiaux.py
 import tkinter as tk
-import os
-from PIL import Image, ImageTk
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-from mpl_toolkits.basemap import Basemap
-from materiaux import MATERIAUX
-import math
-import pandas as pd
-import matplotlib.pyplot as plt
-from styles import COULEURS, bouton_flat, carte_bento
+from tkinter import filedialog, messagebox
+from styles import COULEURS, bouton_flat
+from materiaux import catalogue, importer
+from liste_materiaux import FiltreIncremental, ListeVirtuelle
 
 class PageMateriaux(tk.Frame):
     def __init__(self, parent, controller):
@@ -19,22 +12,70 @@ class PageMateriaux(tk.Frame):
         tk.Label(self, text="Base de données matériaux", bg=COULEURS["fond"],
                  fg=COULEURS["primaire"], font=("Segoe UI", 18, "bold")).pack(pady=20)
 
-        # Liste des matériaux clés
-        materiaux = [
-            ("Acier S235", "E = 210 GPa\nRe = 235 MPa\nρ = 7.85 g/cm³"),
-            ("Acier Inox 304", "E = 193 GPa\nRe = 215 MPa\nρ = 8.0 g/cm³"),
-            ("Aluminium 6061-T6", "E = 69 GPa\nRe = 276 MPa\nρ = 2.70 g/cm³"),
-            ("Titane Grade 5", "E = 114 GPa\nRe = 880 MPa\nρ = 4.43 g/cm³"),
-            ("ABS", "E = 2.1 GPa\nRe ≈ 40 MPa\nρ = 1.04 g/cm³"),
-            ("Nylon (PA)", "E = 2.5 GPa\nRe ≈ 70 MPa\nρ = 1.15 g/cm³"),
-            ("PEEK", "E = 3.6 GPa\nRe = 100 MPa\nρ = 1.3 g/cm³"),
-            ("Bakelite", "E ≈ 3.5 GPa\nRe ≈ 60 MPa\nρ = 1.3 g/cm³"),
-            ("Carbone époxy", "E = 70–135 GPa\nRe = 600+ MPa\nρ = 1.5 g/cm³"),
-            ("Cuivre", "E = 110 GPa\nRe = 70 MPa\nρ = 8.96 g/cm³")
-        ]
-
-        for nom, specs in materiaux:
-            carte = carte_bento(self, nom, specs)
-            carte.pack(pady=10)
-
-        bouton_flat(self, "Retour", lambda: controller.afficher_page(PageAccueil)).pack(pady=20)
\ No newline at end of file
+        # Recherche : nom et/ou conditions, ex. "re>400 densite<3 alu"
+        barre = tk.Frame(self, bg=COULEURS["fond"])
+        barre.pack(fill="x", padx=20)
+        tk.Label(barre, text="Recherche :", bg=COULEURS["fond"], fg=COULEURS["texte"],
+                 font=("Segoe UI", 10)).pack(side="left")
+        self.recherche = tk.StringVar()
+        tk.Entry(barre, textvariable=self.recherche, font=("Segoe UI", 10), width=40).pack(side="left", padx=6)
+        self.compte = tk.Label(barre, text="", bg=COULEURS["fond"], fg=COULEURS["texte"], font=("Segoe UI", 9))
+        self.compte.pack(side="left", padx=6)
+        bouton_flat(barre, "Importer un catalogue…", self.importer_catalogue).pack(side="right")
+        tk.Label(self, text="Ex. : « inox », « re>400 densite<3 », « e>=100000 tmax>500 »",
+                 bg=COULEURS["fond"], fg=COULEURS["texte"], font=("Segoe UI", 9)).pack(anchor="w", padx=20)
+
+        col = lambda champ, fmt: (lambda i: fmt.format(catalogue()[champ][i]))
+        self.liste = ListeVirtuelle(self, [
+            ("Nuance", 240, lambda i: str(catalogue().noms[i])),
+            ("E (GPa)", 80, lambda i: f"{catalogue()['E'][i] / 1e3:.0f}"),
+            ("Re (MPa)", 80, col("Re", "{:.0f}")),
+            ("Rm (MPa)", 80, col("Rm", "{:.0f}")),
+            ("ρ (g/cm³)", 85, col("densite", "{:.2f}")),
+            ("T max (°C)", 85, col("t_max", "{:.0f}")),
+            ("Coût (€/kg)", 90, col("cout", "{:.1f}")),
+        ], sur_selection=self.detailler)
+        self.liste.pack(fill="both", expand=True, padx=20, pady=10)
+
+        self.detail = tk.Label(self, text="", bg=COULEURS["fond"], fg=COULEURS["texte"],
+                               font=("Segoe UI", 10), justify="left")
+        self.detail.pack(anchor="w", padx=20)
+
+        bouton_flat(self, "Retour", lambda: controller.afficher_page("PageAccueil")).pack(pady=20)
+
+        self._filtre = FiltreIncremental()
+        self._tache = None
+        self.recherche.trace_add("write", lambda *_: self._planifier())
+        self.filtrer()
+
+    def _planifier(self):
+        # Regroupe les frappes rapprochées en un seul filtrage
+        if self._tache is None:
+            self._tache = self.after_idle(self.filtrer)
+
+    def filtrer(self):
+        self._tache = None
+        indices = self._filtre.filtrer(self.recherche.get())
+        self.liste.afficher(indices)
+        self.compte.config(text=f"{len(indices)} / {len(catalogue())} nuances")
+
+    def detailler(self, i):
+        p = catalogue().proprietes(i)
+        usage = f"\nUsage : {p['usage']}" if p.get("usage") else ""
+        sf = p.get("Sf", float("nan"))
+        fatigue = f", Sf = {sf:.0f} MPa à {p['N_D']:.0e} cycles" if sf == sf else ""
+        self.detail.config(text=f"{p['nom']} : E = {p['E'] / 1e3:.0f} GPa, Re = {p['Re']:.0f} MPa, "
+                                f"Rm = {p['Rm']:.0f} MPa, ρ = {p['densite']:.2f} g/cm³{fatigue}{usage}")
+
+    def importer_catalogue(self):
+        chemin = filedialog.askopenfilename(title="Catalogue matériaux",
+                                            filetypes=[("Catalogues", "*.csv *.json *.txt"), ("Tous les fichiers", "*.*")])
+        if not chemin:
+            return
+        try:
+            n = importer(chemin)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Import impossible", str(e))
+            return
+        self.filtrer()
+        messagebox.showinfo("Catalogue importé", f"{n} nuances ajoutées à la base.")
@@ -1,109 +1,14 @@
 # pages/page_moteur_stirling.py
 
 import tkinter as tk
-import numpy as np
 from styles import COULEURS, bouton_flat
-from matplotlib.figure import Figure
-from matplotlib.patches import Rectangle
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from canevas_schema import CanevasSchema
+from reactif import GrapheReactif
 
-from pages.page_piston_stirling import PagePistonStirling
-from pages.page_cylindre_stirling import PageCylindreStirling
-from pages.page_vilebrequin_stirling import PageVilebrequinStirling
-from pages.page_bielle_stirling import PageBielleStirling
-from pages.page_volant_stirling import PageVolantStirling
-from pages.page_embase_stirling import PageEmbaseStirling
-from pages.page_visserie_stirling import PageVisserieStirling
-from pages.page_arbre_stirling import PageArbreStirling
-from pages.page_accueil import PageAccueil
-
-PI = np.pi
-R = 8.314  # Constante gaz parfait
-
-def borned(val, vmin, vmax):
-    """Contrainte une valeur entre vmin et vmax"""
-    return max(vmin, min(val, vmax))
-
-def recommandation_n_cyl(puissance):
-    """Renvoie un nombre réaliste de cylindres selon la puissance"""
-    if puissance < 200:
-        return 1
-    elif puissance < 1000:
-        return 2
-    elif puissance < 4000:
-        return 4
-    elif puissance < 12000:
-        return 6
-    elif puissance < 25000:
-        return 8
-    elif puissance < 70000:
-        return 12
-    elif puissance < 150000:
-        return 16
-    return 24
-
-def pression_recommandee(puissance, n_cyl):
-    """Valeur indicative de pression maximale selon la puissance (plus la puissance est grande, plus la pression doit augmenter)"""
-    if puissance < 300:
-        return 10
-    elif puissance < 1000:
-        return 15
-    elif puissance < 5000:
-        return 20
-    elif puissance < 20000:
-        return 28
-    elif puissance < 70000:
-        return 38
-    return 55
-
-def rpm_recommandee(puissance):
-    """Valeur indicative de régime maximal selon puissance"""
-    if puissance < 1000:
-        return 1600
-    elif puissance < 5000:
-        return 1500
-    elif puissance < 20000:
-        return 1400
-    elif puissance < 50000:
-        return 1200
-    elif puissance < 120000:
-        return 950
-    return 700
-
-def temperature_chaude_reco():
-    """Valeur industrielle standard en °C pour moteur robuste avec air ou hélium (hors haute techno)"""
-    return 650
-
-def temperature_froide_reco():
-    return 40
-
-def sanitize_inputs(P_tot, n_cyl, P_bar, rpm, T_chaud, T_froide):
-    """Corrige dynamiquement les entrées irréalistes"""
-    rec_n_cyl = recommandation_n_cyl(P_tot)
-    n_cyl = int(borned(n_cyl, 1, 32))
-    if n_cyl > 2 * rec_n_cyl:
-        n_cyl = rec_n_cyl
-
-    # Corrige la pression service en bar
-    rec_P_bar = pression_recommandee(P_tot, n_cyl)
-    P_bar = borned(P_bar, 6, rec_P_bar * 1.2)
-    if abs(P_bar - rec_P_bar) > rec_P_bar * 0.5:
-        P_bar = rec_P_bar
-
-    # Corrige régime cible
-    rec_rpm = rpm_recommandee(P_tot)
-    rpm = borned(rpm, 400, rec_rpm * 1.25)
-    if rpm > rec_rpm * 1.15:
-        rpm = rec_rpm
-
-    # Températures réalistes
-    T_chaud = borned(T_chaud, 450, 800)
-    T_froide = borned(T_froide, -20, 90)
-    if T_chaud < T_froide + 100:
-        T_chaud = T_froide + 120
-
-    # Retourne les valeurs corrigées
-    return float(P_tot), int(n_cyl), float(P_bar), float(rpm), float(T_chaud), float(T_froide)
+from calculs.moteur_stirling import V_PISTON_MAX, dimensionner_moteur
+from calculs.adiabatique import adiabatique_moteur
+from calculs.echangeurs import bilan, optimiser_regenerateur
+from calculs.refroidissement import chaleur_rejetee, dimensionner_radiateur, equilibre_froid
 
 class PageMoteurStirling(tk.Frame):
     def __init__(self, parent, controller):
@@ -128,6 +33,7 @@ class PageMoteurStirling(tk.Frame):
             ("Régime cible (tr/min)", "rpm", "1400"),
             ("Température chaude (°C)", "t_chaude", "650"),
             ("Température froide (°C)", "t_froide", "40"),
+            ("Température ambiante (°C)", "t_ambiante", "25"),
         ]
         for i, (lbl, key, default) in enumerate(champs):
             tk.Label(form, text=lbl, font=("Segoe UI", 11), bg=COULEURS["fond"], fg=COULEURS["texte"]).grid(row=i, column=0, sticky="w")
@@ -137,7 +43,8 @@ class PageMoteurStirling(tk.Frame):
             self.fields[key] = ent
 
         bouton_flat(form, "Calculer le plan moteur", self.calculer).grid(row=len(champs), column=0, columnspan=2, pady=14)
-        bouton_flat(form, "Retour", lambda: controller.afficher_page(PageAccueil)).grid(row=len(champs)+1, column=0, columnspan=2, pady=6)
+        bouton_flat(form, "Validation cycle adiabatique", self.valider_cycle).grid(row=len(champs)+1, column=0, columnspan=2, pady=6)
+        bouton_flat(form, "Retour", lambda: controller.afficher_page("PageAccueil")).grid(row=len(champs)+2, column=0, columnspan=2, pady=6)
 
         self.plan_texte = tk.Label(self, text="", bg=COULEURS["fond"], fg=COULEURS["accent"],
                                    font=("Consolas", 10), justify="left", anchor="nw")
@@ -145,123 +52,174 @@ class PageMoteurStirling(tk.Frame):
 
         souspage_zone = tk.Frame(self, bg=COULEURS["fond"])
         souspage_zone.grid(row=4, column=0, sticky="nw", padx=16, pady=(6,10))
-        bouton_flat(souspage_zone, "Détail Piston", lambda: self.goto_piece(PagePistonStirling)).pack(side="left", padx=4)
-        bouton_flat(souspage_zone, "Détail Cylindre", lambda: self.goto_piece(PageCylindreStirling)).pack(side="left", padx=4)
-        bouton_flat(souspage_zone, "Détail Vilebrequin", lambda: self.goto_piece(PageVilebrequinStirling)).pack(side="left", padx=4)
-        bouton_flat(souspage_zone, "Détail Bielle", lambda: self.goto_piece(PageBielleStirling)).pack(side="left", padx=4)
-        bouton_flat(souspage_zone, "Détail Volant", lambda: self.goto_piece(PageVolantStirling)).pack(side="left", padx=4)
-        bouton_flat(souspage_zone, "Détail Arbre", lambda: self.goto_piece(PageArbreStirling)).pack(side="left", padx=4)
-        bouton_flat(souspage_zone, "Support / Embase", lambda: self.goto_piece(PageEmbaseStirling)).pack(side="left", padx=4)
-        bouton_flat(souspage_zone, "Visserie", lambda: self.goto_piece(PageVisserieStirling)).pack(side="left", padx=4)
+        bouton_flat(souspage_zone, "Détail Piston", lambda: self.goto_piece("PagePistonStirling")).pack(side="left", padx=4)
+        bouton_flat(souspage_zone, "Détail Cylindre", lambda: self.goto_piece("PageCylindreStirling")).pack(side="left", padx=4)
+        bouton_flat(souspage_zone, "Détail Vilebrequin", lambda: self.goto_piece("PageVilebrequinStirling")).pack(side="left", padx=4)
+        bouton_flat(souspage_zone, "Détail Bielle", lambda: self.goto_piece("PageBielleStirling")).pack(side="left", padx=4)
+        bouton_flat(souspage_zone, "Détail Volant", lambda: self.goto_piece("PageVolantStirling")).pack(side="left", padx=4)
+        bouton_flat(souspage_zone, "Détail Arbre", lambda: self.goto_piece("PageArbreStirling")).pack(side="left", padx=4)
+        bouton_flat(souspage_zone, "Support / Embase", lambda: self.goto_piece("PageEmbaseStirling")).pack(side="left", padx=4)
+        bouton_flat(souspage_zone, "Visserie", lambda: self.goto_piece("PageVisserieStirling")).pack(side="left", padx=4)
+
+        self.validation_texte = tk.Label(self, text="", bg=COULEURS["fond"], fg=COULEURS["texte"],
+                                         font=("Consolas", 10), justify="left", anchor="nw")
+        self.validation_texte.grid(row=5, column=0, sticky="nw", padx=16, pady=(0,10))
 
         self.cadre_schema = tk.Frame(self, bg=COULEURS["fond"])
         self.cadre_schema.grid(row=2, column=1, rowspan=4, sticky="ne", padx=(0,10), pady=10)
-        self.canvas = None
+        self.schema = None
+
+        # Recalcul en direct : champs -> moteur -> (plan, mémoire partagée, géométrie -> schéma)
+        g = self.graphe = GrapheReactif(self, sur_erreur=self.afficher_erreur)
+        for key in ("puissance", "pression", "rpm", "t_chaude", "t_froide"):
+            g.source(key, self.fields[key], lambda v: abs(float(v)))
+        g.source("n_cyl", self.fields["n_cyl"], lambda v: abs(int(v)))
+        g.source("t_ambiante", self.fields["t_ambiante"], float)
+        # Correction intelligente et couplée de toutes les entrées + calculs (moteur vectorisé)
+        g.noeud("moteur", ["puissance", "n_cyl", "pression", "rpm", "t_chaude", "t_froide"],
+                lambda *entrees: dimensionner_moteur(*entrees, echangeurs=True)[()])
+        g.noeud("echangeurs", ["moteur"], self.echangeurs)
+        g.noeud("refroidissement", ["moteur", "t_ambiante"], self.refroidissement)
+        g.noeud("geometrie", ["moteur"],
+                lambda res: (int(res["n_cyl"]), float(res["d_cyl"]), float(res["course"])))
+        g.observer(["moteur", "echangeurs", "refroidissement"], self.afficher_plan)
+        g.observer(["geometrie"], lambda geo: self.afficher_schema(*geo))
+        g.planifier()
 
     def calculer(self):
-        try:
-            # Récupère et corrige toutes les entrées incohérentes
-            P_tot = abs(float(self.fields["puissance"].get()))
-            n_cyl = abs(int(self.fields["n_cyl"].get()))
-            P_bar = abs(float(self.fields["pression"].get()))
-            rpm = abs(float(self.fields["rpm"].get()))
-            T_chaud = abs(float(self.fields["t_chaude"].get()))
-            T_froide = abs(float(self.fields["t_froide"].get()))
-
-            # Correction intelligente et couplée de toutes les entrées
-            P_tot, n_cyl, P_bar, rpm, T_chaud, T_froide = sanitize_inputs(P_tot, n_cyl, P_bar, rpm, T_chaud, T_froide)
-
-            # ---- CALCULS ----
-            f = rpm / 60
-            rendement = 0.22
-            P = P_bar * 1e5
-            P_cyl = P_tot / n_cyl
-
-            # Calcul du volume balayé/cylindre (respecte les contraintes d'usure piston)
-            v_piston_max = 1.8
-            d_cyl, course, v_piston, V_balayé = 45, 45, 10, 0
-            correction_ok = False
-            for _ in range(15):
-                V_balayé = P_cyl / (P * f * rendement)
-                d_cyl = (4 * V_balayé / (PI * 0.85))**(1/3)
-                course = 0.85 * d_cyl
-                v_piston = 2 * course * f / 1000
-                if v_piston > v_piston_max:
-                    course *= 0.96
-                else:
-                    correction_ok = True
-                    break
-            V_balayé_cm3 = V_balayé * 1e6
-
-            S_piston = PI/4 * (d_cyl/1000)**2
-            F_piston_max = P * S_piston
-            effort_maneton = F_piston_max / np.cos(np.radians(17))
-            C_nom = P_cyl / (2 * PI * f)
-            tau_adm = 160e6
-            d_vilebrequin = ((16 * C_nom) / (PI * tau_adm))**(1/3) * 1000
-            masse_air = (P * V_balayé / (R * (T_chaud + 273.15))) * 29
-
-            warnings = []
-            if not correction_ok:
-                warnings.append("⚠️ Limite de vitesse piston atteinte, dimensions réduites automatiquement.")
-
-            if T_chaud < T_froide + 100:
-                warnings.append("⚠️ T° chaude augmentée pour assurer un fonctionnement efficace.")
-
-            plan = (
-                f"PLAN MOTEUR STIRLING MULTICYLINDRE – CALCULS INDUSTRIELS\n"
-                f"-------------------------------------------------------\n"
-                f"Puissance totale : {P_tot:.0f} W – Cylindres : {n_cyl}\n"
-                f"Pression service corrigée : {P_bar:.1f} bar\n"
-                f"T° Chaude corrigée : {T_chaud:.1f} °C | T° froide corrigée : {T_froide:.1f} °C\n"
-                f"Régime corrigé : {rpm:.0f} tr/min | Rendement estimé : {rendement*100:.1f}%\n"
-                f"Puissance/cylindre : {P_cyl:.1f} W\n"
-                f"Volume balayé/cylindre : {V_balayé_cm3:.1f} cm³\n"
-                f"Diamètre cylindre : {d_cyl:.3f} mm | Course piston : {course:.3f} mm\n"
-                f"Vitesse linéaire piston : {v_piston:.3f} m/s (max : 1.8 m/s)\n"
-                f"Couple/cylindre : {C_nom:.2f} Nm\n"
-                f"Effort piston max : {F_piston_max:.1f} N | Effort maneton : {effort_maneton:.1f} N\n"
-                f"Diamètre min maneton vilebrequin : {d_vilebrequin:.2f} mm\n"
-                f"Masse air/cycle/cylindre : {masse_air:.2f} g\n"
-                f"\nNOMENCLATURE (par cylindre) :\n"
-                f"- Cylindre Ø {d_cyl:.3f} mm, course {course:.3f} mm\n"
-                f"- Piston galette épaisseur {round(0.16*d_cyl,2)} mm\n"
-                f"- Bielle L = {round(2.3*course,2)} mm\n"
-                f"- Vilebrequin Ø {d_vilebrequin:.2f} mm (maneton)\n"
-                f"- Refroidissement, embases, visserie : à détailler selon conception\n"
-                f"\n{' '.join(warnings)}\n"
-            )
-            self.plan_texte.config(text=plan)
-            # Pour les autres modules
-            self.controller.memo_moteur_stirling = {
-                "puissance": P_tot, "n_cyl": n_cyl, "pression": P_bar,
-                "rpm": rpm, "t_chaude": T_chaud, "t_froide": T_froide,
-                "d_cyl": d_cyl, "course": course, "P_cyl": P_cyl
-            }
-            self.afficher_schema(n_cyl, d_cyl, course)
-        except Exception as e:
-            self.plan_texte.config(text=f"Erreur : {str(e)}")
+        """Recalcul immédiat (bouton) ; seuls les nœuds dont une entrée a changé sont réévalués"""
+        self.graphe.recalculer()
+
+    def afficher_erreur(self, e):
+        self.plan_texte.config(text=f"Erreur : {str(e)}")
+
+    @staticmethod
+    def echangeurs(res):
+        """Bilan des échangeurs de référence et régénérateur optimal (balayage vectorisé) du plan"""
+        args = (float(res["V_balaye"]), float(res["freq"]), float(res["pression"]) * 1e5,
+                float(res["t_chaude"]) + 273.15, float(res["t_froide"]) + 273.15, float(res["d_cyl"]))
+        matrice, optimum, _ = optimiser_regenerateur(*args)
+        return {"reference": bilan(*args), "matrice": matrice, "optimum": optimum}
+
+    @staticmethod
+    def refroidissement(res, t_air):
+        """Radiateur le plus compact tenant la T° froide du plan, puis T° froide d'équilibre avec lui"""
+        Q = chaleur_rejetee(res["puissance"], res["rendement_thermique"])
+        rad = dimensionner_radiateur(Q, res["t_froide"], res["puissance"], t_air)
+        _, equilibre = equilibre_froid(res["puissance"], res["n_cyl"], res["pression"], res["rpm"], res["t_chaude"],
+                                       rad["surface"], rad["profondeur"], rad["pas_ailettes"], rad["vitesse"],
+                                       t_air, res["t_froide"])
+        return {c: v[()] for c, v in {**rad, **equilibre}.items()}
+
+    def afficher_plan(self, res, ech, froid):
+        P_tot, n_cyl, P_bar = float(res["puissance"]), int(res["n_cyl"]), float(res["pression"])
+        rpm, T_chaud, T_froide = float(res["rpm"]), float(res["t_chaude"]), float(res["t_froide"])
+        rendement, rendement_th = float(res["rendement"]), float(res["rendement_thermique"])
+        ref, opt = ech["reference"], ech["optimum"]
+        _, d_fil, porosite, l_regen = ech["matrice"]
+        freq = float(res["freq"])
+        P_cyl = float(res["P_cyl"])
+        V_balayé_cm3 = float(res["V_balaye"]) * 1e6
+        d_cyl, course, v_piston = float(res["d_cyl"]), float(res["course"]), float(res["v_piston"])
+        F_piston_max, effort_maneton = float(res["F_piston_max"]), float(res["effort_maneton"])
+        C_nom = float(res["C_nom"])
+        d_vilebrequin = float(res["d_vilebrequin"])
+        masse_air = float(res["masse_air"])
+
+        warnings = []
+        if res["n_reductions"] > 0:
+            warnings.append("⚠️ Limite de vitesse piston atteinte, dimensions réduites automatiquement.")
+        if not res["vitesse_ok"]:
+            warnings.append(f"⚠️ Vitesse piston > {V_PISTON_MAX} m/s malgré la réduction de course.")
+
+        if T_chaud < T_froide + 100:
+            warnings.append("⚠️ T° chaude augmentée pour assurer un fonctionnement efficace.")
+        if rendement_th <= 0:
+            warnings.append("⚠️ Pertes des échangeurs supérieures au travail du cycle : augmenter le nombre de cylindres.")
+        elif not froid["faisable"]:
+            warnings.append("⚠️ Aucun radiateur du balayage ne tient la T° froide : relever T° froide ou accepter un ventilateur plus puissant.")
+        elif not froid["converge"]:
+            warnings.append("⚠️ T° froide d'équilibre non convergée (hors des bornes du moteur).")
+
+        plan = (
+            f"PLAN MOTEUR STIRLING MULTICYLINDRE – CALCULS INDUSTRIELS\n"
+            f"-------------------------------------------------------\n"
+            f"Puissance totale : {P_tot:.0f} W – Cylindres : {n_cyl}\n"
+            f"Pression service corrigée : {P_bar:.1f} bar\n"
+            f"T° Chaude corrigée : {T_chaud:.1f} °C | T° froide corrigée : {T_froide:.1f} °C\n"
+            f"Régime corrigé : {rpm:.0f} tr/min | Rendement thermique : {rendement_th*100:.1f}%"
+            f" | Travail spécifique W/(pV) : {rendement:.3f}\n"
+            f"Puissance/cylindre : {P_cyl:.1f} W\n"
+            f"Volume balayé/cylindre : {V_balayé_cm3:.1f} cm³\n"
+            f"Diamètre cylindre : {d_cyl:.3f} mm | Course piston : {course:.3f} mm\n"
+            f"Vitesse linéaire piston : {v_piston:.3f} m/s (max : {V_PISTON_MAX} m/s)\n"
+            f"Couple/cylindre : {C_nom:.2f} Nm\n"
+            f"Effort piston max : {F_piston_max:.1f} N | Effort maneton : {effort_maneton:.1f} N\n"
+            f"Diamètre min maneton vilebrequin : {d_vilebrequin:.2f} mm\n"
+            f"Masse air/cycle/cylindre : {masse_air:.2f} g\n"
+            f"Échangeurs/cylindre : réchauffeur {float(ref['rechauffeur']['n_passages']):.0f} tubes"
+            f" | refroidisseur {float(ref['refroidisseur']['n_passages']):.0f} tubes"
+            f" | pompage {float(ref['W_pompage'])*freq:.0f} W | fuite régénérateur {float(ref['Q_regeneration'])*freq:.0f} W\n"
+            f"Régénérateur optimal : toile fil {d_fil*1000:.0f} µm, porosité {porosite:.2f}, L = {l_regen*d_cyl:.1f} mm"
+            f" -> rendement thermique {float(opt['rendement_thermique'])*100:.1f}%\n"
+            f"Chaleur rejetée : {float(froid['Q']):.0f} W | Eau : {float(froid['debit_eau'])*60:.1f} kg/min\n"
+            f"Radiateur : {float(froid['cote']):.0f} × {float(froid['cote']):.0f} × {float(froid['profondeur']):.0f} mm,"
+            f" ailettes au pas de {float(froid['pas_ailettes']):.1f} mm, ventilateur {float(froid['vitesse']):.1f} m/s"
+            f" ({float(froid['puissance_ventilateur']):.0f} W)\n"
+            f"T° froide d'équilibre : {float(froid['t_froide']):.1f} °C ({int(froid['iterations'])} itérations)\n"
+            f"\nNOMENCLATURE (par cylindre) :\n"
+            f"- Cylindre Ø {d_cyl:.3f} mm, course {course:.3f} mm\n"
+            f"- Piston galette épaisseur {round(0.16*d_cyl,2)} mm\n"
+            f"- Bielle L = {round(2.3*course,2)} mm\n"
+            f"- Vilebrequin Ø {d_vilebrequin:.2f} mm (maneton)\n"
+            f"- Refroidissement, embases, visserie : à détailler selon conception\n"
+            f"\n{' '.join(warnings)}\n"
+        )
+        self.plan_texte.config(text=plan)
+        # Pour les autres modules : seuls les champs modifiés sont notifiés aux pages abonnées
+        self.controller.etat.maj(
+            puissance=P_tot, n_cyl=n_cyl, pression=P_bar,
+            rpm=rpm, t_chaude=T_chaud, t_froide=T_froide,
+            d_cyl=d_cyl, course=course, P_cyl=P_cyl, d_vilebrequin=d_vilebrequin,
+        )
 
     def afficher_schema(self, n_cyl, d_cyl, course):
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-        fig = Figure(figsize=(min(13, n_cyl*1.6), 3.8), dpi=110)
-        ax = fig.add_subplot(111)
+        if self.schema is None:
+            self.schema = CanevasSchema(self.cadre_schema, figsize=(min(13, n_cyl*1.6), 3.8), dpi=110, expand=True)
+        s = self.schema
+        s.taille(min(13, n_cyl*1.6), 3.8)
         ecart = 1.4 * d_cyl
+        ep_piston = 0.16 * d_cyl
         for i in range(n_cyl):
             x = 1 + i * ecart
-            ax.add_patch(Rectangle((x, 1), course, d_cyl, fc="#dde3f8", ec="#111", lw=2, zorder=1))
-            ep_piston = 0.16 * d_cyl
-            ax.add_patch(Rectangle((x+course-ep_piston, 1), ep_piston, d_cyl, fc="#f7d6c1", ec="#a36b19", lw=2, zorder=2))
-            ax.text(x + course/2, 1 + d_cyl + 5, f"Cyl {i+1}", ha="center", fontsize=10, color="#175")
-        ax.axis("off")
-        ax.set_xlim(0, 1 + n_cyl * ecart)
-        ax.set_ylim(0, 1 + d_cyl + 30)
-        ax.set_title(f"Implantation {n_cyl} cyl. – vue coupe", fontsize=13)
-        self.canvas = FigureCanvasTkAgg(fig, master=self.cadre_schema)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(expand=True)
+            s.rectangle(("cyl", i), (x, 1), course, d_cyl, fc="#dde3f8", ec="#111", lw=2, zorder=1)
+            s.rectangle(("piston", i), (x+course-ep_piston, 1), ep_piston, d_cyl, fc="#f7d6c1", ec="#a36b19", lw=2, zorder=2)
+            s.texte(("nom", i), (x + course/2, 1 + d_cyl + 5), f"Cyl {i+1}", ha="center", fontsize=10, color="#175")
+        s.limites((0, 1 + n_cyl * ecart), (0, 1 + d_cyl + 30))
+        s.titre(f"Implantation {n_cyl} cyl. – vue coupe", fontsize=13)
+        s.rafraichir()
+
+    def valider_cycle(self):
+        """Modèle adiabatique (coûteux) du plan courant : puissance et flux thermiques de validation"""
+        self.graphe.vider()
+        moteur = self.graphe.valeur("moteur")
+        if moteur is None:
+            return
+        self.validation_texte.config(text="Cycle adiabatique en cours…")
+        self.update_idletasks()
+        r = adiabatique_moteur(moteur)[()]
+        n_cyl, freq = int(moteur["n_cyl"]), float(moteur["freq"])
+        etat = f"{r['cycles']} cycles" if r["converge"] else f"non convergé après {r['cycles']} cycles"
+        self.validation_texte.config(text=(
+            f"CYCLE ADIABATIQUE IDÉAL (hélium, {etat}, {r['duree']*1e3:.0f} ms)\n"
+            f"Puissance indiquée : {r['P_adiab']:.0f} W ({r['W_adiab']:.1f} J/cycle/cyl.)"
+            f" | Rendement : {r['rendement_adiab']*100:.1f} %\n"
+            f"Réchauffeur : {r['Q_chaud']*freq*n_cyl:.0f} W | Refroidisseur : {r['Q_froid']*freq*n_cyl:.0f} W\n"
+            f"Pression cycle : {r['p_min_adiab']:.1f} à {r['p_max_adiab']:.1f} bar"
+            f" | T compression {r['T_compression']:.0f} °C, détente {r['T_detente']:.0f} °C"
+        ))
 
     def goto_piece(self, page):
-        self.calculer()
+        # Les résultats sont déjà à jour : on ne termine qu'une saisie encore en attente
+        self.graphe.vider()
         self.controller.afficher_page(page)
@@ -1,14 +1,4 @@
 import tkinter as tk
-import os
-from PIL import Image, ImageTk
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-from mpl_toolkits.basemap import Basemap
-from materiaux import MATERIAUX
-import math
-import pandas as pd
-import matplotlib.pyplot as plt
 from styles import COULEURS, bouton_flat, carte_bento
 
 
@@ -19,4 +9,4 @@ class PageParametres(tk.Frame):
                  fg=COULEURS["primaire"], font=("Segoe UI", 18, "bold")).pack(pady=20)
         carte = carte_bento(self, "Unités", "Longueur : mm\nForce : N\nModule : MPa")
         carte.pack(pady=20)
-        bouton_flat(self, "Retour", lambda: controller.afficher_page(PageAccueil)).pack(pady=20)
\ No newline at end of file
+        bouton_flat(self, "Retour", lambda: controller.afficher_page("PageAccueil")).pack(pady=20)
\ No newline at end of file
@@ -1,16 +1,55 @@
 import tkinter as tk
-import numpy as np
 from styles import COULEURS, bouton_flat
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-DENSITES_MATERIAUX = {
-    "alu": 2.800,
-    "aluminium": 2.800,
-    "graphite": 1.900,
-    "acier": 7.850,
+from canevas_schema import CanevasSchema
+from reactif import GrapheReactif
+from etat_conception import remplir_champ
+from calculs.pieces_stirling import piston
+from calculs.cotation import AJUSTEMENT_PISTON, analyser, chaine_piston, ecarts
+from calculs.thermique import piston_thermique
+from materiaux import proprietes
+
+# Nuance de la base matériaux retenue pour une désignation libre
+NUANCES_MATERIAUX = {
+    "alu": "Aluminium 2017",
+    "aluminium": "Aluminium 2017",
+    "graphite": "Graphite",
+    "acier": "Acier S355",
 }
 
+# Rainure de joint : largeur, profondeur, décalage du bord (mm)
+RAINURE = (2.40, 1.60, 2.00)
+
+
+def proprietes_piston(mat_piston):
+    """Propriétés de la base matériaux : nuance exacte, sinon famille reconnue dans la désignation"""
+    try:
+        return proprietes(mat_piston.strip())
+    except ValueError:
+        pass
+    for key in NUANCES_MATERIAUX:
+        if key in mat_piston.lower():
+            return proprietes(NUANCES_MATERIAUX[key])
+    return proprietes(NUANCES_MATERIAUX["alu"])
+
+
+def temperature_max_materiau(mat_piston):
+    return proprietes_piston(mat_piston)["t_max"]
+
+
+def _float(texte, defaut):
+    try:
+        return float(texte)
+    except ValueError:
+        return float(defaut)
+
+
+def _int(texte, defaut):
+    try:
+        return int(texte)
+    except ValueError:
+        return int(defaut)
+
+
 class PagePistonStirling(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent, bg=COULEURS["fond"])
@@ -34,6 +73,7 @@ class PagePistonStirling(tk.Frame):
             ("Hauteur utile du cylindre (mm)", "h_cyl_utile"),
             ("Nombre de joints", "nb_joints"),
             ("Température chaude max (°C)", "t_chaude"),
+            ("Température froide (°C)", "t_froide"),
             ("Matériau du piston", "materiau_piston")
         ]
         for label, cle in donnees:
@@ -45,7 +85,11 @@ class PagePistonStirling(tk.Frame):
             f.pack(pady=2, anchor="w")
             self.champs[cle] = entry
 
-        self.prefill_from_moteur()
+        if not self.champs["materiau_piston"].get():
+            self.champs["materiau_piston"].insert(0, "Alu 2017A / 6082 / Graphite")
+        if not self.champs["nb_joints"].get():
+            self.champs["nb_joints"].insert(0, "2")
+        self.controller.etat.abonner(self.synchroniser, ["d_cyl", "t_chaude", "t_froide", "h_cyl_utile"])
         self.resultat = tk.Label(cadre_gauche, text="", bg=COULEURS["fond"], fg=COULEURS["accent"],
                                  font=("Consolas", 10), justify="left", anchor="nw")
         self.resultat.pack(pady=10, anchor="w")
@@ -58,112 +102,124 @@ class PagePistonStirling(tk.Frame):
         # Partie droite : Schéma matplotlib (Canvas)
         self.cadre_schema = tk.Frame(self, bg=COULEURS["fond"])
         self.cadre_schema.grid(row=2, column=1, sticky="ne", padx=(0,16), pady=15)
-        self.canvas = None
+        self.schema = None
 
         # Pour un affichage plus propre sur grands écrans
         self.grid_columnconfigure(0, weight=0)
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(2, weight=1)
 
-    def prefill_from_moteur(self):
-        moteur = getattr(self.controller, "memo_moteur_stirling", {})
-        if moteur.get("d_cyl"):
-            self.champs["d_cyl"].delete(0, tk.END)
-            self.champs["d_cyl"].insert(0, str(moteur["d_cyl"]))
-        if moteur.get("t_chaude"):
-            self.champs["t_chaude"].delete(0, tk.END)
-            self.champs["t_chaude"].insert(0, str(moteur["t_chaude"]))
-        if not self.champs["materiau_piston"].get():
-            self.champs["materiau_piston"].insert(0, "Alu 2017A / 6082 / Graphite")
-        if not self.champs["nb_joints"].get():
-            self.champs["nb_joints"].insert(0, "2")
+        self._installer_graphe()
+
+    def synchroniser(self, etat, changes):
+        """Reprend les champs du moteur qui ont changé (le graphe recalcule ce qui en dépend)"""
+        for cle in changes:
+            remplir_champ(self.champs[cle], etat.get(cle))
 
     def retour_page_moteur(self):
-        from pages.page_moteur_stirling import PageMoteurStirling
-        self.controller.afficher_page(PageMoteurStirling)
+        self.controller.afficher_page("PageMoteurStirling")
+
+    def _installer_graphe(self):
+        """Recalcul en direct : la masse/les cotes ne dépendent que de d_cyl et du matériau"""
+        etat = self.controller.etat
+        g = self.graphe = GrapheReactif(self, sur_erreur=self.afficher_erreur)
+        g.source("d_cyl", self.champs["d_cyl"], lambda v: _float(v, etat.get("d_cyl", 70)))
+        g.source("h_cyl_utile", self.champs["h_cyl_utile"], lambda v: _float(v, etat.get("h_cyl_utile", 0)) or None)
+        g.source("nb_joints", self.champs["nb_joints"], lambda v: _int(v, 2))
+        g.source("t_chaude", self.champs["t_chaude"], lambda v: _float(v, etat.get("t_chaude", 650)))
+        g.source("t_froide", self.champs["t_froide"], lambda v: _float(v, etat.get("t_froide", 40)))
+        g.source("materiau", self.champs["materiau_piston"], lambda v: v.strip() or "Aluminium 2017A")
+        g.noeud("props", ["materiau"], proprietes_piston)
+        g.noeud("densite", ["props"], lambda props: float(props["densite"]))
+        g.noeud("temp_max", ["props"], lambda props: props["t_max"])
+        g.noeud("cotes", ["d_cyl", "densite"],
+                lambda d_cyl, densite: {k: float(v) for k, v in piston(d_cyl, densite).items()})
+        # Champ de température du piston entre gaz chaud et gaz froid : contraintes et dilatation
+        g.noeud("thermique", ["cotes", "t_chaude", "t_froide", "props"],
+                lambda cotes, t_chaude, t_froide, props: piston_thermique(cotes["d_piston"], cotes["epaisseur_piston"],
+                                                                          t_chaude, t_froide, props))
+        # Chaîne de cotes alésage H7 / piston g6 autour du jeu de montage
+        g.noeud("empilage", ["d_cyl"], lambda d_cyl: analyser(*chaine_piston(d_cyl), n=0)["jeu_piston"])
+        g.observer(["cotes", "nb_joints", "materiau", "densite", "temp_max", "thermique", "props", "empilage"],
+                   self.afficher_plan)
+        g.observer(["cotes", "nb_joints"], self.afficher_schema)
+        # La hauteur utile saisie ici sert au cylindre
+        g.observer(["h_cyl_utile"], lambda h: etat.maj(h_cyl_utile=h))
+        g.planifier()
 
     def calculer_piston(self):
-        try:
-            moteur = getattr(self.controller, "memo_moteur_stirling", {})
-            d_cyl = self._get_float("d_cyl", moteur.get("d_cyl", 70))
-            h_cyl_utile = self._get_float("h_cyl_utile", 0.75 * d_cyl)
-            nb_joints = self._get_int("nb_joints", 2)
-            t_chaude = self._get_float("t_chaude", moteur.get("t_chaude", 650))
-            mat_piston = self.champs["materiau_piston"].get().strip() or "Aluminium 2017A"
-            jeu_lateral = max(round(0.0004 * d_cyl + 0.02, 4), 0.03)
-            d_piston = round(d_cyl - 2 * jeu_lateral, 3)
-            epaisseur_piston = round(max(0.165 * d_cyl, 7), 3)
-            epaisseur_fond = round(0.12 * d_cyl, 3)
-            largeur_rainure = 2.40
-            profondeur_rainure = 1.60
-            decalage_rainure = 2.00
-
-            surface_piston = round(np.pi * (d_piston / 2) ** 2, 3)
-            volume_piston = round(surface_piston * epaisseur_piston, 3)
-            mat_key = "alu"
-            for key in DENSITES_MATERIAUX:
-                if key in mat_piston.lower():
-                    mat_key = key
-                    break
-            densite = DENSITES_MATERIAUX.get(mat_key, 2.8)
-            masse_piston = volume_piston * densite / 1000
-            if "graphite" in mat_piston.lower():
-                temp_max = 300
-            elif "alu" in mat_piston.lower() or "aluminium" in mat_piston.lower():
-                temp_max = 200
-            elif "acier" in mat_piston.lower():
-                temp_max = 500
-            else:
-                temp_max = 200
-
-            plan = (
-                f"PLAN TECHNIQUE : PISTON GALETTE STIRLING\n"
-                f"--------------------------------------------------\n"
-                f"1. Forme : Cylindre (galette), arrêtes légèrement chanfreinées\n"
-                f"2. Ø extérieur piston (Øp) : {d_piston:.3f} mm (Tol. H8)\n"
-                f"3. Épaisseur totale piston : {epaisseur_piston:.3f} mm\n"
-                f"4. Épaisseur fond (côté froid) : {epaisseur_fond:.3f} mm\n"
-                f"5. Nombre de joints : {nb_joints}\n"
-                f"6. Rainure(s) joint : {nb_joints} x (largeur {largeur_rainure:.2f} mm × profondeur {profondeur_rainure:.2f} mm),\n"
-                f"     décalée(s) de {decalage_rainure:.2f} mm du bord, symétriques\n"
-                f"7. Matière : {mat_piston} (densité réelle {densite:.3f} g/cm³)\n"
-                f"8. Jeu latéral cylindre/piston : {jeu_lateral:.4f} mm\n"
-                f"9. Surface (piston) : {surface_piston:.3f} mm²\n"
-                f"10. Volume (piston) : {volume_piston:.3f} mm³\n"
-                f"11. Masse estimée : {masse_piston:.3f} g\n"
-                f"12. Température max piston : {temp_max} °C\n"
-                f"\n"
-                f"Instructions CAO/SolidWorks :\n"
-                f"- Faire un disque Ø {d_piston:.3f} mm, extrusion {epaisseur_piston:.3f} mm\n"
-                f"- Ajouter un fond épaisseur {epaisseur_fond:.3f} mm (côté froid)\n"
-                f"- Rainures pour {nb_joints} joints toriques : largeur {largeur_rainure:.2f} mm, profondeur {profondeur_rainure:.2f} mm, décalage {decalage_rainure:.2f} mm\n"
-                f"- Chanfrein 0.5 mm sur toutes arrêtes vives\n"
-                f"- Tolérances H8/g6, à ajuster selon usinage\n"
-                f"\n"
-                f"💡 Contrôler le jeu piston/cylindre, tester le coulissement à sec avant montage définitif.\n"
-            )
-            self.resultat.config(text=plan)
-            self.generer_schema_piston(d_piston, epaisseur_piston, epaisseur_fond, nb_joints, largeur_rainure, profondeur_rainure, decalage_rainure)
-        except Exception as e:
-            self.resultat.config(text=f"Erreur : {str(e)}")
-            if self.canvas:
-                self.canvas.get_tk_widget().destroy()
-                self.canvas = None
+        """Recalcul immédiat (bouton)"""
+        self.graphe.recalculer()
+
+    def afficher_erreur(self, e):
+        self.resultat.config(text=f"Erreur : {str(e)}")
+        if self.schema:
+            self.schema.masquer()
+
+    def afficher_plan(self, cotes, nb_joints, mat_piston, densite, temp_max, thermique, props, empilage):
+        jeu_lateral = cotes["jeu_lateral"]
+        d_piston = cotes["d_piston"]
+        epaisseur_piston = cotes["epaisseur_piston"]
+        epaisseur_fond = cotes["epaisseur_fond"]
+        surface_piston = round(cotes["surface_piston"], 3)
+        volume_piston = round(cotes["volume_piston"], 3)
+        masse_piston = cotes["masse_piston"]
+        largeur_rainure, profondeur_rainure, decalage_rainure = RAINURE
+        T_piston = float(thermique["T_max"])
+        sigma_th = float(thermique["von_mises_max"])
+        dilatation = float(thermique["u_ext"].max()) * 1000
+        ecart_inf, ecart_sup = ecarts(d_piston, AJUSTEMENT_PISTON)
+        jeu_min, jeu_max = empilage["pire_cas"]
+
+        plan = (
+            f"PLAN TECHNIQUE : PISTON GALETTE STIRLING\n"
+            f"--------------------------------------------------\n"
+            f"1. Forme : Cylindre (galette), arrêtes légèrement chanfreinées\n"
+            f"2. Ø extérieur piston (Øp) : {d_piston:.3f} mm ({AJUSTEMENT_PISTON} : {ecart_sup*1000:+.0f}/{ecart_inf*1000:+.0f} µm)\n"
+            f"3. Épaisseur totale piston : {epaisseur_piston:.3f} mm\n"
+            f"4. Épaisseur fond (côté froid) : {epaisseur_fond:.3f} mm\n"
+            f"5. Nombre de joints : {nb_joints}\n"
+            f"6. Rainure(s) joint : {nb_joints} x (largeur {largeur_rainure:.2f} mm × profondeur {profondeur_rainure:.2f} mm),\n"
+            f"     décalée(s) de {decalage_rainure:.2f} mm du bord, symétriques\n"
+            f"7. Matière : {mat_piston} (densité réelle {densite:.3f} g/cm³)\n"
+            f"8. Jeu latéral cylindre/piston : {jeu_lateral:.4f} mm nominal, {jeu_min:.3f} à {jeu_max:.3f} mm "
+            f"au pire cas (H7/{AJUSTEMENT_PISTON}, RSS {empilage['rss'][0]:.3f} à {empilage['rss'][1]:.3f} mm)\n"
+            f"9. Surface (piston) : {surface_piston:.3f} mm²\n"
+            f"10. Volume (piston) : {volume_piston:.3f} mm³\n"
+            f"11. Masse estimée : {masse_piston:.3f} g\n"
+            f"12. Température piston (calcul axisymétrique) : {T_piston:.0f} °C maxi "
+            f"(limite {props['nom']} : {temp_max:.0f} °C)\n"
+            f"13. Contrainte thermique maxi (von Mises) : {sigma_th:.1f} MPa (Re {props['Re']:.0f} MPa)\n"
+            f"14. Dilatation radiale à chaud : {dilatation:.1f} µm (à retrancher du jeu latéral)\n"
+            f"\n"
+            f"Instructions CAO/SolidWorks :\n"
+            f"- Faire un disque Ø {d_piston:.3f} mm, extrusion {epaisseur_piston:.3f} mm\n"
+            f"- Ajouter un fond épaisseur {epaisseur_fond:.3f} mm (côté froid)\n"
+            f"- Rainures pour {nb_joints} joints toriques : largeur {largeur_rainure:.2f} mm, profondeur {profondeur_rainure:.2f} mm, décalage {decalage_rainure:.2f} mm\n"
+            f"- Chanfrein 0.5 mm sur toutes arrêtes vives\n"
+            f"- Tolérances H7 (alésage) / {AJUSTEMENT_PISTON} (piston), à ajuster selon usinage\n"
+            f"\n"
+            f"💡 Contrôler le jeu piston/cylindre, tester le coulissement à sec avant montage définitif.\n"
+            + (f"⚠️ Piston au-delà de la température admissible du matériau ({T_piston:.0f} > {temp_max:.0f} °C).\n"
+               if T_piston > temp_max else "")
+        )
+        self.resultat.config(text=plan)
+
+    def afficher_schema(self, cotes, nb_joints):
+        self.generer_schema_piston(cotes["d_piston"], cotes["epaisseur_piston"], cotes["epaisseur_fond"],
+                                   nb_joints, *RAINURE)
 
     def generer_schema_piston(self, d_piston, epaisseur_piston, epaisseur_fond, nb_joints, largeur_rainure, profondeur_rainure, decalage_rainure):
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-        from matplotlib.patches import Rectangle
-
-        fig = Figure(figsize=(5.5, 6), dpi=110)
-        ax = fig.add_subplot(111)
-        ax.set_aspect('equal')
+        if self.schema is None:
+            self.schema = CanevasSchema(self.cadre_schema, figsize=(5.5, 6), dpi=110, expand=True)
+            self.schema.ax.set_aspect('equal')
+        s = self.schema
 
         x0, y0 = 20, 30
         # Piston corps
-        ax.add_patch(Rectangle((x0, y0), epaisseur_piston, d_piston, color="#e4e4e4", ec="#222", lw=2))
+        s.rectangle("corps", (x0, y0), epaisseur_piston, d_piston, color="#e4e4e4", ec="#222", lw=2)
         # Fond
-        ax.add_patch(Rectangle((x0, y0), epaisseur_fond, d_piston, color="#bbbbbb", ec="#222", lw=2))
+        s.rectangle("fond", (x0, y0), epaisseur_fond, d_piston, color="#bbbbbb", ec="#222", lw=2)
         # Rainures
         espace_total = d_piston - 2 * decalage_rainure
         if nb_joints > 1:
@@ -172,34 +228,15 @@ class PagePistonStirling(tk.Frame):
             espace_entre_rainures = 0
         for i in range(nb_joints):
             y_rainure = y0 + decalage_rainure + i * espace_entre_rainures - largeur_rainure / 2
-            ax.add_patch(Rectangle((x0 + epaisseur_piston - profondeur_rainure, y_rainure),
-                                   profondeur_rainure, largeur_rainure, color="#9ad0fc", ec="#1976d2", lw=1.2))
+            s.rectangle(("rainure", i), (x0 + epaisseur_piston - profondeur_rainure, y_rainure),
+                        profondeur_rainure, largeur_rainure, color="#9ad0fc", ec="#1976d2", lw=1.2)
         # Cotes/annotations plus visibles
-        ax.annotate(f"{epaisseur_piston:.1f} mm", xy=(x0 + epaisseur_piston/2, y0 + d_piston + 16), ha="center", fontsize=13, color="#111", fontweight="bold")
-        ax.annotate(f"{d_piston:.1f} mm", xy=(x0 + epaisseur_piston + 12, y0 + d_piston/2), rotation=90, va="center", fontsize=13, color="#1976d2", fontweight="bold")
-        ax.annotate("Rainure joint", xy=(x0 + epaisseur_piston - profondeur_rainure/2, y0 + d_piston/2),
-                    xytext=(x0 + epaisseur_piston + 42, y0 + d_piston/2),
-                    arrowprops=dict(arrowstyle="->", color="#1976d2", lw=2), color="#1976d2", fontsize=12)
-
-        ax.axis("off")
-        ax.set_xlim(0, x0 + epaisseur_piston + 90)
-        ax.set_ylim(0, y0 + d_piston + 50)
-        ax.set_title("Mise en plan simplifiée du piston (coupe longitudinale)", fontsize=14, pad=14)
-
-        self.canvas = FigureCanvasTkAgg(fig, master=self.cadre_schema)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(expand=True)
-
-    def _get_float(self, key, default):
-        val = self.champs[key].get()
-        try:
-            return float(val)
-        except Exception:
-            return float(default)
-
-    def _get_int(self, key, default):
-        val = self.champs[key].get()
-        try:
-            return int(val)
-        except Exception:
-            return int(default)
+        s.cote("epaisseur", f"{epaisseur_piston:.1f} mm", (x0 + epaisseur_piston/2, y0 + d_piston + 16), ha="center", fontsize=13, color="#111", fontweight="bold")
+        s.cote("diametre", f"{d_piston:.1f} mm", (x0 + epaisseur_piston + 12, y0 + d_piston/2), rotation=90, va="center", fontsize=13, color="#1976d2", fontweight="bold")
+        s.cote("rainure", "Rainure joint", (x0 + epaisseur_piston - profondeur_rainure/2, y0 + d_piston/2),
+               (x0 + epaisseur_piston + 42, y0 + d_piston/2),
+               arrowprops=dict(arrowstyle="->", color="#1976d2", lw=2), color="#1976d2", fontsize=12)
+
+        s.limites((0, x0 + epaisseur_piston + 90), (0, y0 + d_piston + 50))
+        s.titre("Mise en plan simplifiée du piston (coupe longitudinale)", fontsize=14, pad=14)
+        s.rafraichir()
@@ -1,15 +1,96 @@
 import tkinter as tk
 import os
-from PIL import Image, ImageTk
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
-from mpl_toolkits.basemap import Basemap
-from materiaux import MATERIAUX
-import math
-import pandas as pd
-import matplotlib.pyplot as plt
 from styles import COULEURS, bouton_flat
+from cache_disque import dossier_cache, ecrire_atomique
+
+# Carte du monde : projection de Miller (comme Basemap 'mill'), sphère Basemap par défaut
+PROJECTION = "mill"
+RESOLUTION = "l"
+BORNES_CARTE = (-60, 80, -180, 180)  # llcrnrlat, urcrnrlat, llcrnrlon, urcrnrlon
+R_SPHERE = 6370997.0
+LARGEUR_FOND_PX = 1600
+
+# Fonds de carte déjà rendus : (projection, résolution, bornes) -> (image RGBA, étendue)
+_FONDS_CARTE = {}
+
+
+def projeter_miller(lon, lat, bornes=BORNES_CARTE):
+    """Coordonnées carte (m) identiques à Basemap(projection='mill') : origine au coin bas-gauche"""
+    lat_min, _, lon_min, lon_max = bornes
+    lon_0 = np.radians((lon_min + lon_max) / 2)
+
+    def y_mill(phi):
+        return 1.25 * R_SPHERE * np.log(np.tan(np.pi / 4 + 0.4 * np.radians(phi)))
+
+    x = R_SPHERE * (np.radians(lon) - lon_0) - R_SPHERE * (np.radians(lon_min) - lon_0)
+    y = y_mill(lat) - y_mill(lat_min)
+    return x, y
+
+
+def etendue_carte(bornes=BORNES_CARTE):
+    lat_min, lat_max, lon_min, lon_max = bornes
+    x0, y0 = projeter_miller(lon_min, lat_min, bornes)
+    x1, y1 = projeter_miller(lon_max, lat_max, bornes)
+    return float(x0), float(x1), float(y0), float(y1)
+
+
+def fond_carte(projection=PROJECTION, resolution=RESOLUTION, bornes=BORNES_CARTE):
+    """
+    Image RGBA du fond de carte et son étendue (xmin, xmax, ymin, ymax).
+
+    Rendue une seule fois avec Basemap, puis gardée en mémoire et sur disque
+    (clé : projection, résolution, bornes).
+    """
+    cle = (projection, resolution, tuple(bornes))
+    if cle in _FONDS_CARTE:
+        return _FONDS_CARTE[cle]
+
+    dossier = dossier_cache("cartes")
+    nom = f"fond_{projection}_{resolution}_" + "_".join(f"{b:g}" for b in bornes) + ".npz"
+    chemin = os.path.join(dossier, nom) if dossier else None
+    if chemin and os.path.exists(chemin):
+        try:
+            with np.load(chemin) as f:
+                _FONDS_CARTE[cle] = (f["image"], tuple(f["etendue"]))
+            return _FONDS_CARTE[cle]
+        except (OSError, KeyError, ValueError):
+            pass  # cache illisible : on le régénère
+
+    image, etendue = _rendre_fond(projection, resolution, bornes)
+    _FONDS_CARTE[cle] = (image, etendue)
+    if chemin:
+        try:
+            ecrire_atomique(chemin, lambda f: np.savez_compressed(f, image=image, etendue=np.array(etendue)))
+        except OSError:
+            pass
+    return _FONDS_CARTE[cle]
+
+
+def _rendre_fond(projection, resolution, bornes):
+    """Rendu hors écran (Agg) des côtes, frontières et continents"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from mpl_toolkits.basemap import Basemap
+
+    lat_min, lat_max, lon_min, lon_max = bornes
+    xmin, xmax, ymin, ymax = etendue_carte(bornes)
+    hauteur_px = int(round(LARGEUR_FOND_PX * (ymax - ymin) / (xmax - xmin)))
+    fig = Figure(figsize=(LARGEUR_FOND_PX / 100, hauteur_px / 100), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    m = Basemap(projection=projection, resolution=resolution,
+                llcrnrlat=lat_min, urcrnrlat=lat_max,
+                llcrnrlon=lon_min, urcrnrlon=lon_max, ax=ax)
+    m.drawcoastlines()
+    m.drawcountries()
+    m.drawmapboundary(fill_color='lightblue')
+    m.fillcontinents(color='beige', lake_color='lightblue')
+    ax.axis("off")
+    canvas.draw()
+    image = np.asarray(canvas.buffer_rgba()).copy()
+    return image, (m.xmin, m.xmax, m.ymin, m.ymax)
+
 
 class PageSimulationMission(tk.Frame):
     def __init__(self, parent, controller):
@@ -31,9 +112,16 @@ class PageSimulationMission(tk.Frame):
         tk.OptionMenu(form_frame, self.mode_var, "aller", "aller-retour").grid(row=3, column=1, pady=10)
 
         bouton_flat(self, "Simuler", self.simuler).pack(pady=10)
-        bouton_flat(self, "Retour", lambda: controller.afficher_page(PageAccueil)).pack(pady=10)
+        bouton_flat(self, "Retour", lambda: controller.afficher_page("PageAccueil")).pack(pady=10)
 
+        # Canevas persistant, créé au premier tracé ; seuls la base et le cercle sont redessinés
         self.canvas = None
+        self._fond_blit = None
+        self._base = None
+        self._cercle = None
+
+        # Coordonnées de Chabeuil (ou autre base)
+        self.base_lat, self.base_lon = 44.933, 5.033
 
     def _champ(self, parent, label, row):
         tk.Label(parent, text=label, bg=COULEURS["fond"], fg=COULEURS["texte"],
@@ -57,32 +145,66 @@ class PageSimulationMission(tk.Frame):
 
         distance_km = autonomie_h * vitesse
 
-        # Carte avec Basemap centrée sur Chabeuil
-        fig = Figure(figsize=(8, 5), dpi=100)
-        ax = fig.add_subplot(111)
-        m = Basemap(projection='mill', resolution='l',
-                    llcrnrlat=-60, urcrnrlat=80,
-                    llcrnrlon=-180, urcrnrlon=180, ax=ax)
-        m.drawcoastlines()
-        m.drawcountries()
-        m.drawmapboundary(fill_color='lightblue')
-        m.fillcontinents(color='beige', lake_color='lightblue')
+        if self.canvas is None:
+            self._creer_carte()
 
-        # Coordonnées de Chabeuil (ou autre base)
-        base_lat, base_lon = 44.933, 5.033
-        x0, y0 = m(base_lon, base_lat)
-        m.plot(x0, y0, 'ro', markersize=5)
+        # Base + cercle de rayon d'action
+        x0, y0 = projeter_miller(self.base_lon, self.base_lat)
+        self._base.set_data([x0], [y0])
+        circle_lats, circle_lons = self._trace_circle(self.base_lat, self.base_lon, distance_km)
+        x, y = self._coupure_antimeridien(*projeter_miller(circle_lons, circle_lats))
+        self._cercle.set_data(x, y)
+        self._redessiner_overlay()
+
+    def _creer_carte(self):
+        """Figure, axes et fond de carte : une seule fois par session"""
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-        # Tracer un cercle de rayon d’action
-        circle_lats, circle_lons = self._trace_circle(base_lat, base_lon, distance_km)
-        x, y = m(circle_lons, circle_lats)
-        m.plot(x, y, 'r-', linewidth=1.5)
+        image, etendue = fond_carte()
+        fig = Figure(figsize=(8, 5), dpi=100)
+        ax = fig.add_subplot(111)
+        ax.imshow(image, extent=etendue, origin="upper", interpolation="antialiased")
+        ax.set_xlim(etendue[0], etendue[1])
+        ax.set_ylim(etendue[2], etendue[3])
+        ax.axis("off")
+        self._base, = ax.plot([], [], 'ro', markersize=5, animated=True)
+        self._cercle, = ax.plot([], [], 'r-', linewidth=1.5, animated=True)
+        self.ax = ax
 
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
         self.canvas = FigureCanvasTkAgg(fig, self)
-        self.canvas.draw()
+        # Après chaque rendu complet (1er affichage, redimensionnement) : mémorise le fond pour le blit
+        self.canvas.mpl_connect("draw_event", self._memoriser_fond)
         self.canvas.get_tk_widget().pack(pady=10)
+        self.canvas.draw()
+
+    def _memoriser_fond(self, event=None):
+        self._fond_blit = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._dessiner_artistes()
+
+    def _dessiner_artistes(self):
+        self.ax.draw_artist(self._base)
+        self.ax.draw_artist(self._cercle)
+
+    def _redessiner_overlay(self):
+        if self._fond_blit is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._fond_blit)
+        self._dessiner_artistes()
+        self.canvas.blit(self.ax.bbox)
+
+    def _coupure_antimeridien(self, x, y):
+        """Ramène le cercle dans la carte et coupe le tracé au passage de l'antiméridien"""
+        xmin, xmax, _, _ = etendue_carte()
+        largeur = xmax - xmin
+        x = (x - xmin) % largeur + xmin
+        saut = np.abs(np.diff(x)) > largeur / 2
+        if saut.any():
+            idx = np.flatnonzero(saut) + 1
+            x = np.insert(x, idx, np.nan)
+            y = np.insert(y, idx, np.nan)
+        return x, y
 
     def _trace_circle(self, lat, lon, rayon_km, points=360):
         R = 6371.0
@@ -95,4 +217,4 @@ class PageSimulationMission(tk.Frame):
                                np.cos(lat_rad)*np.sin(d)*np.cos(angles))
         lon_circle = lon_rad + np.arctan2(np.sin(angles)*np.sin(d)*np.cos(lat_rad),
                                           np.cos(d)-np.sin(lat_rad)*np.sin(lat_circle))
-        return np.degrees(lat_circle), np.degrees(lon_circle)
\ No newline at end of file
+        return np.degrees(lat_circle), np.degrees(lon_circle)
@@ -2,10 +2,19 @@
 import tkinter as tk
 import numpy as np
 from styles import COULEURS, bouton_flat
-from materiaux import MATERIAUX
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from pages.page_accueil import PageAccueil
+from canevas_schema import CanevasSchema
+from etat_conception import remplir_champ
+from materiaux import catalogue
+from liste_materiaux import ComboMateriau
+from calculs.pieces_stirling import bielle, piston, vilebrequin, volant
+from calculs.moteur_stirling import rpm_recommandee
+from calculs.phasage import calage_optimal
+from calculs.cotation import analyser, chaine_embiellage
+from calculs.cinematique import PART_ALTERNATIVE, RATIO_BIELLE, amplitudes, efforts_moteur, extremes
+from calculs.equilibrage import ENTRAXE_CYLINDRES, contrepoids, meilleur_ordre, positions_cylindres
+from calculs.fatigue import N_FIBRES, contraintes_maneton, dommages, duree_vie
+from calculs.torsion import (RAIDEUR_ACCOUPLEMENT, chaine, harmoniques as harmoniques_couple, inertie_generatrice,
+                             inertie_manivelle, modes, ordres_critiques, raideur_manivelle)
 
 class PageVilebrequinStirling(tk.Frame):
     def __init__(self, parent, controller):
@@ -18,22 +27,17 @@ class PageVilebrequinStirling(tk.Frame):
         form = tk.Frame(self, bg=COULEURS["fond"])
         form.pack(pady=10)
 
-        # Lecture des données moteur
-        moteur = getattr(self.controller, "memo_moteur_stirling", {}) or {}
-        P_tot = moteur.get("puissance", 1000)
-        n_cyl = moteur.get("n_cyl", 1)
-        rpm = moteur.get("rpm", 900)
-        couple_nom = (P_tot / n_cyl) / (2 * np.pi * (rpm/60)) if n_cyl else 10
-        L_defaut = max(80, 2.7 * moteur.get("course", 30)) if "course" in moteur else 80
-
+        # Valeurs par défaut, remplacées par les données moteur (cf. synchroniser)
         self.champs = {}
         items = [
-            ("Nombre de cylindres", "n_cyl", str(n_cyl)),
-            ("Puissance transmise (W)", "puissance", str(P_tot)),
-            ("Couple transmis par cyl. (Nm)", "couple", f"{couple_nom:.2f}"),
-            ("Vitesse de rotation (tr/min)", "vitesse", str(rpm)),
-            ("Longueur entre paliers (mm)", "longueur", f"{L_defaut:.2f}"),
-            ("Rayon excentrique (mm)", "rayon_manivelle", f"{moteur.get('course', 20)/2:.2f}"),
+            ("Nombre de cylindres", "n_cyl", "1"),
+            ("Puissance transmise (W)", "puissance", "1000"),
+            ("Couple transmis par cyl. (Nm)", "couple", f"{1000 / (2 * np.pi * 900/60):.2f}"),
+            ("Vitesse de rotation (tr/min)", "vitesse", "900"),
+            ("Longueur entre paliers (mm)", "longueur", "80.00"),
+            ("Rayon excentrique (mm)", "rayon_manivelle", "10.00"),
+            ("Diamètre cylindre (mm)", "d_cyl", "40.00"),
+            ("Pression moyenne de cycle (bar)", "pression", "20"),
             ("Largeur maneton (mm)", "largeur_maneton", "18"),
             ("Tolérance sécurité (%)", "tol", "20"),
         ]
@@ -47,7 +51,7 @@ class PageVilebrequinStirling(tk.Frame):
 
         tk.Label(form, text="Matériau", bg=COULEURS["fond"], fg=COULEURS["texte"]).grid(row=len(items), column=0, sticky="w", padx=10, pady=5)
         self.mat_var = tk.StringVar(value="Acier S355")
-        tk.OptionMenu(form, self.mat_var, *MATERIAUX.keys()).grid(row=len(items), column=1, padx=10)
+        ComboMateriau(form, self.mat_var, width=18).grid(row=len(items), column=1, padx=10)
 
         bouton_flat(form, "Calculer vilebrequin", self.calculer).grid(row=len(items)+1, columnspan=2, pady=10)
 
@@ -55,8 +59,32 @@ class PageVilebrequinStirling(tk.Frame):
                                  font=("Consolas", 10), justify="left", anchor="w")
         self.resultat.pack(pady=10, fill="x")
 
-        self.canvas = None
-        bouton_flat(self, "Retour", lambda: controller.afficher_page(PageAccueil)).pack(pady=15)
+        self.schema = None
+        bouton_flat(self, "Retour", lambda: controller.afficher_page("PageAccueil")).pack(pady=15)
+
+        self.controller.etat.abonner(self.synchroniser, ["puissance", "n_cyl", "rpm", "course", "d_cyl", "pression"])
+
+    def synchroniser(self, etat, changes):
+        """Reprend les données moteur modifiées et les cotes qui en découlent"""
+        if "n_cyl" in changes:
+            remplir_champ(self.champs["n_cyl"], etat.n_cyl)
+        if "puissance" in changes:
+            remplir_champ(self.champs["puissance"], etat.puissance)
+        if "rpm" in changes:
+            remplir_champ(self.champs["vitesse"], etat.rpm)
+        if changes & {"puissance", "n_cyl", "rpm"}:
+            P_tot = etat.get("puissance", 1000)
+            n_cyl = etat.get("n_cyl", 1)
+            rpm = etat.get("rpm", 900)
+            couple_nom = (P_tot / n_cyl) / (2 * np.pi * (rpm/60)) if n_cyl else 10
+            remplir_champ(self.champs["couple"], couple_nom, "{:.2f}")
+        if "course" in changes:
+            remplir_champ(self.champs["longueur"], max(80, 2.7 * etat.course), "{:.2f}")
+            remplir_champ(self.champs["rayon_manivelle"], etat.course / 2, "{:.2f}")
+        if "d_cyl" in changes:
+            remplir_champ(self.champs["d_cyl"], etat.d_cyl, "{:.2f}")
+        if "pression" in changes:
+            remplir_champ(self.champs["pression"], etat.pression)
 
     def calculer(self):
         try:
@@ -67,77 +95,146 @@ class PageVilebrequinStirling(tk.Frame):
             L = float(self.champs["longueur"].get())
             r = float(self.champs["rayon_manivelle"].get())
             b = float(self.champs["largeur_maneton"].get())
+            d_cyl = float(self.champs["d_cyl"].get())
+            P_bar = float(self.champs["pression"].get())
             tol = float(self.champs["tol"].get()) / 100
             mat = self.mat_var.get()
-            mat_props = MATERIAUX.get(mat)
-            if mat_props is None:
-                raise ValueError(f"Matériau '{mat}' introuvable dans la base.")
+            mat_props = catalogue().proprietes(mat)  # ValueError si la nuance est inconnue
 
             Re = float(mat_props["Re"]) * 1e6 if "Re" in mat_props else 250e6  # MPa -> Pa
 
-            # Calcul très précis : charge maxi sur le maneton
-            couple_tot = C * n_cyl  # couple total pour tous les cylindres
-            Re_adm = (1-tol) * Re
-            tau_adm = 0.6 * Re_adm
+            largeur_palier = 0.9 * b
+            largeur_bras = 0.65 * b
+            espace_bras_maneton = 0.22 * b
+
+            # Charge du maneton sur un tour : gaz, inertie du piston et de la bielle (bielle
+            # standard de la page Bielle, masses estimées comme dans le balayage)
+            etat = self.controller.etat
+            T_chaud, T_froide = etat.get("t_chaude", 650.0), etat.get("t_froide", 40.0)
+            L_bielle = RATIO_BIELLE * 2 * r
+            masse_piston = round(float(piston(d_cyl)["masse_piston"]), 1)
+            crete = extremes(efforts_moteur(d_cyl, 2 * r, L_bielle, P_bar, N, T_chaud, T_froide, masse_piston))
+            masse_bielle = round(float(bielle(d_cyl, max(crete["F_bielle"], crete["F_traction"]), L_bielle, tol)["masse_bielle"]), 1)
+            charges = efforts_moteur(d_cyl, 2 * r, L_bielle, P_bar, N, T_chaud, T_froide, masse_piston, masse_bielle)
+            crete = extremes(charges)
+            moyen, amplitude = amplitudes(charges, ("F_maneton",))["F_maneton"]
 
-            # Diamètre min du maneton sous torsion + flexion combinée
-            d_m = ((16 * couple_tot) / (np.pi * tau_adm))**(1/3) * 1000  # mm
-            d_m = max(d_m, 12)  # Sécu mini
+            # Calage des manetons à ondulation minimale : le maneton est dimensionné au couple crête
+            # et à la flexion sous la charge crête, sur sa portée entre bras
+            calage = calage_optimal(n_cyl)
+            arbre_vil = vilebrequin(C, n_cyl, r, tol, Re, couple_crete=C * calage["couple_crete"],
+                                    effort_maneton=crete["F_maneton"], portee=b + 2 * espace_bras_maneton)
+            couple_tot = float(arbre_vil["couple_tot"])  # couple total pour tous les cylindres
+            tau_adm = 0.6 * (1 - tol) * Re
+            d_m = float(arbre_vil["d_maneton"])
 
             # Diamètre des paliers
-            d_p = d_m * 1.15
+            d_p = float(arbre_vil["d_palier"])
 
-            largeur_palier = 0.9 * b
-            largeur_bras = 0.65 * b
-            espace_bras_maneton = 0.22 * b
+            effort_radial = float(arbre_vil["effort_radial"])
 
-            # Vitesse de rotation en rad/s pour calcul dynamique
-            omega = 2 * np.pi * (N/60)
-            effort_radial = couple_tot / r if r > 0 else 0
+            # Fatigue du maneton : une fibre par cas de charge (flexion + torsion sur un tour, rainflow + Miner)
+            sigma = contraintes_maneton(charges, d_m, b + 2 * espace_bras_maneton)
+            D, amplitude_fibre, _ = dommages(sigma, mat_props, "goodman")
+            fibre = int(np.argmax(D)) if D.max() > 0 else int(np.argmax(amplitude_fibre))
+            vie = float(duree_vie(D[fibre], N))
+            txt_vie = "illimitée" if not np.isfinite(vie) else f"{vie:.3g} h"
+            couple_crete = float(arbre_vil["couple_crete"])
+            # Équilibrage : ordre des manetons le long de l'arbre (sans effet sur le couple) réduisant
+            # forces libres et moments, contrepoids par manivelle (bielle rotative + maneton + 50 % alternatif)
+            m_alt = masse_piston + PART_ALTERNATIVE * masse_bielle
+            masse_maneton = float(mat_props.get("densite", 7.85)) * np.pi / 4 * d_m ** 2 * b * 1e-3
+            m_rot = (1 - PART_ALTERNATIVE) * masse_bielle + masse_maneton
+            ordre, equilibre = meilleur_ordre(calage["phases"], positions_cylindres(n_cyl, ENTRAXE_CYLINDRES * d_cyl),
+                                              m_alt, m_rot, r, L_bielle, N)
+            cp = contrepoids(m_rot, m_alt, r)
+            phases = ", ".join(f"{p:g}°" for p in ordre)
+
+            # Torsion de la ligne : manivelles (Carter, bras de largeur Øp) -> volant (arbre Øp sur L)
+            # -> génératrice (accouplement élastique) ; ordres critiques près du régime saisi et recommandé
+            G = float(mat_props.get("E", 210e3)) * 1e6 / 2.6
+            J_vol = float(volant(C, N, E_fluctuation=calage["energie"] * C)["J_volant"])
+            J, k = chaine(n_cyl, inertie_manivelle(m_rot, m_alt, r, cp["masse"]),
+                          raideur_manivelle(d_p, d_m, r, largeur_palier, b + 2 * espace_bras_maneton, largeur_bras, d_p, G),
+                          J_vol, G * np.pi * (d_p / 1000) ** 4 / 32 / (L / 1000),
+                          inertie_generatrice(W), RAIDEUR_ACCOUPLEMENT * couple_tot)
+            frequences, formes = modes(J, k)
+            rpm_service = rpm_recommandee(W)
+            resonances = ordres_critiques(frequences, formes, k, harmoniques_couple(C), ordre, [N, rpm_service], C)
+            dangereux = [res for res in resonances if res["dangereux"]]
+            txt_torsion = "; ".join(f"ordre {res['ordre']} du mode {res['mode']} à {res['rpm']:.0f} tr/min "
+                                    f"({res['couple']:.1f} Nm)" for res in dangereux[:3]) or "aucun"
+            # Chaînes de cotes de l'embiellage : ajustements tête de bielle / paliers, garde au PMH
+            empilage = analyser(*chaine_embiellage(d_cyl, r, d_m, d_p, L_bielle))
+            jeu_m, serrage, garde = empilage["jeu_maneton"], empilage["serrage_palier"], empilage["garde_pmh"]
+            harmoniques = ", ".join(f"h{k+1} {a*100:.1f} %" for k, a in enumerate(calage["harmoniques"][:4]))
 
             plan = (
                 f"PLAN TECHNIQUE : VILEBREQUIN STIRLING MULTICYLINDRE\n"
                 f"---------------------------------------------------\n"
                 f"Nombre de cylindres : {n_cyl}\n"
                 f"Puissance transmise totale : {W:.1f} W\n"
-                f"Couple transmis total : {couple_tot:.2f} Nm\n"
+                f"Couple transmis total : {couple_tot:.2f} Nm (crête {couple_crete:.2f} Nm)\n"
+                f"Calage des manetons (cyl. 1 à {n_cyl}) : {phases}\n"
+                f"Ondulation de couple : {calage['ondulation']*100:.1f} % crête à crête ({harmoniques})\n"
                 f"Vitesse de rotation : {N:.1f} tr/min\n"
                 f"1. Longueur entre paliers (L) : {L:.1f} mm\n"
-                f"2. Diamètre maneton (Øm) : {d_m:.2f} mm (Tol. h7)\n"
+                f"2. Diamètre maneton (Øm) : {d_m:.2f} mm (Tol. g6, tête de bielle H7)\n"
                 f"3. Largeur maneton : {b:.1f} mm\n"
-                f"4. Diamètre paliers (Øp) : {d_p:.2f} mm (Tol. h7)\n"
+                f"4. Diamètre paliers (Øp) : {d_p:.2f} mm (Tol. k6, roulements)\n"
                 f"5. Largeur palier : {largeur_palier:.2f} mm\n"
                 f"6. Bras de manivelle : {largeur_bras:.2f} mm chacun\n"
                 f"7. Rayon excentrique (manivelle) : {r:.2f} mm\n"
                 f"8. Espace entre bras/maneton : {espace_bras_maneton:.2f} mm\n"
                 f"9. Matériau recommandé : {mat}\n"
                 f"10. Résistance admissible τ : {tau_adm/1e6:.0f} MPa (Sécurité {tol*100:.0f}%)\n"
-                f"11. Effort radial max : {effort_radial:.2f} N\n"
+                f"11. Charge maneton crête : {effort_radial:.2f} N (cyclique {float(moyen):.1f} ± {float(amplitude):.1f} N)\n"
+                f"12. Charge par palier crête : {float(crete['F_palier']):.2f} N "
+                f"(piston {masse_piston:.0f} g, bielle {masse_bielle:.0f} g, cinématique exacte)\n"
+                f"13. Fatigue maneton (Goodman) : fibre à {fibre * 360 / N_FIBRES:.0f}°, amplitude "
+                f"{amplitude_fibre[fibre]:.1f} MPa (Sf {mat_props.get('Sf', float('nan')):.0f} MPa), durée de vie {txt_vie}\n"
+                f"14. Contrepoids par manivelle : {float(cp['masse']):.0f} g au rayon {r:.2f} mm "
+                f"({float(cp['masse_bras']):.0f} g par bras ; maneton {masse_maneton:.0f} g)\n"
+                f"15. Forces libres : primaire {float(equilibre['F_primaire']):.1f} N, secondaire "
+                f"{float(equilibre['F_secondaire']):.1f} N ; moments : primaire {float(equilibre['M_primaire']):.2f} Nm, "
+                f"secondaire {float(equilibre['M_secondaire']):.2f} Nm\n"
+                f"16. Torsion (manivelles, volant, génératrice) : modes propres "
+                f"{', '.join(f'{f:.0f}' for f in frequences[1:4])} Hz\n"
+                f"17. Ordres critiques près de {N:.0f} / {rpm_service:.0f} tr/min : {txt_torsion}\n"
+                f"18. Jeu tête de bielle H7/g6 : {jeu_m['pire_cas'][0]*1000:.0f} à {jeu_m['pire_cas'][1]*1000:.0f} µm "
+                f"au pire cas, {jeu_m['rss'][0]*1000:.0f} à {jeu_m['rss'][1]*1000:.0f} µm (RSS), "
+                f"{jeu_m['p_hors']*100:.2f} % hors [{jeu_m['mini']*1000:.0f}, {jeu_m['maxi']*1000:.0f}] µm\n"
+                f"19. Serrage tourillon k6 / roulement : {serrage['pire_cas'][0]*1000:.0f} à "
+                f"{serrage['pire_cas'][1]*1000:.0f} µm au pire cas\n"
+                f"20. Garde au PMH : {garde['nominal']:.2f} mm nominale, {garde['pire_cas'][0]:.2f} à "
+                f"{garde['pire_cas'][1]:.2f} mm au pire cas, {garde['monte_carlo'][0]:.2f} à "
+                f"{garde['monte_carlo'][1]:.2f} mm (Monte Carlo ± 3σ)\n"
                 f"\n"
                 f"Instructions CAO/SolidWorks :\n"
                 f"- Axe principal (Øp), extrusion sur toute la longueur.\n"
                 f"- Bras de manivelle : extrusion largeur {largeur_bras:.2f} mm, reliés au maneton.\n"
                 f"- Maneton excentré (Øm, b): centre à r = {r:.2f} mm de l’axe principal.\n"
                 f"- Palier gauche et droit (Øp), largeur {largeur_palier:.2f} mm.\n"
-                f"- Tous les axes et arrondis, tolérance h7 pour montage sur roulements.\n"
+                f"- Tous les axes et arrondis, tolérance k6 des portées de roulements.\n"
                 f"💡 Astuce : prévoir un congé de rayon 2 mm à la jonction bras/maneton.\n"
-                f"⚠️ Vérifier l’équilibrage dynamique avant usinage.\n"
+                f"⚠️ Équilibrer dynamiquement le vilebrequin, contrepoids montés, avant assemblage.\n"
+                + ("⚠️ Garde au PMH insuffisante dans les tolérances : contact piston / culasse possible.\n"
+                   if garde["p_hors"] > 0 or garde["pire_cas"][0] <= 0 else "")
+                + ("⚠️ Résonance de torsion près du régime : changer de régime, raidir la ligne ou "
+                   "prévoir un amortisseur de torsion.\n" if dangereux else "")
             )
 
             self.resultat.config(text=plan)
             self.afficher_schema(d_p, d_m, L, r, b)
         except Exception as e:
             self.resultat.config(text=f"Erreur : {str(e)}")
-            if self.canvas:
-                self.canvas.get_tk_widget().destroy()
-                self.canvas = None
+            if self.schema:
+                self.schema.masquer()
 
     def afficher_schema(self, d_p, d_m, L, r, b):
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-        import matplotlib.patches as mpatches
-        fig = Figure(figsize=(8.5, 2.6), dpi=110)
-        ax = fig.add_subplot(111)
+        if self.schema is None:
+            self.schema = CanevasSchema(self, figsize=(8.5, 2.6), dpi=110, pady=8)
+        s = self.schema
 
         largeur_palier = 0.9 * b
         largeur_bras = 0.65 * b
@@ -157,29 +254,24 @@ class PageVilebrequinStirling(tk.Frame):
         y = 1.0
 
         # Palier gauche/droite
-        ax.add_patch(mpatches.Rectangle((x0, y - d_p/2), largeur_palier, d_p, color="#b6cef2", label="Palier gauche"))
-        ax.add_patch(mpatches.Rectangle((x6, y - d_p/2), largeur_palier, d_p, color="#b6cef2", label="Palier droit"))
+        s.rectangle("palier_g", (x0, y - d_p/2), largeur_palier, d_p, color="#b6cef2", label="Palier gauche")
+        s.rectangle("palier_d", (x6, y - d_p/2), largeur_palier, d_p, color="#b6cef2", label="Palier droit")
         # Bras de manivelle
-        ax.add_patch(mpatches.Rectangle((x1, y - d_p/2), largeur_bras, d_p, color="#aaaaaa", label="Bras"))
-        ax.add_patch(mpatches.Rectangle((x5, y - d_p/2), largeur_bras, d_p, color="#aaaaaa"))
+        s.rectangle("bras_g", (x1, y - d_p/2), largeur_bras, d_p, color="#aaaaaa", label="Bras")
+        s.rectangle("bras_d", (x5, y - d_p/2), largeur_bras, d_p, color="#aaaaaa")
         # Maneton
-        ax.add_patch(mpatches.Rectangle((x3, y + r - d_m/2), largeur_maneton, d_m, color="#ef767a", label="Maneton excentré"))
+        s.rectangle("maneton", (x3, y + r - d_m/2), largeur_maneton, d_m, color="#ef767a", label="Maneton excentré")
 
-        ax.plot([x0, x7], [y, y], color="k", lw=2, linestyle="--", zorder=3)
+        s.ligne("axe", [x0, x7], [y, y], color="k", lw=2, linestyle="--", zorder=3)
         x_centre_maneton = x3 + largeur_maneton / 2
-        ax.plot([x_centre_maneton, x_centre_maneton], [y, y + r], color="#222", lw=2, linestyle="-")
-        ax.plot([x3, x4], [y + r, y + r], color="#a33", lw=2, linestyle=":")
-
-        ax.text(x1 + largeur_bras/2, y + d_p/2 + 3, "Bras de manivelle", ha="center", color="#555")
-        ax.text(x3 + largeur_maneton/2, y + r + d_m/2 + 2, "Maneton (excentré)", ha="center", color="#a33")
-        ax.text(x0 + largeur_palier/2, y + d_p/2 + 2, "Palier", ha="center", color="#334")
-        ax.text(x6 + largeur_palier/2, y + d_p/2 + 2, "Palier", ha="center", color="#334")
-
-        ax.set_xlim(x0 - 10, x7 + 10)
-        ax.set_ylim(y - d_p, y + d_p * 2)
-        ax.axis("off")
-        ax.set_title("Croquis industriel du vilebrequin – vue de dessus")
-
-        self.canvas = FigureCanvasTkAgg(fig, master=self)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(pady=8)
+        s.ligne("rayon", [x_centre_maneton, x_centre_maneton], [y, y + r], color="#222", lw=2, linestyle="-")
+        s.ligne("excentre", [x3, x4], [y + r, y + r], color="#a33", lw=2, linestyle=":")
+
+        s.texte("txt_bras", (x1 + largeur_bras/2, y + d_p/2 + 3), "Bras de manivelle", ha="center", color="#555")
+        s.texte("txt_maneton", (x3 + largeur_maneton/2, y + r + d_m/2 + 2), "Maneton (excentré)", ha="center", color="#a33")
+        s.texte("txt_palier_g", (x0 + largeur_palier/2, y + d_p/2 + 2), "Palier", ha="center", color="#334")
+        s.texte("txt_palier_d", (x6 + largeur_palier/2, y + d_p/2 + 2), "Palier", ha="center", color="#334")
+
+        s.limites((x0 - 10, x7 + 10), (y - d_p, y + d_p * 2))
+        s.titre("Croquis industriel du vilebrequin – vue de dessus")
+        s.rafraichir()
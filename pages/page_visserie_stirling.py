@@ -4,8 +4,9 @@
 
 import tkinter as tk
 from styles import COULEURS, bouton_flat
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from etat_conception import remplir_champ
+from canevas_schema import CanevasSchema
+import numpy as np
 
 class PageVisserieStirling(tk.Frame):
     def __init__(self, parent, controller):
@@ -23,7 +24,7 @@ class PageVisserieStirling(tk.Frame):
         )
         tk.Label(self, text=desc, bg=COULEURS["fond"], fg=COULEURS["texte"], font=("Segoe UI", 10)).pack()
 
-        # Entrées principales (peuvent venir du memo_moteur_stirling)
+        # Entrées principales (peuvent venir de l'état de conception moteur)
         form = tk.Frame(self, bg=COULEURS["fond"])
         form.pack(pady=10)
         self.d_cyl = self._champ(form, "Diamètre cylindre (mm)", 0)
@@ -33,14 +34,14 @@ class PageVisserieStirling(tk.Frame):
         self.n_trous_volant = self._champ(form, "Nb vis volant", 4, default="4")
 
         bouton_flat(form, "Calculer la visserie", self.calculer_visserie).grid(row=6, columnspan=2, pady=10)
-        bouton_flat(form, "Retour", lambda: controller.afficher_page(list(controller.frames.keys())[0])).grid(row=7, columnspan=2, pady=4)
+        bouton_flat(form, "Retour", lambda: controller.afficher_page("PageAccueil")).grid(row=7, columnspan=2, pady=4)
 
         self.resultat = tk.Label(self, text="", bg=COULEURS["fond"], fg=COULEURS["accent"],
                                  font=("Consolas", 10), justify="left")
         self.resultat.pack(pady=10)
-        self.canvas = None
+        self.schema = None
 
-        self.prefill_from_memo()
+        self.controller.etat.abonner(self.prefill_from_memo, ["d_cyl"])
 
     def _champ(self, parent, label, row, default=""):
         tk.Label(parent, text=label, bg=COULEURS["fond"], fg=COULEURS["texte"],
@@ -50,11 +51,8 @@ class PageVisserieStirling(tk.Frame):
         e.grid(row=row, column=1, padx=7)
         return e
 
-    def prefill_from_memo(self):
-        memo = getattr(self.controller, "memo_moteur_stirling", {})
-        if memo.get("d_cyl"):
-            self.d_cyl.delete(0, tk.END)
-            self.d_cyl.insert(0, str(memo["d_cyl"]))
+    def prefill_from_memo(self, etat, changes):
+        remplir_champ(self.d_cyl, etat.d_cyl)
 
     def calculer_visserie(self):
         try:
@@ -114,19 +112,39 @@ class PageVisserieStirling(tk.Frame):
 
         except Exception as e:
             self.resultat.config(text=f"Erreur : {str(e)}")
-            if self.canvas:
-                self.canvas.get_tk_widget().destroy()
-                self.canvas = None
+            if self.schema:
+                self.schema.masquer()
 
     def afficher_schema(self, d_cyl, ep, n_emb, n_cyl, n_volant, vis_emb, vis_cyl, vis_volant):
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-        from matplotlib.patches import Rectangle, Circle
-
-        fig = Figure(figsize=(6, 2.2), dpi=100)
-        ax = fig.add_subplot(111)
-        # Simple croquis schématique : embase, cylindre, volant, et points de vis
+        if self.schema is None:
+            self.schema = CanevasSchema(self, figsize=(6, 2.2), pady=5)
+            self.schema.ax.set_aspect("equal")
+        s = self.schema
+        # Simple croquis schématique : embase, cylindre, volant, et points de vis
         # Embase = grande plaque
-        ax.add_patch(Rectangle((0, 0), 180, 60, edgecolor="#222", facecolor="#b9e1f5", lw=2, label="Embase"))
-        # Points de vis embase (n_emb)
-        f
+        s.rectangle("embase", (0, 0), 180, 60, edgecolor="#222", facecolor="#b9e1f5", lw=2, label="Embase")
+        # Points de vis embase (n_emb), répartis le long de la plaque
+        for i, x in enumerate(np.linspace(12, 168, max(n_emb, 1))[:n_emb]):
+            s.cercle(("vis_emb", i), (x, 8 if i % 2 == 0 else 52), 3, color="#ef767a")
+        s.texte("txt_emb", (90, -10), f"Embase : {n_emb} x {vis_emb}", ha="center", fontsize=8, color="#222")
+
+        # Cylindre (vue de dessus) posé sur l'embase, vis de couvercle sur un cercle primitif
+        r_cyl = min(d_cyl / 2, 25)
+        centre_cyl = (55, 30)
+        s.cercle("cylindre", centre_cyl, r_cyl, edgecolor="#222", facecolor="#dde3f8", lw=1.5)
+        for i, a in enumerate(np.linspace(0, 2 * np.pi, max(n_cyl, 1), endpoint=False)[:n_cyl]):
+            s.cercle(("vis_cyl", i), (centre_cyl[0] + 0.8 * r_cyl * np.cos(a), centre_cyl[1] + 0.8 * r_cyl * np.sin(a)),
+                     2, color="#1976d2")
+        s.texte("txt_cyl", (centre_cyl[0], 66), f"Couvercle : {n_cyl} x {vis_cyl}", ha="center", fontsize=8, color="#175")
+
+        # Volant, vis de moyeu
+        centre_volant = (130, 30)
+        s.cercle("volant", centre_volant, 22, edgecolor="#222", facecolor="#cccccc", lw=1.5)
+        for i, a in enumerate(np.linspace(0, 2 * np.pi, max(n_volant, 1), endpoint=False)[:n_volant]):
+            s.cercle(("vis_volant", i), (centre_volant[0] + 9 * np.cos(a), centre_volant[1] + 9 * np.sin(a)),
+                     2, color="#a36b19")
+        s.texte("txt_volant", (centre_volant[0], 66), f"Volant : {n_volant} x {vis_volant}", ha="center", fontsize=8, color="#a36b19")
+
+        s.limites((-10, 190), (-18, 75))
+        s.titre(f"Croquis visserie (plaques {ep:.0f} mm)")
+        s.rafraichir()
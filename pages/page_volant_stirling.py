@@ -4,22 +4,31 @@
 
 import tkinter as tk
 from styles import COULEURS, bouton_flat
+from canevas_schema import CanevasSchema
 import numpy as np
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-MATERIAUX_VOLANT = [
-    {"nom": "Acier S235", "Re": 235, "densite": 7.85, "usage": "standard, masse élevée"},
-    {"nom": "Fonte GGG40", "Re": 400, "densite": 7.1, "usage": "inertie, anti-vibratoire"},
-    {"nom": "Alu 2017A", "Re": 380, "densite": 2.8, "usage": "léger, petits moteurs"},
-]
-
-def mat_volant_optimal(M_cible):
-    # On privilégie fonte/acier si masse élevée nécessaire, alu sinon
-    if M_cible > 1:
-        return MATERIAUX_VOLANT[1]  # Fonte
-    else:
-        return MATERIAUX_VOLANT[0]  # Acier
+from materiaux import catalogue
+from etat_conception import remplir_champ
+from calculs.pieces_stirling import volant
+from calculs.phasage import calage_optimal, couple_moteur
+from calculs.selection_materiaux import volant as volant_materiaux, front
+from calculs import dynamique_volant as dyn
+
+def volant_optimal(profil, J_estime, N, delta, D_max, tol=0.2, b_mini=dyn.B_MINI):
+    """
+    Volant le plus léger par simulation de la vitesse de l'arbre : géométries (disque,
+    jante à bras, jante à voile) × diamètres jusqu'à D_max × matériaux du front masse /
+    marge / coût du catalogue qui tiennent la contrainte centrifuge d'un disque plein.
+    Renvoie (catalogue, candidats, indice du meilleur).
+    """
+    cat = catalogue()
+    materiaux = front(volant_materiaux(cat, J_estime, N, D_max, tol), "cout")
+    if not materiaux.size:
+        raise ValueError("Aucun matériau ne tient la contrainte centrifuge : réduire D ou le régime.")
+    cand = dyn.dimensionner(profil, N, delta, dyn.candidats(cat, materiaux, D_max), tol, b_mini=b_mini)
+    i = dyn.meilleur(cand)
+    if i < 0:
+        raise ValueError("Aucun volant valide : augmenter D, l'ondulation admise ou réduire le régime.")
+    return cat, cand, i
 
 class PageVolantStirling(tk.Frame):
     def __init__(self, parent, controller):
@@ -41,16 +50,28 @@ class PageVolantStirling(tk.Frame):
         self.C = self._champ(form, "Couple max moteur (Nm)", 2)
         self.delta = self._champ(form, "Ondulation max (Δω/ω, ex: 0.04)", 3, "0.04")
         self.D = self._champ(form, "Diamètre max dispo (mm)", 4, "200")
-        self.e = self._champ(form, "Épaisseur cible (mm)", 5, "18")
+        self.e = self._champ(form, "Largeur mini (mm)", 5, "18")
         self.tol = self._champ(form, "Tolérance sécurité (%)", 6, "20")
+        self.n_cyl = self._champ(form, "Nombre de cylindres", 7, "1")
 
         bouton_flat(form, "Calculer volant", self.calculer).grid(row=8, columnspan=2, pady=10)
-        bouton_flat(form, "Retour", lambda: controller.afficher_page(list(self.controller.frames.keys())[0])).grid(row=9, columnspan=2, pady=4)
+        bouton_flat(form, "Retour", lambda: controller.afficher_page("PageAccueil")).grid(row=9, columnspan=2, pady=4)
 
         self.resultat = tk.Label(self, text="", bg=COULEURS["fond"], fg=COULEURS["accent"],
                                  font=("Consolas", 10), justify="left")
         self.resultat.pack(pady=10)
-        self.canvas = None
+        self.schema = None
+
+        self.controller.etat.abonner(self.synchroniser, ["puissance", "n_cyl", "rpm"])
+
+    def synchroniser(self, etat, changes):
+        """Reprend les données moteur modifiées"""
+        if "puissance" in changes:
+            remplir_champ(self.P, etat.puissance)
+        if "rpm" in changes:
+            remplir_champ(self.N, etat.rpm)
+        if "n_cyl" in changes:
+            remplir_champ(self.n_cyl, etat.n_cyl)
 
     def _champ(self, parent, label, row, default=""):
         tk.Label(parent, text=label, bg=COULEURS["fond"], fg=COULEURS["texte"],
@@ -69,27 +90,38 @@ class PageVolantStirling(tk.Frame):
             D_max = float(self.D.get())
             e = float(self.e.get())
             tol = float(self.tol.get()) / 100
-
-            omega = 2*np.pi*N/60  # rad/s
-            # Énergie cinétique cible = énergie fournie par cycle, corrigée du facteur d’ondulation
-            E_cycle = C * 2 * np.pi
-            J_min = E_cycle / (omega * delta) * (1 + tol)
-            # On suppose un disque plein, J = (1/2) M R^2
-            R = D_max / 2 / 1000  # en m
-            M = J_min / (0.5 * R**2)
-            mat = mat_volant_optimal(M)
-            masse_volant = M
-            inertie = 0.5 * M * (R**2)
-            sigma_max = (3 * M * (omega**2) * R**2) / (8 * np.pi * e / 1000 * (R**3))
+            n_cyl = int(self.n_cyl.get() or 1)
+
+            # Couple instantané des cylindres au calage optimal ; estimation J = ΔE / (ω² δ)
+            calage = calage_optimal(n_cyl)
+            E_fluctuation = C / n_cyl * calage["energie"]
+            cotes = volant(C, N, delta, D_max, tol, E_fluctuation)
+            profil = couple_moteur(n_cyl, C)
+
+            # Géométrie retenue par simulation, puis démarrage depuis l'arrêt
+            cat, cand, i = volant_optimal(profil, float(cotes["J_volant"]), N, delta, D_max, tol, e)
+            v = cand[i]
+            mat = cat.proprietes(int(v["materiau"]))
+            demarrage = dyn.simuler(profil, v["J"], N, depart_arret=True)
+            if demarrage["demarre"]:
+                txt_demarrage = f"{demarrage['temps']:.1f} s ({demarrage['tours']} tours) jusqu'à {dyn.SEUIL_DEMARRAGE*100:.0f} % du régime"
+            else:
+                txt_demarrage = "le moteur cale : prévoir un lanceur"
+            type_volant = {"disque": "disque plein", "jante": f"jante à {dyn.N_BRAS} bras", "voile": "jante à voile"}[dyn.TYPES_VOLANT[v["type"]]]
+            n_valides = int(cand["valide"].sum())
 
             plan = (
-                f"- Ø volant : {D_max:.1f} mm\n"
-                f"- Largeur/épaisseur : {e:.1f} mm\n"
-                f"- Masse cible : {masse_volant:.2f} kg\n"
-                f"- Inertie (J) : {inertie:.2f} kg·m²\n"
-                f"- Régime : {N:.0f} tr/min\n"
-                f"- Matériau recommandé : {mat['nom']} (Re={mat['Re']} MPa, ρ={mat['densite']} g/cm³)\n"
-                f"- Tension max estimée (centre) : {sigma_max/1e6:.1f} MPa (tolérance {tol*100:.0f}%)\n"
+                f"- Type : {type_volant} ({n_valides} candidats valides sur {len(cand)})\n"
+                f"- Ø volant : {v['D']:.1f} mm\n"
+                f"- Largeur : {v['b']:.1f} mm\n"
+                f"- Masse : {v['masse']:.2f} kg\n"
+                f"- Inertie (J) : {v['J']:.4f} kg·m² (estimation ΔE/(ω²δ) : {float(cotes['J_volant']):.4f})\n"
+                f"- Régime : {N:.0f} tr/min, fluctuation simulée δ = {v['delta']:.4f} (visée {delta})\n"
+                f"- Énergie de fluctuation : {E_fluctuation:.2f} J ({n_cyl} cyl., ondulation de couple {calage['ondulation']*100:.1f} %"
+                f" ; C·2π = {C*2*np.pi:.1f} J)\n"
+                f"- Démarrage depuis l'arrêt : {txt_demarrage}\n"
+                f"- Matériau recommandé : {mat['nom']} (Re={mat['Re']} MPa, ρ={mat['densite']} g/cm³, {v['cout']:.2f} €)\n"
+                f"- Contrainte centrifuge : {v['sigma']:.1f} MPa (tolérance {tol*100:.0f}%)\n"
                 "- Moyeu alésé H7, rainure de clavette ou vis de pression.\n"
                 "- Fixation sur vilebrequin par clavette, vis M6/M8 (min 8.8).\n"
                 "- Usiner équilibrage dynamique, filetage taraudé possible pour extracteur."
@@ -105,27 +137,20 @@ class PageVolantStirling(tk.Frame):
 {plan}
 {conseils}
 """)
-            self.afficher_schema(D_max, e, masse_volant)
+            self.afficher_schema(v["D"], v["b"], v["masse"])
         except Exception as e:
             self.resultat.config(text=f"Erreur : {str(e)}")
-            if self.canvas:
-                self.canvas.get_tk_widget().destroy()
-                self.canvas = None
+            if self.schema:
+                self.schema.masquer()
 
     def afficher_schema(self, D, e, masse):
-        if self.canvas:
-            self.canvas.get_tk_widget().destroy()
-        import matplotlib.patches as mpatches
-        fig = Figure(figsize=(4.6, 2), dpi=100)
-        ax = fig.add_subplot(111)
+        if self.schema is None:
+            self.schema = CanevasSchema(self, figsize=(4.6, 2), pady=5)
+        s = self.schema
         # Volant vu de côté (rectangle)
-        ax.add_patch(mpatches.Rectangle((0.7, 0.8), D/60, e/15, color="#cccccc", label="Volant d'inertie"))
-        ax.text(0.7 + D/120, 0.8 + e/30 + 0.08, f"Ø {D:.0f} mm", ha="center", color="#333")
-        ax.text(0.7 + D/130, 0.8 - 0.09, f"e {e:.0f} mm", ha="center", color="#333")
-        ax.set_xlim(0.5, 0.7 + D/55)
-        ax.set_ylim(0.7, 1.3)
-        ax.axis("off")
-        ax.set_title(f"Croquis technique volant (vue de côté, masse ≈ {masse:.2f} kg)")
-        self.canvas = FigureCanvasTkAgg(fig, master=self)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(pady=5)
+        s.rectangle("volant", (0.7, 0.8), D/60, e/15, color="#cccccc", label="Volant d'inertie")
+        s.texte("D", (0.7 + D/120, 0.8 + e/30 + 0.08), f"Ø {D:.0f} mm", ha="center", color="#333")
+        s.texte("e", (0.7 + D/130, 0.8 - 0.09), f"e {e:.0f} mm", ha="center", color="#333")
+        s.limites((0.5, 0.7 + D/55), (0.7, 1.3))
+        s.titre(f"Croquis technique volant (vue de côté, masse ≈ {masse:.2f} kg)")
+        s.rafraichir()
@@ -0,0 +1,146 @@
+# profil_demarrage.py
+"""
+Chronométrage du démarrage de l'application (façon python -X importtime).
+
+    python main.py --profil-demarrage             # rapport sur la sortie d'erreur
+    python main.py --budget-ms 800                # rapport, puis code retour 1 si le budget est dépassé
+
+Un chercheur de modules placé en tête de sys.meta_path mesure, pour chaque
+import, le temps cumulé et le temps propre (hors sous-imports). Les étapes
+nommées (construction des pages…) sont mesurées par ProfilDemarrage.etape().
+"""
+
+import importlib.abc
+import sys
+import time
+from contextlib import contextmanager
+
+
+class _ChargeurChronometre(importlib.abc.Loader):
+    """Enveloppe un chargeur pour mesurer create_module + exec_module"""
+
+    def __init__(self, chargeur, profil, nom):
+        self._chargeur = chargeur
+        self._profil = profil
+        self._nom = nom
+
+    def __getattr__(self, attr):
+        return getattr(self._chargeur, attr)
+
+    def create_module(self, spec):
+        self._profil._debut(self._nom)
+        try:
+            return self._chargeur.create_module(spec)
+        except BaseException:
+            self._profil._pile.pop()
+            raise
+
+    def exec_module(self, module):
+        if not self._profil._pile or self._profil._pile[-1][0] != self._nom:
+            self._profil._debut(self._nom)
+        try:
+            self._chargeur.exec_module(module)
+        finally:
+            self._profil._fin(self._nom)
+            # Le module garde son vrai chargeur (importlib.resources, pkgutil…)
+            module.__loader__ = self._chargeur
+            if getattr(module, "__spec__", None) is not None:
+                module.__spec__.loader = self._chargeur
+
+
+class _ChercheurChronometre(importlib.abc.MetaPathFinder):
+    def __init__(self, profil):
+        self._profil = profil
+
+    def find_spec(self, nom, chemin, cible=None):
+        for chercheur in sys.meta_path:
+            if chercheur is self or not hasattr(chercheur, "find_spec"):
+                continue
+            spec = chercheur.find_spec(nom, chemin, cible)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _ChargeurChronometre(spec.loader, self._profil, nom)
+                return spec
+        return None
+
+
+class ProfilDemarrage:
+    def __init__(self, t0=None, budget_ms=None):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.budget_ms = budget_ms
+        self.imports = {}      # nom -> [cumulé s, propre s]
+        self.etapes = []       # (nom, durée s)
+        self.total = None
+        self._pile = []        # [nom, début, durée des sous-imports]
+        self._chercheur = None
+
+    @classmethod
+    def depuis_arguments(cls, argv, t0=None):
+        """Renvoie un profil actif si --profil-demarrage ou --budget-ms est présent, sinon None"""
+        budget = None
+        if "--budget-ms" in argv:
+            i = argv.index("--budget-ms")
+            budget = float(argv[i + 1])
+        elif "--profil-demarrage" not in argv:
+            return None
+        profil = cls(t0=t0, budget_ms=budget)
+        profil.installer()
+        return profil
+
+    # ---- chronométrage des imports ----
+    def installer(self):
+        if self._chercheur is None:
+            self._chercheur = _ChercheurChronometre(self)
+            sys.meta_path.insert(0, self._chercheur)
+
+    def desinstaller(self):
+        if self._chercheur in sys.meta_path:
+            sys.meta_path.remove(self._chercheur)
+        self._chercheur = None
+
+    def _debut(self, nom):
+        self._pile.append([nom, time.perf_counter(), 0.0])
+
+    def _fin(self, nom):
+        nom, debut, enfants = self._pile.pop()
+        cumule = time.perf_counter() - debut
+        self.imports[nom] = [cumule, cumule - enfants]
+        if self._pile:
+            self._pile[-1][2] += cumule
+
+    # ---- étapes nommées ----
+    @contextmanager
+    def etape(self, nom):
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.etapes.append((nom, time.perf_counter() - debut))
+
+    def terminer(self):
+        """Fige la durée totale (appelé quand la première page est affichée)"""
+        self.total = time.perf_counter() - self.t0
+        self.desinstaller()
+        return self.total
+
+    def budget_respecte(self):
+        return self.budget_ms is None or (self.total or 0) * 1000 <= self.budget_ms
+
+    def rapport(self, n_imports=25):
+        total = self.total if self.total is not None else time.perf_counter() - self.t0
+        lignes = [
+            "PROFIL DE DÉMARRAGE",
+            "-------------------",
+            f"Temps jusqu'à la première page : {total * 1000:.0f} ms"
+            + (f" (budget {self.budget_ms:.0f} ms : {'OK' if self.budget_respecte() else 'DÉPASSÉ'})"
+               if self.budget_ms is not None else ""),
+            "",
+            "Étapes :",
+        ]
+        for nom, duree in self.etapes:
+            lignes.append(f"  {duree * 1000:9.1f} ms  {nom}")
+        lignes += ["", f"Imports les plus lents ({len(self.imports)} modules chargés) :",
+                   "   cumulé (ms) | propre (ms) | module"]
+        for nom, (cumule, propre) in sorted(self.imports.items(), key=lambda kv: -kv[1][0])[:n_imports]:
+            lignes.append(f"  {cumule * 1000:11.1f} | {propre * 1000:11.1f} | {nom}")
+        return "\n".join(lignes)
@@ -0,0 +1,338 @@
+# projet.py
+"""
+Fichier projet (.caoprj) : état de conception, variantes et saisies de toutes les pages.
+
+Format binaire à sections (en-tête JSON, données brutes) :
+
+    MAGIC | bloc | bloc | ... | index JSON | MAGIC_INDEX + offset index + taille index
+
+- une section JSON (petits dicts : saisies d'une page, état moteur) ou un
+  tableau NumPy brut (profils, variantes) est un bloc d'octets ;
+- l'index donne pour chaque section : offset, taille, type, dtype/forme et
+  empreinte (blake2b) ;
+- une sauvegarde incrémentale ajoute en fin de fichier les seules sections dont
+  l'empreinte a changé, puis un nouvel index : les anciennes sections restent
+  valides, et un arrêt brutal laisse toujours le dernier index complet lisible ;
+- quand les blocs morts dépassent les blocs vivants, le fichier est réécrit
+  (fichier temporaire + os.replace).
+
+Les saisies sont relevées dans le thread Tk (simples .get()) ; sérialisation,
+empreintes et écriture se font dans le thread d'autosauvegarde.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+import tkinter as tk
+
+import numpy as np
+
+from cache_disque import dossier_cache, ecrire_atomique
+from etat_conception import NOMS, Instantane
+
+MAGIC = b"CAOPRJ\x00\x01"
+MAGIC_INDEX = b"CAOIDX\x00\x01"
+_FIN = struct.Struct("<8sQQ")  # magic, offset index, taille index
+EXTENSION = ".caoprj"
+VERSION_FORMAT = 1
+SEUIL_COMPACTAGE = 1 << 20  # octets morts tolérés avant réécriture complète
+
+
+class ErreurProjet(Exception):
+    pass
+
+
+# ----------------- Sections -----------------
+
+def _encoder(valeur):
+    """Renvoie (méta, octets) d'une section"""
+    if isinstance(valeur, np.ndarray):
+        tableau = np.ascontiguousarray(valeur)
+        meta = {"type": "npy", "dtype": tableau.dtype.str, "forme": list(tableau.shape)}
+        octets = tableau.tobytes()
+    else:
+        meta = {"type": "json"}
+        octets = json.dumps(valeur, ensure_ascii=False, separators=(",", ":")).encode()
+    meta["empreinte"] = hashlib.blake2b(octets, digest_size=16).hexdigest()
+    return meta, octets
+
+
+def _decoder(meta, octets):
+    if meta["type"] == "npy":
+        return np.frombuffer(octets, dtype=np.dtype(meta["dtype"])).reshape(meta["forme"]).copy()
+    return json.loads(octets.decode())
+
+
+class FichierProjet:
+    """Conteneur à sections avec écriture incrémentale par ajout"""
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        self.index = None        # index du fichier sur disque (None : inconnu / à réécrire)
+        self._verrou = threading.Lock()
+
+    # ---- lecture ----
+    def lire(self):
+        with self._verrou:
+            with open(self.chemin, "rb") as f:
+                donnees = f.read()
+            if not donnees.startswith(MAGIC):
+                raise ErreurProjet(f"{self.chemin} n'est pas un projet CAO")
+            index = self._trouver_index(donnees)
+            sections = {}
+            for nom, meta in index["sections"].items():
+                debut = meta["offset"]
+                sections[nom] = _decoder(meta, donnees[debut:debut + meta["taille"]])
+            self.index = index
+            return sections
+
+    @staticmethod
+    def _trouver_index(donnees):
+        """Dernier index complet (remonte le fichier si l'écriture précédente a été interrompue)"""
+        fin = len(donnees)
+        while True:
+            pos = donnees.rfind(MAGIC_INDEX, 0, fin)
+            if pos < 0:
+                raise ErreurProjet("Index du projet introuvable (fichier corrompu)")
+            if pos + _FIN.size <= len(donnees):
+                _, offset, taille = _FIN.unpack_from(donnees, pos)
+                if offset + taille == pos:
+                    try:
+                        index = json.loads(donnees[offset:pos].decode())
+                        if index.get("format") == VERSION_FORMAT:
+                            index["fin"] = pos + _FIN.size
+                            return index
+                    except (UnicodeDecodeError, ValueError):
+                        pass
+            fin = pos
+
+    # ---- écriture ----
+    def ecrire(self, sections, incremental=True):
+        """
+        Enregistre sections {nom: dict/list JSON ou ndarray}.
+        Renvoie la liste des sections réellement écrites ([] si rien n'a changé).
+        """
+        encodees = {nom: _encoder(v) for nom, v in sections.items()}
+        with self._verrou:
+            if incremental and self.index is None and os.path.exists(self.chemin):
+                try:
+                    with open(self.chemin, "rb") as f:
+                        donnees = f.read()
+                    if donnees.startswith(MAGIC):
+                        self.index = self._trouver_index(donnees)
+                except (OSError, ErreurProjet):
+                    self.index = None
+            if not incremental or self.index is None:
+                return self._ecrire_complet(encodees)
+
+            anciennes = self.index["sections"]
+            modifiees = [nom for nom, (meta, _) in encodees.items()
+                         if nom not in anciennes or anciennes[nom]["empreinte"] != meta["empreinte"]]
+            supprimees = set(anciennes) - set(encodees)
+            if not modifiees and not supprimees:
+                return []
+
+            vivant = sum(len(o) for _, o in encodees.values())
+            mort = self.index["fin"] - vivant + sum(len(encodees[n][1]) for n in modifiees)
+            if mort > max(vivant, SEUIL_COMPACTAGE):
+                return self._ecrire_complet(encodees)
+
+            nouvelles = {nom: dict(anciennes[nom]) for nom in encodees if nom not in modifiees}
+            with open(self.chemin, "r+b") as f:
+                f.seek(self.index["fin"])
+                pos = self.index["fin"]
+                for nom in modifiees:
+                    meta, octets = encodees[nom]
+                    f.write(octets)
+                    nouvelles[nom] = dict(meta, offset=pos, taille=len(octets))
+                    pos += len(octets)
+                self.index = self._ecrire_index(f, pos, nouvelles)
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+            return modifiees
+
+    def _ecrire_complet(self, encodees):
+        index = {}
+
+        def ecrire(f):
+            f.write(MAGIC)
+            pos = len(MAGIC)
+            sections = {}
+            for nom, (meta, octets) in encodees.items():
+                f.write(octets)
+                sections[nom] = dict(meta, offset=pos, taille=len(octets))
+                pos += len(octets)
+            index.update(self._ecrire_index(f, pos, sections))
+            f.flush()
+            os.fsync(f.fileno())
+
+        ecrire_atomique(self.chemin, ecrire)
+        self.index = index
+        return list(encodees)
+
+    @staticmethod
+    def _ecrire_index(f, pos, sections):
+        index = {"format": VERSION_FORMAT, "sections": sections}
+        octets = json.dumps(index, separators=(",", ":")).encode()
+        f.write(octets)
+        f.write(_FIN.pack(MAGIC_INDEX, pos, len(octets)))
+        index["fin"] = pos + len(octets) + _FIN.size
+        return index
+
+
+# ----------------- Saisies des pages (thread Tk) -----------------
+
+# Attributs internes de tk.Frame (et le contrôleur) : jamais relevés
+_ATTRIBUTS_IGNORES = {"master", "tk", "children", "widgetName", "controller"}
+
+
+def capturer_saisies(page):
+    """Relève le contenu des Entry, variables Tk et tableaux NumPy portés par la page"""
+    textes, tableaux = {}, {}
+    for attr, valeur in vars(page).items():
+        if attr.startswith("_") or attr in _ATTRIBUTS_IGNORES:
+            continue
+        if isinstance(valeur, tk.Entry):
+            textes[attr] = valeur.get()
+        elif isinstance(valeur, tk.Variable):
+            textes[attr] = valeur.get()
+        elif isinstance(valeur, np.ndarray):
+            tableaux[attr] = valeur
+        elif isinstance(valeur, dict):
+            for cle, widget in valeur.items():
+                if isinstance(widget, tk.Entry):
+                    textes[f"{attr}.{cle}"] = widget.get()
+    return textes, tableaux
+
+
+def restaurer_saisies(page, textes, tableaux):
+    for nom, texte in textes.items():
+        attr, _, cle = nom.partition(".")
+        cible = getattr(page, attr, None)
+        if cle:
+            cible = cible.get(cle) if isinstance(cible, dict) else None
+        if isinstance(cible, tk.Entry):
+            if cible.get() != texte:
+                cible.delete(0, tk.END)
+                cible.insert(0, texte)
+        elif isinstance(cible, tk.Variable):
+            cible.set(texte)
+    for attr, tableau in tableaux.items():
+        setattr(page, attr, tableau)
+
+
+# ----------------- Projet de l'application -----------------
+
+def _variantes_en_tableau(variantes):
+    valeurs = np.full((len(variantes), len(NOMS)), np.nan)
+    for i, v in enumerate(variantes):
+        valeurs[i] = [np.nan if x is None else x for x in v.valeurs]
+    return valeurs
+
+
+def sections_application(app):
+    """Relevé de tout le projet (à appeler dans le thread Tk)"""
+    sections = {
+        "etat": app.etat.en_dict(),
+        "variantes/noms": [v.nom for v in app.variantes],
+        "variantes/valeurs": _variantes_en_tableau(app.variantes),
+    }
+    # Pages jamais ouvertes depuis le chargement : on conserve leurs saisies telles quelles
+    for nom, (textes, tableaux) in app.saisies_en_attente.items():
+        sections[f"page/{nom}"] = textes
+        for attr, tableau in tableaux.items():
+            sections[f"page/{nom}/{attr}"] = tableau
+    for nom, page in app.frames.items():
+        textes, tableaux = capturer_saisies(page)
+        sections[f"page/{nom}"] = textes
+        for attr, tableau in tableaux.items():
+            sections[f"page/{nom}/{attr}"] = tableau
+    return sections
+
+
+def appliquer_sections(app, sections):
+    """Recharge état, variantes et saisies ; les pages non construites les reçoivent à leur ouverture"""
+    app.etat.maj(**{nom: sections.get("etat", {}).get(nom) for nom in NOMS})
+    valeurs = sections.get("variantes/valeurs")
+    noms = sections.get("variantes/noms", [])
+    app.variantes = []
+    if valeurs is not None:
+        for nom, ligne in zip(noms, valeurs):
+            app.variantes.append(Instantane(0, tuple(None if np.isnan(x) else (int(x) if n == "n_cyl" else float(x))
+                                                     for n, x in zip(NOMS, ligne)), nom))
+    pages = {}
+    for nom, valeur in sections.items():
+        if not nom.startswith("page/"):
+            continue
+        _, page, *attr = nom.split("/", 2)
+        textes, tableaux = pages.setdefault(page, ({}, {}))
+        if attr:
+            tableaux[attr[0]] = valeur
+        else:
+            textes.update(valeur)
+    app.saisies_en_attente = {}
+    for page, (textes, tableaux) in pages.items():
+        if page in app.frames:
+            restaurer_saisies(app.frames[page], textes, tableaux)
+        else:
+            app.saisies_en_attente[page] = (textes, tableaux)
+
+
+def chemin_autosauvegarde(precedente=False):
+    """Autosauvegarde hors projet de la session courante (ou de la précédente)"""
+    dossier = dossier_cache("projets")
+    if not dossier:
+        return None
+    return os.path.join(dossier, ("session_precedente" if precedente else "autosauvegarde") + EXTENSION)
+
+
+def nouvelle_autosauvegarde_session():
+    """Met de côté l'autosauvegarde de la session précédente et renvoie le fichier de la session courante"""
+    chemin = chemin_autosauvegarde()
+    if chemin is None:
+        return None
+    if os.path.exists(chemin):
+        os.replace(chemin, chemin_autosauvegarde(precedente=True))
+    return FichierProjet(chemin)
+
+
+class Autosauvegarde:
+    """Écrit en arrière-plan le dernier relevé demandé ; seules les sections modifiées sont ajoutées"""
+
+    def __init__(self, fichier, sur_erreur=None):
+        self.fichier = fichier
+        self.sur_erreur = sur_erreur
+        self._attente = None
+        self._condition = threading.Condition()
+        self._actif = True
+        self._thread = threading.Thread(target=self._boucle, name="autosauvegarde", daemon=True)
+        self._thread.start()
+
+    def demander(self, sections):
+        with self._condition:
+            self._attente = sections
+            self._condition.notify()
+
+    def _boucle(self):
+        while True:
+            with self._condition:
+                while self._attente is None and self._actif:
+                    self._condition.wait()
+                if self._attente is None:
+                    return
+                sections, self._attente = self._attente, None
+            try:
+                self.fichier.ecrire(sections, incremental=True)
+            except Exception as e:
+                if self.sur_erreur:
+                    self.sur_erreur(e)
+
+    def arreter(self, delai=5.0):
+        """Termine l'écriture en attente puis arrête le thread"""
+        with self._condition:
+            self._actif = False
+            self._condition.notify()
+        self._thread.join(delai)
@@ -0,0 +1,153 @@
+# reactif.py
+"""
+Graphe de dépendances réactif pour le recalcul en direct des pages.
+
+Chaque champ de saisie est une source ; chaque grandeur calculée est un nœud
+déclaré avec ses dépendances ; les observateurs mettent l'interface à jour.
+Une frappe marque la source modifiée et programme un recalcul différé
+(anti-rebond) : au déclenchement, seuls les nœuds en aval d'une valeur qui a
+réellement changé sont recalculés. Un nœud dont le résultat est identique à
+la valeur précédente ne propage rien.
+
+    g = GrapheReactif(self, sur_erreur=self.afficher_erreur)
+    g.source("d_cyl", entry_d_cyl)
+    g.noeud("cotes", ["d_cyl", "densite"], piston)
+    g.observer(["cotes"], self.afficher_schema)
+"""
+
+import tkinter as tk
+
+DELAI_MS = 300
+
+
+def _identiques(a, b):
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+class _Noeud:
+    __slots__ = ("nom", "dependances", "fonction", "valeur", "calcule", "erreur", "observateur")
+
+    def __init__(self, nom, dependances, fonction, observateur=False):
+        self.nom = nom
+        self.dependances = tuple(dependances)
+        self.fonction = fonction
+        self.valeur = None
+        self.calcule = False
+        self.erreur = None
+        self.observateur = observateur
+
+
+class GrapheReactif:
+    def __init__(self, widget, delai_ms=DELAI_MS, sur_erreur=None):
+        self.widget = widget
+        self.delai_ms = delai_ms
+        self.sur_erreur = sur_erreur
+        self._sources = {}      # nom -> (lecture, StringVar)
+        self._noeuds = {}       # ordre d'insertion = ordre topologique
+        self._modifiees = set()
+        self._tache = None
+        self.n_calculs = 0      # nombre de nœuds évalués (diagnostic)
+
+    # ---- construction ----
+    def source(self, nom, entry, conversion=float):
+        """Champ de saisie observé : toute écriture (frappe, collage, insert) programme un recalcul"""
+        var = tk.StringVar(master=entry, value=entry.get())
+        entry.configure(textvariable=var)
+        var.trace_add("write", lambda *_: self.modifier(nom))
+        self._sources[nom] = (lambda: conversion(var.get()), var)
+        self._ajouter(_Noeud(nom, (), None))
+        self._modifiees.add(nom)
+
+    def noeud(self, nom, dependances, fonction):
+        """Grandeur calculée : fonction(*valeurs des dépendances)"""
+        self._ajouter(_Noeud(nom, dependances, fonction))
+
+    def observer(self, dependances, rappel):
+        """Rappel d'affichage, exécuté quand l'une des dépendances change"""
+        nom = f"_observateur_{len(self._noeuds)}"
+        self._ajouter(_Noeud(nom, dependances, rappel, observateur=True))
+
+    def _ajouter(self, noeud):
+        if noeud.nom in self._noeuds:
+            raise ValueError(f"Nœud déjà défini : {noeud.nom}")
+        for dep in noeud.dependances:
+            if dep not in self._noeuds:
+                raise ValueError(f"{noeud.nom} dépend de {dep}, qui n'est pas (encore) défini")
+        self._noeuds[noeud.nom] = noeud
+
+    # ---- lecture ----
+    def valeur(self, nom):
+        return self._noeuds[nom].valeur
+
+    @property
+    def en_attente(self):
+        return bool(self._modifiees)
+
+    # ---- recalcul ----
+    def modifier(self, nom):
+        self._modifiees.add(nom)
+        self.planifier()
+
+    def planifier(self):
+        """(Re)lance la temporisation : le recalcul part quand la saisie s'arrête"""
+        if self._tache is not None:
+            self.widget.after_cancel(self._tache)
+        self._tache = self.widget.after(self.delai_ms, self.recalculer)
+
+    def vider(self):
+        """Exécute tout de suite un recalcul en attente (changement de page, sauvegarde…)"""
+        if self._modifiees:
+            self.recalculer()
+
+    def recalculer(self):
+        if self._tache is not None:
+            self.widget.after_cancel(self._tache)
+            self._tache = None
+        modifiees, self._modifiees = self._modifiees, set()
+        changes = set()
+        premiere_erreur = None
+        for noeud in self._noeuds.values():
+            if noeud.fonction is None:
+                if noeud.nom not in modifiees:
+                    continue
+                lecture = self._sources[noeud.nom][0]
+                ancienne_erreur = noeud.erreur
+                try:
+                    valeur = lecture()
+                    noeud.erreur = None
+                except Exception as e:
+                    noeud.erreur = e
+                    premiere_erreur = premiere_erreur or e
+                    changes.add(noeud.nom)
+                    continue
+            else:
+                if noeud.calcule and not any(d in changes for d in noeud.dependances):
+                    continue
+                erreur_amont = next((self._noeuds[d].erreur for d in noeud.dependances
+                                     if self._noeuds[d].erreur is not None), None)
+                ancienne_erreur = noeud.erreur
+                if erreur_amont is not None:
+                    noeud.erreur = erreur_amont
+                    changes.add(noeud.nom)
+                    continue
+                try:
+                    valeur = noeud.fonction(*(self._noeuds[d].valeur for d in noeud.dependances))
+                    noeud.erreur = None
+                    self.n_calculs += 1
+                except Exception as e:
+                    noeud.erreur = e
+                    premiere_erreur = premiere_erreur or e
+                    changes.add(noeud.nom)
+                    continue
+            # Un nœud qui sort d'une erreur repropage même si sa valeur n'a pas changé
+            if (noeud.observateur or not noeud.calcule or ancienne_erreur is not None
+                    or not _identiques(valeur, noeud.valeur)):
+                changes.add(noeud.nom)
+            noeud.valeur = valeur
+            noeud.calcule = True
+        if premiere_erreur is not None and self.sur_erreur:
+            self.sur_erreur(premiere_erreur)
+        return changes